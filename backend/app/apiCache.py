@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from .singleFlight import SingleFlight
+
+# 외부 검색 API 응답 캐시 (네이버 지역/블로그/이미지 검색, 카카오 웹/키워드 검색)
+# 1단계: 프로세스 내부 LRU (직렬화된 JSON을 저장하므로 호출자가 결과를 수정해도 캐시는 그대로)
+# 2단계: SQLite 디스크 저장소 (zlib 압축 JSON, 재시작 후에도 유지, 여러 워커가 같은 파일 공유)
+# 키: 엔드포인트(호스트 + 경로) + 정규화한 파라미터 (키 정렬, 유니코드 NFC, 공백 정리, 대소문자 통일)
+# TTL은 엔드포인트마다 다름 (지역/이미지 검색 결과는 천천히, 블로그/웹 검색 결과는 빨리 바뀜)
+# 같은 키의 캐시 미스가 동시에 들어오면 single-flight로 외부 호출을 한 번만 보냄
+# 실패한 요청(예외)은 저장하지 않음
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# (이름, URL 경로, 기본 TTL) - API_CACHE_TTL_<이름 대문자> 환경 변수(초)로 변경 가능
+ENDPOINTS = [
+    ("naver_local", "/v1/search/local", 7 * DAY),
+    ("naver_image", "/v1/search/image", 7 * DAY),
+    ("naver_blog", "/v1/search/blog", 6 * HOUR),
+    ("kakao_web", "/v2/search/web", 6 * HOUR),
+    ("kakao_keyword", "/v2/local/search/keyword", 3 * DAY),
+    ("kakao_local", "/v2/search/local", 3 * DAY),
+]
+DEFAULT_TTL = float(os.getenv("API_CACHE_DEFAULT_TTL", str(HOUR)))
+
+def endpoint_ttls() -> Dict[str, float]:
+    return {name: float(os.getenv(f"API_CACHE_TTL_{name.upper()}", str(ttl))) for name, _, ttl in ENDPOINTS}
+
+def endpoint_name(url: str) -> str:
+    """URL이 어느 엔드포인트인지 (등록되지 않은 URL은 호스트 + 경로)"""
+    parts = urlsplit(url)
+    path = parts.path[:-5] if parts.path.endswith(".json") else parts.path
+    for name, endpoint_path, _ in ENDPOINTS:
+        if path == endpoint_path:
+            return name
+    return f"{parts.netloc.lower()}{path}"
+
+def _normalize(value: Any) -> str:
+    text = unicodedata.normalize("NFC", str(value))
+    return " ".join(text.split()).lower()
+
+def cache_key(url: str, params: Optional[dict]) -> str:
+    parts = urlsplit(url)
+    path = parts.path[:-5] if parts.path.endswith(".json") else parts.path
+    normalized = sorted((str(k), _normalize(v)) for k, v in (params or {}).items() if v is not None)
+    raw = json.dumps([parts.netloc.lower(), path, normalized], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+class ApiCache:
+    """메모리 LRU 앞단 + SQLite 뒷단으로 구성된 2단계 API 응답 캐시"""
+
+    def __init__(self, path: str, ttls: Optional[Dict[str, float]] = None, default_ttl: float = DEFAULT_TTL,
+                 memory_size: int = 2048, disk_size: int = 100_000, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttls = endpoint_ttls() if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._clock = clock
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict() # 키 -> (만료 시각, JSON bytes)
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, body BLOB NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses(expires_at)")
+        self._conn.commit()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "expired": 0, "fetches": 0, "errors": 0, "evictions": 0}
+        self._endpoints: Dict[str, Dict[str, int]] = {}
+
+    def ttl(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    # ------------------------------
+    # 조회 / 저장
+    # ------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        """캐시된 응답 (메모리 -> 디스크 순서로 조회, 만료된 항목은 None)"""
+        now = self._clock()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                expires_at, body = cached
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return json.loads(body)
+                del self._memory[key]
+            row = self._conn.execute("SELECT body, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            blob, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            body = zlib.decompress(blob)
+            self._remember(key, expires_at, body)
+            self._counters["disk_hits"] += 1
+            return json.loads(body)
+
+    def put(self, key: str, endpoint: str, value: Any) -> bytes:
+        now = self._clock()
+        expires_at = now + self.ttl(endpoint)
+        body = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self._remember(key, expires_at, body)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, endpoint, zlib.compress(body, 6), expires_at, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+        return body
+
+    def fetch(self, url: str, params: Optional[dict], fetch_fn: Callable[[], Any]) -> Any:
+        """캐시에 있으면 그대로, 없으면 fetch_fn()을 한 번만 호출하여 저장 후 반환"""
+        key = cache_key(url, params)
+        endpoint = endpoint_name(url)
+        cached = self.get(key)
+        self._count(endpoint, "hits" if cached is not None else "misses")
+        if cached is not None:
+            return cached
+
+        def load() -> bytes:
+            with self._lock:
+                # 캐시 조회 후 single-flight에 들어오기 전에 다른 호출이 저장을 마쳤을 수 있으므로 메모리 캐시를 다시 확인
+                cached = self._memory.get(key)
+                if cached is not None and cached[0] > self._clock():
+                    return cached[1]
+                self._counters["fetches"] += 1
+            try:
+                value = fetch_fn()
+            except Exception:
+                with self._lock:
+                    self._counters["errors"] += 1
+                raise
+            return self.put(key, endpoint, value)
+
+        body, shared = self._flight.do(key, load)
+        if shared:
+            self._count(endpoint, "shared")
+        return json.loads(body)
+
+    # ------------------------------
+    # 관리 및 통계
+    # ------------------------------
+    def stats(self) -> Dict[str, Any]:
+        """히트율, 절약한 외부 호출 수, 엔드포인트별 통계"""
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            lookups = hits + self._counters["misses"]
+            disk_rows = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                **self._counters,
+                "shared": self._flight.shared,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                # 캐시 히트 + single-flight로 합쳐진 호출은 외부 API를 호출하지 않음
+                "saved_calls": lookups - self._counters["fetches"],
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_rows,
+                "endpoints": {name: dict(counts) for name, counts in self._endpoints.items()},
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _count(self, endpoint: str, name: str):
+        with self._lock:
+            counts = self._endpoints.setdefault(endpoint, {"hits": 0, "misses": 0, "shared": 0})
+            counts[name] += 1
+
+    def _remember(self, key: str, expires_at: float, body: bytes):
+        self._memory[key] = (expires_at, body)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float):
+        """만료된 항목을 지우고, 그래도 disk_size를 넘으면 가장 오래 사용되지 않은 항목부터 삭제"""
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        overflow = count - self.disk_size
+        if overflow <= 0:
+            return
+        removed = self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+        overflow -= removed
+        if overflow > 0:
+            # 매번 한 건씩 지우지 않도록 여유분(10%)까지 한 번에 정리
+            overflow = min(count - removed, overflow + self.disk_size // 10)
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+            removed += overflow
+        self._counters["evictions"] += removed
+        logging.info(f"[API CACHE] 디스크 캐시에서 {removed}개 항목 정리")
+
+# 프로세스 전체에서 공유하는 캐시 (API_CACHE_ENABLED=0 으로 끌 수 있음)
+API_CACHE_ENABLED = os.getenv("API_CACHE_ENABLED", "1") != "0"
+api_cache = None
+_api_cache_lock = threading.Lock()
+
+def get_api_cache() -> Optional[ApiCache]:
+    global api_cache
+    if api_cache is None and API_CACHE_ENABLED:
+        with _api_cache_lock:
+            if api_cache is None:
+                api_cache = ApiCache(
+                    path=os.getenv("API_CACHE_PATH", "./api_cache.sqlite3"),
+                    memory_size=int(os.getenv("API_CACHE_MEMORY_SIZE", "2048")),
+                    disk_size=int(os.getenv("API_CACHE_DISK_SIZE", "100000")),
+                )
+    return api_cache
+
+def cached_get_json(url: str, params: Optional[dict], fetch_fn: Callable[[], Any]) -> Any:
+    """캐시가 켜져 있으면 캐시를 거쳐, 꺼져 있으면 바로 fetch_fn() 호출"""
+    cache = get_api_cache()
+    return cache.fetch(url, params, fetch_fn) if cache else fetch_fn()
@@ -1,13 +1,30 @@
-import requests
 import json
 import os
+import sys
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from readability import Document
-import google.generativeai as genai
+
+try:
+    from .httpClient import get_http_client
+    from .apiCache import cached_get_json
+    from .pageStore import fetch_page, page_text
+    from .textMining import LINE_SEPARATORS, ReviewMatcher
+    from .htmlExtract import canonical_url, extract_main_text
+    from .llmClient import GeminiClient
+    from .llmCache import with_cache
+    from .summarizer import SummaryTask, summarize_many
+except ImportError: # 스크립트로 직접 실행하는 경우
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+    from backend.app.httpClient import get_http_client
+    from backend.app.apiCache import cached_get_json
+    from backend.app.pageStore import fetch_page, page_text
+    from backend.app.textMining import LINE_SEPARATORS, ReviewMatcher
+    from backend.app.htmlExtract import canonical_url, extract_main_text
+    from backend.app.llmClient import GeminiClient
+    from backend.app.llmCache import with_cache
+    from backend.app.summarizer import SummaryTask, summarize_many
 
 # 환경 변수 로드
 load_dotenv()
@@ -16,19 +33,77 @@ load_dotenv()
 KAKAO_REST_KEY = os.getenv('KAKAO_REST_KEY')
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 
-# Gemini AI 설정
-genai.configure(api_key=GOOGLE_API_KEY)
-model = genai.GenerativeModel('gemini-1.5-flash')
+# Gemini AI 설정 (여러 맛집을 한 번의 요청으로 분석, 같은 리뷰의 분석 결과는 응답 캐시에서 반환)
+LLM_CLIENT = with_cache(GeminiClient('gemini-1.5-flash', api_key=GOOGLE_API_KEY)) if GOOGLE_API_KEY else None
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 리뷰 관련 키워드 (줄 단위로 검사, 광고 문구가 있는 줄은 제외)
+REVIEW_KEYWORDS = [
+    "맛있", "추천", "별로", "최고", "불친절", "친절",
+    "가격", "가성비", "재방문", "웨이팅", "분위기",
+    "서비스", "음식", "맛", "후기"
+]
+REVIEW_MATCHER = ReviewMatcher(REVIEW_KEYWORDS, separators=LINE_SEPARATORS)
+
+# 맛집 상세 분석 형식
+ANALYSIS_TASK = SummaryTask(
+    instruction=(
+        "각 맛집의 리뷰들(reviews)을 분석해서 상세한 JSON으로 답변해주세요.\n"
+        "recommended_for는 데이트, 가족식사, 회식, 혼밥, 친구모임 중 적절한 것들만 넣어주세요."
+    ),
+    template={
+        "restaurant_summary": {
+            "name": "맛집 이름",
+            "category": "음식 카테고리 (예: 한식, 일식, 중식, 양식, 카페 등)",
+            "overall_rating": 4.2,
+            "price_range": "가격대 (예: 1만원 이하, 1-2만원, 2-3만원, 3만원 이상)",
+            "recommended_for": ["데이트", "가족식사", "회식", "혼밥", "친구모임"]
+        },
+        "menu_info": {
+            "signature_dishes": ["대표메뉴1", "대표메뉴2", "대표메뉴3"],
+            "popular_items": ["인기메뉴1", "인기메뉴2"],
+            "menu_variety": "메뉴 다양성 평가",
+            "taste_rating": 4.1
+        },
+        "ambiance_service": {
+            "atmosphere": "분위기 상세 설명",
+            "interior": "인테리어 특징",
+            "service_quality": "서비스 품질 평가",
+            "staff_friendliness": 4.0,
+            "cleanliness": "청결도 평가"
+        },
+        "practical_info": {
+            "parking": "주차 정보",
+            "waiting_time": "대기시간 정보",
+            "reservation": "예약 가능 여부",
+            "opening_hours": "영업시간 정보 (있다면)",
+            "best_time_to_visit": "방문 추천 시간대"
+        },
+        "detailed_analysis": {
+            "pros": ["구체적인 장점1", "구체적인 장점2", "구체적인 장점3"],
+            "cons": ["구체적인 단점1", "구체적인 단점2", "구체적인 단점3"],
+            "keywords": ["특징키워드1", "특징키워드2", "특징키워드3", "특징키워드4", "특징키워드5"],
+            "customer_types": "주요 고객층 분석",
+            "revisit_intention": "재방문 의향 분석"
+        },
+        "recommendation": {
+            "overall_recommendation": "전체적인 추천도 (5점 만점)",
+            "target_audience": "추천 대상",
+            "best_menu_combo": "추천 메뉴 조합",
+            "visit_tips": "방문 팁"
+        }
+    },
+)
+
 class RestaurantCrawler:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        # 공용 HTTP 클라이언트 (호스트별 연결 풀 공유, 연결 오류/5xx 재시도)
+        self.http = get_http_client()
+        self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        })
+        }
         
     def kakao_search_local(self, query: str, size: int = 10) -> List[Dict[str, Any]]:
         """카카오 지역 검색 API로 맛집 검색"""
@@ -44,15 +119,11 @@ class RestaurantCrawler:
         }
         
         try:
-            response = self.session.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                documents = data.get('documents', [])
-                logging.info(f"카카오 API: {len(documents)}개 맛집 찾음")
-                return documents
-            else:
-                logging.error(f"카카오 API 오류: {response.status_code}")
-                return []
+            # 같은 검색어는 API 응답 캐시에서 바로 반환 (apiCache)
+            data = cached_get_json(url, params, lambda: self.http.get_json(url, headers={**self.headers, **headers}, params=params, timeout=10))
+            documents = data.get('documents', [])
+            logging.info(f"카카오 API: {len(documents)}개 맛집 찾음")
+            return documents
         except Exception as e:
             logging.error(f"카카오 API 요청 오류: {e}")
             return []
@@ -70,32 +141,21 @@ class RestaurantCrawler:
         }
         
         try:
-            response = self.session.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                documents = data.get('documents', [])
-                logging.info(f"카카오 웹 검색: {len(documents)}개 리뷰 페이지 찾음")
-                return documents
-            else:
-                logging.error(f"카카오 웹 검색 오류: {response.status_code}")
-                return []
+            data = cached_get_json(url, params, lambda: self.http.get_json(url, headers={**self.headers, **headers}, params=params, timeout=10))
+            documents = data.get('documents', [])
+            logging.info(f"카카오 웹 검색: {len(documents)}개 리뷰 페이지 찾음")
+            return documents
         except Exception as e:
             logging.error(f"카카오 웹 검색 요청 오류: {e}")
             return []
     
     def fetch_page_content(self, url: str) -> str:
-        """웹페이지 내용 크롤링"""
+        """웹페이지 내용 크롤링 (페이지 저장소를 거쳐 같은 내용은 다시 받거나 파싱하지 않음)"""
         try:
-            response = self.session.get(url, timeout=10)
-            if response.status_code == 200:
-                # Readability로 본문 추출
-                doc = Document(response.text)
-                soup = BeautifulSoup(doc.summary(), 'html.parser')
-                text = soup.get_text()
-                # 텍스트 정제
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
-                clean_text = '\n'.join(lines)
-                return clean_text[:2000]  # 2000자로 제한
+            page = fetch_page(canonical_url(url), headers=self.headers, timeout=10)
+            if page is not None:
+                # 사이트별 본문 규칙 -> readability 순서로 추출 (빈 줄 제거)
+                return page_text(page, "main_text", lambda html: extract_main_text(html, page.url))[:2000]  # 2000자로 제한
             return ""
         except Exception as e:
             logging.warning(f"페이지 크롤링 실패 {url}: {e}")
@@ -105,107 +165,25 @@ class RestaurantCrawler:
         """크롤링한 내용에서 리뷰 추출"""
         if not content:
             return []
-            
-        # 리뷰 관련 키워드
-        review_keywords = [
-            "맛있", "추천", "별로", "최고", "불친절", "친절", 
-            "가격", "가성비", "재방문", "웨이팅", "분위기", 
-            "서비스", "음식", "맛", "후기"
-        ]
-        
-        lines = content.split('\n')
-        reviews = []
-        
-        for line in lines:
-            line = line.strip()
-            if len(line) > 20 and len(line) < 200:  # 적당한 길이
-                if any(keyword in line for keyword in review_keywords):
-                    reviews.append(line)
-                    
+
+        reviews = REVIEW_MATCHER.extract(content, min_length=21, max_length=199)  # 적당한 길이
         return reviews[:10]  # 최대 10개
     
+    def analyze_many_with_gemini(self, items: List[tuple]) -> List[Dict[str, Any]]:
+        """(맛집 이름, 리뷰 목록) 여러 개를 배치로 묶어 Gemini AI로 분석 (입력 순서대로, 실패하면 빈 dict)"""
+        jobs = [(i, {"name": name, "reviews": reviews}) for i, (name, reviews) in enumerate(items) if reviews]
+        analyses = summarize_many(LLM_CLIENT, ANALYSIS_TASK, jobs)
+        for i, (name, _) in enumerate(items):
+            if i in analyses:
+                logging.info(f"Gemini 분석 완료: {name}")
+        return [analyses.get(i, {}) for i in range(len(items))]
+
     def analyze_with_gemini(self, restaurant_name: str, reviews: List[str]) -> Dict[str, Any]:
         """Gemini AI로 맛집 정보 상세 분석"""
-        if not GOOGLE_API_KEY or not reviews:
-            return {}
-            
-        reviews_text = '\n'.join(reviews)
-        
-        prompt = f"""
-다음은 '{restaurant_name}' 맛집에 대한 리뷰들입니다:
-
-{reviews_text}
-
-위 리뷰들을 분석해서 다음 형식의 상세한 JSON으로 답변해주세요:
-
-{{
-    "restaurant_summary": {{
-        "name": "{restaurant_name}",
-        "category": "음식 카테고리 (예: 한식, 일식, 중식, 양식, 카페 등)",
-        "overall_rating": 4.2,
-        "price_range": "가격대 (예: 1만원 이하, 1-2만원, 2-3만원, 3만원 이상)",
-        "recommended_for": ["데이트", "가족식사", "회식", "혼밥", "친구모임"] 중 적절한 것들
-    }},
-    "menu_info": {{
-        "signature_dishes": ["대표메뉴1", "대표메뉴2", "대표메뉴3"],
-        "popular_items": ["인기메뉴1", "인기메뉴2"],
-        "menu_variety": "메뉴 다양성 평가",
-        "taste_rating": 4.1
-    }},
-    "ambiance_service": {{
-        "atmosphere": "분위기 상세 설명",
-        "interior": "인테리어 특징",
-        "service_quality": "서비스 품질 평가",
-        "staff_friendliness": 4.0,
-        "cleanliness": "청결도 평가"
-    }},
-    "practical_info": {{
-        "parking": "주차 정보",
-        "waiting_time": "대기시간 정보",
-        "reservation": "예약 가능 여부",
-        "opening_hours": "영업시간 정보 (있다면)",
-        "best_time_to_visit": "방문 추천 시간대"
-    }},
-    "detailed_analysis": {{
-        "pros": ["구체적인 장점1", "구체적인 장점2", "구체적인 장점3"],
-        "cons": ["구체적인 단점1", "구체적인 단점2", "구체적인 단점3"],
-        "keywords": ["특징키워드1", "특징키워드2", "특징키워드3", "특징키워드4", "특징키워드5"],
-        "customer_types": "주요 고객층 분석",
-        "revisit_intention": "재방문 의향 분석"
-    }},
-    "recommendation": {{
-        "overall_recommendation": "전체적인 추천도 (5점 만점)",
-        "target_audience": "추천 대상",
-        "best_menu_combo": "추천 메뉴 조합",
-        "visit_tips": "방문 팁"
-    }}
-}}
-
-JSON 형식으로만 답변해주세요.
-"""
-        
-        try:
-            response = model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # JSON 추출
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            if start != -1 and end != 0:
-                json_str = response_text[start:end]
-                analysis = json.loads(json_str)
-                logging.info(f"Gemini 분석 완료: {restaurant_name}")
-                return analysis
-            else:
-                logging.warning("Gemini 응답에서 JSON을 찾을 수 없습니다.")
-                return {}
-                
-        except Exception as e:
-            logging.error(f"Gemini AI 분석 오류: {e}")
-            return {}
+        return self.analyze_many_with_gemini([(restaurant_name, reviews)])[0]
     
-    def crawl_restaurant(self, restaurant_name: str, location: str = "") -> Dict[str, Any]:
-        """개별 맛집 크롤링 및 분석"""
+    def crawl_restaurant(self, restaurant_name: str, location: str = "", analyze: bool = True) -> Dict[str, Any]:
+        """개별 맛집 크롤링 및 분석 (analyze가 False면 분석은 호출하는 쪽에서 배치로)"""
         logging.info(f"맛집 크롤링 시작: {restaurant_name}")
         
         # 1. 카카오 지역 검색으로 기본 정보 수집
@@ -248,7 +226,7 @@ JSON 형식으로만 답변해주세요.
         restaurant_info["reviews"] = all_reviews[:20]  # 최대 20개 리뷰
         
         # 4. Gemini AI로 분석
-        if all_reviews:
+        if analyze and all_reviews:
             review_texts = [r["text"] for r in all_reviews]
             analysis = self.analyze_with_gemini(restaurant_name, review_texts)
             restaurant_info["analysis"] = analysis
@@ -262,11 +240,22 @@ JSON 형식으로만 답변해주세요.
         
         for restaurant in restaurant_list:
             try:
-                result = self.crawl_restaurant(restaurant, location)
+                result = self.crawl_restaurant(restaurant, location, analyze=False)
                 results.append(result)
             except Exception as e:
                 logging.error(f"맛집 크롤링 오류 {restaurant}: {e}")
                 continue
+
+        # 리뷰가 있는 맛집 전체를 배치로 묶어 분석 (맛집마다 요청하지 않음)
+        try:
+            analyses = self.analyze_many_with_gemini([(r["name"], [review["text"] for review in r["reviews"]]) for r in results])
+        except Exception as e:
+            logging.error(f"Gemini 배치 분석 오류: {e}")
+            analyses = [{}] * len(results)
+        for result, analysis in zip(results, analyses):
+            # 분석에 실패한 맛집은 이미 가지고 있는 분석 결과를 그대로 둠
+            if analysis:
+                result["analysis"] = analysis
                 
         return results
     
@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import update
+from sqlalchemy import update, select, func, tuple_
 from backend import db
 from . import models, schemas
+from .database import PGVECTOR_ENABLED
 from passlib.context import CryptContext
 from datetime import date
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from passlib.context import CryptContext
 
 # 비밀번호 해싱 설정
@@ -69,6 +70,72 @@ def get_or_create_restaurant_in_postgres(db: Session, name: str, address: str, i
     db.refresh(db_restaurant)
     return db_restaurant
 
+def upsert_restaurants_in_postgres(db: Session, items: List[Tuple[Dict[str, Any], Optional[Sequence[float]]]]) -> List[models.Restaurant]:
+    """
+    여러 맛집의 (상세 정보, 임베딩)을 이름+주소 기준으로 한 번에 저장 (있으면 갱신)
+    임베딩은 PGVECTOR_ENABLED일 때만 저장
+    """
+    if not items:
+        return []
+    keys = list({(details["name"], details["address"]) for details, _ in items})
+    existing = {
+        (restaurant.name, restaurant.address): restaurant
+        for restaurant in db.query(models.Restaurant).filter(tuple_(models.Restaurant.name, models.Restaurant.address).in_(keys))
+    }
+
+    saved = []
+    for details, embedding in items:
+        key = (details["name"], details["address"])
+        restaurant = existing.get(key)
+        if restaurant is None:
+            restaurant = existing[key] = models.Restaurant(name=details["name"], address=details["address"])
+            db.add(restaurant)
+        restaurant.image_url = details.get("image_url") or restaurant.image_url
+        restaurant.price_range = details.get("price_range") or details.get("summary_price") # 요약 결과의 키는 price_range
+        restaurant.review_trust_score = details.get("review_trust_score")
+        restaurant.details = details
+        if PGVECTOR_ENABLED and embedding is not None:
+            restaurant.embedding = [float(x) for x in embedding]
+        saved.append(restaurant)
+    db.commit()
+    return saved
+
+def search_restaurants_hybrid(
+    db: Session,
+    embedding: Sequence[float],
+    limit: int = 10,
+    region: Optional[str] = None,
+    price_ranges: Optional[List[str]] = None,
+    min_review_count: Optional[int] = None,
+    min_trust_score: Optional[int] = None,
+) -> List[Tuple[models.Restaurant, float, int]]:
+    """
+    SQL 조건(지역, 가격대, 리뷰 수, 신뢰도)과 벡터 유사도를 한 번의 쿼리로 검색
+    (맛집, L2 거리, 리뷰 수)를 거리가 가까운 순서로 반환
+    필터가 매우 선택적이면 HNSW 후보가 부족할 수 있으므로 pgvector 0.8+의 hnsw.iterative_scan 설정을 권장
+    """
+    if not PGVECTOR_ENABLED:
+        raise ValueError("PGVECTOR_ENABLED가 꺼져 있어 벡터 검색을 할 수 없습니다.")
+    review_count = (
+        select(func.count(models.Review.id))
+        .where(models.Review.restaurant_id == models.Restaurant.id)
+        .correlate(models.Restaurant)
+        .scalar_subquery()
+    )
+    distance = models.Restaurant.embedding.l2_distance([float(x) for x in embedding])
+
+    query = db.query(models.Restaurant, distance.label("distance"), review_count.label("review_count"))
+    query = query.filter(models.Restaurant.embedding.isnot(None))
+    if region:
+        query = query.filter(models.Restaurant.address.contains(region))
+    if price_ranges:
+        query = query.filter(models.Restaurant.price_range.in_(price_ranges))
+    if min_trust_score is not None:
+        query = query.filter(models.Restaurant.review_trust_score >= min_trust_score)
+    if min_review_count is not None:
+        query = query.filter(review_count >= min_review_count)
+    return [(restaurant, float(dist), int(count)) for restaurant, dist, count in query.order_by(distance).limit(limit)]
+
 # 리뷰 & 검색로그 CRUD 함수
 def create_review(db: Session, review: schemas.ReviewCreate):
     """새로운 리뷰를 생성"""
@@ -2,7 +2,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
-import chromadb
+import threading
 
 # PostgreSQL 연결 URL (환경 변수에서 불러옴)
 SQLALCHEMY_DATABASE_URL = os.getenv(
@@ -14,6 +14,11 @@ engine = create_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# pgvector 사용 여부 (PostgreSQL에 vector 확장이 설치되어 있어야 함)
+# 켜면 맛집 임베딩을 restaurants 테이블에도 저장하고, SQL 조건과 벡터 유사도를 한 쿼리로 검색할 수 있음
+PGVECTOR_ENABLED = os.getenv("PGVECTOR_ENABLED", "false").lower() == "true"
+PGVECTOR_DIMENSION = int(os.getenv("PGVECTOR_DIMENSION", "768"))  # jhgan/ko-sroberta-multitask 출력 차원
+
 def get_db():
     # PostgreSQL 데이터베이스 세션을 반환하는 의존성 함수
     db = SessionLocal()
@@ -23,10 +28,18 @@ def get_db():
         db.close()
 
 # Vector DB 설정 (ChromaDB)
-vector_db_client = chromadb.PersistentClient(path="./chroma_db_storage")
-# restaurants 컬렉션 가져오기 (없으면 생성)
-restaurant_collection = vector_db_client.get_or_create_collection(name="restaurants")
+# 클라이언트는 import 시점이 아니라 처음 사용할 때 생성 (앱 시작 지연 방지)
+vector_db_client = None
+restaurant_collection = None
+_vector_db_lock = threading.Lock()
 
 def get_vector_db_collection():
-    # 벡터 DB의 restaurants 컬렉션을 반환
+    # 벡터 DB의 restaurants 컬렉션을 반환 (없으면 생성)
+    global vector_db_client, restaurant_collection
+    if restaurant_collection is None:
+        with _vector_db_lock:
+            if restaurant_collection is None:
+                import chromadb
+                vector_db_client = chromadb.PersistentClient(path="./chroma_db_storage")
+                restaurant_collection = vector_db_client.get_or_create_collection(name="restaurants")
     return restaurant_collection
\ No newline at end of file
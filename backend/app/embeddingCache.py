@@ -0,0 +1,197 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# 임베딩 캐시
+# 1단계: 프로세스 내부 LRU (OrderedDict)
+# 2단계: SQLite 디스크 저장소 (재시작 후에도 유지, 여러 워커가 같은 파일 공유)
+# 벡터 키는 "모델 이름 + preprocess_text 결과"의 해시이며,
+# 원문 -> 전처리 결과도 함께 저장해서 캐시 히트 시 Okt 형태소 분석까지 건너뜀
+
+def _hash(*parts: str) -> str:
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+class _LRU:
+    """크기 제한이 있는 단순 LRU 딕셔너리"""
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data = OrderedDict()
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class EmbeddingCache:
+    """메모리 LRU 앞단 + SQLite 뒷단으로 구성된 2단계 임베딩 캐시"""
+
+    def __init__(self, path: str, model_name: str, memory_size: int = 4096, disk_size: int = 200_000):
+        self.path = path
+        self.model_name = model_name
+        self.disk_size = disk_size
+        self._vectors = _LRU(memory_size)
+        self._preprocessed = _LRU(memory_size)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS preprocessed ("
+            "key TEXT PRIMARY KEY, text TEXT NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings(accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_preprocessed_accessed ON preprocessed(accessed_at)")
+        self._conn.commit()
+        self._counters = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0,
+            "preprocess_hits": 0, "preprocess_misses": 0, "evictions": 0,
+        }
+
+    # ------------------------------
+    # 키 생성
+    # ------------------------------
+    def vector_key(self, preprocessed_text: str) -> str:
+        return _hash(self.model_name, preprocessed_text)
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        return _hash(text)
+
+    # ------------------------------
+    # 원문 -> 전처리 결과
+    # ------------------------------
+    def get_preprocessed_many(self, texts: Iterable[str]) -> Dict[str, str]:
+        """캐시에 있는 원문의 전처리 결과를 {원문: 전처리 결과}로 반환"""
+        found, missing = {}, {}
+        with self._lock:
+            for text in set(texts):
+                key = self.text_key(text)
+                cached = self._preprocessed.get(key)
+                if cached is not None:
+                    found[text] = cached
+                else:
+                    missing[key] = text
+            for key, value in self._select("preprocessed", "text", list(missing)):
+                found[missing.pop(key)] = value
+                self._preprocessed.put(key, value)
+            self._counters["preprocess_hits"] += len(found)
+            self._counters["preprocess_misses"] += len(missing)
+        return found
+
+    def put_preprocessed_many(self, items: Dict[str, str]):
+        if not items:
+            return
+        now = time.time()
+        rows = [(self.text_key(text), preprocessed, now) for text, preprocessed in items.items()]
+        with self._lock:
+            for key, preprocessed, _ in rows:
+                self._preprocessed.put(key, preprocessed)
+            self._conn.executemany("INSERT OR REPLACE INTO preprocessed VALUES (?, ?, ?)", rows)
+            self._evict("preprocessed")
+            self._conn.commit()
+
+    # ------------------------------
+    # 전처리 결과 -> 벡터
+    # ------------------------------
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """캐시에 있는 벡터를 {키: 벡터}로 반환 (메모리 -> 디스크 순서로 조회)"""
+        found, missing = {}, []
+        with self._lock:
+            for key in set(keys):
+                cached = self._vectors.get(key)
+                if cached is not None:
+                    found[key] = cached
+                else:
+                    missing.append(key)
+            self._counters["memory_hits"] += len(found)
+            disk_rows = self._select("embeddings", "dim, vector", missing)
+            for key, (dim, blob) in disk_rows:
+                vector = np.frombuffer(blob, dtype=np.float32, count=dim)
+                found[key] = vector
+                self._vectors.put(key, vector)
+            self._counters["disk_hits"] += len(disk_rows)
+            self._counters["misses"] += len(missing) - len(disk_rows)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        with self._lock:
+            for key, vector in items.items():
+                vector = np.ascontiguousarray(vector, dtype=np.float32)
+                self._vectors.put(key, vector)
+                rows.append((key, vector.shape[0], vector.tobytes(), now))
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+            self._evict("embeddings")
+            self._conn.commit()
+
+    # ------------------------------
+    # 관리 및 통계
+    # ------------------------------
+    def stats(self) -> Dict[str, int]:
+        """히트/미스 카운터와 현재 캐시 크기를 반환"""
+        with self._lock:
+            disk_rows = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return {**self._counters, "memory_entries": len(self._vectors), "disk_entries": disk_rows}
+
+    def clear(self):
+        with self._lock:
+            self._vectors.clear()
+            self._preprocessed.clear()
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.execute("DELETE FROM preprocessed")
+            self._conn.commit()
+
+    def _select(self, table: str, columns: str, keys: List[str]) -> List[tuple]:
+        """키 목록을 SQLite 변수 제한에 맞춰 나누어 조회하고, 조회된 행의 접근 시간을 갱신"""
+        rows = []
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self._conn.execute(f"SELECT key, {columns} FROM {table} WHERE key IN ({placeholders})", chunk):
+                rows.append((row[0], row[1] if len(row) == 2 else row[1:]))
+        if rows:
+            now = time.time()
+            self._conn.executemany(f"UPDATE {table} SET accessed_at = ? WHERE key = ?", [(now, key) for key, _ in rows])
+            self._conn.commit()
+        return rows
+
+    def _evict(self, table: str):
+        """디스크 항목 수가 disk_size를 넘으면 가장 오래 사용되지 않은 항목부터 삭제"""
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        overflow = count - self.disk_size
+        if overflow <= 0:
+            return
+        # 매번 한 건씩 지우지 않도록 여유분(10%)까지 한 번에 정리
+        overflow = min(count, overflow + self.disk_size // 10)
+        self._conn.execute(
+            f"DELETE FROM {table} WHERE key IN (SELECT key FROM {table} ORDER BY accessed_at LIMIT ?)",
+            (overflow,)
+        )
+        self._counters["evictions"] += overflow
+        logging.info(f"[EMBEDDING CACHE] {table} 테이블에서 {overflow}개 항목 정리")
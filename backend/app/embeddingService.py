@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+
+# 임베딩 사이드카
+# 노드당 하나의 프로세스가 모델/Okt/임베딩 캐시를 소유하고, uvicorn 워커들은 소켓으로 텍스트를 보내 벡터를 받음
+# 여러 워커에서 거의 동시에 들어온 요청은 짧은 대기 시간(max_wait_ms) 동안 모아 한 번에 인코딩(micro-batching)
+#
+# 프레임 형식: [헤더 길이(4바이트)][페이로드 길이(4바이트)][JSON 헤더][페이로드]
+# - 요청: {"op": "encode", "texts": [...], "batch_size": 32} / {"op": "stats"}
+# - 응답: {"rows": n, "dim": d} + float32 행렬 바이트 / {"error": "..."}
+#
+# 실행: python -m backend.app.embeddingService --addr unix:/tmp/cureat-embedding.sock
+
+_FRAME_HEADER = struct.Struct("!II")
+
+def _pack(header: dict, payload: bytes = b"") -> bytes:
+    raw = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    return _FRAME_HEADER.pack(len(raw), len(payload)) + raw + payload
+
+def parse_addr(addr: str) -> Tuple[str, object]:
+    """'unix:/path/to.sock' 또는 'host:port' 형식의 주소를 (종류, 주소)로 변환"""
+    if addr.startswith("unix:"):
+        return "unix", addr[len("unix:"):]
+    host, _, port = addr.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+# ------------------------------
+# 클라이언트 (uvicorn 워커에서 사용)
+# ------------------------------
+class EmbeddingClient:
+    """사이드카에 동기 방식으로 인코딩을 요청하는 클라이언트 (스레드별로 연결 유지)"""
+
+    def __init__(self, addr: str, timeout: float = 30.0, retry_after: float = 30.0):
+        self.kind, self.address = parse_addr(addr)
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._local = threading.local()
+        self._failed_at = 0.0
+
+    def available(self) -> bool:
+        """최근 연결 실패 후 retry_after초가 지나기 전에는 사이드카를 건너뜀"""
+        return time.monotonic() - self._failed_at >= self.retry_after
+
+    def _connect(self) -> socket.socket:
+        family = socket.AF_UNIX if self.kind == "unix" else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.address)
+        if self.kind == "tcp":
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _recv_exact(self, sock: socket.socket, size: int) -> bytes:
+        buf = bytearray()
+        while len(buf) < size:
+            chunk = sock.recv(size - len(buf))
+            if not chunk:
+                raise ConnectionError("사이드카 연결이 끊어졌습니다.")
+            buf.extend(chunk)
+        return bytes(buf)
+
+    def _request(self, header: dict) -> Tuple[dict, bytes]:
+        sock = getattr(self._local, "sock", None)
+        try:
+            if sock is None:
+                sock = self._local.sock = self._connect()
+            sock.sendall(_pack(header))
+            header_len, payload_len = _FRAME_HEADER.unpack(self._recv_exact(sock, _FRAME_HEADER.size))
+            response = json.loads(self._recv_exact(sock, header_len))
+            payload = self._recv_exact(sock, payload_len)
+        except OSError:
+            self.close()
+            self._failed_at = time.monotonic()
+            raise
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response, payload
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        response, payload = self._request({"op": "encode", "texts": list(texts), "batch_size": batch_size})
+        return np.frombuffer(payload, dtype=np.float32).reshape(response["rows"], response["dim"])
+
+    def stats(self) -> dict:
+        return self._request({"op": "stats"})[0]
+
+    def close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            finally:
+                self._local.sock = None
+
+# ------------------------------
+# 서버 (사이드카 프로세스)
+# ------------------------------
+class MicroBatcher:
+    """짧은 시간 동안 들어온 요청들을 모아 한 번의 인코딩으로 처리"""
+
+    def __init__(self, encode_fn, max_batch: int = 128, max_wait_ms: float = 5.0):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        # 모델은 하나이므로 인코딩은 단일 스레드에서 순서대로 실행
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self.counters = {"requests": 0, "texts": 0, "batches": 0}
+
+    async def submit(self, texts: List[str], batch_size: int) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, batch_size, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            total = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while total < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                total += len(item[0])
+
+            texts = [text for item in batch for text in item[0]]
+            batch_size = max(item[1] for item in batch)
+            self.counters["requests"] += len(batch)
+            self.counters["texts"] += len(texts)
+            self.counters["batches"] += 1
+            try:
+                vectors = await loop.run_in_executor(self._executor, self.encode_fn, texts, batch_size)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for item_texts, _, future in batch:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+async def _handle_connection(batcher: MicroBatcher, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            try:
+                header_len, payload_len = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+            except asyncio.IncompleteReadError:
+                break
+            request = json.loads(await reader.readexactly(header_len))
+            await reader.readexactly(payload_len)
+
+            if request.get("op") == "stats":
+                writer.write(_pack({**batcher.counters, "pid": os.getpid()}))
+            else:
+                try:
+                    vectors = np.ascontiguousarray(
+                        await batcher.submit(request.get("texts", []), int(request.get("batch_size", 32))),
+                        dtype=np.float32,
+                    )
+                    writer.write(_pack({"rows": vectors.shape[0], "dim": vectors.shape[1]}, vectors.tobytes()))
+                except Exception as e:
+                    writer.write(_pack({"error": str(e)}))
+            await writer.drain()
+    finally:
+        writer.close()
+
+async def serve(addr: str, max_batch: int = 128, max_wait_ms: float = 5.0):
+    """사이드카 서버 실행: 모델을 미리 로드/워밍업한 뒤 요청을 받음"""
+    from . import nlpService
+
+    nlpService.encode_locally(["임베딩 사이드카 워밍업"])
+    batcher = MicroBatcher(nlpService.encode_locally, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    batch_task = asyncio.create_task(batcher.run())
+
+    def handler(reader, writer):
+        return _handle_connection(batcher, reader, writer)
+
+    kind, address = parse_addr(addr)
+    if kind == "unix":
+        if os.path.exists(address):
+            os.unlink(address)
+        server = await asyncio.start_unix_server(handler, path=address)
+    else:
+        server = await asyncio.start_server(handler, host=address[0], port=address[1])
+    logging.info(f"[EMBEDDING SERVICE] {addr} 에서 대기 중 (pid={os.getpid()})")
+    async with server:
+        try:
+            await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Cureat 임베딩 사이드카")
+    parser.add_argument("--addr", default=os.getenv("EMBEDDING_SERVICE_ADDR") or "unix:/tmp/cureat-embedding.sock")
+    parser.add_argument("--max-batch", type=int, default=int(os.getenv("EMBEDDING_SERVICE_MAX_BATCH", "128")))
+    parser.add_argument("--max-wait-ms", type=float, default=float(os.getenv("EMBEDDING_SERVICE_MAX_WAIT_MS", "5")))
+    args = parser.parse_args()
+    asyncio.run(serve(args.addr, args.max_batch, args.max_wait_ms))
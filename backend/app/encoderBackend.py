@@ -0,0 +1,139 @@
+import logging
+import os
+from typing import List
+
+import numpy as np
+
+# 문장 임베딩 인코더 백엔드
+# - torch     : 기존 SentenceTransformer(PyTorch) 경로, 다른 백엔드가 실패했을 때의 폴백
+# - onnx      : 같은 모델을 ONNX로 내보내 onnxruntime(CPU)으로 실행
+# - onnx-int8 : ONNX 모델을 동적 int8 양자화하여 실행
+# 백엔드에 따라 벡터 값이 조금씩 달라지므로 name 속성(임베딩 캐시 키에 사용)에 백엔드를 포함
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+class TorchEncoder:
+    """SentenceTransformer(PyTorch) 기반 인코더"""
+    backend = "torch"
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False)
+
+class OnnxEncoder:
+    """ONNX Runtime 기반 인코더 (mean pooling은 SentenceTransformer 설정과 동일하게 numpy로 수행)"""
+
+    def __init__(self, model_name: str, model_dir: str, quantize: bool = False, max_seq_length: int = 128):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.backend = "onnx-int8" if quantize else "onnx"
+        self.name = f"{model_name}@{self.backend}"
+        self.max_seq_length = max_seq_length
+
+        model_path = export_onnx(model_name, model_dir, quantize=quantize)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._dimension = self.session.get_outputs()[0].shape[-1]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self._dimension), dtype=np.float32)
+        # 길이가 비슷한 텍스트끼리 묶어 패딩을 줄이고, 결과는 원래 순서로 되돌림
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        outputs = np.empty((len(texts), self._dimension), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            index = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [texts[i] for i in index], padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors="np",
+            )
+            mask = encoded["attention_mask"].astype(np.int64)
+            hidden = self.session.run(None, {
+                "input_ids": encoded["input_ids"].astype(np.int64),
+                "attention_mask": mask,
+            })[0]
+            mask = mask[:, :, None].astype(np.float32)
+            outputs[index] = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return outputs
+
+def export_onnx(model_name: str, model_dir: str, quantize: bool = False) -> str:
+    """모델을 ONNX로 내보내고(이미 있으면 재사용) 필요 시 동적 int8 양자화한 파일 경로를 반환"""
+    fp32_path = os.path.join(model_dir, "model.onnx")
+    int8_path = os.path.join(model_dir, "model.int8.onnx")
+
+    if not os.path.exists(fp32_path):
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        logging.info(f"[ENCODER] '{model_name}' ONNX 변환 시작 -> {fp32_path}")
+        os.makedirs(model_dir, exist_ok=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name).eval()
+        tokenizer.save_pretrained(model_dir)
+
+        class _LastHiddenState(torch.nn.Module):
+            def __init__(self, inner):
+                super().__init__()
+                self.inner = inner
+
+            def forward(self, input_ids, attention_mask):
+                return self.inner(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+        dummy = tokenizer(["onnx 변환용 문장"], return_tensors="pt")
+        torch.onnx.export(
+            _LastHiddenState(model),
+            (dummy["input_ids"], dummy["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=17,
+        )
+
+    if not quantize:
+        return fp32_path
+
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logging.info(f"[ENCODER] 동적 int8 양자화 시작 -> {int8_path}")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+def load_encoder(model_name: str, backend: str = "torch", model_dir: str = None):
+    """설정된 백엔드로 인코더를 생성하고, 실패하면 PyTorch 경로로 폴백"""
+    if backend not in BACKENDS:
+        logging.warning(f"[ENCODER] 알 수 없는 백엔드 '{backend}', torch 사용")
+        backend = "torch"
+
+    if backend != "torch":
+        model_dir = model_dir or os.path.join("./onnx_models", model_name.replace("/", "__"))
+        try:
+            return OnnxEncoder(model_name, model_dir, quantize=(backend == "onnx-int8"))
+        except Exception as e:
+            logging.warning(f"[ENCODER] {backend} 백엔드 로딩 실패, torch로 폴백: {e}")
+
+    return TorchEncoder(model_name)
@@ -0,0 +1,327 @@
+import os
+import time
+import uuid
+import socket
+import asyncio
+import logging
+import argparse
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table, Text, create_engine, event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+# 맛집 상세 정보 보강(크롤링 -> LLM 요약 -> 벡터 변환/저장) 작업 큐
+# 추천 요청은 네이버 Local 기본 정보만 바로 반환하고, 벡터 DB에 없는 맛집은 이 큐에 등록 (service RECOMMENDATION_MODE=background)
+# - 작업 하나 = 맛집 하나 (id는 service와 같은 f"{이름}_{주소}"), 같은 맛집을 다시 등록하면 우선순위만 높이고 실패한 작업은 다시 대기
+#   (requeue_done이면 완료된 작업도 다시 대기 - 완료됐는데 벡터 저장소에 없는 맛집: 저장소 초기화, 프로세스마다 다른 저장소)
+# - 저장소: ENRICH_QUEUE_BACKEND로 선택 (SQLAlchemy Core 테이블 하나라 두 백엔드가 같은 코드)
+#   * sqlite   : ENRICH_QUEUE_PATH 파일 (한 서버의 여러 워커 프로세스가 공유, 모든 트랜잭션을 BEGIN IMMEDIATE로 시작)
+#   * postgres : database.engine의 enrich_jobs 테이블 (여러 서버, 작업을 가져올 때 FOR UPDATE SKIP LOCKED)
+# - 워커는 우선순위가 높은 순 -> 먼저 등록된 순으로 ENRICH_BATCH_SIZE개를 가져와 (status=running, ENRICH_LEASE 동안 점유)
+#   service.get_restaurants_details_async로 한 번에 처리 (벡터 DB 재확인, 배치 요약, 맛집별 잠금은 service가 처리)
+# - 실패한 맛집은 ENRICH_RETRY_BACKOFF * 시도 횟수만큼 기다렸다가 다시 처리, ENRICH_MAX_ATTEMPTS번 실패하면 failed
+# - 워커가 죽어 점유 시간이 지난 running 작업은 다른 워커가 다시 가져감
+# 워커: API 서버 안의 스레드 (ENRICH_WORKERS개, main lifespan) 또는 별도 프로세스
+#
+# 실행: python -m backend.app.enrichQueue work --processes 2
+#       python -m backend.app.enrichQueue stats
+
+ENRICH_QUEUE_BACKEND = os.getenv("ENRICH_QUEUE_BACKEND", "sqlite") # sqlite / postgres
+ENRICH_QUEUE_PATH = os.getenv("ENRICH_QUEUE_PATH", "./enrich_queue.sqlite3")
+ENRICH_WORKERS = int(os.getenv("ENRICH_WORKERS", "1")) # API 서버 안에서 돌릴 워커 스레드 수
+ENRICH_BATCH_SIZE = int(os.getenv("ENRICH_BATCH_SIZE", "8"))
+ENRICH_MAX_ATTEMPTS = int(os.getenv("ENRICH_MAX_ATTEMPTS", "3"))
+ENRICH_RETRY_BACKOFF = float(os.getenv("ENRICH_RETRY_BACKOFF", "30")) # 재시도 전 대기 (초, 시도 횟수에 비례)
+ENRICH_LEASE = float(os.getenv("ENRICH_LEASE", "600")) # 작업 점유 시간 (초)
+ENRICH_POLL_INTERVAL = float(os.getenv("ENRICH_POLL_INTERVAL", "0.5")) # 큐가 비었을 때 다시 확인하는 간격 (초)
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+UNKNOWN = "unknown" # 등록된 작업이 없음 (큐에는 저장하지 않고 상태 조회/응답에서만 사용)
+
+metadata = MetaData()
+enrich_jobs = Table(
+    "enrich_jobs", metadata,
+    Column("restaurant_id", String, primary_key=True), # f"{이름}_{주소}"
+    Column("name", String, nullable=False),
+    Column("address", String, nullable=False),
+    Column("priority", Integer, nullable=False), # 클수록 먼저
+    Column("status", String, nullable=False), # pending / running / done / failed
+    Column("attempts", Integer, nullable=False), # 지금까지 가져간 횟수
+    Column("available_at", Float, nullable=False), # 이 시각 이후에 처리 (재시도 대기)
+    Column("locked_by", String, nullable=True), # 처리 중인 워커
+    Column("locked_until", Float, nullable=True), # 점유 만료 시각
+    Column("last_error", Text, nullable=True),
+    Column("created_at", Float, nullable=False),
+    Column("updated_at", Float, nullable=False),
+    Index("idx_enrich_jobs_claim", "status", "priority", "created_at"),
+)
+
+class EnrichJob(NamedTuple):
+    restaurant_id: str
+    name: str
+    address: str
+    attempts: int
+
+def restaurant_id(name: str, address: str) -> str:
+    return f"{name}_{address}"
+
+def sqlite_engine(path: str) -> Engine:
+    """여러 프로세스가 함께 쓰는 SQLite 엔진 (쓰기 잠금을 트랜잭션 시작 시 잡아 읽기 -> 쓰기 전환 충돌이 없게 함)"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 30, "check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, _):
+        dbapi_connection.isolation_level = None # 트랜잭션은 아래 begin 이벤트에서 직접 시작
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        dbapi_connection.execute("PRAGMA synchronous=NORMAL")
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+class EnrichQueue:
+    """enrich_jobs 테이블 위의 우선순위 작업 큐 (재시도 대기, 점유 만료 포함)"""
+
+    def __init__(self, engine: Engine, max_attempts: int = ENRICH_MAX_ATTEMPTS, retry_backoff: float = ENRICH_RETRY_BACKOFF,
+                 lease: float = ENRICH_LEASE, clock: Callable[[], float] = time.time):
+        self.engine = engine
+        self.max_attempts = max(max_attempts, 1)
+        self.retry_backoff = retry_backoff
+        self.lease = lease
+        self._clock = clock
+        self._lock = threading.Lock()
+        metadata.create_all(engine)
+        self._counters = {"enqueued": 0, "requeued": 0, "claimed": 0, "completed": 0, "retried": 0, "exhausted": 0}
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] += n
+
+    # ------------------------------
+    # 등록 / 조회
+    # ------------------------------
+    def enqueue(self, places: Sequence[Tuple[str, str]], priority: int = 0, requeue_done: bool = False) -> List[str]:
+        """(이름, 주소) 목록을 등록하고 작업 id 목록을 반환
+        이미 있는 작업은 대기 중이면 우선순위만 높이고, 실패한 작업은 시도 횟수를 초기화하여 다시 대기 (처리 중은 그대로)
+        완료된 작업은 requeue_done일 때만 다시 대기 (호출한 쪽이 벡터 저장소에 없음을 확인한 맛집)
+        """
+        jobs = {restaurant_id(name, address): (name, address) for name, address in places}
+        if not jobs:
+            return []
+        for attempt in range(2):
+            try:
+                self._enqueue(jobs, priority, requeue_done)
+                break
+            except IntegrityError:
+                # 다른 워커가 같은 맛집을 동시에 등록 -> 한 번 더 시도하면 기존 작업으로 처리
+                if attempt:
+                    raise
+        return list(jobs)
+
+    def _enqueue(self, jobs: Dict[str, Tuple[str, str]], priority: int, requeue_done: bool):
+        now = self._clock()
+        t = enrich_jobs.c
+        with self.engine.begin() as conn:
+            existing = dict(conn.execute(select(t.restaurant_id, t.status).where(t.restaurant_id.in_(list(jobs)))).all())
+            new = [restaurant_id for restaurant_id in jobs if restaurant_id not in existing]
+            if new:
+                conn.execute(enrich_jobs.insert(), [{
+                    "restaurant_id": restaurant_id, "name": jobs[restaurant_id][0], "address": jobs[restaurant_id][1],
+                    "priority": priority, "status": PENDING, "attempts": 0, "available_at": now,
+                    "created_at": now, "updated_at": now,
+                } for restaurant_id in new])
+            waiting = [restaurant_id for restaurant_id, status in existing.items() if status == PENDING]
+            if waiting:
+                conn.execute(enrich_jobs.update().where(t.restaurant_id.in_(waiting), t.priority < priority)
+                             .values(priority=priority, updated_at=now))
+            finished = (FAILED, DONE) if requeue_done else (FAILED,)
+            requeued = [restaurant_id for restaurant_id, status in existing.items() if status in finished]
+            if requeued:
+                conn.execute(enrich_jobs.update().where(t.restaurant_id.in_(requeued), t.status.in_(finished)).values(
+                    status=PENDING, attempts=0, priority=priority, available_at=now, last_error=None, updated_at=now))
+        self._count("enqueued", len(new))
+        self._count("requeued", len(requeued))
+
+    def status(self, restaurant_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """{작업 id: {status, attempts, last_error}} (등록되지 않은 id는 제외)"""
+        if not restaurant_ids:
+            return {}
+        t = enrich_jobs.c
+        with self.engine.begin() as conn:
+            rows = conn.execute(select(t.restaurant_id, t.status, t.attempts, t.last_error)
+                                .where(t.restaurant_id.in_(list(restaurant_ids)))).all()
+        return {row.restaurant_id: {"status": row.status, "attempts": row.attempts, "last_error": row.last_error} for row in rows}
+
+    # ------------------------------
+    # 워커용
+    # ------------------------------
+    def claim(self, worker_id: str, limit: int = ENRICH_BATCH_SIZE) -> List[EnrichJob]:
+        """처리할 작업을 최대 limit개 가져와 점유 (대기 시간이 지난 pending + 점유가 만료된 running)"""
+        now = self._clock()
+        t = enrich_jobs.c
+        ready = ((t.status == PENDING) & (t.available_at <= now)) | ((t.status == RUNNING) & (t.locked_until < now))
+        with self.engine.begin() as conn:
+            rows = conn.execute(
+                select(t.restaurant_id, t.name, t.address, t.attempts).where(ready)
+                .order_by(t.priority.desc(), t.created_at).limit(limit).with_for_update(skip_locked=True)
+            ).all()
+            if rows:
+                conn.execute(enrich_jobs.update().where(t.restaurant_id.in_([row.restaurant_id for row in rows]), ready).values(
+                    status=RUNNING, attempts=t.attempts + 1, locked_by=worker_id, locked_until=now + self.lease, updated_at=now))
+        self._count("claimed", len(rows))
+        return [EnrichJob(row.restaurant_id, row.name, row.address, row.attempts + 1) for row in rows]
+
+    def complete(self, worker_id: str, restaurant_ids: Sequence[str]):
+        if not restaurant_ids:
+            return
+        t = enrich_jobs.c
+        with self.engine.begin() as conn:
+            done = conn.execute(enrich_jobs.update().where(t.restaurant_id.in_(list(restaurant_ids)), t.locked_by == worker_id,
+                                                           t.status == RUNNING)
+                                .values(status=DONE, locked_by=None, locked_until=None, last_error=None,
+                                        updated_at=self._clock())).rowcount
+        self._count("completed", done)
+
+    def retry(self, worker_id: str, restaurant_ids: Sequence[str], error: str):
+        """실패한 작업을 시도 횟수에 비례해 기다린 뒤 다시 처리하도록 되돌림 (ENRICH_MAX_ATTEMPTS번 실패하면 failed)"""
+        if not restaurant_ids:
+            return
+        now = self._clock()
+        t = enrich_jobs.c
+        mine = (t.restaurant_id.in_(list(restaurant_ids))) & (t.locked_by == worker_id) & (t.status == RUNNING)
+        with self.engine.begin() as conn:
+            failed = conn.execute(enrich_jobs.update().where(mine, t.attempts >= self.max_attempts).values(
+                status=FAILED, locked_by=None, locked_until=None, last_error=error, updated_at=now)).rowcount
+            retried = conn.execute(enrich_jobs.update().where(mine).values(
+                status=PENDING, available_at=now + self.retry_backoff * t.attempts, locked_by=None, locked_until=None,
+                last_error=error, updated_at=now)).rowcount
+        self._count("exhausted", failed)
+        self._count("retried", retried)
+        if failed:
+            logging.warning(f"[ENRICH] {failed}개 맛집 보강 실패 ({self.max_attempts}회 시도): {error}")
+
+    # ------------------------------
+    # 관리 및 통계
+    # ------------------------------
+    def stats(self) -> Dict[str, Any]:
+        """상태별 작업 수와 이 프로세스의 처리 횟수"""
+        t = enrich_jobs.c
+        with self.engine.begin() as conn:
+            by_status = dict(conn.execute(select(t.status, func.count()).group_by(t.status)).all())
+        with self._lock:
+            return {**{status: by_status.get(status, 0) for status in (PENDING, RUNNING, DONE, FAILED)}, **self._counters}
+
+    def purge(self, older_than: float) -> int:
+        """older_than초 전에 끝난 완료 작업 삭제"""
+        t = enrich_jobs.c
+        with self.engine.begin() as conn:
+            return conn.execute(enrich_jobs.delete().where(t.status == DONE, t.updated_at < self._clock() - older_than)).rowcount
+
+class EnrichWorker:
+    """큐에서 작업을 가져와 service로 상세 정보를 만들고 결과를 기록하는 워커"""
+
+    def __init__(self, queue: EnrichQueue, batch_size: int = ENRICH_BATCH_SIZE, poll_interval: float = ENRICH_POLL_INTERVAL):
+        self.queue = queue
+        self.batch_size = max(batch_size, 1)
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> int:
+        """작업을 한 번 가져와 처리하고 처리한 작업 수를 반환 (없으면 0)"""
+        from . import service # service가 이 모듈을 import하므로 여기서
+        from .database import SessionLocal
+        jobs = self.queue.claim(self.worker_id, self.batch_size)
+        if not jobs:
+            return 0
+        ids = [job.restaurant_id for job in jobs]
+        db = SessionLocal()
+        try:
+            details = asyncio.run(service.get_restaurants_details_async(db, [(job.name, job.address) for job in jobs]))
+        except Exception as e:
+            logging.warning(f"[ENRICH] {len(jobs)}개 맛집 처리 중 오류: {e}")
+            self.queue.retry(self.worker_id, ids, str(e))
+            return len(jobs)
+        finally:
+            db.close()
+        self.queue.complete(self.worker_id, [restaurant_id for restaurant_id, found in zip(ids, details) if found])
+        self.queue.retry(self.worker_id, [restaurant_id for restaurant_id, found in zip(ids, details) if not found],
+                         "상세 정보를 만들지 못함 (리뷰 없음 또는 크롤링/요약 실패)")
+        logging.info(f"[ENRICH] {sum(1 for found in details if found)}/{len(jobs)}개 맛집 보강 완료")
+        return len(jobs)
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logging.warning(f"[ENRICH] 작업 큐 오류: {e}")
+                processed = 0
+            if not processed:
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> "EnrichWorker":
+        self._thread = threading.Thread(target=self.run, name=f"cureat-enrich-{self.worker_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+# 프로세스 전체에서 공유하는 큐 (처음 사용할 때 생성)
+enrich_queue = None
+_enrich_queue_lock = threading.Lock()
+
+def get_enrich_queue() -> EnrichQueue:
+    global enrich_queue
+    if enrich_queue is None:
+        with _enrich_queue_lock:
+            if enrich_queue is None:
+                if ENRICH_QUEUE_BACKEND == "postgres":
+                    from .database import engine
+                else:
+                    engine = sqlite_engine(ENRICH_QUEUE_PATH)
+                enrich_queue = EnrichQueue(engine)
+    return enrich_queue
+
+def start_workers(count: int = ENRICH_WORKERS) -> List[EnrichWorker]:
+    """현재 프로세스에서 워커 스레드 count개 시작"""
+    queue = get_enrich_queue()
+    return [EnrichWorker(queue).start() for _ in range(count)]
+
+def _work_forever():
+    workers = start_workers(1)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.stop()
+        from . import vectorDBService
+        vectorDBService.flush_vector_store()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Cureat 맛집 보강 작업 큐 워커/통계 도구")
+    parser.add_argument("command", choices=["work", "stats", "purge"])
+    parser.add_argument("--processes", type=int, default=1, help="work: 워커 프로세스 수")
+    parser.add_argument("--older-than-days", type=float, default=7, help="purge: 이 기간 전에 끝난 완료 작업 삭제")
+    args = parser.parse_args()
+    if args.command == "work":
+        import multiprocessing
+        processes = [multiprocessing.Process(target=_work_forever) for _ in range(args.processes)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    elif args.command == "purge":
+        print(f"삭제한 작업: {get_enrich_queue().purge(args.older_than_days * 24 * 3600)}개")
+    else:
+        print(get_enrich_queue().stats())
@@ -0,0 +1,52 @@
+import json
+import time
+import logging
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+# 스트리밍 응답 (/recommendations/stream, /date-course/stream)
+# 결과를 하나씩 (이벤트 이름, 데이터)로 받아 준비되는 대로 내보냄
+# - NDJSON (기본): 한 줄에 {"event": 이름, "data": 데이터} 하나
+# - SSE: Accept 헤더에 text/event-stream이 있거나 ?format=sse 이면 "event: 이름\ndata: JSON\n\n"
+# 마지막에는 항상 summary 이벤트 (이벤트 수, 첫 이벤트/전체 경과 시간)를 보내고,
+# 도중에 오류가 나면 error 이벤트를 보낸 뒤 summary로 끝냄 (상태 코드는 이미 200으로 나갔으므로)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+def wants_sse(accept: Optional[str], stream_format: Optional[str] = None) -> bool:
+    if stream_format:
+        return stream_format.lower() == "sse"
+    return SSE_MEDIA_TYPE in (accept or "")
+
+def encode_event(event: str, data: Any, sse: bool) -> bytes:
+    data = jsonable_encoder(data)
+    if sse:
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+    return (json.dumps({"event": event, "data": data}, ensure_ascii=False) + "\n").encode("utf-8")
+
+async def encode_events(events: AsyncIterator[Tuple[str, Any]], sse: bool) -> AsyncIterator[bytes]:
+    """(이벤트 이름, 데이터)를 인코딩하고 마지막 summary 이벤트에 이벤트 수와 경과 시간을 덧붙임"""
+    start = time.perf_counter()
+    count, first_ms, summary = 0, None, {}
+    try:
+        async for event, data in events:
+            if event == "summary":
+                summary = dict(data)
+                continue
+            count += 1
+            if first_ms is None:
+                first_ms = round((time.perf_counter() - start) * 1000, 1)
+            yield encode_event(event, data, sse)
+    except Exception as e:
+        logging.warning(f"[STREAM] 스트리밍 응답 중 오류: {e}")
+        yield encode_event("error", {"message": str(e)}, sse)
+    yield encode_event("summary", {**summary, "count": count, "first_item_ms": first_ms,
+                                   "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}, sse)
+
+def streaming_response(events: AsyncIterator[Tuple[str, Any]], sse: bool) -> StreamingResponse:
+    # 프록시(nginx 등)가 버퍼링하지 않도록 헤더 지정
+    return StreamingResponse(encode_events(events, sse), media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
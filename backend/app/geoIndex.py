@@ -0,0 +1,173 @@
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 맛집 좌표 공간 색인 (격자 버킷)
+# 위도/경도를 cell_deg 크기의 칸으로 나누어 칸마다 row 번호를 모아 두고,
+# 반경/영역/최근접 검색은 해당 칸들의 후보만 numpy로 거리 계산
+# 추가/삭제는 해당 칸만 갱신하므로 맛집이 저장될 때마다 바로 반영 가능
+
+EARTH_RADIUS_M = 6_371_008.8
+METERS_PER_DEG_LAT = math.pi * EARTH_RADIUS_M / 180
+
+def parse_naver_coordinates(mapx: Any, mapy: Any) -> Optional[Tuple[float, float]]:
+    """네이버 지역 검색의 mapx/mapy(WGS84 경위도 * 1e7 정수 문자열)를 (위도, 경도)로 변환
+    이미 도 단위인 값도 허용하고, 변환할 수 없는 값(빈 값, 구 KATECH 좌표 등)은 None
+    """
+    try:
+        x, y = float(mapx), float(mapy)
+    except (TypeError, ValueError):
+        return None
+    if x > 1e8 and y > 1e7:
+        x, y = x / 1e7, y / 1e7
+    if not (-180 <= x <= 180 and -90 <= y <= 90) or (x == 0 and y == 0):
+        return None
+    return y, x
+
+def haversine_m(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """한 점과 여러 점 사이의 대원 거리(미터)"""
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+class GeoIndex:
+    """격자 버킷 기반 공간 색인 (id -> 위도/경도)"""
+
+    def __init__(self, cell_deg: float = 0.01):
+        self.cell_deg = cell_deg
+        self._lock = threading.RLock()
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._lats = np.empty(1024, dtype=np.float64)
+        self._lngs = np.empty(1024, dtype=np.float64)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    # ------------------------------
+    # 추가 / 삭제
+    # ------------------------------
+    def upsert(self, item_id: str, lat: float, lng: float):
+        self.upsert_many([(item_id, lat, lng)])
+
+    def upsert_many(self, items: Iterable[Tuple[str, float, float]]):
+        with self._lock:
+            for item_id, lat, lng in items:
+                row = self._rows.get(item_id)
+                if row is not None:
+                    self._discard(row)
+                else:
+                    row = self._free.pop() if self._free else len(self._ids)
+                    if row == len(self._ids):
+                        self._ids.append(item_id)
+                        if row >= len(self._lats):
+                            self._lats = np.resize(self._lats, len(self._lats) * 2)
+                            self._lngs = np.resize(self._lngs, len(self._lngs) * 2)
+                    else:
+                        self._ids[row] = item_id
+                    self._rows[item_id] = row
+                self._lats[row], self._lngs[row] = lat, lng
+                self._cells.setdefault(self._cell(lat, lng), []).append(row)
+
+    def remove(self, item_ids: Iterable[str]):
+        with self._lock:
+            for item_id in item_ids:
+                row = self._rows.pop(item_id, None)
+                if row is None:
+                    continue
+                self._discard(row)
+                self._ids[row] = None
+                self._free.append(row)
+
+    def _discard(self, row: int):
+        cell = self._cell(self._lats[row], self._lngs[row])
+        self._cells[cell].remove(row)
+        if not self._cells[cell]:
+            del self._cells[cell]
+
+    def get(self, item_id: str) -> Optional[Tuple[float, float]]:
+        row = self._rows.get(item_id)
+        return None if row is None else (float(self._lats[row]), float(self._lngs[row]))
+
+    # ------------------------------
+    # 검색
+    # ------------------------------
+    def _rows_in_cells(self, lat_range: Tuple[int, int], lng_range: Tuple[int, int]) -> np.ndarray:
+        (lat0, lat1), (lng0, lng1) = lat_range, lng_range
+        if (lat1 - lat0 + 1) * (lng1 - lng0 + 1) > len(self._cells):
+            # 영역이 넓으면 비어 있지 않은 칸만 훑는 편이 빠름
+            groups = [rows for (i, j), rows in self._cells.items() if lat0 <= i <= lat1 and lng0 <= j <= lng1]
+        else:
+            groups = [self._cells[(i, j)] for i in range(lat0, lat1 + 1) for j in range(lng0, lng1 + 1) if (i, j) in self._cells]
+        if not groups:
+            return np.empty(0, dtype=np.int64)
+        return np.fromiter((row for rows in groups for row in rows), dtype=np.int64)
+
+    def in_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> List[str]:
+        """사각 영역 안의 id 목록"""
+        with self._lock:
+            (lat0, lng0), (lat1, lng1) = self._cell(min_lat, min_lng), self._cell(max_lat, max_lng)
+            rows = self._rows_in_cells((lat0, lat1), (lng0, lng1))
+            lats, lngs = self._lats[rows], self._lngs[rows]
+            rows = rows[(lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng)]
+            return [self._ids[row] for row in rows]
+
+    def within_radius(self, lat: float, lng: float, meters: float, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """반경 meters 안의 (id, 거리)를 가까운 순서로 반환"""
+        with self._lock:
+            dlat = meters / METERS_PER_DEG_LAT
+            dlng = meters / (METERS_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+            (lat0, lng0), (lat1, lng1) = self._cell(lat - dlat, lng - dlng), self._cell(lat + dlat, lng + dlng)
+            rows = self._rows_in_cells((lat0, lat1), (lng0, lng1))
+            return self._rank(lat, lng, rows, limit, max_meters=meters)
+
+    def k_nearest(self, lat: float, lng: float, k: int, max_meters: Optional[float] = None) -> List[Tuple[str, float]]:
+        """가장 가까운 k개의 (id, 거리) - 중심 칸에서부터 고리 모양으로 칸을 넓혀 가며 탐색"""
+        with self._lock:
+            if not self._rows or k <= 0:
+                return []
+            ci, cj = self._cell(lat, lng)
+            occupied = np.array(list(self._cells.keys()))
+            max_ring = int(np.abs(occupied - (ci, cj)).max())
+            # 고리 r까지 탐색했을 때 탐색하지 않은 영역까지의 최소 거리
+            cell_m = self.cell_deg * METERS_PER_DEG_LAT * min(1.0, max(math.cos(math.radians(lat)), 1e-6))
+            groups: List[List[int]] = []
+            for ring in range(max_ring + 1):
+                for i in range(ci - ring, ci + ring + 1):
+                    # 고리의 위/아래 줄은 전체, 나머지 줄은 양 끝 칸만
+                    edge = abs(i - ci) == ring
+                    for j in (range(cj - ring, cj + ring + 1) if edge else {cj - ring, cj + ring}):
+                        if (i, j) in self._cells:
+                            groups.append(self._cells[(i, j)])
+                found = sum(len(rows) for rows in groups)
+                reach = ring * cell_m
+                if max_meters is not None and reach >= max_meters:
+                    break
+                if found >= k:
+                    rows = np.fromiter((row for rows in groups for row in rows), dtype=np.int64)
+                    dists = haversine_m(lat, lng, self._lats[rows], self._lngs[rows])
+                    if np.partition(dists, k - 1)[k - 1] <= reach:
+                        break
+            rows = np.fromiter((row for rows in groups for row in rows), dtype=np.int64)
+            return self._rank(lat, lng, rows, k, max_meters=max_meters)
+
+    def _rank(self, lat: float, lng: float, rows: np.ndarray, limit: Optional[int], max_meters: Optional[float]) -> List[Tuple[str, float]]:
+        if len(rows) == 0:
+            return []
+        dists = haversine_m(lat, lng, self._lats[rows], self._lngs[rows])
+        if max_meters is not None:
+            keep = dists <= max_meters
+            rows, dists = rows[keep], dists[keep]
+        if limit is not None and len(dists) > limit:
+            top = np.argpartition(dists, limit - 1)[:limit]
+            rows, dists = rows[top], dists[top]
+        order = np.argsort(dists, kind="stable")
+        return [(self._ids[rows[i]], float(dists[i])) for i in order]
@@ -0,0 +1,165 @@
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import lxml.html
+from lxml import etree
+from readability import Document
+
+# 블로그/웹 페이지 본문 추출
+# - 자주 수집하는 호스트(네이버 블로그, 티스토리, 다음, 브런치)는 lxml XPath 규칙으로 본문 컨테이너를 바로 찾음
+# - 규칙이 없는 호스트이거나, 규칙으로 찾은 본문이 너무 짧으면(레이아웃 변경 등) readability로 대체
+# - 결과는 블록 요소마다 줄을 나누고 양끝 공백/빈 줄을 정리한 텍스트 (readability 결과도 같은 방식으로 정리)
+# - extract_in_pool: 파싱은 CPU를 많이 쓰므로 프로세스 풀(HTML_EXTRACT_WORKERS)에서 실행 (0이면 호출한 스레드에서)
+# 네이버 블로그 글 주소(blog.naver.com/{id}/{logNo})는 본문이 iframe 안에 있으므로 canonical_url로 PostView 주소를 받아야 함
+
+def _default_workers() -> int:
+    cpus = os.cpu_count() or 1
+    return 0 if cpus < 2 else min(cpus, 4)
+
+HTML_EXTRACT_WORKERS = int(os.getenv("HTML_EXTRACT_WORKERS", str(_default_workers())))
+MIN_RULE_TEXT = 100 # 규칙으로 찾은 본문이 이보다 짧으면 readability로 대체
+
+class SiteRule(NamedTuple):
+    name: str
+    hosts: Tuple[str, ...] # 이 호스트 또는 그 하위 도메인
+    xpaths: Tuple[str, ...] # 본문 컨테이너 후보 (앞에서부터 시도)
+
+def _has_class(cls: str, tag: str = "div") -> str:
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+SITE_RULES = [
+    # 스마트에디터 ONE / 2.0 / 구버전 본문
+    SiteRule("naver_blog", ("blog.naver.com",),
+             (_has_class("se-main-container"), _has_class("se_component_wrap"), "//div[@id='postViewArea']")),
+    SiteRule("tistory", ("tistory.com",),
+             (_has_class("tt_article_useless_p_margin"), _has_class("entry-content"), "//div[@id='article-view']",
+              _has_class("article-view"), _has_class("contents_style"), "//article")),
+    # 다음 뉴스 / 다음 카페 글 본문
+    SiteRule("daum", ("daum.net",), (_has_class("article_view"), "//div[@id='user_contents']", "//div[@id='article']")),
+    SiteRule("brunch", ("brunch.co.kr",), (_has_class("wrap_body"),)),
+]
+
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "dl", "dt", "dd", "tr", "table", "section", "article", "blockquote",
+    "pre", "header", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "figure", "figcaption",
+}
+DROP_TAGS = ("script", "style", "noscript", "iframe", "form", "button", "svg", "template", "select")
+
+_PARSER = lxml.html.HTMLParser(encoding="utf-8", remove_comments=True)
+_INVISIBLE = dict.fromkeys(map(ord, "\u200b\u200c\u200d\ufeff")) # 네이버 에디터가 넣는 폭 없는 문자
+
+class Extraction(NamedTuple):
+    text: str
+    method: str # 사용한 규칙 이름 / "readability" / "empty"
+
+def rule_for(url: str) -> Optional[SiteRule]:
+    host = urlsplit(url or "").hostname or ""
+    for rule in SITE_RULES:
+        if any(host == h or host.endswith("." + h) for h in rule.hosts):
+            return rule
+    return None
+
+def canonical_url(url: str) -> str:
+    """네이버 블로그 글 주소를 본문이 들어 있는 PostView 주소로 바꿈 (다른 주소는 그대로)"""
+    parts = urlsplit(url or "")
+    if parts.hostname != "blog.naver.com":
+        return url
+    segments = [s for s in parts.path.split("/") if s]
+    log_no = parse_qs(parts.query).get("logNo", [None])[0]
+    if len(segments) == 2 and segments[1].isdigit():
+        blog_id, log_no = segments
+    elif len(segments) == 1 and log_no and not segments[0].lower().startswith("postview"):
+        blog_id = segments[0]
+    else:
+        return url
+    return f"https://blog.naver.com/PostView.naver?blogId={blog_id}&logNo={log_no}"
+
+def _parse(html: str):
+    return lxml.html.document_fromstring(html.encode("utf-8", errors="replace"), parser=_PARSER)
+
+def element_text(element) -> str:
+    """블록 요소 경계마다 줄을 나눈 텍스트 (스크립트/스타일 등 제외, 빈 줄 제거)"""
+    for node in list(element.iter(*DROP_TAGS)):
+        node.drop_tree()
+    for node in element.iter():
+        if isinstance(node.tag, str) and node.tag in BLOCK_TAGS:
+            node.text = "\n" + (node.text or "")
+            node.tail = "\n" + (node.tail or "")
+    text = element.text_content().translate(_INVISIBLE)
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+def readability_text(html: str) -> str:
+    try:
+        summary = Document(html).summary(html_partial=True)
+        return element_text(_parse(summary))
+    except Exception:
+        return ""
+
+def extract(html: str, url: str = "") -> Extraction:
+    """본문 텍스트와 사용한 추출 방법"""
+    if not html:
+        return Extraction("", "empty")
+    rule = rule_for(url)
+    if rule is not None:
+        try:
+            root = _parse(html)
+            for xpath in rule.xpaths:
+                found = root.xpath(xpath)
+                if found:
+                    text = element_text(found[0])
+                    if len(text) >= MIN_RULE_TEXT:
+                        return Extraction(text, rule.name)
+                    break
+        except (etree.ParserError, ValueError):
+            pass
+    return Extraction(readability_text(html), "readability")
+
+def extract_main_text(html: str, url: str = "") -> str:
+    return extract(html, url).text
+
+# ------------------------------
+# 프로세스 풀
+# ------------------------------
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # 서버 프로세스는 여러 스레드를 쓰므로 fork 대신 spawn으로 워커를 띄움
+                _pool = ProcessPoolExecutor(HTML_EXTRACT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+                logging.info(f"[EXTRACT] 본문 추출 프로세스 풀 생성 ({HTML_EXTRACT_WORKERS}개)")
+    return _pool
+
+def extract_in_pool(html: str, url: str = "") -> str:
+    """프로세스 풀에서 본문 추출 (스레드에서 호출하며 결과가 나올 때까지 기다림)"""
+    if HTML_EXTRACT_WORKERS <= 0 or not html:
+        return extract_main_text(html, url)
+    try:
+        return _get_pool().submit(extract_main_text, html, url).result()
+    except BrokenProcessPool:
+        logging.warning("[EXTRACT] 프로세스 풀이 중단되어 현재 스레드에서 추출합니다.")
+        close_pool()
+        return extract_main_text(html, url)
+
+def extract_many(pages: Sequence[Tuple[str, str]]) -> List[Extraction]:
+    """(html, url) 목록을 프로세스 풀에서 한꺼번에 추출 (워커가 0이면 순서대로)"""
+    if HTML_EXTRACT_WORKERS <= 0:
+        return [extract(html, url) for html, url in pages]
+    htmls, urls = zip(*pages) if pages else ((), ())
+    return list(_get_pool().map(extract, htmls, urls, chunksize=8))
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
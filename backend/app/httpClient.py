@@ -0,0 +1,219 @@
+import os
+import re
+import time
+import random
+import logging
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 외부 HTTP 요청(네이버/카카오 API, 블로그 페이지, ScrapingBee) 공용 클라이언트
+# - 호스트별 연결 풀을 프로세스 전체에서 공유하여 요청마다 TCP/TLS 연결을 새로 맺지 않음 (keep-alive)
+# - HTTP/2: h2 패키지가 설치되어 있으면 httpx 클라이언트로 HTTP/2 사용, 없으면 requests.Session (HTTP/1.1)
+# - 재시도: 연결 오류/타임아웃/429/5xx 응답은 최대 max_retry회까지 지수 백오프 + 지터 후 재시도 (Retry-After 존중)
+# - get_text: 본문을 스트리밍으로 받다가 max_bytes에서 멈춤 (블로그 페이지는 앞부분만 있으면 충분)
+
+# HTTP_CLIENT_BACKEND: auto(기본, h2가 있으면 httpx) | httpx | requests
+HTTP_CLIENT_BACKEND = os.getenv("HTTP_CLIENT_BACKEND", "auto")
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1") != "0"
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "32")) # 연결 풀을 유지할 호스트 수
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32")) # 호스트별 유지할 연결 수
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "5.0"))
+HTTP_MAX_RETRY = int(os.getenv("HTTP_MAX_RETRY", "2"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.3")) # 첫 재시도 대기 시간 상한 (초), 재시도마다 2배
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "5.0"))
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+STREAM_CHUNK_SIZE = 16 * 1024
+
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+class TextResponse(NamedTuple):
+    status_code: int
+    headers: Any # 대소문자 구분 없는 응답 헤더
+    text: str
+    truncated: bool # max_bytes에서 잘렸는지 여부
+
+def decode_body(body: bytes, content_type: Optional[str]) -> str:
+    """Content-Type의 charset -> <meta charset> -> UTF-8 순서로 인코딩을 정해 디코딩
+    (requests의 response.text는 charset이 없는 text/html을 ISO-8859-1로 읽어 한글이 깨짐)
+    """
+    encoding = None
+    match = re.search(r"charset=[\"']?([\w-]+)", content_type or "", re.IGNORECASE)
+    if match:
+        encoding = match.group(1)
+    else:
+        meta = _CHARSET_RE.search(body[:4096])
+        if meta:
+            encoding = meta.group(1).decode("ascii")
+    try:
+        return body.decode(encoding or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+class HttpError(Exception):
+    """재시도 후에도 실패한 요청 (status는 응답을 받은 경우에만 설정)"""
+
+    def __init__(self, message: str, status: Optional[int] = None, url: str = ""):
+        super().__init__(message)
+        self.status = status
+        self.url = url
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        import httpx  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+class HttpClient:
+    """호스트별 연결 풀과 재시도를 갖춘 HTTP 클라이언트 (스레드 간 공유 가능)"""
+
+    def __init__(self, backend: str = HTTP_CLIENT_BACKEND, pool_connections: int = HTTP_POOL_CONNECTIONS,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE, connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = HTTP_READ_TIMEOUT, max_retry: int = HTTP_MAX_RETRY,
+                 backoff: float = HTTP_BACKOFF, backoff_max: float = HTTP_BACKOFF_MAX,
+                 http2: bool = HTTP2_ENABLED):
+        if backend == "auto":
+            backend = "httpx" if http2 and _h2_available() else "requests"
+        self.backend = backend
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retry = max_retry
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+        if backend == "httpx":
+            import httpx
+            self._client = httpx.Client(
+                http2=http2 and _h2_available(),
+                limits=httpx.Limits(max_connections=pool_connections * pool_maxsize, max_keepalive_connections=pool_maxsize),
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                follow_redirects=True,
+            )
+            self._retryable_errors = (httpx.TransportError,)
+            self._request_errors = (httpx.HTTPError, httpx.InvalidURL)
+        else:
+            self._client = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+            self._client.mount("http://", adapter)
+            self._client.mount("https://", adapter)
+            self._retryable_errors = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            self._request_errors = (requests.exceptions.RequestException,)
+
+    def _timeout(self, timeout: Optional[float]):
+        read = self.read_timeout if timeout is None else timeout
+        if self.backend == "httpx":
+            import httpx
+            return httpx.Timeout(read, connect=min(self.connect_timeout, read))
+        return (min(self.connect_timeout, read), read)
+
+    def _delay(self, attempt: int, response: Any = None) -> float:
+        # full jitter: 0 ~ min(상한, backoff * 2^attempt) 사이에서 무작위로 대기 (동시 재시도가 한꺼번에 몰리지 않도록)
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.backoff_max))
+        return delay
+
+    def request(self, method: str, url: str, *, params: Optional[dict] = None, headers: Optional[dict] = None,
+                data: Any = None, json: Any = None, timeout: Optional[float] = None,
+                max_retry: Optional[int] = None, raise_for_status: bool = True, stream: bool = False):
+        """요청을 보내고 응답을 반환
+        연결 오류/재시도 대상 상태 코드는 max_retry회까지 재시도하며,
+        raise_for_status=True 이면 최종 응답이 4xx/5xx일 때 HttpError를 발생
+        stream=True 이면 본문을 읽지 않은 응답을 반환 (read_body로 읽어야 연결이 반환됨)
+        """
+        retries = self.max_retry if max_retry is None else max_retry
+        for attempt in range(retries + 1):
+            try:
+                if stream and self.backend == "httpx":
+                    request = self._client.build_request(method, url, params=params, headers=headers, data=data, json=json,
+                                                         timeout=self._timeout(timeout))
+                    response = self._client.send(request, stream=True)
+                else:
+                    response = self._client.request(method, url, params=params, headers=headers, data=data, json=json,
+                                                    timeout=self._timeout(timeout), **({"stream": True} if stream else {}))
+            except self._retryable_errors as e:
+                if attempt < retries:
+                    delay = self._delay(attempt)
+                    logging.info(f"[HTTP] {url} 연결 실패, {delay:.2f}s 후 재시도 ({attempt + 1}/{retries}): {e}")
+                    time.sleep(delay)
+                    continue
+                raise HttpError(f"{method} {url} 실패: {e}", url=url) from e
+            except self._request_errors as e:
+                raise HttpError(f"{method} {url} 실패: {e}", url=url) from e
+
+            if response.status_code in RETRY_STATUS and attempt < retries:
+                delay = self._delay(attempt, response)
+                logging.info(f"[HTTP] {url} 응답 {response.status_code}, {delay:.2f}s 후 재시도 ({attempt + 1}/{retries})")
+                response.close()
+                time.sleep(delay)
+                continue
+            if raise_for_status and response.status_code >= 400:
+                response.close()
+                raise HttpError(f"{method} {url} 응답 {response.status_code}", status=response.status_code, url=url)
+            return response
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def get_json(self, url: str, **kwargs) -> Dict[str, Any]:
+        """GET 후 JSON 본문을 반환 (JSON이 아니면 HttpError)"""
+        response = self.get(url, **kwargs)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise HttpError(f"GET {url} JSON 파싱 실패: {e}", status=response.status_code, url=url) from e
+
+    def read_body(self, response, max_bytes: Optional[int] = None) -> Tuple[bytes, bool]:
+        """stream=True 응답의 본문을 최대 max_bytes까지 읽고 연결을 닫음 -> (본문, 잘렸는지 여부)"""
+        chunks, size = [], 0
+        iterator = response.iter_bytes(STREAM_CHUNK_SIZE) if self.backend == "httpx" else response.iter_content(STREAM_CHUNK_SIZE)
+        try:
+            for chunk in iterator:
+                chunks.append(chunk)
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    break
+        except self._request_errors as e:
+            raise HttpError(f"본문 읽기 실패: {e}", status=response.status_code, url=str(response.url)) from e
+        finally:
+            response.close()
+        body = b"".join(chunks)
+        if max_bytes is not None and len(body) > max_bytes:
+            return body[:max_bytes], True
+        return body, False
+
+    def get_text(self, url: str, max_bytes: Optional[int] = None, **kwargs) -> TextResponse:
+        """GET 후 본문을 최대 max_bytes까지만 받아 디코딩 (나머지는 받지 않고 연결을 닫음)"""
+        response = self.get(url, stream=True, **kwargs)
+        body, truncated = self.read_body(response, max_bytes)
+        return TextResponse(response.status_code, response.headers, decode_body(body, response.headers.get("Content-Type")), truncated)
+
+    def close(self):
+        self._client.close()
+
+# 프로세스 전체에서 공유하는 클라이언트 (처음 사용할 때 생성)
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient()
+                logging.info(f"[HTTP] 공용 HTTP 클라이언트 생성 ({_http_client.backend})")
+    return _http_client
+
+def close_http_client():
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
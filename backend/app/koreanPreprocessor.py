@@ -0,0 +1,83 @@
+import re
+import itertools
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Tuple
+
+# 한국어 전처리 엔진
+# - 정규식/불용어/품사 필터는 모듈 로딩 시 한 번만 컴파일하고 set으로 조회 (fast path)
+# - 형태소 분석(Okt)은 워커 프로세스마다 미리 워밍업한 Okt 인스턴스로 병렬 처리
+# 워커는 spawn 방식으로 띄우므로 이 모듈은 무거운 의존성(nlpService 등)을 import 하지 않아야 함
+
+NON_HANGUL_PATTERN = re.compile(r"[^ㄱ-ㅎㅏ-ㅣ가-힣\s]")
+STOPWORDS = frozenset(['하다', '있다', '되다', '그', '않다', '없다', '나', '말', '사람', '이', '보다', '등', '같다', '것'])
+MEANINGFUL_POS = frozenset(['Noun', 'Adjective', 'Verb'])
+WARMUP_TEXT = "분위기 좋은 맛집에서 맛있는 음식을 먹었다"
+
+def clean_text(text: str) -> str:
+    """한글, 공백을 제외한 모든 문자 제거"""
+    return NON_HANGUL_PATTERN.sub("", text or "")
+
+def filter_tokens(tokens: Iterable[Tuple[str, str]]) -> str:
+    """의미있는 품사이면서 불용어가 아니고 두 글자 이상인 단어만 공백으로 이어 붙임"""
+    return " ".join(
+        word for word, pos in tokens
+        if pos in MEANINGFUL_POS and len(word) > 1 and word not in STOPWORDS
+    )
+
+# ------------------------------
+# 워커 프로세스
+# ------------------------------
+_worker_okt = None
+
+def _init_worker():
+    """워커마다 Okt(JVM)를 한 번 생성하고 첫 호출 지연을 없애기 위해 워밍업"""
+    global _worker_okt
+    from konlpy.tag import Okt
+    _worker_okt = Okt()
+    _worker_okt.pos(WARMUP_TEXT, stem=True)
+
+def _preprocess_chunk(texts: List[str]) -> List[str]:
+    return [filter_tokens(_worker_okt.pos(clean_text(text), stem=True)) for text in texts]
+
+class PreprocessorPool:
+    """Okt 형태소 분석을 여러 프로세스에 나누어 처리하는 전처리 풀 (입력 순서 유지)"""
+
+    def __init__(self, workers: int, chunk_size: int = 64):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        # JVM이 이미 떠 있는 부모 프로세스를 fork 하면 안전하지 않으므로 spawn 사용
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def warmup(self):
+        """모든 워커가 Okt 로딩을 마칠 때까지 대기"""
+        list(self._executor.map(_preprocess_chunk, [[WARMUP_TEXT]] * self.workers))
+
+    def map(self, texts: List[str]) -> List[str]:
+        """텍스트 배치를 전처리하여 같은 순서의 리스트로 반환"""
+        return list(self.imap(texts))
+
+    def imap(self, texts: Iterable[str]) -> Iterator[str]:
+        """텍스트 스트림을 청크 단위로 워커에 보내고, 입력 순서대로 결과를 내보냄
+        동시에 처리 중인 청크 수를 워커 수의 2배로 제한해 긴 스트림에서도 메모리가 늘지 않음
+        """
+        iterator = iter(texts)
+        pending = deque()
+        max_pending = self.workers * 2
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(itertools.islice(iterator, self.chunk_size))
+                if not chunk:
+                    break
+                pending.append(self._executor.submit(_preprocess_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,220 @@
+import os
+import time
+import zlib
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from typing import Callable, Dict, Optional
+
+from .llmClient import LLMClient, estimate_tokens
+from .singleFlight import SingleFlight
+
+# LLM 응답 캐시
+# - 키: 모델 이름 + JSON 모드 여부 + 정규화한 프롬프트(유니코드 NFC, 줄마다 양끝 공백 제거, 빈 줄 제거)의 SHA-1
+#   (프롬프트는 들여쓴 f-string이라 들여쓰기/빈 줄만 다른 같은 요청이 많음, 대소문자나 문장 내용은 그대로 비교)
+# - SQLite 디스크 저장소 (zlib 압축, LLM_CACHE_TTL 동안 유지, 재시작 후에도 유지, 여러 워커가 같은 파일 공유)
+# - 같은 키의 캐시 미스가 동시에 들어오면 single-flight로 LLM 호출을 한 번만 보냄
+# - 항목마다 요청/응답 추정 토큰 수와 실제 응답 시간을 함께 저장해, 히트마다 절약한 토큰/시간을 집계
+# 실패한 요청(예외)과 빈 응답은 저장하지 않음
+# summarizer는 배치 요청과 별개로 맛집 하나짜리 프롬프트를 키로 항목별 결과도 저장 (배치 구성이 달라도 히트)
+
+HOUR = 3600
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * HOUR)))
+
+def normalize_prompt(prompt: str) -> str:
+    text = unicodedata.normalize("NFC", prompt or "")
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+def cache_key(model: str, prompt: str, json_mode: bool = False) -> str:
+    raw = f"{model}\x00{int(json_mode)}\x00{normalize_prompt(prompt)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    """SQLite에 저장하는 LLM 응답 캐시 (TTL + single-flight)"""
+
+    def __init__(self, path: str, ttl: float = LLM_CACHE_TTL, disk_size: int = 50_000, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl = ttl
+        self.disk_size = disk_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, body BLOB NOT NULL, "
+            "prompt_tokens INTEGER NOT NULL, output_tokens INTEGER NOT NULL, latency REAL NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed ON responses(accessed_at)")
+        self._conn.commit()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "calls": 0, "errors": 0, "evictions": 0, "shared": 0,
+                          "saved_prompt_tokens": 0, "saved_output_tokens": 0}
+        self._seconds = {"saved": 0.0, "upstream": 0.0, "hit_lookup": 0.0}
+
+    # ------------------------------
+    # 조회 / 저장
+    # ------------------------------
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 텍스트 (없거나 만료되면 None)"""
+        start = time.perf_counter()
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, prompt_tokens, output_tokens, latency, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            blob, prompt_tokens, output_tokens, latency, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._counters["hits"] += 1
+            self._counters["saved_prompt_tokens"] += prompt_tokens
+            self._counters["saved_output_tokens"] += output_tokens
+            self._seconds["saved"] += latency
+            self._seconds["hit_lookup"] += time.perf_counter() - start
+        return zlib.decompress(blob).decode("utf-8")
+
+    def put(self, key: str, model: str, text: str, prompt_tokens: int, output_tokens: int, latency: float):
+        if not text:
+            return
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, zlib.compress(text.encode("utf-8"), 6), prompt_tokens, output_tokens, latency, now + self.ttl, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def fetch(self, model: str, prompt: str, json_mode: bool, generate_fn: Callable[[], str], store: bool = True) -> str:
+        """캐시에 있으면 그대로, 없으면 generate_fn()을 한 번만 호출하여 저장 후 반환
+        store가 False면 조회/저장 없이 동시에 들어온 같은 요청만 합침 (summarizer의 배치 요청: 결과는 항목별로 따로 저장)
+        """
+        key = cache_key(model, prompt, json_mode)
+        cached = self.get(key) if store else None
+        if cached is not None:
+            return cached
+
+        def load() -> str:
+            # 캐시 조회 후 single-flight에 들어오기 전에 다른 호출이 저장을 마쳤을 수 있으므로 다시 확인 (카운터는 그대로)
+            with self._lock:
+                if store:
+                    row = self._conn.execute("SELECT body FROM responses WHERE key = ? AND expires_at > ?", (key, self._clock())).fetchone()
+                    if row is not None:
+                        return zlib.decompress(row[0]).decode("utf-8")
+                self._counters["calls"] += 1
+            start = time.perf_counter()
+            try:
+                text = generate_fn()
+            except Exception:
+                with self._lock:
+                    self._counters["errors"] += 1
+                raise
+            latency = time.perf_counter() - start
+            with self._lock:
+                self._seconds["upstream"] += latency
+            if store:
+                self.put(key, model, text, estimate_tokens(prompt), estimate_tokens(text), latency)
+            return text
+
+        text, shared = self._flight.do(key, load)
+        if shared:
+            with self._lock:
+                self._counters["shared"] += 1
+                self._counters["saved_prompt_tokens"] += estimate_tokens(prompt)
+                self._counters["saved_output_tokens"] += estimate_tokens(text)
+        return text
+
+    # ------------------------------
+    # 관리 및 통계
+    # ------------------------------
+    def stats(self) -> Dict[str, object]:
+        """히트율, 절약한 토큰/시간, 평균 응답 시간"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            disk_rows = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            calls, hits = self._counters["calls"], self._counters["hits"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                # 캐시 히트 + single-flight로 합쳐진 요청은 LLM을 호출하지 않음
+                "saved_calls": hits + self._counters["shared"],
+                "saved_tokens": self._counters["saved_prompt_tokens"] + self._counters["saved_output_tokens"],
+                "saved_seconds": round(self._seconds["saved"], 3),
+                "upstream_latency_ms": round(self._seconds["upstream"] / calls * 1000, 1) if calls else None,
+                "hit_latency_ms": round(self._seconds["hit_lookup"] / hits * 1000, 3) if hits else None,
+                "disk_entries": disk_rows,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float):
+        """만료된 항목을 지우고, 그래도 disk_size를 넘으면 가장 오래 사용되지 않은 항목부터 삭제"""
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        overflow = count - self.disk_size
+        if overflow <= 0:
+            return
+        removed = self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+        overflow -= removed
+        if overflow > 0:
+            overflow = min(count - removed, overflow + self.disk_size // 10)
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+            removed += overflow
+        self._counters["evictions"] += removed
+        logging.info(f"[LLM CACHE] 디스크 캐시에서 {removed}개 항목 정리")
+
+class CachedLLMClient(LLMClient):
+    """다른 LLMClient 앞에 LLMCache를 두는 클라이언트 (모델 이름은 감싼 클라이언트와 같음)"""
+
+    def __init__(self, inner: LLMClient, cache: LLMCache):
+        self.inner = inner
+        self.cache = cache
+        self.name = inner.name
+
+    def generate(self, prompt: str, json_mode: bool = False) -> str:
+        return self.cache.fetch(self.name, prompt, json_mode, lambda: self.inner.generate(prompt, json_mode))
+
+# 프로세스 전체에서 공유하는 캐시 (LLM_CACHE_ENABLED=0 으로 끌 수 있음)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache() -> Optional[LLMCache]:
+    global llm_cache
+    if llm_cache is None and LLM_CACHE_ENABLED:
+        with _llm_cache_lock:
+            if llm_cache is None:
+                llm_cache = LLMCache(
+                    path=os.getenv("LLM_CACHE_PATH", "./llm_cache.sqlite3"),
+                    disk_size=int(os.getenv("LLM_CACHE_DISK_SIZE", "50000")),
+                )
+    return llm_cache
+
+def with_cache(client: Optional[LLMClient]) -> Optional[LLMClient]:
+    """캐시가 켜져 있으면 client를 CachedLLMClient로 감싸서 반환"""
+    cache = get_llm_cache()
+    if client is None or cache is None or isinstance(client, CachedLLMClient):
+        return client
+    return CachedLLMClient(client, cache)
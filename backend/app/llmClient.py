@@ -0,0 +1,191 @@
+import os
+import re
+import json
+import time
+import zlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# LLM 클라이언트 인터페이스
+# summarizer와 각 호출 위치는 이 인터페이스(generate: 프롬프트 -> 응답 텍스트)만 사용하고, 실제 클라이언트는 설정(LLM_BACKEND)으로 선택
+# - GeminiClient  : google.generativeai (json_mode면 response_mime_type=application/json으로 구조화 출력 요청)
+# - FakeLLMClient : 네트워크 없이 결정적으로 응답하는 로컬 대역 (지연 시간/실패를 흉내 내어 오프라인 벤치마크에 사용)
+#   프롬프트의 ```json 블록 중 첫 번째 객체를 응답 형식(template), 첫 번째 배열을 입력 항목으로 보고,
+#   항목마다 template과 같은 구조의 값을 채운 {"results": [...]}를 반환 (summarizer의 프롬프트 형식)
+# get_llm_client는 응답 캐시(llmCache, LLM_CACHE_ENABLED)가 켜져 있으면 캐시로 감싼 클라이언트를 반환
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini") # gemini / fake
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-1.5-flash")
+CHARS_PER_TOKEN = 2 # 한국어 + JSON 기준 대략적인 값 (배치 크기 계산용)
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+class LLMClient(ABC):
+    """프롬프트 하나를 보내고 응답 텍스트를 받는 LLM 클라이언트"""
+    name: str = "llm"
+
+    @abstractmethod
+    def generate(self, prompt: str, json_mode: bool = False) -> str:
+        """응답 텍스트 (요청 실패 시 예외)"""
+
+class GeminiClient(LLMClient):
+    """google.generativeai GenerativeModel 래퍼 (import와 설정은 처음 호출할 때)"""
+
+    def __init__(self, model_name: str = LLM_MODEL, api_key: Optional[str] = None, model: Any = None):
+        self.name = f"gemini/{model_name}"
+        self.model_name = model_name
+        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        self._model = model # 이미 만든 GenerativeModel을 그대로 사용할 수도 있음
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def generate(self, prompt: str, json_mode: bool = False) -> str:
+        config = {"response_mime_type": "application/json"} if json_mode else None
+        response = self._get_model().generate_content(prompt, generation_config=config)
+        return getattr(response, "text", "") or ""
+
+# ------------------------------
+# 로컬 대역
+# ------------------------------
+_JSON_BLOCK_RE = re.compile(r"```json\s*(.*?)```", re.DOTALL)
+
+def _strings(value: Any, skip: Optional[str] = None) -> List[str]:
+    """중첩된 값 안의 문자열 전체 (skip 키의 값 제외)"""
+    if isinstance(value, dict):
+        return [s for k, v in value.items() if k != skip for s in _strings(v)]
+    if isinstance(value, list):
+        return [s for v in value for s in _strings(v)]
+    return [value] if isinstance(value, str) else []
+
+class FakeLLMClient(LLMClient):
+    """결정적인 로컬 LLM 대역
+    지연 시간 = base_latency + 입력 토큰 * input_token_latency + 출력 토큰 * output_token_latency (time.sleep)
+    fail_rate: 항목별로 결과를 빠뜨리거나 형식이 틀린 값을 넣는 확률 (같은 항목도 요청할 때마다 다시 추첨)
+    malformed_rate: 응답 전체를 잘린 JSON으로 보내는 확률
+    null_rate: 항목별로 정보가 없는 것처럼 배열 값을 null로 넣거나 빼는 확률 (형식 오류는 아님)
+    """
+    name = "fake"
+
+    def __init__(self, base_latency: float = 1.0, input_token_latency: float = 0.00005, output_token_latency: float = 0.004,
+                 fail_rate: float = 0.0, malformed_rate: float = 0.0, null_rate: float = 0.0, seed: int = 0):
+        self.base_latency = base_latency
+        self.input_token_latency = input_token_latency
+        self.output_token_latency = output_token_latency
+        self.fail_rate = fail_rate
+        self.malformed_rate = malformed_rate
+        self.null_rate = null_rate
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._seen: Counter = Counter() # 추첨용 (같은 입력을 몇 번째 받았는지)
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def _roll(self, *parts: Any) -> float:
+        """parts로 정해지는 0~1 사이 값"""
+        key = json.dumps([self.seed, *parts], ensure_ascii=False, sort_keys=True, default=str)
+        return zlib.crc32(key.encode("utf-8")) / 0xFFFFFFFF
+
+    def _fill(self, template: Any, item: Dict[str, Any], path: str) -> Any:
+        """template과 같은 구조의 값을 항목 내용으로 채움"""
+        if isinstance(template, dict):
+            return {k: self._fill(v, item, f"{path}.{k}") for k, v in template.items()}
+        if isinstance(template, list):
+            return [self._fill(v, item, f"{path}[{i}]") for i, v in enumerate(template)]
+        if isinstance(template, bool):
+            return self._roll(item.get("id"), path) < 0.5
+        if isinstance(template, (int, float)):
+            return round(3.0 + 2.0 * self._roll(item.get("id"), path), 1)
+        words = [w for w in re.split(r"\W+", " ".join(_strings(item, skip="id"))) if len(w) > 1]
+        start = int(self._roll(item.get("id"), path) * max(len(words) - 4, 1))
+        return " ".join(words[start:start + 5]) or str(template)
+
+    def _answer(self, template: Dict[str, Any], item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        key = json.dumps(item, ensure_ascii=False, sort_keys=True)
+        with self._lock:
+            self._seen[key] += 1
+            attempt = self._seen[key]
+        roll = self._roll("fail", item, attempt)
+        if roll < self.fail_rate / 2:
+            return None # 항목 누락
+        if roll < self.fail_rate:
+            return {"id": item.get("id")} # 필드 누락
+        answer = {"id": item.get("id"), **self._fill({k: v for k, v in template.items() if k != "id"}, item, "")}
+        if self._roll("null", item, attempt) < self.null_rate:
+            # 배열 값을 하나 걸러 하나씩 null로 넣거나 키를 뺌
+            for i, k in enumerate([k for k, v in answer.items() if isinstance(v, list)]):
+                if i % 2:
+                    del answer[k]
+                else:
+                    answer[k] = None
+        return answer
+
+    def generate(self, prompt: str, json_mode: bool = False) -> str:
+        template: Optional[Dict[str, Any]] = None
+        items: List[Dict[str, Any]] = []
+        for block in _JSON_BLOCK_RE.findall(prompt):
+            try:
+                parsed = json.loads(block)
+            except json.JSONDecodeError:
+                continue
+            if template is None and isinstance(parsed, dict):
+                template = parsed
+            elif isinstance(parsed, list) and not items:
+                items = [item for item in parsed if isinstance(item, dict)]
+        results = [result for result in (self._answer(template or {}, item) for item in items) if result is not None]
+        text = json.dumps({"results": results}, ensure_ascii=False)
+
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if self._roll("malformed", prompt, call) < self.malformed_rate:
+            text = text[:len(text) // 2]
+
+        input_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(text)
+        with self._lock:
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+        time.sleep(self.base_latency + input_tokens * self.input_token_latency + output_tokens * self.output_token_latency)
+        return text
+
+# ------------------------------
+# 설정에 따른 공용 클라이언트
+# ------------------------------
+_client: Optional[LLMClient] = None
+_client_configured = False
+_client_lock = threading.Lock()
+
+def get_llm_client() -> Optional[LLMClient]:
+    """LLM_BACKEND에 따른 공용 클라이언트 (gemini인데 GOOGLE_API_KEY가 없으면 None)"""
+    global _client, _client_configured
+    if not _client_configured:
+        with _client_lock:
+            if not _client_configured:
+                from .llmCache import with_cache # llmCache가 이 모듈을 import하므로 여기서
+                if LLM_BACKEND == "fake":
+                    _client = with_cache(FakeLLMClient())
+                elif os.getenv("GOOGLE_API_KEY"):
+                    _client = with_cache(GeminiClient(LLM_MODEL))
+                else:
+                    _client = None
+                logging.info(f"[LLM] 클라이언트: {_client.name if _client else '없음 (GOOGLE_API_KEY 미설정)'}")
+                _client_configured = True
+    return _client
+
+def set_llm_client(client: Optional[LLMClient]):
+    """공용 클라이언트 교체 (벤치마크/스크립트용)"""
+    global _client, _client_configured
+    with _client_lock:
+        _client, _client_configured = client, True
@@ -1,18 +1,93 @@
-from fastapi import FastAPI, Depends, HTTPException
+import os
+from typing import List, Optional
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from . import crud, models, schemas, service
-from .database import engine, get_db
+from . import crud, models, schemas, service, nlpService, vectorDBService, pgvectorSync, apiCache, pageStore, htmlExtract, llmClient, llmCache, enrichQueue, eventStream
+from .database import SessionLocal, engine, get_db
+from .readiness import Readiness
+from .httpClient import close_http_client
 
-# 애플리케이션 시작 시, PostgreSQL에 테이블들을 생성합니다.
-models.Base.metadata.create_all(bind=engine)
+# 무거운 자원은 import 시점이 아니라 lifespan에서 백그라운드로 병렬 준비합니다.
+readiness = Readiness()
 
-app = FastAPI(title="Cureat API", description="AI 기반 맛집 추천 및 코스 생성 서비스")
+def _warmup_postgres():
+    # 애플리케이션 시작 시, PostgreSQL에 테이블들을 생성합니다.
+    # (pgvector 확장 준비 및 기존 테이블의 새 컬럼/인덱스 추가 포함)
+    pgvectorSync.prepare_database(engine)
+
+def _warmup_vector_db():
+    return f"{vectorDBService.count_restaurants()} restaurants ({vectorDBService.VECTOR_STORE_BACKEND})"
+
+def _warmup_embedding():
+    # 트래픽을 받기 전에 모델 로딩과 첫 인코딩(워밍업)을 끝내 둡니다.
+    nlpService.text_to_vectors(["분위기 좋은 데이트 맛집 추천"])
+    return "sidecar" if nlpService.embedding_client else nlpService.get_vector_model().name
+
+def _warmup_llm():
+    client = llmClient.get_llm_client()
+    return client.name if client else "disabled (GOOGLE_API_KEY 없음)"
+
+readiness.register("postgres", _warmup_postgres)
+readiness.register("vector_db", _warmup_vector_db)
+readiness.register("embedding", _warmup_embedding)
+readiness.register("llm", _warmup_llm)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # STARTUP_MODE=serial 이면 기존처럼 모든 자원을 준비한 뒤에 요청을 받습니다.
+    if os.getenv("STARTUP_MODE", "background") == "serial":
+        readiness.run_serially()
+    else:
+        readiness.start()
+    # 백그라운드 보강 모드면 서버 안에서도 보강 워커를 돌립니다. (ENRICH_WORKERS=0 이면 별도 워커 프로세스만 사용)
+    enrich_workers = []
+    if service.RECOMMENDATION_MODE == "background" and enrichQueue.ENRICH_WORKERS > 0:
+        enrich_workers = await run_in_threadpool(enrichQueue.start_workers, enrichQueue.ENRICH_WORKERS)
+    yield
+    for worker in enrich_workers:
+        worker.stop(timeout=5)
+    readiness.shutdown()
+    # 마지막 기록 이후의 벡터/HNSW 변경을 디스크에 남깁니다.
+    await run_in_threadpool(vectorDBService.flush_vector_store)
+    close_http_client()
+    htmlExtract.close_pool()
+
+app = FastAPI(title="Cureat API", description="AI 기반 맛집 추천 및 코스 생성 서비스", lifespan=lifespan)
 
 @app.get("/", tags=["Root"])
 def read_root():
     """서버가 정상적으로 실행 중인지 확인하는 기본 경로입니다."""
     return {"message": "Cureat API 서버에 오신 것을 환영합니다!"}
 
+@app.get("/ready", tags=["Root"])
+def read_ready():
+    """구성 요소별 워밍업 상태를 반환합니다. 모두 준비되기 전에는 503을 반환합니다."""
+    report = readiness.report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+@app.get("/metrics", tags=["Root"])
+def read_metrics():
+    """검색 결과 캐시, 임베딩 캐시, 외부 API 응답 캐시, 페이지 저장소, LLM 응답 캐시의 히트율, 맛집 상세 정보 중복 처리 방지와 보강 작업 큐 등 지표를 반환합니다."""
+    query_cache = vectorDBService.query_cache
+    embedding_cache = nlpService.embedding_cache
+    api_cache = apiCache.api_cache
+    page_store = pageStore.page_store
+    llm_cache = llmCache.llm_cache
+    enrich_queue = enrichQueue.enrich_queue
+    return {
+        "query_cache": query_cache.stats() if query_cache else None,
+        "embedding_cache": embedding_cache.stats() if embedding_cache else None,
+        "api_cache": api_cache.stats() if api_cache else None,
+        "page_store": page_store.stats() if page_store else None,
+        "llm_cache": llm_cache.stats() if llm_cache else None,
+        "details_flight": service.details_flight_stats(),
+        "enrich_queue": enrich_queue.stats() if enrich_queue else None,
+        "vector_store_generation": vectorDBService.generation,
+    }
+
 # --- User & Auth ---
 @app.post("/users/signup", response_model=schemas.User, tags=["User"])
 def signup_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
@@ -25,15 +100,41 @@ def signup_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
 
 # --- Recommendations & Course ---
 @app.post("/recommendations", response_model=schemas.RecommendationResponse, tags=["Recommendation"])
-def get_recommendations(request: schemas.ChatRequest, db: Session = Depends(get_db)):
-    user = crud.get_user_by_id(db, user_id=request.user_id)
+async def get_recommendations(request: schemas.ChatRequest, db: Session = Depends(get_db)):
+    # 후보 검색/크롤링/요약은 이벤트 루프에서 동시에 진행하고, DB 호출은 스레드 풀에서 실행
+    user = await run_in_threadpool(crud.get_user_by_id, db, user_id=request.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     
-    recommendation_data = service.get_personalized_recommendation(db, request, user)
-    crud.create_search_log(db, user_id=user.id, query=request.prompt)
+    recommendation_data = await service.get_personalized_recommendation_async(db, request, user)
+    await run_in_threadpool(crud.create_search_log, db, user_id=user.id, query=request.prompt)
     return recommendation_data
 
+@app.post("/recommendations/stream", tags=["Recommendation"])
+async def stream_recommendations(request: schemas.ChatRequest, http_request: Request, format: Optional[str] = None,
+                                 db: Session = Depends(get_db)):
+    """추천 맛집을 준비되는 대로 하나씩 보냅니다. (NDJSON, Accept: text/event-stream 또는 format=sse 이면 SSE)
+    restaurant 이벤트: {"index": 후보 순서, "restaurant": RestaurantDetail}, 마지막 summary 이벤트: {"answer", "count", ...}
+    """
+    user = await run_in_threadpool(crud.get_user_by_id, db, user_id=request.user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+
+    async def events():
+        # 응답을 보내는 동안 쓸 세션은 따로 열어 스트림이 끝날 때 닫음
+        stream_db = SessionLocal()
+        try:
+            count = 0
+            async for index, details in service.iter_personalized_recommendation_async(stream_db, request, user):
+                count += 1
+                yield "restaurant", {"index": index, "restaurant": schemas.RestaurantDetail(**details)}
+            await run_in_threadpool(crud.create_search_log, stream_db, user_id=user.id, query=request.prompt)
+            yield "summary", {"answer": service.RECOMMENDATION_ANSWER if count else service.RECOMMENDATION_EMPTY_ANSWER}
+        finally:
+            stream_db.close()
+
+    return eventStream.streaming_response(events(), eventStream.wants_sse(http_request.headers.get("accept"), format))
+
 @app.post("/date-course", response_model=schemas.CourseResponse, tags=["Date Course"])
 def create_date_course_api(request: schemas.CourseRequest, db: Session = Depends(get_db)):
     user = crud.get_user_by_id(db, user_id=request.user_id)
@@ -43,6 +144,42 @@ def create_date_course_api(request: schemas.CourseRequest, db: Session = Depends
     course_data = service.create_date_course(db, request, user)
     return course_data
 
+@app.post("/date-course/stream", tags=["Date Course"])
+async def stream_date_course(request: schemas.CourseRequest, http_request: Request, format: Optional[str] = None,
+                             db: Session = Depends(get_db)):
+    """코스를 장소 정보가 준비되는 대로 하나씩 보냅니다. (NDJSON 또는 SSE)
+    course 이벤트: {"index": 코스 순서, "course": CourseDetail}, 마지막 summary 이벤트: {"count", ...}
+    """
+    user = await run_in_threadpool(crud.get_user_by_id, db, user_id=request.user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+
+    async def events():
+        stream_db = SessionLocal()
+        try:
+            async for index, course in service.iter_date_courses_async(stream_db, request):
+                yield "course", {"index": index, "course": course}
+        finally:
+            stream_db.close()
+
+    return eventStream.streaming_response(events(), eventStream.wants_sse(http_request.headers.get("accept"), format))
+
+@app.get("/restaurants/enrichment", response_model=List[schemas.EnrichmentStatus], tags=["Recommendation"])
+def get_enrichment_status(ids: List[str] = Query(..., description="추천 응답의 restaurant_id 목록")):
+    """백그라운드 보강 모드에서 맛집별 상세 정보 보강 상태를 반환합니다. (ready이면 상세 정보 포함)"""
+    return service.get_enrichment_status(ids)
+
+# --- Map ---
+@app.get("/restaurants/nearby", response_model=List[schemas.RestaurantDetail], tags=["Map"])
+def get_nearby_restaurants(lat: float, lng: float, radius_m: float = 1000, limit: int = 20):
+    """기준 좌표 반경 안의 맛집을 가까운 순서로 반환합니다."""
+    return vectorDBService.find_restaurants_nearby(lat, lng, radius_m, limit=limit)
+
+@app.get("/restaurants/in-bbox", response_model=List[schemas.RestaurantDetail], tags=["Map"])
+def get_restaurants_in_bbox(min_lat: float, min_lng: float, max_lat: float, max_lng: float, limit: int = 200):
+    """지도 화면 영역 안의 맛집을 반환합니다."""
+    return vectorDBService.find_restaurants_in_bbox(min_lat, min_lng, max_lat, max_lng, limit=limit)
+
 # --- Reviews (in PostgreSQL) ---
 @app.post("/reviews", response_model=schemas.Review, tags=["Review"])
 def write_review(review: schemas.ReviewCreate, db: Session = Depends(get_db)):
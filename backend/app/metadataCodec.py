@@ -0,0 +1,130 @@
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, Union, get_args, get_origin, get_type_hints
+
+from pydantic import BaseModel
+
+from .schemas import RestaurantDetail
+
+# ChromaDB 메타데이터 코덱
+# ChromaDB 메타데이터 값은 str/int/float/bool만 허용하므로 리스트 값은 문자열 하나로 저장
+# - 기본 형식: 앞에 RS(\x1e)를 붙이고 항목을 US(\x1f)로 이어 붙임 (split 한 번으로 복원, '|'가 있어도 손실 없음)
+# - 항목에 제어 문자가 섞인 드문 경우와 리스트가 아닌 값은 JSON 문자열로 저장
+# - 이전 형식('|'로 이어 붙인 문자열)도 읽을 수 있음
+# 리스트로 복원할 필드 목록은 schemas.RestaurantDetail에서 자동으로 생성하므로 스키마에 필드를 추가하면 코덱도 따라감
+# 필터 검색용 플래그 키: categories=["한식"] -> "categories__한식": True 처럼 항목마다 bool 키를 함께 저장
+# (where 절에서 문자열 분리 없이 {"categories__한식": True}로 바로 필터링, 복원할 때는 제외)
+
+_SCALAR_TYPES = frozenset((str, int, float, bool))
+# 대부분의 값은 기본 타입이므로 isinstance 대신 클래스 조회로 빠르게 판별
+# json.dumps/loads는 호출마다 인코더를 새로 만들므로 미리 만들어 둔 인스턴스를 재사용
+_json_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_json_decode = json.JSONDecoder().decode
+LIST_PREFIX = "\x1e"
+LIST_SEPARATOR = "\x1f"
+FLAG_SEPARATOR = "__"
+
+# 주소의 행정구역 접미사 ("강남구" -> "강남"도 함께 저장해 "강남"으로 검색 가능)
+_REGION_SUFFIX = re.compile(r"(특별시|광역시|특별자치시|특별자치도|시|도|구|군|동|읍|면|가)$")
+_ROAD_NAME = re.compile(r"(로|길)\d*$")
+
+def flag_key(field: str, term: str) -> str:
+    return f"{field}{FLAG_SEPARATOR}{term}"
+
+def list_terms(value: Any) -> Iterable[str]:
+    return value if value.__class__ is list else ()
+
+def address_terms(address: Any) -> Iterable[str]:
+    """주소에서 지역 검색어 추출 (도로명/번지는 제외)"""
+    if address.__class__ is not str:
+        return ()
+    terms = set()
+    for token in address.split():
+        # 번지/도로명(테헤란로, 연남로1길 등)부터는 지역이 아님
+        if token[:1].isdigit() or _ROAD_NAME.search(token):
+            break
+        terms.add(token)
+        stripped = _REGION_SUFFIX.sub("", token)
+        if len(stripped) >= 2:
+            terms.add(stripped)
+    return terms
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)):
+        # str/int 등을 상속한 타입(Enum 등)
+        return value
+    if value.__class__ is list:
+        try:
+            joined = LIST_SEPARATOR.join(value)
+        except TypeError:
+            return _json_encode(value)
+        # 항목 안에 구분 문자가 없고, [""]처럼 빈 리스트와 구분되지 않는 경우가 아니면 기본 형식 사용
+        if joined.count(LIST_SEPARATOR) == len(value) - 1 and LIST_PREFIX not in joined and (joined or len(value) != 1):
+            return LIST_PREFIX + joined
+    return _json_encode(value)
+
+def _is_list_type(annotation) -> bool:
+    origin = get_origin(annotation)
+    if origin is Union:
+        return any(_is_list_type(arg) for arg in get_args(annotation))
+    return origin in (list, List)
+
+class MetadataCodec:
+    """pydantic 스키마로부터 만든 메타데이터 인코더/디코더"""
+
+    def __init__(self, model: Type[BaseModel], flag_fields: Optional[Dict[str, Callable[[Any], Iterable[str]]]] = None):
+        self.list_fields = frozenset(
+            name for name, annotation in get_type_hints(model).items() if _is_list_type(annotation)
+        )
+        # 필드 이름 -> 플래그 검색어 추출 함수
+        self.flag_fields = dict(flag_fields or {})
+
+    def encode(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """메타데이터 한 건을 ChromaDB에 저장할 수 있는 형태로 변환 (None 값은 저장하지 않음)"""
+        encoded = {
+            key: value if value.__class__ in _SCALAR_TYPES else _encode_value(value)
+            for key, value in metadata.items() if value is not None
+        }
+        for field, terms in self.flag_fields.items():
+            value = metadata.get(field)
+            if value is not None:
+                for term in terms(value):
+                    if term.__class__ is str and term:
+                        encoded[flag_key(field, term)] = True
+        return encoded
+
+    def decode(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """저장된 메타데이터 한 건을 원래 형태로 복원"""
+        if self.flag_fields:
+            decoded = {key: value for key, value in (metadata or {}).items() if FLAG_SEPARATOR not in key}
+        else:
+            decoded = dict(metadata or {})
+        for key in self.list_fields:
+            value = decoded.get(key)
+            if value.__class__ is not str:
+                continue
+            head = value[:1]
+            if head == LIST_PREFIX:
+                decoded[key] = value[1:].split(LIST_SEPARATOR) if len(value) > 1 else []
+                continue
+            if head == "[":
+                try:
+                    decoded[key] = _json_decode(value)
+                    continue
+                except ValueError:
+                    # "[웨이팅]|주차"처럼 '['로 시작하는 이전 형식 값
+                    pass
+            # 이전 형식('|'로 이어 붙인 문자열)으로 저장된 데이터
+            decoded[key] = value.split("|") if value else []
+        return decoded
+
+    def encode_many(self, metadatas: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.encode(metadata) for metadata in metadatas]
+
+    def decode_many(self, metadatas: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.decode(metadata) for metadata in metadatas]
+
+restaurant_codec = MetadataCodec(
+    RestaurantDetail,
+    flag_fields={"categories": list_terms, "keywords": list_terms, "address": address_terms},
+)
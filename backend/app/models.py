@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, Boolean, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship # SQLAlchemy 관계
 from sqlalchemy.sql import func # SQLAlchemy 함수
-from .database import Base # SQLAlchemy3 Base 가져오기
+from .database import Base, PGVECTOR_ENABLED, PGVECTOR_DIMENSION # SQLAlchemy3 Base 가져오기
 from pgvector.sqlalchemy import Vector # pgvector 임포트
 
 class User(Base): # User 모델 정의
@@ -40,6 +41,21 @@ class Restaurant(Base):
     address = Column(String, nullable=False) # 음식점 주소
     # 이름과 주소 조합으로 고유성 유지
     image_url = Column(String, nullable=True) # 음식점 이미지 URL
+    price_range = Column(String, nullable=True, index=True) # 가격대 (요약 결과의 price_range)
+    review_trust_score = Column(Integer, nullable=True) # 리뷰 신뢰도 점수
+    details = Column(JSONB, nullable=True) # 벡터 DB와 같은 상세 정보 (RestaurantDetail)
+
+    # 임베딩 (PGVECTOR_ENABLED일 때만) - 벡터 DB와 같은 제곱 L2 거리용 HNSW 인덱스
+    if PGVECTOR_ENABLED:
+        embedding = Column(Vector(PGVECTOR_DIMENSION), nullable=True) # 맛집 임베딩
+        __table_args__ = (
+            Index(
+                "ix_restaurants_embedding_hnsw", embedding,
+                postgresql_using="hnsw",
+                postgresql_with={"m": 16, "ef_construction": 64},
+                postgresql_ops={"embedding": "vector_l2_ops"},
+            ),
+        )
         
     reviews = relationship("Review", back_populates="restaurant") # 리뷰
     
@@ -0,0 +1,140 @@
+import os
+import zlib
+import difflib
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# 근사 중복 문장 탐지 (MinHash + LSH)
+# - 문장을 정규화(NFC, 소문자, 공백 정리)한 뒤 글자 n-gram(shingle) 집합으로 변환
+# - shingle 집합마다 MinHash 서명(num_perm개의 최솟값)을 계산하고, 서명을 bands개 구간으로 나누어 구간별 버킷에 등록
+#   -> 한 구간이라도 같은 버킷에 들어간 문장만 후보가 되므로 모든 쌍을 비교하지 않음 (문장 수에 거의 선형)
+# - 후보 중 서명으로 추정한 Jaccard 유사도가 threshold 이상인 것만 남기고,
+#   match_sets / dedupe는 남은 후보를 기존과 같은 기준(difflib ratio > MATCH_RATIO)으로 최종 확인
+#   -> difflib 비교는 후보 쌍에만 하므로 판정 기준은 기존 전수 비교와 같고 비교 횟수만 줄어듦
+# difflib ratio > 0.6인 쌍의 3-gram Jaccard는 대부분 0.25 이상이므로 후보 기준은 0.2
+
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.2"))
+MATCH_RATIO = float(os.getenv("NEAR_DUP_MATCH_RATIO", "0.6"))
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+BANDS = 64 # 2행 x 64구간: Jaccard 0.2인 쌍이 후보가 될 확률 약 0.93, 0.3이면 0.998
+
+_PRIME = np.uint64(4294967311) # 2^32보다 큰 소수 (a * h + b가 uint64 범위를 넘지 않음)
+
+def normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text or "").split()).lower()
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """정규화한 문장의 글자 n-gram 해시 집합 (문장이 size보다 짧으면 문장 전체 하나)"""
+    text = normalize(text)
+    grams = {text[i:i + size] for i in range(max(len(text) - size + 1, 1))}
+    return {zlib.crc32(g.encode("utf-8")) for g in grams}
+
+class MinHasher:
+    """shingle 집합 -> MinHash 서명 (h_i(x) = (a_i * x + b_i) mod p)"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: Set[int]) -> np.ndarray:
+        if not shingle_set:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+        return ((values[:, None] * self._a + self._b) % _PRIME).min(axis=0)
+
+class NearDuplicateIndex:
+    """문장을 추가하고, 주어진 문장과 Jaccard 유사도가 threshold 이상인 문장을 찾는 LSH 인덱스"""
+
+    def __init__(self, threshold: float = NEAR_DUP_THRESHOLD, num_perm: int = NUM_PERM, bands: int = BANDS,
+                 shingle_size: int = SHINGLE_SIZE, hasher: Optional[MinHasher] = None):
+        if bands > num_perm:
+            raise ValueError("bands는 num_perm보다 클 수 없습니다.")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = hasher or MinHasher(num_perm)
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures = np.empty((16, self.hasher.num_perm), dtype=np.uint64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def signature(self, text: str) -> np.ndarray:
+        return self.hasher.signature(shingles(text, self.shingle_size))
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, text: str) -> int:
+        """문장을 추가하고 인덱스 번호(추가한 순서)를 반환"""
+        signature = self.signature(text)
+        idx = self._size
+        if idx == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self._signatures[idx] = signature
+        self._size += 1
+        for band, key in self._band_keys(signature):
+            self._buckets[band][key].append(idx)
+        return idx
+
+    def query(self, text: str) -> List[Tuple[int, float]]:
+        """추정 Jaccard 유사도가 threshold 이상인 (인덱스 번호, 유사도) 목록을 인덱스 번호 순으로 반환"""
+        signature = self.signature(text)
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+        if not candidates:
+            return []
+        ids = np.fromiter(sorted(candidates), dtype=np.int64, count=len(candidates))
+        similarity = (self._signatures[ids] == signature).mean(axis=1)
+        keep = similarity >= self.threshold
+        return list(zip(ids[keep].tolist(), similarity[keep].tolist()))
+
+def _similar(a: str, b_matcher: difflib.SequenceMatcher, ratio: Optional[float]) -> bool:
+    """difflib ratio > ratio (상한값인 real_quick_ratio / quick_ratio로 먼저 걸러냄)"""
+    if ratio is None:
+        return True
+    b_matcher.set_seq1(a)
+    return b_matcher.real_quick_ratio() > ratio and b_matcher.quick_ratio() > ratio and b_matcher.ratio() > ratio
+
+def match_sets(left: Sequence[str], right: Sequence[str], threshold: float = NEAR_DUP_THRESHOLD,
+               ratio: Optional[float] = MATCH_RATIO) -> Dict[int, int]:
+    """left의 각 문장을 아직 짝이 없는 right 문장 중 번호가 가장 작은 근사 중복과 1:1로 짝지음 ({left 번호: right 번호})
+    ratio가 None이면 difflib 확인 없이 추정 Jaccard만으로 판정
+    """
+    index = NearDuplicateIndex(threshold)
+    for text in right:
+        index.add(text)
+    matchers: Dict[int, difflib.SequenceMatcher] = {} # right 문장별 SequenceMatcher (seq2 전처리 재사용)
+    used, pairs = set(), {}
+    for i, text in enumerate(left):
+        for j, _ in index.query(text):
+            if j in used:
+                continue
+            matcher = matchers.get(j)
+            if matcher is None:
+                matcher = matchers[j] = difflib.SequenceMatcher(None, "", right[j])
+            if _similar(text, matcher, ratio):
+                used.add(j)
+                pairs[i] = j
+                break
+    return pairs
+
+def dedupe(texts: Sequence[str], threshold: float = NEAR_DUP_THRESHOLD, ratio: Optional[float] = MATCH_RATIO) -> List[str]:
+    """근사 중복 문장을 제거 (먼저 나온 문장을 남김)"""
+    index = NearDuplicateIndex(threshold)
+    kept = []
+    for text in texts:
+        if not any(_similar(text, difflib.SequenceMatcher(None, "", kept[j]), ratio) for j, _ in index.query(text)):
+            index.add(text)
+            kept.append(text)
+    return kept
@@ -1,21 +1,83 @@
-import re
-from konlpy.tag import Okt
-from sentence_transformers import SentenceTransformer
-from typing import List
+import os
+import logging
+import threading
+import numpy as np
+from typing import List, Optional
+from .embeddingCache import EmbeddingCache
+from .embeddingService import EmbeddingClient
+from .encoderBackend import load_encoder
+from .koreanPreprocessor import PreprocessorPool, clean_text, filter_tokens
 
 # 모델 로딩
 # 한국어 처리에 특화된 사전 학습된 백터 변환 모델 로드
-# 이 코드가 처음 실행될 때 모델을 다운로드하며, 몇 분 정도 소요될 수 있음
-
-try:
-    vector_model = SentenceTransformer('jhgan/ko-sroberta-multitask')
-except Exception as e:
-    print(f"모델 로딩 중 오류 발생: {e}")
-    print("인터넷 연결을 확인하거나 'pip install sentence-transformers'를 실행해주세요.")
-    vector_model = None
-    
-# 형태소 분석을 위해 Okt 객체 생성
-okt = Okt()
+# 처음 사용할 때 모델을 다운로드하며, 몇 분 정도 소요될 수 있음
+# 모델과 Okt(JVM)는 처음 필요할 때 로드하므로, 임베딩 사이드카를 쓰는 워커는 둘 다 로드하지 않음
+
+# EMBEDDING_BACKEND: torch(기본) | onnx | onnx-int8 (ONNX 로딩 실패 시 torch로 폴백)
+EMBEDDING_MODEL_NAME = 'jhgan/ko-sroberta-multitask'
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+
+# 임베딩 사이드카 주소 (예: unix:/tmp/cureat-embedding.sock, 127.0.0.1:8765), 비어 있으면 프로세스 내부에서 인코딩
+EMBEDDING_SERVICE_ADDR = os.getenv("EMBEDDING_SERVICE_ADDR", "")
+
+vector_model = None
+okt = None
+_model_load_error = None
+_load_lock = threading.Lock()
+
+def get_vector_model():
+    """벡터 변환 모델을 처음 호출될 때 한 번만 로드"""
+    global vector_model, _model_load_error
+    if vector_model is None and _model_load_error is None:
+        with _load_lock:
+            if vector_model is None and _model_load_error is None:
+                try:
+                    vector_model = load_encoder(EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND, model_dir=os.getenv("ONNX_MODEL_DIR"))
+                except Exception as e:
+                    print(f"모델 로딩 중 오류 발생: {e}")
+                    print("인터넷 연결을 확인하거나 'pip install sentence-transformers'를 실행해주세요.")
+                    _model_load_error = e
+    if vector_model is None:
+        raise ValueError("벡터 변환 모델이 로드되지 않았습니다.")
+    return vector_model
+
+def get_okt():
+    """형태소 분석을 위한 Okt 객체를 처음 호출될 때 생성"""
+    global okt
+    if okt is None:
+        with _load_lock:
+            if okt is None:
+                from konlpy.tag import Okt
+                okt = Okt()
+    return okt
+
+# 형태소 분석 프로세스 풀 설정 (0이면 현재 프로세스의 okt만 사용)
+PREPROCESS_WORKERS = int(os.getenv("PREPROCESS_WORKERS", "0"))
+PREPROCESS_CHUNK_SIZE = int(os.getenv("PREPROCESS_CHUNK_SIZE", "64"))
+# 이보다 적은 텍스트는 프로세스 간 전송 비용이 더 크므로 현재 프로세스에서 처리
+PREPROCESS_POOL_MIN_TEXTS = int(os.getenv("PREPROCESS_POOL_MIN_TEXTS", "32"))
+_preprocessor_pool = None
+
+# 한 번의 encode 호출에 넣을 기본 배치 크기
+DEFAULT_BATCH_SIZE = 32
+
+# 임베딩 캐시 (EMBEDDING_CACHE_ENABLED=0 으로 끌 수 있음)
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1") != "0"
+embedding_cache = None
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    global embedding_cache
+    if embedding_cache is None and EMBEDDING_CACHE_ENABLED:
+        embedding_cache = EmbeddingCache(
+            path=os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache.sqlite3"),
+            # 백엔드별로 벡터 값이 다르므로 백엔드 이름이 포함된 모델 이름으로 키 생성
+            model_name=get_vector_model().name,
+            memory_size=int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "4096")),
+            disk_size=int(os.getenv("EMBEDDING_CACHE_DISK_SIZE", "200000")),
+        )
+    return embedding_cache
+
+embedding_client = EmbeddingClient(EMBEDDING_SERVICE_ADDR) if EMBEDDING_SERVICE_ADDR else None
 
 # 데이터 전처리 (텍스트 정제 및 토큰화) 모델
 def preprocess_text(text: str) -> str:
@@ -24,36 +86,87 @@ def preprocess_text(text: str) -> str:
     2. 형태소 분석을 통해 의미있는 품사(명사, 형용사, 동사)만 추출
     3. 불필요한 단어(불용어)와 한 글자 단어 제거
     """
-    
-    # 1. 정규 표현식을 사용하여 한글, 공백, 외 문자 제거
-    text = re.sub(r"[^ㄱ-ㅎㅏ-ㅣ가-힣\s]", "", text)
-    
+    # 1. 한글, 공백 외 문자 제거 (미리 컴파일된 정규식 사용)
     # 2. 형태소 분석 및 품사 태깅(단어의 원형 복원 포함)
-    tokens = okt.pos(text, stem=True)
-    
-    # 3. 불용어 리스트 정의 (필요에 따라 계속 추가 가능)
-    stopwords = ['하다', '있다', '되다', '그', '않다', '없다', '나', '말', '사람', '이', '보다', '등', '같다', '것']
-
-    # 4. 의미있는 품사이면서 불용어가 아니고, 두 글자 이상 단어만 필터링
-    meaningful_tokens = [
-        word for word, pos in tokens 
-        if pos in ['Noun', 'Adjective', 'Verb'] and word not in stopwords and len(word) > 1
-    ]
-    
-    # 정제된 토큰들을 공백으로 구분된 하나의 문자열로 합쳐서 반환
-    return " ".join(meaningful_tokens)
+    tokens = get_okt().pos(clean_text(text), stem=True)
+
+    # 3. 의미있는 품사이면서 불용어가 아니고, 두 글자 이상 단어만 필터링 (set 기반)
+    return filter_tokens(tokens)
+
+def get_preprocessor_pool() -> Optional[PreprocessorPool]:
+    """PREPROCESS_WORKERS가 설정된 경우에만 전처리 프로세스 풀을 처음 호출 시 생성"""
+    global _preprocessor_pool
+    if _preprocessor_pool is None and PREPROCESS_WORKERS > 0:
+        _preprocessor_pool = PreprocessorPool(PREPROCESS_WORKERS, chunk_size=PREPROCESS_CHUNK_SIZE)
+    return _preprocessor_pool
+
+def preprocess_texts(texts: List[str]) -> List[str]:
+    """여러 텍스트를 입력 순서대로 전처리 (텍스트가 많으면 프로세스 풀에 분산)"""
+    pool = get_preprocessor_pool()
+    if pool and len(texts) >= PREPROCESS_POOL_MIN_TEXTS:
+        return pool.map(texts)
+    return [preprocess_text(text) for text in texts]
 
 # 백터 변환 모델
+def _encode(preprocessed_texts: List[str], batch_size: int) -> np.ndarray:
+    return get_vector_model().encode(preprocessed_texts, batch_size=batch_size)
+
+def _preprocess_many(texts: List[str], cache: Optional[EmbeddingCache]) -> List[str]:
+    """전처리 결과를 캐시에서 먼저 찾고, 없는 원문만 Okt로 분석"""
+    if cache is None:
+        return preprocess_texts(texts)
+
+    cached = cache.get_preprocessed_many(texts)
+    missing = [text for text in dict.fromkeys(texts) if text not in cached]
+    computed = dict(zip(missing, preprocess_texts(missing)))
+    cache.put_preprocessed_many(computed)
+    return [cached.get(text, computed.get(text)) for text in texts]
+
+def encode_locally(texts: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> np.ndarray:
+    """현재 프로세스의 모델로 텍스트를 벡터로 변환 (임베딩 사이드카도 이 함수를 사용)
+    1. 목록 전체를 한 번에 전처리하고, 전처리 결과가 같은 텍스트는 한 번만 인코딩
+    2. 임베딩 캐시에 없는 텍스트만 batch_size 단위로 묶어 vector_model.encode 호출
+    """
+    if not texts:
+        return np.empty((0, get_vector_model().get_sentence_embedding_dimension()), dtype=np.float32)
+
+    # 1. 텍스트 전처리 (노이즈 제거) 후 중복 제거, 원래 순서는 inverse 인덱스로 복원
+    cache = get_embedding_cache()
+    preprocessed_texts = _preprocess_many(texts, cache)
+    unique_index = {}
+    inverse = np.fromiter(
+        (unique_index.setdefault(t, len(unique_index)) for t in preprocessed_texts),
+        dtype=np.intp, count=len(preprocessed_texts)
+    )
+    unique_texts = list(unique_index)
+
+    # 2. 고유한 전처리 텍스트만 배치 단위로 벡터 변환 (캐시에 있는 벡터는 재사용)
+    if cache is None:
+        return _encode(unique_texts, batch_size)[inverse]
+
+    keys = [cache.vector_key(t) for t in unique_texts]
+    cached = cache.get_many(keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if missing:
+        encoded = _encode([unique_texts[i] for i in missing], batch_size)
+        cache.put_many({keys[i]: vector for i, vector in zip(missing, encoded)})
+        cached.update((keys[i], vector) for i, vector in zip(missing, encoded))
+
+    vectors = np.stack([cached[key] for key in keys])
+    return vectors[inverse]
+
+def text_to_vectors(texts: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> np.ndarray:
+    """여러 텍스트를 한 번에 벡터로 변환하여 (텍스트 수, 임베딩 차원) 행렬로 반환
+    임베딩 사이드카가 설정되어 있으면 사이드카에 요청하고, 연결에 실패하면 현재 프로세스에서 인코딩
+    """
+    if embedding_client is not None and texts and embedding_client.available():
+        try:
+            return embedding_client.encode(texts, batch_size=batch_size)
+        except Exception as e:
+            logging.warning(f"[EMBEDDING] 사이드카 요청 실패, 프로세스 내부 인코딩으로 폴백: {e}")
+    return encode_locally(texts, batch_size=batch_size)
+
 def text_to_vector(text: str) -> List[float]:
-    """입력된 텍스트를 벡터로 변환"""
-    if not vector_model:
-        raise ValueError("벡터 변환 모델이 로드되지 않았습니다.")
-    
-    # 1. 텍스트 전처리 (노이즈 제거)
-    preprocessed_text = preprocess_text(text)
-    
-    # 2. 전처리된 텍스트를 벡터로 변환
-    vector = vector_model.encode(preprocessed_text)
-    
-    # 3. DB에 저장하기 쉽도록 numpy 배열을 리스트로 변환하여 반환
-    return vector.tolist()
\ No newline at end of file
+    """입력된 텍스트를 벡터로 변환 (text_to_vectors의 단건 버전)"""
+    # DB에 저장하기 쉽도록 numpy 배열을 리스트로 변환하여 반환
+    return text_to_vectors([text], batch_size=1)[0].tolist()
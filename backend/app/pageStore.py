@@ -0,0 +1,293 @@
+import os
+import argparse
+import time
+import zlib
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from .httpClient import HttpError, get_http_client
+from .singleFlight import SingleFlight
+
+# 크롤링한 블로그/웹 페이지 저장소
+# - URL -> 내용 해시 (ETag/Last-Modified와 마지막 확인 시각 포함)
+# - 내용 해시 -> zlib 압축 HTML (같은 글을 여러 URL/맛집에서 참조해도 한 번만 저장)
+# - (내용 해시, 추출기 이름) -> 압축된 본문 텍스트 (같은 내용은 추출기마다 한 번만 파싱)
+# fresh_ttl 안에 다시 요청하면 네트워크 없이 저장된 내용을 반환하고,
+# 그 뒤에는 If-None-Match / If-Modified-Since 조건부 요청으로 바뀌었을 때만 다시 받음 (304면 그대로 사용)
+# 다시 받지 못하면(오류/타임아웃) 저장된 내용을 그대로 사용
+# 본문은 스트리밍으로 받다가 byte_cap(PAGE_BYTE_CAP)에서 멈추고 받은 앞부분만 저장 (리뷰 본문은 보통 앞쪽에 있음)
+# GC: max_age 동안 사용되지 않은 URL을 지우고, 압축 HTML 총량이 max_bytes를 넘으면 오래 사용되지 않은 URL부터 삭제
+
+HOUR = 3600
+DAY = 24 * HOUR
+PAGE_BYTE_CAP = int(os.getenv("PAGE_BYTE_CAP", str(512 * 1024)))
+
+class Page(NamedTuple):
+    url: str
+    html: str
+    content_hash: str
+
+def content_hash(html: str) -> str:
+    return hashlib.sha1(html.encode("utf-8")).hexdigest()
+
+class PageStore:
+    """URL별 조건부 요청과 내용 해시 기준 중복 제거를 갖춘 SQLite 페이지 저장소"""
+
+    def __init__(self, path: str, fresh_ttl: float = DAY, max_age: float = 30 * DAY, max_bytes: int = 512 * 1024 * 1024,
+                 gc_every: int = 500, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.fresh_ttl = fresh_ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.gc_every = gc_every
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._puts_since_gc = 0
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, content_hash TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+            "checked_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS contents ("
+            "hash TEXT PRIMARY KEY, html BLOB NOT NULL, size INTEGER NOT NULL, raw_size INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS texts ("
+            "hash TEXT NOT NULL, extractor TEXT NOT NULL, text BLOB NOT NULL, PRIMARY KEY (hash, extractor))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages(content_hash)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages(accessed_at)")
+        self._conn.commit()
+        self._counters = {
+            "fresh_hits": 0, "revalidated": 0, "changed": 0, "new": 0, "deduplicated": 0,
+            "stale_served": 0, "failures": 0, "truncated": 0, "text_hits": 0, "text_misses": 0, "gc_removed": 0,
+        }
+
+    # ------------------------------
+    # 페이지 조회 / 저장
+    # ------------------------------
+    def fetch(self, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None,
+              max_retry: Optional[int] = None, byte_cap: Optional[int] = PAGE_BYTE_CAP) -> Optional[Page]:
+        """저장된 페이지를 반환하거나 (필요하면 조건부 요청으로) 받아서 저장 후 반환, 받을 수 없으면 None"""
+        if not url:
+            return None
+        page, _ = self._flight.do(url, lambda: self._fetch(url, headers, timeout, max_retry, byte_cap))
+        return page
+
+    def _fetch(self, url: str, headers: Optional[dict], timeout: Optional[float], max_retry: Optional[int],
+               byte_cap: Optional[int]) -> Optional[Page]:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, etag, last_modified, checked_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None and now - row[3] < self.fresh_ttl:
+                self._counters["fresh_hits"] += 1
+                return self._load(url, row[0], now)
+
+        request_headers = dict(headers or {})
+        if row is not None:
+            if row[1]:
+                request_headers["If-None-Match"] = row[1]
+            if row[2]:
+                request_headers["If-Modified-Since"] = row[2]
+        try:
+            response = get_http_client().get_text(url, max_bytes=byte_cap, headers=request_headers, timeout=timeout,
+                                                  max_retry=max_retry, raise_for_status=False)
+        except HttpError as e:
+            response = None
+            logging.info(f"[PAGE STORE] {url} 요청 실패: {e}")
+
+        with self._lock:
+            if response is not None and response.status_code == 304 and row is not None:
+                self._conn.execute("UPDATE pages SET checked_at = ? WHERE url = ?", (now, url))
+                self._counters["revalidated"] += 1
+                return self._load(url, row[0], now)
+            if response is None or response.status_code != 200:
+                if row is not None:
+                    # 다시 받지 못하면 저장된 내용이라도 사용
+                    self._counters["stale_served"] += 1
+                    return self._load(url, row[0], now)
+                self._counters["failures"] += 1
+                return None
+            self._counters["changed" if row is not None else "new"] += 1
+            if response.truncated:
+                self._counters["truncated"] += 1
+            return self._save(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"), now)
+
+    def put(self, url: str, html: str) -> Page:
+        """다른 경로(ScrapingBee 등)로 받은 HTML을 저장 (조건부 요청 정보 없음)"""
+        with self._lock:
+            self._counters["new"] += 1
+            return self._save(url, html, None, None, self._clock())
+
+    def _save(self, url: str, html: str, etag: Optional[str], last_modified: Optional[str], now: float) -> Page:
+        digest = content_hash(html)
+        exists = self._conn.execute("SELECT 1 FROM contents WHERE hash = ?", (digest,)).fetchone()
+        if exists:
+            self._counters["deduplicated"] += 1
+        else:
+            raw = html.encode("utf-8")
+            blob = zlib.compress(raw, 6)
+            self._conn.execute("INSERT INTO contents VALUES (?, ?, ?, ?)", (digest, blob, len(blob), len(raw)))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)", (url, digest, etag, last_modified, now, now)
+        )
+        self._conn.commit()
+        self._puts_since_gc += 1
+        if self._puts_since_gc >= self.gc_every:
+            self._gc(now)
+        return Page(url, html, digest)
+
+    def _load(self, url: str, digest: str, now: float) -> Optional[Page]:
+        row = self._conn.execute("SELECT html FROM contents WHERE hash = ?", (digest,)).fetchone()
+        if row is None: # 요청하는 동안 GC로 지워진 경우
+            return None
+        blob = row[0]
+        self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+        self._conn.commit()
+        return Page(url, zlib.decompress(blob).decode("utf-8"), digest)
+
+    # ------------------------------
+    # 본문 텍스트
+    # ------------------------------
+    def text(self, page: Page, extractor_name: str, extractor: Callable[[str], str]) -> str:
+        """페이지 본문 텍스트 (같은 내용 + 같은 추출기는 한 번만 파싱)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM texts WHERE hash = ? AND extractor = ?", (page.content_hash, extractor_name)
+            ).fetchone()
+            if row is not None:
+                self._counters["text_hits"] += 1
+                return zlib.decompress(row[0]).decode("utf-8")
+            self._counters["text_misses"] += 1
+        text = extractor(page.html)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO texts VALUES (?, ?, ?)",
+                (page.content_hash, extractor_name, zlib.compress(text.encode("utf-8"), 6)),
+            )
+            self._conn.commit()
+        return text
+
+    # ------------------------------
+    # 관리 및 통계
+    # ------------------------------
+    def gc(self, max_age: Optional[float] = None, max_bytes: Optional[int] = None) -> int:
+        """오래된 URL과 용량 초과분을 정리하고, 더 이상 참조되지 않는 내용/텍스트를 삭제. 지운 URL 수를 반환"""
+        with self._lock:
+            return self._gc(self._clock(), max_age, max_bytes)
+
+    def _gc(self, now: float, max_age: Optional[float] = None, max_bytes: Optional[int] = None) -> int:
+        max_age = self.max_age if max_age is None else max_age
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        self._puts_since_gc = 0
+        removed = self._conn.execute("DELETE FROM pages WHERE accessed_at < ?", (now - max_age,)).rowcount
+        self._delete_orphans()
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM contents").fetchone()[0]
+        if total > max_bytes:
+            # 오래 사용되지 않은 URL부터, 그 URL만 참조하던 내용의 크기를 빼 가며 목표(90%)까지 삭제
+            target = max_bytes * 0.9
+            rows = self._conn.execute(
+                "SELECT p.url, p.content_hash, c.size FROM pages p JOIN contents c ON c.hash = p.content_hash "
+                "ORDER BY p.accessed_at"
+            ).fetchall()
+            references = dict(self._conn.execute("SELECT content_hash, COUNT(*) FROM pages GROUP BY content_hash").fetchall())
+            victims = []
+            for url, digest, size in rows:
+                if total <= target:
+                    break
+                victims.append((url,))
+                references[digest] -= 1
+                if references[digest] == 0:
+                    total -= size
+            self._conn.executemany("DELETE FROM pages WHERE url = ?", victims)
+            removed += len(victims)
+            self._delete_orphans()
+        self._conn.commit()
+        self._counters["gc_removed"] += removed
+        if removed:
+            logging.info(f"[PAGE STORE] GC: URL {removed}개 정리")
+        return removed
+
+    def _delete_orphans(self):
+        self._conn.execute("DELETE FROM contents WHERE hash NOT IN (SELECT content_hash FROM pages)")
+        self._conn.execute("DELETE FROM texts WHERE hash NOT IN (SELECT hash FROM contents)")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            contents, size, raw_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) FROM contents"
+            ).fetchone()
+            return {**self._counters, "shared_fetches": self._flight.shared, "urls": pages, "contents": contents,
+                    "html_bytes": size, "html_raw_bytes": raw_size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# 프로세스 전체에서 공유하는 저장소 (PAGE_STORE_ENABLED=0 으로 끌 수 있음)
+PAGE_STORE_ENABLED = os.getenv("PAGE_STORE_ENABLED", "1") != "0"
+page_store = None
+_page_store_lock = threading.Lock()
+
+def get_page_store() -> Optional[PageStore]:
+    global page_store
+    if page_store is None and PAGE_STORE_ENABLED:
+        with _page_store_lock:
+            if page_store is None:
+                page_store = PageStore(
+                    path=os.getenv("PAGE_STORE_PATH", "./page_store.sqlite3"),
+                    fresh_ttl=float(os.getenv("PAGE_STORE_FRESH_TTL", str(DAY))),
+                    max_age=float(os.getenv("PAGE_STORE_MAX_AGE", str(30 * DAY))),
+                    max_bytes=int(os.getenv("PAGE_STORE_MAX_BYTES", str(512 * 1024 * 1024))),
+                )
+    return page_store
+
+def fetch_page(url: str, headers: Optional[dict] = None, timeout: Optional[float] = None,
+               max_retry: Optional[int] = None, byte_cap: Optional[int] = PAGE_BYTE_CAP) -> Optional[Page]:
+    """저장소를 거쳐 페이지를 가져옴 (저장소가 꺼져 있으면 바로 요청), 실패하면 None"""
+    store = get_page_store()
+    if store is not None:
+        return store.fetch(url, headers=headers, timeout=timeout, max_retry=max_retry, byte_cap=byte_cap)
+    if not url:
+        return None
+    try:
+        html = get_http_client().get_text(url, max_bytes=byte_cap, headers=headers, timeout=timeout, max_retry=max_retry).text
+    except HttpError:
+        return None
+    return Page(url, html, content_hash(html))
+
+def store_page(url: str, html: str) -> Page:
+    store = get_page_store()
+    return store.put(url, html) if store is not None else Page(url, html, content_hash(html))
+
+def page_text(page: Page, extractor_name: str, extractor: Callable[[str], str]) -> str:
+    store = get_page_store()
+    return store.text(page, extractor_name, extractor) if store is not None else extractor(page.html)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Cureat 페이지 저장소 정리/통계 도구")
+    parser.add_argument("command", choices=["gc", "stats"])
+    parser.add_argument("--max-age-days", type=float, default=None)
+    parser.add_argument("--max-mb", type=float, default=None)
+    args = parser.parse_args()
+    store = get_page_store()
+    if store is None:
+        print("PAGE_STORE_ENABLED=0 이므로 페이지 저장소가 꺼져 있습니다.")
+    else:
+        if args.command == "gc":
+            max_age = args.max_age_days * DAY if args.max_age_days is not None else None
+            max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None
+            print(f"정리한 URL: {store.gc(max_age, max_bytes)}개")
+        print(store.stats())
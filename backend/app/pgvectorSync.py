@@ -0,0 +1,73 @@
+import argparse
+import logging
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from . import crud, models, vectorDBService
+from .database import PGVECTOR_ENABLED, SessionLocal, engine
+from .metadataCodec import restaurant_codec
+
+# PostgreSQL(pgvector) 스키마 보강 및 벡터 DB -> restaurants 테이블 백필
+# - 새 요청은 service에서 벡터 DB와 PostgreSQL에 함께 기록(dual-write)
+# - 기존 데이터는 이 도구로 한 번 옮김
+#
+# 실행: python -m backend.app.pgvectorSync schema
+#       python -m backend.app.pgvectorSync backfill --batch-size 500
+
+def prepare_database(bind: Engine = engine):
+    """vector 확장 -> 테이블 생성 -> 기존 테이블 보강 순서로 PostgreSQL 스키마를 준비"""
+    if PGVECTOR_ENABLED:
+        with bind.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    models.Base.metadata.create_all(bind=bind)
+    ensure_schema(bind)
+
+def ensure_schema(bind: Engine = engine):
+    """restaurants 테이블에 없는 컬럼/인덱스를 추가 (create_all은 기존 테이블에 컬럼을 추가하지 않음)"""
+    with bind.begin() as conn:
+        table = models.Restaurant.__table__
+        existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS "{column.name}" {column_type}'))
+                logging.info(f"[PGVECTOR] {table.name}.{column.name} 컬럼 추가")
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+def backfill(batch_size: int = 500, limit: Optional[int] = None) -> int:
+    """벡터 DB의 (id, 벡터, 메타데이터)를 restaurants 테이블로 복사하고 옮긴 개수를 반환"""
+    copied = 0
+    db = SessionLocal()
+    try:
+        for ids, vectors, metadatas in vectorDBService.get_vector_store().iter_all(batch_size):
+            items = [
+                (details, vector)
+                for details, vector in zip(restaurant_codec.decode_many(metadatas), vectors)
+                if details.get("name") and details.get("address")
+            ]
+            if limit is not None:
+                items = items[:limit - copied]
+            crud.upsert_restaurants_in_postgres(db, items)
+            copied += len(items)
+            logging.info(f"[PGVECTOR] {copied}건 백필 완료")
+            if limit is not None and copied >= limit:
+                break
+    finally:
+        db.close()
+    return copied
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Cureat pgvector 스키마/백필 도구")
+    parser.add_argument("command", choices=["schema", "backfill"])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+    prepare_database()
+    if args.command == "backfill":
+        if not PGVECTOR_ENABLED:
+            logging.warning("[PGVECTOR] PGVECTOR_ENABLED가 꺼져 있어 임베딩 없이 상세 정보만 복사합니다.")
+        print(f"{backfill(args.batch_size, args.limit)}건을 restaurants 테이블로 옮겼습니다.")
@@ -0,0 +1,79 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+# 벡터 유사도 검색 결과 캐시
+# 키: 양자화한 쿼리 벡터 + n_results + 필터 등 검색 조건의 해시
+#    (같은 프롬프트의 임베딩도 배치 크기 등에 따라 float32 끝자리가 달라질 수 있으므로 quantum 단위로 반올림,
+#     차원이 많을수록 한 성분이라도 반올림 경계에 걸릴 확률이 커지므로 quantum은 잡음보다 충분히 크게)
+# 무효화: 저장소 세대(generation) 값이 저장 시점과 다르면 버림 (upsert/delete 때 증가)
+#        + TTL(다른 워커에서 저장한 변경 사항은 세대 값으로 알 수 없으므로 TTL로 제한) + LRU 개수 제한
+
+class QueryCache:
+    """TTL + LRU + 세대 기반 무효화를 갖춘 검색 결과 캐시"""
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 300.0, quantum: float = 1e-2,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.quantum = quantum
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # 키 -> (세대, 만료 시각, 값)
+        self.hits = self.misses = self.expired = self.invalidated = self.evicted = 0
+
+    def key(self, vector: Sequence[float], *conditions: Any) -> str:
+        quantized = np.rint(np.asarray(vector, dtype=np.float64) / self.quantum).astype(np.int32)
+        digest = hashlib.sha1(quantized.tobytes())
+        digest.update(repr(conditions).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str, generation: int) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_generation, expires_at, value = entry
+            if stored_generation != generation:
+                del self._entries[key]
+                self.invalidated += 1
+                self.misses += 1
+                return None
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, generation: int, value: Any):
+        with self._lock:
+            self._entries[key] = (generation, self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expired": self.expired,
+                "invalidated": self.invalidated,
+                "evicted": self.evicted,
+            }
@@ -0,0 +1,69 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# 앱 구성 요소(PostgreSQL, 벡터 DB, 임베딩 모델, LLM)의 워밍업 상태 관리
+# 서버는 바로 요청(헬스 체크)을 받고, 무거운 자원은 백그라운드 스레드에서 병렬로 준비
+# /ready 는 모든 구성 요소의 워밍업이 끝났을 때만 200을 반환 -> 로드밸런서는 그 이후에 트래픽을 보냄
+
+PENDING, WARMING, READY, FAILED = "pending", "warming", "ready", "failed"
+
+class Readiness:
+    """구성 요소별 워밍업 함수를 병렬로 실행하고 상태를 기록"""
+
+    def __init__(self):
+        self._components: Dict[str, Callable[[], Optional[str]]] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self.started_at = None
+
+    def register(self, name: str, warmup: Callable[[], Optional[str]]):
+        """워밍업 함수 등록 (반환값이 문자열이면 상태 설명으로 기록)"""
+        self._components[name] = warmup
+        self._status[name] = {"state": PENDING}
+
+    def start(self):
+        """등록된 모든 워밍업 함수를 백그라운드에서 동시에 실행 (바로 반환)"""
+        self.started_at = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self._components), 1), thread_name_prefix="warmup")
+        for name, warmup in self._components.items():
+            self._executor.submit(self._run, name, warmup)
+
+    def run_serially(self):
+        """워밍업 함수를 현재 스레드에서 순서대로 실행 (비교/디버깅용)"""
+        self.started_at = time.monotonic()
+        for name, warmup in self._components.items():
+            self._run(name, warmup)
+
+    def _run(self, name: str, warmup: Callable[[], Optional[str]]):
+        start = time.monotonic()
+        self._set(name, state=WARMING)
+        try:
+            detail = warmup()
+            self._set(name, state=READY, seconds=round(time.monotonic() - start, 3), detail=detail)
+            logging.info(f"[READY] {name} 준비 완료 ({time.monotonic() - start:.2f}s)")
+        except Exception as e:
+            self._set(name, state=FAILED, seconds=round(time.monotonic() - start, 3), error=str(e))
+            logging.warning(f"[READY] {name} 준비 실패: {e}")
+
+    def _set(self, name: str, **values):
+        with self._lock:
+            self._status[name] = {k: v for k, v in values.items() if v is not None}
+
+    def is_ready(self) -> bool:
+        with self._lock:
+            return bool(self._status) and all(s["state"] == READY for s in self._status.values())
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            components = {name: dict(status) for name, status in self._status.items()}
+        ready = bool(components) and all(s["state"] == READY for s in components.values())
+        elapsed = round(time.monotonic() - self.started_at, 3) if self.started_at else None
+        return {"ready": ready, "elapsed": elapsed, "components": components}
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False)
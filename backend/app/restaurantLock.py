@@ -0,0 +1,157 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# 워커/서버 사이의 맛집별 잠금 (같은 맛집을 여러 워커가 동시에 크롤링/요약하지 않도록)
+# 같은 프로세스 안에서는 service의 FutureFlight가 합치고, 이 잠금은 다른 프로세스/서버와의 중복만 막음
+# DETAILS_LOCK_BACKEND로 선택 (기본 none: 잠금 없음)
+# - file     : DETAILS_LOCK_DIR 아래 맛집별 파일에 flock (같은 서버의 여러 워커)
+# - postgres : PostgreSQL 세션 advisory lock (여러 서버, 키는 맛집 id의 SHA-1 앞 8바이트)
+# 요청마다 세션 하나(postgres면 연결 하나)가 여러 맛집 잠금을 가지고 release로 일부를, release_all로 모두 풀고 끝남
+# (요청 안의 여러 스레드가 함께 쓸 수 있도록 세션 안에서 직렬화)
+# 다른 워커가 가진 잠금은 모든 워커가 같은 순서(정렬된 id)로 하나씩 기다리므로 서로 상대의 잠금을 기다리며 멈추지 않음
+# 잠금을 기다리다 DETAILS_LOCK_TIMEOUT이 지나면 잠금 없이 진행 (중복 작업은 생겨도 요청은 실패하지 않음)
+
+DETAILS_LOCK_BACKEND = os.getenv("DETAILS_LOCK_BACKEND", "none") # none / file / postgres
+DETAILS_LOCK_DIR = os.getenv("DETAILS_LOCK_DIR", "./restaurant_locks")
+DETAILS_LOCK_TIMEOUT = float(os.getenv("DETAILS_LOCK_TIMEOUT", "120"))
+POLL_INTERVAL = 0.05
+
+def _digest(key: str) -> bytes:
+    return hashlib.sha1(key.encode("utf-8")).digest()
+
+class LockSession(ABC):
+    """맛집 id별 잠금 묶음"""
+
+    def __init__(self):
+        self._held: Dict[str, Any] = {} # 키 -> 백엔드별 잠금 핸들
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _try_lock(self, key: str) -> Optional[Any]:
+        """기다리지 않고 잠금 시도 (성공하면 핸들, 실패하면 None)"""
+
+    @abstractmethod
+    def _unlock(self, key: str, handle: Any):
+        ...
+
+    def _close(self):
+        pass
+
+    def try_acquire(self, key: str) -> bool:
+        """기다리지 않고 잠금 시도 (이미 이 세션이 가진 잠금이면 True)"""
+        with self._lock:
+            if key in self._held:
+                return True
+            handle = self._try_lock(key)
+            if handle is None:
+                return False
+            self._held[key] = handle
+            return True
+
+    def release(self, keys: Sequence[str]):
+        with self._lock:
+            for key in keys:
+                if key in self._held:
+                    # 푸는 데 실패한 잠금은 _held에 남겨 _close가 처리하게 함
+                    self._unlock(key, self._held[key])
+                    del self._held[key]
+
+    def release_all(self):
+        """가진 잠금을 모두 풀고 세션을 닫음 (풀지 못한 잠금은 _close에서 연결/파일을 닫아 풂)"""
+        try:
+            self.release(list(self._held))
+        finally:
+            with self._lock:
+                self._close()
+                self._held.clear()
+
+    def acquire_each(self, keys: Sequence[str], on_acquired: Callable[[str], bool], timeout: float = DETAILS_LOCK_TIMEOUT) -> List[str]:
+        """keys를 정렬된 순서로 하나씩 잠글 때까지 기다리고, 잠글 때마다 on_acquired(키)를 호출
+        on_acquired가 True를 반환하면(더 할 일이 없음) 잠금을 바로 풀고, False면 잠금을 가진 채로 다음 키를 기다림
+        시간 안에 잠그지 못한 키 목록을 반환
+        """
+        deadline = time.monotonic() + timeout
+        timed_out = []
+        for key in sorted(keys):
+            while not self.try_acquire(key):
+                if time.monotonic() >= deadline:
+                    timed_out.append(key)
+                    break
+                time.sleep(POLL_INTERVAL)
+            else:
+                if on_acquired(key):
+                    self.release([key])
+        if timed_out:
+            logging.warning(f"[LOCK] {len(timed_out)}개 맛집 잠금 대기 시간 초과, 잠금 없이 진행")
+        return timed_out
+
+class FileLockSession(LockSession):
+    """DETAILS_LOCK_DIR/{id 해시}.lock 파일에 flock"""
+
+    def __init__(self, directory: str = DETAILS_LOCK_DIR):
+        import fcntl
+        super().__init__()
+        self._fcntl = fcntl
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _try_lock(self, key: str) -> Optional[int]:
+        fd = os.open(os.path.join(self.directory, _digest(key).hex() + ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._fcntl.flock(fd, self._fcntl.LOCK_EX | self._fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    def _unlock(self, key: str, fd: int):
+        self._fcntl.flock(fd, self._fcntl.LOCK_UN)
+        os.close(fd)
+
+    def _close(self):
+        # 풀지 못한 잠금은 파일을 닫아 풂
+        for fd in self._held.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+class PostgresLockSession(LockSession):
+    """연결 하나에서 pg_try_advisory_lock / pg_advisory_unlock (연결이 끊겨도 자동으로 풀림)"""
+
+    def __init__(self, bind=None):
+        from sqlalchemy import text
+        if bind is None:
+            from .database import engine as bind
+        super().__init__()
+        self._text = text
+        self._conn = bind.connect()
+
+    def _try_lock(self, key: str) -> Optional[int]:
+        lock_id = int.from_bytes(_digest(key)[:8], "big", signed=True)
+        acquired = self._conn.execute(self._text("SELECT pg_try_advisory_lock(:id)"), {"id": lock_id}).scalar()
+        self._conn.commit()
+        return lock_id if acquired else None
+
+    def _unlock(self, key: str, lock_id: int):
+        self._conn.execute(self._text("SELECT pg_advisory_unlock(:id)"), {"id": lock_id})
+        self._conn.commit()
+
+    def _close(self):
+        if self._held:
+            # 풀지 못한 잠금이 있으면 연결을 풀에 돌려주지 않고 끊어서 잠금을 풂
+            self._conn.invalidate()
+        self._conn.close()
+
+def lock_session() -> Optional[LockSession]:
+    """설정된 잠금 세션 (none이면 None)"""
+    if DETAILS_LOCK_BACKEND == "file":
+        return FileLockSession(DETAILS_LOCK_DIR)
+    if DETAILS_LOCK_BACKEND == "postgres":
+        return PostgresLockSession()
+    return None
@@ -54,6 +54,11 @@ class RestaurantDetail(BaseModel): # 가게 기본 필드
     # 프론트 엔드에서 지도에 마커 표시할 때 사용할 좌표
     mapx : Optional[str] = None # 가게 위치 X 좌표
     mapy : Optional[str] = None # 가게 위치 Y 좌표    
+    categories: Optional[List[str]] = None # 음식 카테고리 (네이버 Local 카테고리, 예: 한식, 카페)
+    review_trust_score: Optional[int] = None # 네이버/다음 리뷰 교차검증 신뢰도 (0~100)
+    distance_m: Optional[float] = None # 기준 좌표로부터의 거리 (근처 맛집 검색 결과에서만)
+    restaurant_id: Optional[str] = None # 벡터 DB id (이름_주소, 보강 상태 조회용)
+    enrichment_status: Optional[str] = None # 상세 정보 보강 상태 (ready, pending, running, failed, unknown / 백그라운드 보강 모드에서만)
     
     # AI 요약 정보
     summary_pros: Optional[List[str]] = Field(None, description="음식점 장점 3가지 요약")
@@ -76,6 +81,13 @@ class RestaurantDetail(BaseModel): # 가게 기본 필드
     class Config: # Config 클래스
         orm_mode = True # ORM 모드 활성화
 
+class RestaurantFilter(BaseModel): # 벡터 유사도 검색 필터 (비어 있는 조건은 무시, 목록은 하나라도 일치하면 통과)
+    regions: Optional[List[str]] = None # 지역 (주소의 시/구/동, 예: 강남, 마포구)
+    price_ranges: Optional[List[str]] = None # 가격대 (요약 결과의 price_range)
+    categories: Optional[List[str]] = None # 음식 카테고리 (네이버 Local 카테고리)
+    keywords: Optional[List[str]] = None # 키워드
+    min_review_trust_score: Optional[int] = None # 최소 리뷰 신뢰도 (0~100)
+
 # API 스키마
 
 class ChatRequest(BaseModel):
@@ -88,6 +100,13 @@ class RecommendationResponse(BaseModel):
     answer: str # AI 응답 메시지
     restaurants: List[RestaurantDetail]
 
+class EnrichmentStatus(BaseModel):
+    """맛집 상세 정보 보강 상태 조회 응답 형식"""
+    restaurant_id: str
+    status: str # ready(상세 정보 있음), pending, running, done(보강은 끝났지만 이 서버의 벡터 DB에 아직 없음), failed, unknown(등록된 작업 없음)
+    attempts: int = 0 # 보강 시도 횟수
+    restaurant: Optional[RestaurantDetail] = None # ready일 때의 상세 정보
+
 class CourseRequest(BaseModel):
     """코스 추천 요청 시 받을 데이터 형식"""
     user_id: int
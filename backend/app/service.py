@@ -1,22 +1,27 @@
 import os
 import re
-import json
 import math
 import time
+import asyncio
 import logging
-import difflib
-from typing import List, Dict, Any, Optional, Tuple
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
-import requests
 from dotenv import load_dotenv
 from sqlalchemy.orm import Session
-import google.generativeai as genai
-from bs4 import BeautifulSoup
-from readability import Document
 
 # --- 프로젝트 내부 모듈 Import ---
-from . import models, schemas, crud, nlpService, vector_db_service
+from . import models, schemas, crud, nlpService, pageStore, nearDuplicate, textMining, htmlExtract, summarizer, restaurantLock, enrichQueue
+from . import vectorDBService as vector_db_service
+from .httpClient import HttpError, get_http_client
+from .apiCache import cached_get_json
+from .llmClient import get_llm_client
+from .singleFlight import FutureFlight
+from .database import SessionLocal
 
 # ------------------------------
 # 초기 설정
@@ -31,12 +36,7 @@ KAKAO_REST_KEY = os.getenv("KAKAO_REST_KEY")
 SCRAPINGBEE_KEY = os.getenv("SCRAPINGBEE_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-# Gemini API 클라이언트를 설정합니다.
-if GOOGLE_API_KEY:
-    genai.configure(api_key=GOOGLE_API_KEY)
-    llm = genai.GenerativeModel('gemini-1.5-flash')
-else:
-    llm = None # API 키가 없을 경우를 대비
+# Gemini 클라이언트는 처음 사용할 때 설정하며, 같은 프롬프트의 응답은 디스크 캐시에서 반환합니다. (llmClient, llmCache)
 
 # 상수 정의
 NAVER_LOCAL_URL = "https://openapi.naver.com/v1/search/local.json"
@@ -47,18 +47,72 @@ KAKAO_LOCAL_KEYWORD_URL = "https://dapi.kakao.com/v2/local/search/keyword.json"
 KAKAO_MOBILITY_DIRECTIONS_URL = "https://apis-navi.kakaomobility.com/v1/directions"
 REQUEST_TIMEOUT = 5.0
 MAX_RETRY = 2
-AD_REVIEW_PATTERNS = [r"소정의\s*원고료", r"체험단", r"업체로부터\s*제공", r"광고\s*참고", r"협찬"]
+REVIEW_KEYWORDS = ["맛있", "추천", "별로", "최고", "불친절", "친절", "가격", "가성비", "재방문", "웨이팅", "대박", "최악", "분위기",
+                   "데이트", "오빠", "언니", "여자친구", "남자친구", "남친", "가족", "아이", "유아", "여친"]
+# 리뷰 키워드 + 광고 문구(textMining.AD_PATTERNS)를 한 번에 검사하는 매처
+review_matcher = textMining.ReviewMatcher(REVIEW_KEYWORDS)
+
+# 추천 후보 수와 종류별 동시 실행 수 제한
+RECOMMENDATION_CANDIDATES = int(os.getenv("RECOMMENDATION_CANDIDATES", "3"))
+# inline: 벡터 DB에 없는 후보를 요청 안에서 크롤링/요약 (기존 방식)
+# background: 네이버 Local 기본 정보(이름/주소/좌표/이미지)만 바로 반환하고 보강은 작업 큐(enrichQueue)에서 처리
+RECOMMENDATION_MODE = os.getenv("RECOMMENDATION_MODE", "inline")
+ENRICH_PRIORITY = int(os.getenv("ENRICH_PRIORITY", "10")) # 추천 요청에서 등록하는 보강 작업의 우선순위
+# 스트리밍 응답에서 벡터 DB에 없는 후보를 몇 곳씩 묶어 처리할지 (작을수록 첫 맛집이 빨리 나오지만 LLM 요청 수가 늘어남)
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "2"))
+HTTP_CONCURRENCY = int(os.getenv("HTTP_CONCURRENCY", "16")) # 외부 API 호출 + 블로그 페이지 수집
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4")) # Gemini 요약
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "1")) # 벡터 변환 (모델은 한 번에 배치로)
+
+# ------------------------------
+# 비동기 실행 헬퍼
+# ------------------------------
+# requests/genai/DB는 동기 라이브러리이므로 전용 스레드 풀에서 실행하고,
+# 이벤트 루프별 세마포어로 종류마다 동시 실행 수를 제한합니다.
+# (기본 스레드 풀은 CPU 수에 비례해 작으므로 세마포어 한도를 모두 수용할 수 있는 크기로 따로 생성)
+_executor = None
+_executor_lock = threading.Lock()
+_loop_semaphores = weakref.WeakKeyDictionary() # 이벤트 루프 -> {종류: 세마포어}
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = HTTP_CONCURRENCY + LLM_CONCURRENCY + EMBEDDING_CONCURRENCY + 4
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cureat-io")
+    return _executor
+
+def _semaphore(kind: str) -> asyncio.Semaphore:
+    semaphores = _loop_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if kind not in semaphores:
+        limit = {"http": HTTP_CONCURRENCY, "llm": LLM_CONCURRENCY, "embedding": EMBEDDING_CONCURRENCY}[kind]
+        semaphores[kind] = asyncio.Semaphore(limit)
+    return semaphores[kind]
+
+async def _run_blocking(kind: Optional[str], fn, *args, **kwargs):
+    """동기 함수를 스레드 풀에서 실행 (kind가 있으면 해당 종류의 동시 실행 수 제한 안에서)"""
+    call = functools.partial(fn, *args, **kwargs)
+    loop = asyncio.get_running_loop()
+    if kind is None:
+        return await loop.run_in_executor(_get_executor(), call)
+    async with _semaphore(kind):
+        return await loop.run_in_executor(_get_executor(), call)
 
 # ------------------------------
 # 외부 API 및 크롤링 헬퍼
 # ------------------------------
+# 모든 외부 요청은 공용 HTTP 클라이언트(연결 풀 재사용, MAX_RETRY회 재시도)를 통해 보냅니다.
+# 검색 API 응답은 엔드포인트별 TTL로 캐시합니다. (apiCache)
+def _api_get_json(url: str, params: dict, headers: dict) -> Dict[str, Any]:
+    return cached_get_json(url, params, lambda: get_http_client().get_json(
+        url, params=params, headers=headers, timeout=REQUEST_TIMEOUT, max_retry=MAX_RETRY))
+
 def _naver_get(url: str, params: dict) -> Dict[str, Any]:
     headers = {"X-Naver-Client-Id": NAVER_CLIENT_ID or "", "X-Naver-Client-Secret": NAVER_CLIENT_SECRET or ""}
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        return resp.json()
-    except requests.exceptions.RequestException as e:
+        return _api_get_json(url, params, headers)
+    except HttpError as e:
         logging.warning(f"Naver API Error: {e}")
         return {}
 
@@ -66,154 +120,389 @@ def _kakao_get(url: str, params: dict) -> Dict[str, Any]:
     if not KAKAO_REST_KEY: return {}
     headers = {"Authorization": f"KakaoAK {KAKAO_REST_KEY}"}
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        return resp.json()
-    except requests.exceptions.RequestException as e:
+        return _api_get_json(url, params, headers)
+    except HttpError as e:
         logging.warning(f"Kakao API Error: {e}")
         return {}
 
+def search_naver_local(query: str, display: int = 5) -> List[Dict[str, Any]]:
+    """네이버 지역 검색 결과 목록"""
+    return _naver_get(NAVER_LOCAL_URL, {"query": query, "display": display}).get("items", [])
+
+def fetch_image_url(query: str) -> Optional[str]:
+    """네이버 이미지 검색의 첫 번째 이미지 URL"""
+    items = _naver_get(NAVER_IMAGE_URL, {"query": query, "display": 1, "sort": "sim"}).get("items", [])
+    return items[0].get("link") if items else None
+
+def kakao_search_web(query: str, size: int = 5) -> List[Dict[str, Any]]:
+    """다음(카카오) 웹 문서 검색 결과 목록"""
+    return _kakao_get(KAKAO_WEB_SEARCH_URL, {"query": query, "size": size}).get("documents", [])
+
 def _clean_html(text: str) -> str:
     return re.sub(r"<\/?b>", "", text or "").strip()
 
-def _safe_json_loads(raw: str, fallback: dict = None) -> dict:
-    if fallback is None: fallback = {}
-    match = re.search(r"\{.*\}", raw, re.DOTALL)
-    if not match: return fallback
-    try:
-        return json.loads(match.group(0))
-    except json.JSONDecodeError:
-        return fallback
+def _categories(category: str) -> List[str]:
+    """네이버 Local 카테고리("한식>육류,고기요리")를 카테고리 목록으로 (["한식", "육류", "고기요리"])"""
+    return list(dict.fromkeys(term.strip() for term in re.split(r"[>,]", category or "") if term.strip()))
 
-def fetch_html(url: str) -> str:
+# 블로그 페이지는 페이지 저장소(pageStore)를 거쳐 가져옵니다. (조건부 요청, 같은 내용은 한 번만 저장/파싱)
+# 본문은 PAGE_BYTE_CAP까지만 받고, htmlExtract(사이트별 규칙 -> readability)로 추출합니다.
+def _fetch_page(url: str) -> Optional[pageStore.Page]:
+    url = htmlExtract.canonical_url(url)
     headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
-    try:
-        r = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-        r.raise_for_status()
-        return r.text
-    except Exception:
-        if SCRAPINGBEE_KEY:
-            params = {"api_key": SCRAPINGBEE_KEY, "url": url, "render_js": "true"}
-            try:
-                rr = requests.get("https://app.scrapingbee.com/api/v1/", params=params, timeout=20)
-                rr.raise_for_status()
-                return rr.text
-            except Exception as e2:
-                logging.warning(f"ScrapingBee fetch failed for {url}: {e2}")
-    return ""
-
-def extract_main_text_from_html(html: str) -> str:
-    try:
-        doc = Document(html)
-        return BeautifulSoup(doc.summary(), "html.parser").get_text(separator="\n").strip()
-    except Exception:
+    page = pageStore.fetch_page(url, headers=headers, timeout=REQUEST_TIMEOUT, max_retry=MAX_RETRY)
+    if page is None and url and SCRAPINGBEE_KEY:
+        params = {"api_key": SCRAPINGBEE_KEY, "url": url, "render_js": "true"}
+        try:
+            html = get_http_client().get("https://app.scrapingbee.com/api/v1/", params=params, timeout=20, max_retry=MAX_RETRY).text
+            page = pageStore.store_page(url, html)
+        except Exception as e2:
+            logging.warning(f"ScrapingBee fetch failed for {url}: {e2}")
+    return page
+
+def fetch_html(url: str) -> str:
+    page = _fetch_page(url)
+    return page.html if page else ""
+
+def fetch_main_text(url: str) -> str:
+    page = _fetch_page(url)
+    if not page:
         return ""
+    return pageStore.page_text(page, "main_text", lambda html: htmlExtract.extract_in_pool(html, page.url))
+
+def extract_main_text_from_html(html: str, url: str = "") -> str:
+    return htmlExtract.extract_main_text(html, url)
 
 def extract_review_snippets_from_text(text: str) -> List[str]:
-    keywords = ["맛있", "추천", "별로", "최고", "불친절", "친절", "가격", "가성비", "재방문", "웨이팅", "대박", "최악", "분위기", "데이트", "오빠", "언니", "여자친구", "남자친구", "남친"
-                "가족", "아이", "유아", "여친", "남친"]
-    sentences = re.split(r'[.。!?\n]', text or "")
-    snippets = {s.strip() for s in sentences if len(s.strip()) > 20 and any(k in s for k in keywords)}
-    return sorted(list(snippets), key=len, reverse=True)[:20]
+    """리뷰 키워드가 들어간 21자 이상 문장 중 광고 문구가 없는 것을 긴 순서로 최대 20개"""
+    snippets = set(review_matcher.extract(text, min_length=21))
+    return sorted(snippets, key=len, reverse=True)[:20]
 
 def cross_validate_review_sets(naver_snips: List[str], daum_snips: List[str]) -> Tuple[List[str], int]:
-    merged_texts, cross_count = [], 0
-    used_daum_indices = set()
-    for n_snip in naver_snips:
-        best_match = False
-        for i, d_snip in enumerate(daum_snips):
-            if i in used_daum_indices: continue
-            if difflib.SequenceMatcher(None, n_snip, d_snip).ratio() > 0.6:
-                used_daum_indices.add(i)
-                cross_count += 1
-                best_match = True
-                break
-        merged_texts.append(n_snip)
-    
-    for i, d_snip in enumerate(daum_snips):
-        if i not in used_daum_indices:
-            merged_texts.append(d_snip)
-            
+    # 네이버 문장마다 근사 중복인 다음 문장을 1:1로 짝지음 (MinHash LSH, 모든 쌍을 비교하지 않음)
+    matches = nearDuplicate.match_sets(naver_snips, daum_snips)
+    cross_count = len(matches)
+    used_daum_indices = set(matches.values())
+    merged_texts = list(naver_snips)
+    merged_texts.extend(d_snip for i, d_snip in enumerate(daum_snips) if i not in used_daum_indices)
+
     total_snips = len(merged_texts)
     score = int((cross_count * 2 / max(total_snips, 1)) * 100) if total_snips else 0
     return merged_texts, min(score, 100)
 
-def advanced_crawl_restaurant_details(name: str) -> Dict[str, Any]:
+def _fetch_review_snippets(url: str) -> List[str]:
+    """블로그 페이지 하나에서 광고성 문장을 제외한 리뷰 문장을 추출"""
+    return extract_review_snippets_from_text(fetch_main_text(url))
+
+async def advanced_crawl_restaurant_details_async(name: str) -> Dict[str, Any]:
     logging.info(f"[CRAWL] '{name}' 리뷰 교차검증 수집 시작")
     query = f"{name} 후기"
-    
-    naver_items = _naver_get(NAVER_BLOG_SEARCH_URL, {"query": query, "display": 5}).get("items", [])
-    naver_snips = [snip for item in naver_items for snip in extract_review_snippets_from_text(extract_main_text_from_html(fetch_html(item.get("link", "")))) if not any(re.search(p, snip) for p in AD_REVIEW_PATTERNS)]
-    
-    daum_items = kakao_search_web(query, size=5)
-    daum_snips = [snip for item in daum_items for snip in extract_review_snippets_from_text(extract_main_text_from_html(fetch_html(item.get("url", "")))) if not any(re.search(p, snip) for p in AD_REVIEW_PATTERNS)]
+
+    # 네이버 블로그 / 다음 웹 검색을 동시에 요청한 뒤, 모든 페이지를 동시에 수집
+    naver_result, daum_items = await asyncio.gather(
+        _run_blocking("http", _naver_get, NAVER_BLOG_SEARCH_URL, {"query": query, "display": 5}),
+        _run_blocking("http", kakao_search_web, query, size=5),
+    )
+    naver_urls = [item.get("link", "") for item in naver_result.get("items", [])]
+    daum_urls = [item.get("url", "") for item in daum_items]
+    pages = await asyncio.gather(*(_run_blocking("http", _fetch_review_snippets, url) for url in naver_urls + daum_urls))
+    # 같은 출처 안에서 여러 글에 반복된 문장(퍼온 글, 모바일/PC 중복 등)은 한 번만 사용
+    naver_snips = nearDuplicate.dedupe([snip for snips in pages[:len(naver_urls)] for snip in snips])
+    daum_snips = nearDuplicate.dedupe([snip for snips in pages[len(naver_urls):] for snip in snips])
 
     merged, score = cross_validate_review_sets(naver_snips, daum_snips)
     return {"crawled_reviews": merged, "review_trust_score": score} if merged else {}
 
+def advanced_crawl_restaurant_details(name: str) -> Dict[str, Any]:
+    return asyncio.run(advanced_crawl_restaurant_details_async(name))
+
 # ------------------------------
 # LLM 요약 로직
 # ------------------------------
+# 맛집 여러 곳을 한 번의 요청으로 요약합니다. (summarizer: 토큰 예산 안에서 배치, 항목별 검증, 실패한 맛집만 재시도)
+SUMMARY_TASK = summarizer.SummaryTask(
+    instruction='너는 맛집 요약 전문가야. 각 맛집의 "crawled_info"(크롤링 정보)를 읽고 요약해줘.',
+    template={
+        "summary_pros": ["장점1", "장점2", "장점3"],
+        "summary_cons": ["단점1", "단점2", "단점3"],
+        "keywords": ["키워드1", "키워드2", "키워드3", "키워드4", "키워드5"],
+        "signature_menu": "대표 메뉴", "price_range": "가격대", "opening_hours": "영업시간",
+        "parking": "주차 정보", "phone": "전화번호",
+        "nearby_attractions": ["주변 놀거리1", "주변 놀거리2", "주변 놀거리3"],
+    },
+)
+
+def llm_summarize_many(items: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """(이름, 크롤링 정보) 목록의 요약을 입력 순서대로 반환 (실패한 맛집은 빈 dict)"""
+    summaries = summarizer.summarize_many(get_llm_client(), SUMMARY_TASK, [
+        (i, {"name": name, "crawled_info": crawled_info}) for i, (name, crawled_info) in enumerate(items)
+    ])
+    return [summaries.get(i, {}) for i in range(len(items))]
+
 def llm_summarize_details(name: str, crawled_info: Dict[str, Any]) -> Dict[str, Any]:
-    if not llm: return {}
-    prompt = f"""
-    너는 맛집 요약 전문가야. 아래 "크롤링 정보"를 읽고 반드시 아래 JSON 형식으로만 응답해줘.
-    [크롤링 정보]
-    {json.dumps(crawled_info, ensure_ascii=False, indent=2)}
-    [JSON 형식]
-    {{
-      "summary_pros": ["장점1","장점2","장점3"],
-      "summary_cons": ["단점1","단점2","단점3"],
-      "keywords": ["키워드1","키워드2","키워드3","키워드4","키워드5"],
-      "signature_menu": "대표 메뉴", "price_range": "가격대", "opening_hours": "영업시간",
-      "parking": "주차 정보", "phone": "전화번호",
-      "nearby_attractions": ["주변 놀거리1","주변 놀거리2","주변 놀거리3"]
-    }}"""
-    try:
-        resp = llm.generate_content(prompt)
-        return _safe_json_loads(getattr(resp, "text", "") or "{}")
-    except Exception as e:
-        logging.warning(f"LLM summarize error: {e}")
-        return {}
+    return llm_summarize_many([(name, crawled_info)])[0]
 
 # ------------------------------
 # 핵심 비즈니스 로직 (맛집 추천)
 # ------------------------------
+async def _find_place(name: str, address: str) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+    """네이버 Local 검색 결과와 대표 이미지 (최종 정보 보정용)"""
+    naver_place = await _run_blocking("http", search_naver_local, f"{name} {address}", display=1)
+    image_url = await _run_blocking("http", fetch_image_url, name) if naver_place else None
+    return naver_place, image_url
+
+async def _build_restaurants_details(places: List[Tuple[str, str]]) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+    """벡터 DB에 없는 맛집들을 크롤링/요약하여 맛집마다 (벡터 변환용 텍스트, 메타데이터)를 반환 (실패/리뷰 없음은 None)
+    크롤링은 맛집별로 동시에, LLM 요약은 리뷰가 있는 맛집 전체를 배치로 묶어 한 번에 처리
+    """
+    for name, _ in places:
+        logging.info(f"[CACHE MISS] '{name}' 신규 처리 시작")
+    crawled = await asyncio.gather(*(advanced_crawl_restaurant_details_async(name) for name, _ in places), return_exceptions=True)
+    targets = []
+    for (name, address), crawled_info in zip(places, crawled):
+        if isinstance(crawled_info, Exception):
+            # 한 후보의 실패가 다른 후보의 결과까지 버리지 않도록 건너뜀
+            logging.warning(f"[CRAWL] '{name}' 처리 실패: {crawled_info}")
+        elif crawled_info.get("crawled_reviews"):
+            targets.append((name, address, crawled_info))
+    if not targets:
+        return [None] * len(places)
+
+    # LLM 요약과 Local/이미지 검색은 서로 독립적이므로 동시에 실행
+    summaries, *found = await asyncio.gather(
+        _run_blocking("llm", llm_summarize_many, [(name, crawled_info) for name, _, crawled_info in targets]),
+        *(_find_place(name, address) for name, address, _ in targets), return_exceptions=True,
+    )
+    if isinstance(summaries, Exception):
+        logging.warning(f"[LLM] 요약 실패: {summaries}")
+        summaries = [{}] * len(targets)
+
+    built = {}
+    for (name, address, crawled_info), summary_data, place in zip(targets, summaries, found):
+        naver_place, image_url = place if not isinstance(place, Exception) else (None, None)
+        vector_text = " ".join(summary_data.get("keywords", [])) + " " + " ".join(summary_data.get("summary_pros", []))
+        built[(name, address)] = vector_text, {
+            "name": name, "address": address, "image_url": image_url,
+            "mapx": naver_place[0].get("mapx") if naver_place else "",
+            "mapy": naver_place[0].get("mapy") if naver_place else "",
+            "categories": _categories(naver_place[0].get("category")) if naver_place else [],
+            "review_trust_score": crawled_info.get("review_trust_score", 0),
+            **summary_data
+        }
+    return [built.get(place) for place in places]
+
+async def _store_restaurants(db: Session, built: Dict[str, Tuple[str, Dict[str, Any]]]):
+    """새로 만든 맛집을 한 번에 벡터 변환하여 벡터 DB와 PostgreSQL에 저장"""
+    vectors = await _run_blocking("embedding", nlpService.text_to_vectors, [vector_text for vector_text, _ in built.values()])
+    await _run_blocking(None, vector_db_service.upsert_restaurants, [
+        (restaurant_id, vector.tolist(), metadata)
+        for (restaurant_id, (_, metadata)), vector in zip(built.items(), vectors)
+    ])
+    # PostgreSQL에도 함께 기록 (PGVECTOR_ENABLED이면 임베딩 포함)
+    await _run_blocking(None, crud.upsert_restaurants_in_postgres, db, [(metadata, vector) for (_, metadata), vector in zip(built.values(), vectors)])
+
+def _task_session(db: Optional[Session]) -> Optional[Session]:
+    """동시에 처리하는 묶음/코스마다 쓸 새 세션 (요청의 세션과 같은 DB, db가 None이면 None)
+    세션은 스레드 사이에 공유할 수 없고, 클라이언트가 연결을 끊으면 요청의 세션이 먼저 닫히므로 작업이 직접 열고 닫음
+    """
+    return SessionLocal(bind=db.get_bind()) if db is not None else None
+
+async def _build_and_store(db: Session, places: Dict[str, Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+    """{맛집 id: (이름, 주소)}를 크롤링/요약/저장하고 {맛집 id: 메타데이터}를 반환 (실패한 맛집은 빠짐)"""
+    if not places:
+        return {}
+    results = await _build_restaurants_details(list(places.values()))
+    built = {restaurant_id: result for restaurant_id, result in zip(places, results) if result}
+    if built:
+        await _store_restaurants(db, built)
+    return {restaurant_id: metadata for restaurant_id, (_, metadata) in built.items()}
+
+async def _build_across_workers(db: Session, places: Dict[str, Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+    """다른 워커와 맛집별 잠금(restaurantLock)을 나누어 처리
+    바로 잠근 맛집은 직접 처리하고, 다른 워커가 처리 중인 맛집은 하나씩 잠금이 풀릴 때까지 기다린 뒤 벡터 DB에서 다시 조회
+    (직접 처리한 맛집의 잠금은 저장이 끝나는 대로, 기다린 맛집의 잠금은 결과를 찾는 대로 풀어 서로 상대의 맛집을 기다리며 멈추지 않게 함)
+    """
+    def try_acquire_all() -> List[str]:
+        acquired = []
+        for restaurant_id in places:
+            if session.try_acquire(restaurant_id):
+                acquired.append(restaurant_id)
+        return acquired
+
+    session = None
+    try:
+        session = await _run_blocking(None, restaurantLock.lock_session)
+        acquired = await _run_blocking(None, try_acquire_all) if session else []
+    except Exception as e:
+        logging.warning(f"[LOCK] 맛집 잠금을 사용할 수 없어 잠금 없이 진행: {e}")
+        if session is not None:
+            # 이미 잡은 잠금을 풀고 세션(연결)을 닫음
+            try:
+                await _run_blocking(None, session.release_all)
+            except Exception as release_error:
+                logging.warning(f"[LOCK] 맛집 잠금 정리 실패: {release_error}")
+        session = None
+    if session is None:
+        return await _build_and_store(db, places)
+    free = {restaurant_id: places[restaurant_id] for restaurant_id in acquired}
+    busy = {restaurant_id: place for restaurant_id, place in places.items() if restaurant_id not in free}
+    found = {}
+
+    def reuse(restaurant_id: str) -> bool:
+        # 잠금을 잡은 뒤 다시 조회해 다른 워커가 저장한 결과가 있으면 쓰고 잠금을 바로 풂 (없으면 잠금을 가진 채로 직접 처리)
+        metadata = vector_db_service.get_restaurants([restaurant_id]).get(restaurant_id)
+        if metadata is not None:
+            found[restaurant_id] = metadata
+        return metadata is not None
+
+    async def build_free():
+        try:
+            return await _build_and_store(db, free)
+        finally:
+            await _run_blocking(None, session.release, list(free))
+
+    async def wait_busy():
+        if not busy:
+            return
+        await _run_blocking(None, session.acquire_each, list(busy), reuse)
+        with _details_lock:
+            _details_counters["remote_shared"] += len(found)
+        for restaurant_id in found:
+            logging.info(f"[SINGLE FLIGHT] '{restaurant_id}' 다른 워커가 처리한 결과를 사용")
+
+    try:
+        built, _ = await asyncio.gather(build_free(), wait_busy())
+        # 기다린 맛집을 다른 워커가 처리하지 못했으면 (실패/시간 초과) 직접 처리
+        leftover = {restaurant_id: place for restaurant_id, place in busy.items() if restaurant_id not in found}
+        return {**built, **found, **await _build_and_store(db, leftover)}
+    finally:
+        await _run_blocking(None, session.release_all)
+
+# 같은 맛집의 벡터 DB 미스가 동시에 여러 요청에서 나면 처음 요청만 크롤링/요약/저장하고 나머지는 그 결과를 기다림
+# (이벤트 루프가 달라도 기다릴 수 있도록 concurrent.futures.Future 사용, 다른 워커와는 restaurantLock으로 조율)
+DETAILS_SINGLE_FLIGHT = os.getenv("DETAILS_SINGLE_FLIGHT", "1") != "0"
+_details_flight = FutureFlight()
+_details_lock = threading.Lock()
+_details_counters = {"remote_shared": 0, "late_hits": 0}
+
+def details_flight_stats() -> Dict[str, int]:
+    with _details_lock:
+        return {"executed": _details_flight.executed, "shared": _details_flight.shared,
+                "in_flight": _details_flight.in_flight(), **_details_counters}
+
+async def get_restaurants_details_async(db: Session, places: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+    """여러 (이름, 주소)의 상세 정보를 입력 순서대로 반환
+    벡터 DB는 한 번에 조회하고, 없는 맛집만 동시에 크롤링 + 배치 요약한 뒤 벡터 변환과 저장은 한 번에 처리
+    다른 요청이 이미 처리 중인 맛집은 다시 처리하지 않고 그 결과를 기다림
+    """
+    restaurant_ids = [f"{name}_{address}" for name, address in places]
+    existing = await _run_blocking(None, vector_db_service.get_restaurants, restaurant_ids)
+    for restaurant_id in existing:
+        logging.info(f"[CACHE HIT] '{restaurant_id}' 정보를 벡터 DB에서 바로 반환")
+
+    missing = {}
+    for restaurant_id, place in zip(restaurant_ids, places):
+        if restaurant_id not in existing:
+            missing.setdefault(restaurant_id, place)
+
+    if not DETAILS_SINGLE_FLIGHT:
+        resolved = {**existing, **await _build_and_store(db, missing)}
+        return [resolved.get(restaurant_id) for restaurant_id in restaurant_ids]
+
+    owned, waiting = {}, {}
+    for restaurant_id, place in missing.items():
+        future, leader = _details_flight.claim(restaurant_id)
+        if leader:
+            owned[restaurant_id] = place
+        else:
+            waiting[restaurant_id] = future
+            logging.info(f"[SINGLE FLIGHT] '{restaurant_id}' 처리 중인 요청의 결과를 기다림")
+
+    built = {}
+    try:
+        if owned:
+            # 조회와 claim 사이에 다른 요청이 처리를 마쳤을 수 있으므로 한 번 더 확인
+            late = await _run_blocking(None, vector_db_service.get_restaurants, list(owned))
+            with _details_lock:
+                _details_counters["late_hits"] += len(late)
+            built = {**late, **await _build_across_workers(db, {k: v for k, v in owned.items() if k not in late})}
+    except BaseException as e:
+        for restaurant_id in owned:
+            _details_flight.fail(restaurant_id, e)
+        raise
+    for restaurant_id in owned:
+        _details_flight.resolve(restaurant_id, built.get(restaurant_id))
+
+    shared = await asyncio.gather(*(asyncio.wrap_future(future) for future in waiting.values()), return_exceptions=True)
+    for restaurant_id, result in zip(waiting, shared):
+        if isinstance(result, BaseException):
+            logging.warning(f"[SINGLE FLIGHT] '{restaurant_id}' 처리 중이던 요청이 실패: {result}")
+        elif result:
+            built[restaurant_id] = result
+
+    resolved = {**existing, **built}
+    return [resolved.get(restaurant_id) for restaurant_id in restaurant_ids]
+
+def get_restaurants_details(db: Session, places: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+    return asyncio.run(get_restaurants_details_async(db, places))
+
 def get_restaurant_details(db: Session, name: str, address: str) -> Optional[Dict[str, Any]]:
-    restaurant_id = f"{name}_{address}"
+    return get_restaurants_details(db, [(name, address)])[0]
 
-    existing_data = vector_db_service.get_restaurant_by_id(restaurant_id)
-    if existing_data:
-        logging.info(f"[CACHE HIT] '{name}' 정보를 벡터 DB에서 바로 반환")
-        return existing_data
+async def get_restaurants_basics_async(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """네이버 Local 검색 결과로 상세 정보를 입력 순서대로 반환 (백그라운드 보강 모드)
+    벡터 DB에 있는 맛집은 상세 정보를, 없는 맛집은 기본 정보(이름/주소/좌표/이미지)를 바로 반환하고 보강 작업을 큐에 등록
+    """
+    places = [(_clean_html(item.get("title", "")), item.get("roadAddress") or item.get("address", "")) for item in items]
+    restaurant_ids = [enrichQueue.restaurant_id(name, address) for name, address in places]
+    existing = await _run_blocking(None, vector_db_service.get_restaurants, restaurant_ids)
+    missing = [i for i, restaurant_id in enumerate(restaurant_ids) if restaurant_id not in existing]
 
-    logging.info(f"[CACHE MISS] '{name}' 신규 처리 시작")
-    crawled_info = advanced_crawl_restaurant_details(name)
-    if not crawled_info.get("crawled_reviews"): return None
+    # 작업 등록과 이미지 검색은 서로 독립적이므로 동시에 실행
+    # 벡터 DB에 없는 맛집만 등록하므로 이미 완료된 작업도 다시 대기시킴 (저장소가 초기화됐거나 워커가 다른 저장소에 저장한 경우,
+    # 워커는 자기 저장소를 먼저 확인하므로 이미 있으면 크롤링/요약 없이 바로 완료)
+    enqueued, *images = await asyncio.gather(
+        _run_blocking(None, enrichQueue.get_enrich_queue().enqueue, [places[i] for i in missing], ENRICH_PRIORITY, True),
+        *(_run_blocking("http", fetch_image_url, places[i][0]) for i in missing), return_exceptions=True,
+    )
+    if isinstance(enqueued, Exception):
+        # 등록하지 못한 맛집은 보강되지 않으므로 pending 대신 unknown으로 알려줌 (다시 추천을 요청하면 다시 등록)
+        logging.warning(f"[ENRICH] 보강 작업 등록 실패: {enqueued}")
+    missing_status = enrichQueue.UNKNOWN if isinstance(enqueued, Exception) else enrichQueue.PENDING
+    images = dict(zip(missing, images))
 
-    summary_data = llm_summarize_details(name, crawled_info)
-    
-    # 네이버 Local 검색으로 최종 정보 보정
-    naver_place = search_naver_local(f"{name} {address}", display=1)
-    image_url = fetch_image_url(name) if naver_place else None
-    
-    vector_text = " ".join(summary_data.get("keywords", [])) + " " + " ".join(summary_data.get("summary_pros", []))
-    vector = nlpService.text_to_vector(vector_text)
-    
-    metadata = {
-        "name": name, "address": address, "image_url": image_url,
-        "mapx": naver_place[0].get("mapx") if naver_place else "",
-        "mapy": naver_place[0].get("mapy") if naver_place else "",
-        "review_trust_score": crawled_info.get("review_trust_score", 0),
-        **summary_data
-    }
-    
-    vector_db_service.upsert_restaurant(restaurant_id, vector, metadata)
-    crud.get_or_create_restaurant_in_postgres(db, name=name, address=address)
-    
-    return metadata
+    restaurants = []
+    for i, (item, (name, address), restaurant_id) in enumerate(zip(items, places, restaurant_ids)):
+        if restaurant_id in existing:
+            restaurants.append({**existing[restaurant_id], "restaurant_id": restaurant_id, "enrichment_status": "ready"})
+        else:
+            image_url = images[i] if not isinstance(images[i], Exception) else None
+            restaurants.append({"name": name, "address": address, "image_url": image_url, "mapx": item.get("mapx", ""),
+                                "mapy": item.get("mapy", ""), "restaurant_id": restaurant_id, "enrichment_status": missing_status})
+    return restaurants
 
-def get_personalized_recommendation(db: Session, request: schemas.ChatRequest, user: models.User) -> Dict[str, Any]:
+def get_enrichment_status(restaurant_ids: List[str]) -> List[Dict[str, Any]]:
+    """맛집별 보강 상태 (벡터 DB에 상세 정보가 있으면 ready와 상세 정보, 없으면 작업 큐의 상태)
+    별도 프로세스의 워커(python -m backend.app.enrichQueue work)가 처리한 맛집은 프로세스마다 따로 가진 벡터 저장소(numpy 등)에
+    바로 보이지 않을 수 있으므로, 큐에서 완료된 작업은 처리 중으로 바꾸지 않고 done 그대로 알려줌
+    """
+    existing = vector_db_service.get_restaurants(restaurant_ids)
+    jobs = enrichQueue.get_enrich_queue().status([restaurant_id for restaurant_id in restaurant_ids if restaurant_id not in existing])
+    statuses = []
+    for restaurant_id in restaurant_ids:
+        job = jobs.get(restaurant_id, {})
+        if restaurant_id in existing:
+            statuses.append({"restaurant_id": restaurant_id, "status": "ready", "attempts": job.get("attempts", 0),
+                             "restaurant": {**existing[restaurant_id], "restaurant_id": restaurant_id, "enrichment_status": "ready"}})
+        else:
+            statuses.append({"restaurant_id": restaurant_id, "status": job.get("status", enrichQueue.UNKNOWN), "attempts": job.get("attempts", 0)})
+    return statuses
+
+RECOMMENDATION_ANSWER = "요청 조건에 맞는 맛집을 추천합니다!"
+RECOMMENDATION_EMPTY_ANSWER = "요청 조건에 맞는 맛집을 찾지 못했어요."
+
+async def _recommendation_candidates(request: schemas.ChatRequest, user: models.User) -> List[Dict[str, Any]]:
+    """추천 후보의 네이버 Local 검색 결과 (이름과 주소가 있는 후보만, 최대 RECOMMENDATION_CANDIDATES개)"""
     # 간단한 조건 파싱 (향후 NLP 기반으로 고도화)
     conditions = {"region": request.prompt, "theme": "", "mood": "", "purpose": ""}
     for interest in (user.interests or "").split(','):
@@ -222,35 +511,85 @@ def get_personalized_recommendation(db: Session, request: schemas.ChatRequest, u
 
     search_queries = [f"{conditions['region']} {conditions['purpose']} 맛집", f"{conditions['region']} {conditions['theme']} 맛집"]
     
-    candidates = []
-    for q in search_queries:
-        candidates.extend(search_naver_local(q, display=5))
+    search_results = await asyncio.gather(*(_run_blocking("http", search_naver_local, q, display=5) for q in search_queries))
+    candidates = [item for items in search_results for item in items]
     
-    top_candidates = list({item['link']: item for item in candidates if item.get("link")}.values())[:3]
+    top_candidates = list({item['link']: item for item in candidates if item.get("link")}.values())[:RECOMMENDATION_CANDIDATES]
+    return [item for item in top_candidates if _clean_html(item.get("title", "")) and (item.get("roadAddress") or item.get("address"))]
 
-    restaurants = []
-    for item in top_candidates:
-        name = _clean_html(item.get("title", ""))
-        address = item.get("roadAddress") or item.get("address", "")
-        if name and address:
-            details = get_restaurant_details(db, name, address)
-            if details:
-                restaurants.append(details)
+def _place(item: Dict[str, Any]) -> Tuple[str, str]:
+    return _clean_html(item.get("title", "")), item.get("roadAddress") or item.get("address", "")
+
+async def get_personalized_recommendation_async(db: Session, request: schemas.ChatRequest, user: models.User) -> Dict[str, Any]:
+    top_candidates = await _recommendation_candidates(request, user)
+
+    if RECOMMENDATION_MODE == "background":
+        # 기본 정보만 바로 반환하고, 프론트는 보강 상태 조회 API로 상세 정보를 받아감
+        restaurants = await get_restaurants_basics_async(top_candidates)
+    else:
+        # 후보 전체를 한 번에 조회하고, 벡터 DB에 없는 후보만 크롤링
+        places = [_place(item) for item in top_candidates]
+        restaurants = [details for details in await get_restaurants_details_async(db, places) if details]
 
     if not restaurants:
-        return {"answer": "요청 조건에 맞는 맛집을 찾지 못했어요.", "restaurants": []}
-    return {"answer": "요청 조건에 맞는 맛집을 추천합니다!", "restaurants": restaurants}
+        return {"answer": RECOMMENDATION_EMPTY_ANSWER, "restaurants": []}
+    return {"answer": RECOMMENDATION_ANSWER, "restaurants": restaurants}
+
+def get_personalized_recommendation(db: Session, request: schemas.ChatRequest, user: models.User) -> Dict[str, Any]:
+    return asyncio.run(get_personalized_recommendation_async(db, request, user))
+
+async def iter_restaurants_details_async(db: Session, places: List[Tuple[str, str]],
+                                         chunk_size: Optional[int] = None) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """(입력 순서, 상세 정보)를 준비되는 대로 반환 (스트리밍 응답용, 실패한 맛집은 빠짐)
+    벡터 DB에 있는 맛집을 먼저 반환하고, 없는 맛집은 chunk_size(기본 STREAM_CHUNK_SIZE)개씩 나누어 동시에 처리하며 끝난 묶음부터 반환
+    """
+    restaurant_ids = [f"{name}_{address}" for name, address in places]
+    existing = await _run_blocking(None, vector_db_service.get_restaurants, restaurant_ids)
+    missing = []
+    for i, restaurant_id in enumerate(restaurant_ids):
+        if restaurant_id in existing:
+            yield i, existing[restaurant_id]
+        else:
+            missing.append(i)
+
+    async def build(chunk: List[int]):
+        task_db = _task_session(db)
+        try:
+            return chunk, await get_restaurants_details_async(task_db, [places[i] for i in chunk])
+        finally:
+            if task_db is not None:
+                task_db.close()
+
+    chunk_size = max(chunk_size or STREAM_CHUNK_SIZE, 1)
+    tasks = [asyncio.ensure_future(build(missing[k:k + chunk_size])) for k in range(0, len(missing), chunk_size)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            chunk, details = await next_done
+            for i, detail in zip(chunk, details):
+                if detail:
+                    yield i, detail
+    finally:
+        # 클라이언트가 연결을 끊어도 이미 시작한 묶음은 끝까지 처리하여 저장 (결과만 버림)
+        for task in tasks:
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+async def iter_personalized_recommendation_async(db: Session, request: schemas.ChatRequest,
+                                                 user: models.User) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """추천 맛집을 (후보 순서, 상세 정보)로 준비되는 대로 반환 (get_personalized_recommendation_async의 스트리밍 버전)"""
+    top_candidates = await _recommendation_candidates(request, user)
+    if RECOMMENDATION_MODE == "background":
+        for i, details in enumerate(await get_restaurants_basics_async(top_candidates)):
+            yield i, details
+        return
+    async for i, details in iter_restaurants_details_async(db, [_place(item) for item in top_candidates]):
+        yield i, details
 
 # ------------------------------
 # 핵심 비즈니스 로직 (코스 추천)
 # ------------------------------
-def create_date_course(db: Session, request: schemas.CourseRequest, user: models.User) -> Dict[str, Any]:
-    # (공유해주신 정교한 코스 생성 로직을 여기에 통합하고,
-    # 각 장소를 get_restaurant_details로 처리하여 상세 정보를 채워넣습니다.)
-    logging.info(f"'{request.theme}' 테마의 코스 생성 요청")
-    
-    # 예시: LLM을 이용한 간단한 코스 생성
-    prompt = f"""
+def course_prompt(request: schemas.CourseRequest) -> str:
+    """코스 생성 프롬프트 (같은 지역/일정/테마면 같은 프롬프트이므로 LLM 응답 캐시에서 반환)"""
+    return f"""
     너는 최고의 데이트 코스 플래너야. 아래 제약 조건에 맞춰 최적의 데이트 코스 3가지를 제안해줘.
     [제약 조건]
     - 지역: {request.location}
@@ -259,35 +598,66 @@ def create_date_course(db: Session, request: schemas.CourseRequest, user: models
     [답변 형식]
     각 코스를 "코스 1: [코스 제목] | [장소1] -> [장소2]..." 형식으로 추천해줘.
     """
+
+def _parse_courses(text: str) -> List[Tuple[str, List[str]]]:
+    """LLM 응답의 "코스 N: [제목] | [장소1] -> [장소2]..." 줄마다 (제목, 장소 이름 목록) (형식이 다른 줄은 건너뜀)"""
+    courses = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line.startswith("코스") or "|" not in line:
+            continue
+        title_part, steps_part = line.split("|", 1)
+        if ":" not in title_part:
+            continue
+        courses.append((title_part.split(":", 1)[1].strip().strip('[]'), [name.strip() for name in steps_part.split("->")]))
+    return courses
+
+async def _build_course_async(db: Session, title: str, place_names: List[str]) -> Optional[schemas.CourseDetail]:
+    """코스 하나의 장소들을 네이버 Local 검색으로 확인하고 상세 정보를 한 번에 가져옴 (상세 정보가 하나도 없으면 None)"""
     try:
-        response = llm.generate_content(prompt)
-        course_lines = [line.strip() for line in response.text.split('\n') if line.strip().startswith("코스")]
-        
-        final_courses = []
-        for line in course_lines:
-            try:
-                title_part, steps_part = line.split("|", 1)
-                course_title = title_part.split(":", 1)[1].strip().strip('[]')
-                place_names = [name.strip() for name in steps_part.split("->")]
-                
-                course_steps_details = []
-                for name in place_names:
-                    # 각 장소의 상세 정보를 가져옵니다.
-                    naver_search_result = search_naver_local(name, display=1)
-                    if naver_search_result:
-                        item = naver_search_result[0]
-                        place_name = _clean_html(item.get("title",""))
-                        place_address = item.get("roadAddress") or item.get("address", "")
-                        details = get_restaurant_details(db, place_name, place_address)
-                        if details:
-                            course_steps_details.append(schemas.RestaurantDetail(**details))
-                
-                if course_steps_details:
-                    final_courses.append(schemas.CourseDetail(title=course_title, steps=course_steps_details))
-            except Exception:
-                continue # 파싱 실패 시 해당 코스는 건너뜀
-
-        return {"courses": final_courses}
+        # 각 장소를 네이버 Local 검색으로 확인한 뒤, 상세 정보는 코스 단위로 한 번에 가져옵니다.
+        search_results = await asyncio.gather(*(_run_blocking("http", search_naver_local, name, display=1) for name in place_names))
+        places = [_place(items[0]) for items in search_results if items]
+        steps = [schemas.RestaurantDetail(**details) for details in await get_restaurants_details_async(db, places) if details]
+    except Exception as e:
+        logging.warning(f"[COURSE] '{title}' 코스 처리 실패: {e}")
+        return None
+    return schemas.CourseDetail(title=title, steps=steps) if steps else None
+
+async def iter_date_courses_async(db: Session, request: schemas.CourseRequest) -> AsyncIterator[Tuple[int, schemas.CourseDetail]]:
+    """(코스 순서, 코스)를 코스마다 장소 정보가 준비되는 대로 반환 (코스끼리는 동시에 처리)"""
+    logging.info(f"'{request.theme}' 테마의 코스 생성 요청")
+    llm = get_llm_client()
+    if not llm:
+        return
+    text = await _run_blocking("llm", llm.generate, course_prompt(request))
+
+    async def build(i: int, title: str, place_names: List[str]):
+        task_db = _task_session(db)
+        try:
+            return i, await _build_course_async(task_db, title, place_names)
+        finally:
+            if task_db is not None:
+                task_db.close()
+
+    tasks = [asyncio.ensure_future(build(i, title, names)) for i, (title, names) in enumerate(_parse_courses(text))]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            i, course = await next_done
+            if course:
+                yield i, course
+    finally:
+        for task in tasks:
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+def create_date_course(db: Session, request: schemas.CourseRequest, user: models.User) -> Dict[str, Any]:
+    # (공유해주신 정교한 코스 생성 로직을 여기에 통합하고,
+    # 각 장소를 get_restaurants_details_async로 처리하여 상세 정보를 채워넣습니다.)
+    async def collect():
+        return sorted([item async for item in iter_date_courses_async(db, request)], key=lambda item: item[0])
+
+    try:
+        return {"courses": [course for _, course in asyncio.run(collect())]}
     except Exception as e:
         logging.warning(f"Course generation error: {e}")
         return {"courses": []}
@@ -0,0 +1,95 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# single-flight: 같은 키에 대한 동시 호출을 하나로 합침
+# 먼저 들어온 호출만 fn을 실행하고, 실행 중에 들어온 같은 키의 호출은 그 결과(또는 예외)를 함께 받음
+# 결과를 저장하지는 않으므로 캐시와 함께 사용 (캐시 미스가 동시에 몰릴 때 외부 호출이 한 번만 나가도록)
+# - SingleFlight : 스레드에서 fn을 직접 실행하고 기다림
+# - FutureFlight : 키마다 concurrent.futures.Future 하나를 공유 (이벤트 루프가 달라도 asyncio.wrap_future로 기다릴 수 있음)
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """키별로 진행 중인 호출을 공유하는 스레드용 single-flight"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0 # fn을 실제로 실행한 횟수
+        self.shared = 0 # 다른 호출의 결과를 받아 간 횟수
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """(결과, 다른 호출의 결과를 공유했는지 여부)를 반환"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+class FutureFlight:
+    """키별로 진행 중인 작업의 Future를 공유하는 single-flight
+    claim에서 처음 들어온 호출(leader)이 작업을 맡고, 끝나면 반드시 resolve / fail로 결과를 알려야 함
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[Hashable, Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def claim(self, key: Hashable) -> Tuple[Future, bool]:
+        """(Future, leader 여부)를 반환"""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = self._futures[key] = Future()
+            self.executed += 1
+            return future, True
+
+    def resolve(self, key: Hashable, result: Any):
+        with self._lock:
+            future = self._futures.pop(key, None)
+        if future is not None:
+            future.set_result(result)
+
+    def fail(self, key: Hashable, error: BaseException):
+        with self._lock:
+            future = self._futures.pop(key, None)
+        if future is not None:
+            future.set_exception(error)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._futures)
@@ -0,0 +1,219 @@
+import os
+import json
+import math
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .llmClient import LLMClient, estimate_tokens
+from .llmCache import CachedLLMClient, cache_key
+
+# 여러 맛집을 한 번의 LLM 요청으로 요약하는 배치 요약기
+# - 맛집(SummaryJob)을 입력 순서대로 묶되, 요청 하나의 예상 토큰(프롬프트 + 항목별 예상 출력)이 LLM_BATCH_TOKENS를,
+#   항목 수가 LLM_BATCH_SIZE를 넘지 않게 나눔 (혼자서 예산을 넘는 항목은 단독 요청)
+# - 응답은 {"results": [{"id": ..., ...}]} 형식의 JSON 하나로 받고, 항목마다 응답 형식(template)과 같은 구조인지 검사
+#   (객체 자리에 객체가 있는지만 확인, 전화번호/주차/영업시간처럼 정보가 없을 수 있는 값은 null이거나 빠져도 허용,
+#    배열 자리의 null/누락은 빈 배열로 바꿈, template의 키가 하나도 없는 항목은 실패)
+# - 누락/형식 오류 항목과 요청 자체가 실패한 배치의 항목만 모아 다시 묶어 재시도 (최대 LLM_MAX_ATTEMPTS회)
+#   재시도할 때는 배치 항목 수를 절반씩 줄여 한 항목의 문제로 같은 배치 전체가 계속 실패하지 않게 함
+# - 배치 요청은 최대 LLM_BATCH_CONCURRENCY개를 동시에 보냄
+# 배치 안의 항목 id는 요청마다 새로 붙이는 짧은 번호이므로 호출하는 쪽의 키가 프롬프트에 들어가지 않음
+# 클라이언트가 응답 캐시(CachedLLMClient)를 쓰면 검증을 통과한 항목마다 맛집 하나짜리 프롬프트를 키로 결과를 저장하고,
+# 다음 요청 때 캐시된 항목은 배치에서 빼므로 같은 맛집을 다른 맛집과 함께 다시 요약해도 LLM을 호출하지 않음
+
+LLM_BATCH_TOKENS = int(os.getenv("LLM_BATCH_TOKENS", "12000"))
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "8"))
+LLM_BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "4"))
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+LLM_RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", "1.0")) # 재시도 전 대기 (초, 시도 횟수에 비례)
+OUTPUT_TOKEN_FACTOR = 1.5 # 항목별 예상 출력 토큰 = template 토큰 * 이 값
+
+class SummaryTask(NamedTuple):
+    instruction: str # 역할과 요약 기준 (맛집 하나를 설명하듯이 작성)
+    template: Dict[str, Any] # 항목별 응답 형식 예시 (검증 기준으로도 사용)
+
+class SummaryJob(NamedTuple):
+    key: Hashable # 결과를 돌려받을 키
+    payload: Dict[str, Any] # 프롬프트에 넣을 맛집 정보 (JSON으로 직렬화 가능해야 함)
+
+_INVALID = object()
+
+def _conform(value: Any, template: Any) -> Any:
+    """template 구조에 맞춘 값 (배열 자리의 null/누락은 [], 구조가 다르면 _INVALID)"""
+    if isinstance(template, dict):
+        if not isinstance(value, dict):
+            return _INVALID
+        conformed = dict(value)
+        for k, v in template.items():
+            item = _conform(value.get(k), v)
+            if item is _INVALID:
+                return _INVALID
+            if k in value or isinstance(v, list):
+                conformed[k] = item
+        return conformed
+    if isinstance(template, list):
+        if value is None:
+            return []
+        return value if isinstance(value, list) else _INVALID
+    return value
+
+def conform_result(result: Any, template: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """응답 항목 하나를 template 구조로 맞춰 반환 (형식이 틀렸거나 template의 키가 하나도 없으면 None)"""
+    if not isinstance(result, dict) or not any(k in result for k in template):
+        return None
+    conformed = _conform(result, template)
+    return None if conformed is _INVALID else conformed
+
+def build_prompt(task: SummaryTask, items: Sequence[Dict[str, Any]]) -> str:
+    template = json.dumps({"id": "입력의 id", **task.template}, ensure_ascii=False, indent=2)
+    entries = json.dumps(list(items), ensure_ascii=False, indent=2)
+    return f"""{task.instruction}
+아래 [맛집 목록]의 맛집마다 [JSON 형식]의 객체를 하나씩 만들어줘. 각 객체의 "id"에는 입력의 "id"를 그대로 넣고,
+맛집끼리 정보를 섞지 마. 알 수 없는 값은 null로 넣되 키는 빼지 마. 반드시 {{"results": [객체1, 객체2, ...]}} 형태의 JSON 하나로만 응답해줘.
+[JSON 형식]
+```json
+{template}
+```
+[맛집 목록]
+```json
+{entries}
+```"""
+
+def parse_results(raw: str) -> Dict[str, Any]:
+    """응답에서 {id: 결과 객체} (JSON이 아니면 빈 dict)"""
+    start = min((i for i in (raw.find("{"), raw.find("[")) if i != -1), default=-1)
+    if start == -1:
+        return {}
+    try:
+        data = json.loads(raw[start:raw.rfind("]" if raw[start] == "[" else "}") + 1])
+    except json.JSONDecodeError:
+        return {}
+    results = data.get("results", []) if isinstance(data, dict) else data
+    if not isinstance(results, list):
+        return {}
+    return {str(r["id"]): r for r in results if isinstance(r, dict) and "id" in r}
+
+class BatchSummarizer:
+    """SummaryTask 하나에 대해 여러 맛집을 배치로 요약"""
+
+    def __init__(self, client: LLMClient, task: SummaryTask, max_batch_tokens: int = LLM_BATCH_TOKENS,
+                 max_batch_items: int = LLM_BATCH_SIZE, concurrency: int = LLM_BATCH_CONCURRENCY,
+                 max_attempts: int = LLM_MAX_ATTEMPTS, retry_backoff: float = LLM_RETRY_BACKOFF):
+        self.client = client
+        self.task = task
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_items = max(max_batch_items, 1)
+        self.concurrency = max(concurrency, 1)
+        self.max_attempts = max(max_attempts, 1)
+        self.retry_backoff = retry_backoff
+        self._base_tokens = estimate_tokens(build_prompt(task, []))
+        self._output_tokens = math.ceil(estimate_tokens(json.dumps(task.template, ensure_ascii=False)) * OUTPUT_TOKEN_FACTOR)
+        self._lock = threading.Lock()
+        self._cache = client.cache if isinstance(client, CachedLLMClient) else None
+        self._counters = {"requests": 0, "failed_requests": 0, "items": 0, "cached_items": 0, "retried_items": 0,
+                          "failed_items": 0, "prompt_tokens": 0}
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] += n
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def _item_key(self, job: SummaryJob) -> str:
+        """항목별 캐시 키 (이 맛집 하나만 요청할 때의 프롬프트)"""
+        return cache_key(self.client.name, build_prompt(self.task, [{"id": "0", **job.payload}]), True)
+
+    def _cached(self, job: SummaryJob) -> Optional[Dict[str, Any]]:
+        text = self._cache.get(self._item_key(job))
+        if text is None:
+            return None
+        return conform_result(json.loads(text), self.task.template)
+
+    def _generate(self, prompt: str) -> str:
+        if self._cache is None:
+            return self.client.generate(prompt, json_mode=True)
+        # 배치 응답 자체는 저장하지 않고 (항목별로 저장) 같은 배치가 동시에 들어온 경우만 합침
+        return self._cache.fetch(self.client.name, prompt, True, lambda: self.client.inner.generate(prompt, json_mode=True), store=False)
+
+    def _item_tokens(self, job: SummaryJob) -> int:
+        return estimate_tokens(json.dumps(job.payload, ensure_ascii=False)) + self._output_tokens
+
+    def pack(self, jobs: Sequence[SummaryJob], max_items: Optional[int] = None) -> List[List[SummaryJob]]:
+        """입력 순서대로 토큰 예산 / 항목 수 안에서 배치로 나눔"""
+        max_items = max_items or self.max_batch_items
+        batches, current, tokens = [], [], self._base_tokens
+        for job in jobs:
+            cost = self._item_tokens(job)
+            if current and (tokens + cost > self.max_batch_tokens or len(current) >= max_items):
+                batches.append(current)
+                current, tokens = [], self._base_tokens
+            current.append(job)
+            tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run_batch(self, batch: List[SummaryJob]) -> Dict[Hashable, Dict[str, Any]]:
+        """배치 하나를 요청하고 형식이 맞는 항목만 {키: 결과}로 반환"""
+        items = [{"id": str(i), **job.payload} for i, job in enumerate(batch)]
+        prompt = build_prompt(self.task, items)
+        self._count("requests")
+        self._count("prompt_tokens", estimate_tokens(prompt))
+        start = time.perf_counter()
+        try:
+            parsed = parse_results(self._generate(prompt))
+        except Exception as e:
+            self._count("failed_requests")
+            logging.warning(f"[LLM] 배치 요약 요청 실패 ({len(batch)}개): {e}")
+            return {}
+        latency = (time.perf_counter() - start) / len(batch)
+        results = {}
+        for i, job in enumerate(batch):
+            result = conform_result(parsed.get(str(i)), self.task.template)
+            if result is not None:
+                results[job.key] = {k: v for k, v in result.items() if k != "id"}
+                if self._cache is not None:
+                    text = json.dumps(results[job.key], ensure_ascii=False)
+                    self._cache.put(self._item_key(job), self.client.name, text, self._item_tokens(job) - self._output_tokens,
+                                    estimate_tokens(text), latency)
+        return results
+
+    def summarize(self, jobs: Sequence[SummaryJob]) -> Dict[Hashable, Dict[str, Any]]:
+        """{키: 요약 결과} (재시도 후에도 실패한 키는 빠짐)"""
+        pending = list({job.key: job for job in jobs}.values())
+        self._count("items", len(pending))
+        results: Dict[Hashable, Dict[str, Any]] = {}
+        if self._cache is not None:
+            for job in pending:
+                cached = self._cached(job)
+                if cached is not None:
+                    results[job.key] = cached
+            pending = [job for job in pending if job.key not in results]
+            self._count("cached_items", len(results))
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="cureat-llm") as pool:
+            for attempt in range(self.max_attempts):
+                if not pending:
+                    break
+                if attempt:
+                    self._count("retried_items", len(pending))
+                    logging.info(f"[LLM] {len(pending)}개 항목 재시도 ({attempt + 1}/{self.max_attempts})")
+                    time.sleep(self.retry_backoff * attempt)
+                batches = self.pack(pending, max(self.max_batch_items >> attempt, 1))
+                for batch_results in pool.map(self._run_batch, batches):
+                    results.update(batch_results)
+                pending = [job for job in pending if job.key not in results]
+        if pending:
+            self._count("failed_items", len(pending))
+            logging.warning(f"[LLM] {len(pending)}개 항목 요약 실패")
+        return results
+
+def summarize_many(client: Optional[LLMClient], task: SummaryTask, jobs: Sequence[Tuple[Hashable, Dict[str, Any]]],
+                   **options) -> Dict[Hashable, Dict[str, Any]]:
+    """(키, 맛집 정보) 목록을 배치로 요약 (클라이언트가 없으면 빈 dict)"""
+    if client is None or not jobs:
+        return {}
+    return BatchSummarizer(client, task, **options).summarize([SummaryJob(key, payload) for key, payload in jobs])
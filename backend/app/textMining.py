@@ -0,0 +1,65 @@
+import re
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Sequence
+
+# 블로그 본문에서 리뷰 문장 추출 (문장 분리 + 키워드 태깅 + 광고 판별)
+# - 키워드 목록 전체와 광고 패턴 전체를 각각 하나의 정규식(캡처 그룹 없는 alternation)으로 미리 컴파일해 두고,
+#   문장마다 키워드 정규식 / 광고 정규식을 한 번씩만 검사 (패턴별 re.search 반복 / 키워드별 in 검사 없음)
+#   캡처 그룹을 쓰면 sre의 첫 글자 집합 최적화가 꺼져 수십 배 느려지므로, 매치된 문자열 자체로 키워드를 찾음
+# - 키워드는 긴 것부터 시도하며, 긴 키워드가 짧은 키워드를 포함하면("불친절" -> "친절") 함께 태깅
+#   (다른 매치와 일부만 겹치는 키워드는 태깅되지 않을 수 있지만, 그 문장은 이미 다른 키워드로 매치된 상태)
+# - 키워드 목록은 호출하는 쪽마다 다르므로 ReviewMatcher를 목록별로 만들어 재사용
+
+AD_PATTERNS = [r"소정의\s*원고료", r"체험단", r"업체로부터\s*제공", r"광고\s*참고", r"협찬"]
+SENTENCE_SEPARATORS = r"[.。!?\n]"
+LINE_SEPARATORS = r"\n"
+
+class Sentence(NamedTuple):
+    text: str
+    keywords: FrozenSet[str] # 문장에 나온 키워드
+    is_ad: bool # 광고 문구 포함 여부
+
+class ReviewMatcher:
+    """키워드 목록 + 광고 패턴을 한 번에 검사하는 리뷰 문장 추출기"""
+
+    def __init__(self, keywords: Sequence[str], ad_patterns: Sequence[str] = AD_PATTERNS,
+                 separators: str = SENTENCE_SEPARATORS):
+        self.keywords = sorted(set(k for k in keywords if k), key=len, reverse=True)
+        self._separator = re.compile(separators)
+        # 매치된 키워드 -> 그 키워드에 포함된 키워드 전체 (자기 자신 포함)
+        self._implied: Dict[str, FrozenSet[str]] = {k: frozenset(s for s in self.keywords if s in k) for k in self.keywords}
+        self._keyword = re.compile("|".join(map(re.escape, self.keywords))) if self.keywords else None
+        self._ad = re.compile("|".join(f"(?:{p})" for p in ad_patterns)) if ad_patterns else None
+
+    def has_keyword(self, sentence: str) -> bool:
+        return self._keyword is not None and self._keyword.search(sentence) is not None
+
+    def is_ad(self, sentence: str) -> bool:
+        return self._ad is not None and self._ad.search(sentence) is not None
+
+    def tag(self, sentence: str) -> Sentence:
+        """문장 하나의 키워드 / 광고 여부"""
+        found = set()
+        if self._keyword is not None:
+            for keyword in set(self._keyword.findall(sentence)):
+                found.update(self._implied[keyword])
+        return Sentence(sentence, frozenset(found), self.is_ad(sentence))
+
+    def _sentences(self, text: str, min_length: int, max_length: Optional[int]) -> Iterator[str]:
+        for raw in self._separator.split(text or ""):
+            sentence = raw.strip()
+            if len(sentence) < min_length or (max_length is not None and len(sentence) > max_length):
+                continue
+            yield sentence
+
+    def scan(self, text: str, min_length: int = 0, max_length: Optional[int] = None) -> Iterator[Sentence]:
+        """본문을 문장으로 나누어 길이 조건(양끝 공백 제외, 경계 포함)을 만족하는 문장마다 태깅 결과를 반환"""
+        for sentence in self._sentences(text, min_length, max_length):
+            yield self.tag(sentence)
+
+    def extract(self, text: str, min_length: int = 0, max_length: Optional[int] = None,
+                exclude_ads: bool = True) -> List[str]:
+        """키워드가 하나 이상 나온 문장 (exclude_ads면 광고 문구가 있는 문장 제외), 본문 순서대로
+        어떤 키워드인지는 필요 없으므로 문장마다 첫 매치만 찾음
+        """
+        return [s for s in self._sentences(text, min_length, max_length)
+                if self.has_keyword(s) and not (exclude_ads and self.is_ad(s))]
@@ -1,61 +1,297 @@
-from typing import List, Dict, Any
+import json
+import math
+import os
+import threading
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from . import schemas
 from .database import get_vector_db_collection
+from .geoIndex import GeoIndex, parse_naver_coordinates
+from .metadataCodec import restaurant_codec, flag_key
+from .queryCache import QueryCache
+from .vectorStore import VectorStore, ChromaVectorStore, NumpyVectorStore, compile_where
+
+# 벡터 저장소 선택: chroma(기본) | numpy (memmap + HNSW/전수 탐색, 프로세스 내부)
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "chroma").lower()
+VECTOR_STORE_PATH = os.getenv("VECTOR_STORE_PATH", "./vector_store")
+
+# 필터 검색 계획: 조건을 만족하는 비율(선택도)이 이 값보다 작으면 저장소의 where로 먼저 거르고(pre-filter),
+# 크면 필터 없이 넉넉히 검색한 뒤 걸러냄(post-filter)
+PREFILTER_SELECTIVITY = float(os.getenv("VECTOR_PREFILTER_SELECTIVITY", "0.2"))
+POSTFILTER_OVERSAMPLE = float(os.getenv("VECTOR_POSTFILTER_OVERSAMPLE", "2.0"))
+# 반경 안 맛집이 이 개수 이하이면 그 맛집들의 벡터만 직접 비교, 많으면 유사도 검색 결과와 교집합
+GEO_EXACT_MAX = int(os.getenv("GEO_EXACT_MAX", "2000"))
+# 변경(upsert/delete)된 맛집 수가 이 값에 이르면 저장소를 디스크에 기록 (0이면 종료 시에만 기록)
+VECTOR_FLUSH_EVERY = int(os.getenv("VECTOR_FLUSH_EVERY", "500"))
+
+vector_store: Optional[VectorStore] = None
+_vector_store_lock = threading.Lock()
+_unflushed_writes = 0
+_flush_lock = threading.Lock()
+
+# 저장소 내용이 바뀔 때마다 증가 (선택도 등 파생 값 캐시 무효화용)
+generation = 0
+_selectivity_cache: Dict[str, Tuple[int, int, int]] = {}  # where -> (generation, 일치 수, 전체 수)
+
+# 유사도 검색 결과 캐시 (저장소 generation이 바뀌면 무효)
+QUERY_CACHE_ENABLED = os.getenv("QUERY_CACHE_ENABLED", "true").lower() == "true"
+query_cache: Optional[QueryCache] = QueryCache(
+    max_entries=int(os.getenv("QUERY_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("QUERY_CACHE_TTL", "300")),
+    quantum=float(os.getenv("QUERY_CACHE_QUANTUM", "0.01")),
+) if QUERY_CACHE_ENABLED else None
+
+# 맛집 좌표(mapx/mapy) 공간 색인 - 처음 사용할 때 저장소 전체로 만들고 이후 upsert/delete 때 함께 갱신
+geo_index: Optional[GeoIndex] = None
+_geo_index_lock = threading.Lock()
 
-# database.py에서 설정한 벡터 DB 컬렉션 가져오기
-collection = get_vector_db_collection()
+def get_vector_store() -> VectorStore:
+    """설정된 벡터 저장소를 반환 (처음 호출할 때 생성)"""
+    global vector_store
+    if vector_store is None:
+        with _vector_store_lock:
+            if vector_store is None:
+                if VECTOR_STORE_BACKEND == "numpy":
+                    vector_store = NumpyVectorStore(VECTOR_STORE_PATH)
+                elif VECTOR_STORE_BACKEND == "chroma":
+                    vector_store = ChromaVectorStore(get_vector_db_collection)
+                else:
+                    raise ValueError(f"알 수 없는 VECTOR_STORE_BACKEND: {VECTOR_STORE_BACKEND}")
+    return vector_store
+
+def flush_vector_store():
+    """저장소의 기록되지 않은 변경을 디스크에 기록 (저장소를 아직 만들지 않았으면 할 일 없음)"""
+    global _unflushed_writes
+    with _flush_lock:
+        _unflushed_writes = 0
+        if vector_store is not None:
+            vector_store.flush()
+
+def _note_writes(count: int):
+    global _unflushed_writes
+    with _flush_lock:
+        _unflushed_writes += count
+        due = VECTOR_FLUSH_EVERY > 0 and _unflushed_writes >= VECTOR_FLUSH_EVERY
+    if due:
+        flush_vector_store()
+
+def upsert_restaurants(batch: List[Tuple[str, List[float], Dict[str, Any]]]):
+    """여러 맛집의 (id, 벡터, 메타데이터)를 한 번의 저장소 호출로 저장하거나 업데이트"""
+    if not batch:
+        return
+    ids, vectors, metadatas = zip(*batch)
+    get_vector_store().upsert(ids, vectors, restaurant_codec.encode_many(metadatas))
+    _update_geo_index(ids, metadatas)
+    _bump_generation()
+    _note_writes(len(ids))
+    print(f"Restaurant {len(ids)}건 벡터 정보가 벡터 DB({VECTOR_STORE_BACKEND})에 업데이트 되었습니다.")
 
 def upsert_restaurant(restaurant_id: str, vector: List[float], metadata: Dict[str, Any]):
-    """맛집의 벡터와 메타데이터(요약 정보 등)를 ChromaDB에 저장하거나 업데이트"""
-    # ChromaDB는 리스트 형태 메타데이터 지원하지 않음, 문자열로 변환 필요
-    senitized_metadata = {}
-    for key, value in metadata.items():
-        if isinstance(value, list):
-            senitized_metadata[key] = '|'.join(value)
+    """맛집의 벡터와 메타데이터(요약 정보 등)를 벡터 DB에 저장하거나 업데이트"""
+    upsert_restaurants([(restaurant_id, vector, metadata)])
+
+def get_restaurants(restaurant_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """여러 맛집을 한 번의 저장소 호출로 조회하여 {id: 메타데이터}로 반환 (없는 id는 제외)"""
+    ids = list(dict.fromkeys(restaurant_ids))
+    if not ids:
+        return {}
+    found = get_vector_store().get(ids)
+    return dict(zip(found.keys(), restaurant_codec.decode_many(list(found.values()))))
+
+def get_restaurant_by_id(restaurant_id: str) -> Optional[Dict[str, Any]]:
+    """맛집 한 곳의 메타데이터를 조회 (없으면 None)"""
+    return get_restaurants([restaurant_id]).get(restaurant_id)
+
+def get_geo_index() -> GeoIndex:
+    """벡터 DB 메타데이터의 좌표로 만든 공간 색인"""
+    global geo_index
+    if geo_index is None:
+        with _geo_index_lock:
+            if geo_index is None:
+                index = GeoIndex()
+                for ids, _, metadatas in get_vector_store().iter_all():
+                    index.upsert_many(
+                        (restaurant_id, *coordinates)
+                        for restaurant_id, coordinates in zip(ids, map(_coordinates, metadatas)) if coordinates
+                    )
+                geo_index = index
+    return geo_index
+
+def _coordinates(metadata: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    return parse_naver_coordinates(metadata.get("mapx"), metadata.get("mapy"))
+
+def _update_geo_index(ids: Iterable[str], metadatas: Iterable[Dict[str, Any]]):
+    if geo_index is None:
+        return
+    located, missing = [], []
+    for restaurant_id, metadata in zip(ids, metadatas):
+        coordinates = _coordinates(metadata)
+        if coordinates:
+            located.append((restaurant_id, *coordinates))
         else:
-            senitized_metadata[key] = value
-            
-    collection.upsert(
-        ids=[restaurant_id],
-        embeddings=[vector],
-        metadatas=[senitized_metadata]
-    )
-    print(f"Restaurant ID {restaurant_id} 벡터 정보가 ChromaDB에 업데이트 되었습니다.")
-    
-def query_similar_restaurants(vector: List[float], n_results: int = 3) -> List[Dict[str, Any]]:
-    results = collection.query(
-        query_embeddings=[vector],
-        n_results=n_results
-    )
-    
-    # DB에서 |로 구분된 문자열을 다시 리스트로 변환하여 반환합니다.
-    final_results = []
-    if results and results.get('metadatas'):
-        for metadata in results['metadatas'][0]:
-            if metadata.get('summary_pros'):
-                metadata['summary_pros'] = metadata['summary_pros'].split('|')
-            if metadata.get('summary_cons'):
-                metadata['summary_cons'] = metadata['summary_cons'].split('|')
-            if metadata.get('keywords'):
-                metadata['keywords'] = metadata['keywords'].split('|')
-            if metadata.get('nearby_attractions'):
-                metadata['nearby_attractions'] = metadata['nearby_attractions'].split('|')
-            if metadata.get('signature_menu'):
-                metadata['signature_menu'] = metadata['signature_menu'].split('|')
-            if metadata.get('categories'):
-                metadata['categories'] = metadata['categories'].split('|')
-            if metadata.get('summary_paring'):
-                metadata['summary_parking'] = metadata['summary_parking'].split('|')
-            if metadata.get('summary_price'):
-                metadata['summary_price'] = metadata['summary_price'].split('|')
-            if metadata.get('summary_opening_hours'):
-                metadata['summary_opening_hours'] = metadata['summary_opening_hours'].split('|')
-            if metadata.get('summary_phone'):
-                metadata['summary_phone'] = metadata['summary_phone'].split('|')
-            final_results.append(metadata)
-                        
-    return final_results
+            missing.append(restaurant_id)
+    geo_index.upsert_many(located)
+    geo_index.remove(missing)
+
+def _with_distances(hits: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
+    found = get_restaurants([restaurant_id for restaurant_id, _ in hits])
+    return [{**found[restaurant_id], "distance_m": round(distance, 1)} for restaurant_id, distance in hits if restaurant_id in found]
+
+def find_restaurants_nearby(lat: float, lng: float, radius_m: float, limit: int = 20) -> List[Dict[str, Any]]:
+    """반경 radius_m 안의 맛집을 가까운 순서로 반환 (distance_m 포함)"""
+    return _with_distances(get_geo_index().within_radius(lat, lng, radius_m, limit=limit))
+
+def find_nearest_restaurants(lat: float, lng: float, k: int = 10, max_meters: Optional[float] = None) -> List[Dict[str, Any]]:
+    """가장 가까운 맛집 k곳 (distance_m 포함)"""
+    return _with_distances(get_geo_index().k_nearest(lat, lng, k, max_meters=max_meters))
+
+def find_restaurants_in_bbox(min_lat: float, min_lng: float, max_lat: float, max_lng: float, limit: int = 200) -> List[Dict[str, Any]]:
+    """지도 화면 영역 안의 맛집 (최대 limit곳)"""
+    ids = get_geo_index().in_bbox(min_lat, min_lng, max_lat, max_lng)[:limit]
+    found = get_restaurants(ids)
+    return [found[restaurant_id] for restaurant_id in ids if restaurant_id in found]
+
+def _bump_generation():
+    global generation
+    generation += 1
+
+def _any_of(field: str, values: List[str], flag: bool) -> Optional[dict]:
+    if not values:
+        return None
+    if not flag:
+        return {field: {"$in": list(values)}}
+    clauses = [{flag_key(field, value): True} for value in values]
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+def build_where(filters: Optional[schemas.RestaurantFilter]) -> Optional[dict]:
+    """검색 필터를 저장소의 where 절(ChromaDB 형식)로 변환 (조건이 없으면 None)"""
+    if filters is None:
+        return None
+    clauses = [
+        _any_of("address", filters.regions, flag=True),
+        _any_of("price_range", filters.price_ranges, flag=False),
+        _any_of("categories", filters.categories, flag=True),
+        _any_of("keywords", filters.keywords, flag=True),
+    ]
+    if filters.min_review_trust_score is not None:
+        clauses.append({"review_trust_score": {"$gte": filters.min_review_trust_score}})
+    clauses = [clause for clause in clauses if clause]
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+def estimate_selectivity(where: dict) -> Tuple[float, int]:
+    """where 조건을 만족하는 비율과 전체 개수 (저장소 내용이 바뀌기 전까지 캐시)"""
+    key = json.dumps(where, sort_keys=True, ensure_ascii=False)
+    cached = _selectivity_cache.get(key)
+    if cached is None or cached[0] != generation:
+        store = get_vector_store()
+        cached = (generation, store.count(where), store.count())
+        if len(_selectivity_cache) > 1024:
+            _selectivity_cache.clear()
+        _selectivity_cache[key] = cached
+    _, matched, total = cached
+    return (matched / total if total else 0.0), total
+
+def plan_filtered_query(where: Optional[dict]) -> str:
+    """필터 검색 방식 선택: none(필터 없음) / pre / post"""
+    if not where:
+        return "none"
+    selectivity, _ = estimate_selectivity(where)
+    return "pre" if selectivity < PREFILTER_SELECTIVITY else "post"
+
+def query_similar_restaurants(
+    vector: List[float],
+    n_results: int = 3,
+    filters: Optional[schemas.RestaurantFilter] = None,
+    strategy: Optional[str] = None,
+    near: Optional[Tuple[float, float, float]] = None,
+) -> List[Dict[str, Any]]:
+    """입력 벡터와 가장 유사한 맛집의 메타데이터를 가까운 순서로 반환
+    filters가 있으면 선택도에 따라 pre/post-filter를 자동으로 고름 (strategy로 강제 가능)
+    near=(위도, 경도, 반경 m)이면 반경 안의 맛집으로 한정 (distance_m 포함)
+    같은 조건의 검색은 저장소 내용이 바뀌기 전까지 query_cache에서 바로 반환
+    """
+    if query_cache is None:
+        return _query_similar_restaurants(vector, n_results, filters, strategy, near)
+    current = generation
+    key = query_cache.key(vector, n_results, filters.model_dump_json() if filters else None, strategy, near)
+    cached = query_cache.get(key, current)
+    if cached is None:
+        cached = _query_similar_restaurants(vector, n_results, filters, strategy, near)
+        query_cache.put(key, current, cached)
+    # 호출하는 쪽에서 결과를 수정해도 캐시가 바뀌지 않도록 복사해서 반환
+    return [dict(metadata) for metadata in cached]
+
+def _query_similar_restaurants(vector, n_results, filters, strategy, near) -> List[Dict[str, Any]]:
+    store = get_vector_store()
+    where = build_where(filters)
+    if near is not None:
+        return _query_similar_nearby(store, vector, n_results, where, near)
+    strategy = strategy or plan_filtered_query(where)
+
+    if strategy == "post":
+        selectivity, total = estimate_selectivity(where)
+        fetch = min(total, math.ceil(n_results / max(selectivity, 1e-6) * POSTFILTER_OVERSAMPLE))
+        matches = compile_where(where)
+        results = [r for r in store.query(vector, fetch) if matches(r[2])][:n_results]
+        if len(results) < n_results and fetch < total:
+            # 가까운 후보 중 조건을 만족하는 항목이 부족하면 pre-filter로 다시 검색
+            results = store.query(vector, n_results, where=where)
+    else:
+        results = store.query(vector, n_results, where=where)
+    return restaurant_codec.decode_many([metadata for _, _, metadata in results])
+
+def _query_similar_nearby(store: VectorStore, vector: List[float], n_results: int, where: Optional[dict],
+                          near: Tuple[float, float, float]) -> List[Dict[str, Any]]:
+    lat, lng, radius_m = near
+    nearby = dict(get_geo_index().within_radius(lat, lng, radius_m))
+    if not nearby:
+        return []
+    if len(nearby) <= GEO_EXACT_MAX:
+        # 반경 안 맛집이 적으면 그 벡터만 가져와 직접 거리 계산 (정확)
+        metadatas = store.get(list(nearby))
+        if where:
+            matches = compile_where(where)
+            metadatas = {i: m for i, m in metadatas.items() if matches(m)}
+        embeddings = store.get_embeddings(list(metadatas))
+        if not embeddings:
+            return []
+        ids = list(embeddings)
+        dists = ((np.stack([embeddings[i] for i in ids]) - np.asarray(vector, dtype=np.float32)) ** 2).sum(axis=1)
+        results = [(ids[i], metadatas[ids[i]]) for i in np.argsort(dists, kind="stable")[:n_results]]
+    else:
+        # 반경 안 맛집이 많으면 유사도 검색 결과를 넉넉히 가져와 교집합
+        total = store.count()
+        fetch = min(total, math.ceil(n_results * total / len(nearby) * POSTFILTER_OVERSAMPLE))
+        results = [(i, m) for i, _, m in store.query(vector, fetch, where=where) if i in nearby][:n_results]
+    decoded = restaurant_codec.decode_many([metadata for _, metadata in results])
+    return [{**metadata, "distance_m": round(nearby[i], 1)} for (i, _), metadata in zip(results, decoded)]
+
+def delete_restaurants(restaurant_ids: Iterable[str]):
+    restaurant_ids = list(restaurant_ids)
+    get_vector_store().delete(restaurant_ids)
+    if geo_index is not None:
+        geo_index.remove(restaurant_ids)
+    _bump_generation()
+    _note_writes(len(restaurant_ids))
+
+def reencode_metadata(batch_size: int = 500) -> int:
+    """저장된 메타데이터를 현재 코덱 형식(필터용 플래그 키 포함)으로 다시 저장하고 개수를 반환"""
+    store = get_vector_store()
+    count = 0
+    for ids, vectors, metadatas in store.iter_all(batch_size):
+        store.upsert(ids, vectors, restaurant_codec.encode_many(restaurant_codec.decode_many(metadatas)))
+        count += len(ids)
+    _bump_generation()
+    flush_vector_store()
+    return count
+
+def count_restaurants(where: Optional[dict] = None) -> int:
+    return get_vector_store().count(where)
 
 def check_restaurant_exists(restaurant_id: str) -> bool:
     """벡터 DB에 해당 맛집 정보가 이미 있는지 확인합니다."""
-    result = collection.get(ids=[restaurant_id])
-    return bool(result['ids'])
\ No newline at end of file
+    return bool(get_vector_store().get([restaurant_id]))
@@ -0,0 +1,445 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 벡터 저장소 추상화
+# vectorDBService는 이 인터페이스만 사용하고, 실제 저장소는 설정(VECTOR_STORE_BACKEND)으로 선택
+# - ChromaVectorStore : 기존 ChromaDB 컬렉션
+# - NumpyVectorStore  : 메모리 매핑된 float32 행렬 + SQLite(id/메타데이터) + HNSW(hnswlib, 선택) 또는 numpy 전수 탐색
+# 메타데이터는 metadataCodec으로 인코딩된 값(str/int/float/bool)을 그대로 저장하며,
+# where 절은 ChromaDB 형식({"field": {"$gte": 1}}, {"$and": [...]})을 두 저장소가 동일하게 지원
+
+QueryResult = Tuple[str, float, Dict[str, Any]]  # (id, 거리, 메타데이터)
+
+class VectorStore(ABC):
+    """맛집 벡터 저장소 인터페이스"""
+
+    @abstractmethod
+    def upsert(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]], metadatas: Sequence[Dict[str, Any]]):
+        ...
+
+    @abstractmethod
+    def get(self, ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """id 목록을 한 번에 조회하여 {id: 메타데이터}로 반환 (없는 id는 제외)"""
+
+    @abstractmethod
+    def get_embeddings(self, ids: Sequence[str]) -> Dict[str, np.ndarray]:
+        """id 목록의 벡터를 한 번에 조회 (없는 id는 제외)"""
+
+    @abstractmethod
+    def query(self, embedding: Sequence[float], n_results: int, where: Optional[dict] = None) -> List[QueryResult]:
+        """거리가 가까운 순서로 최대 n_results개 반환"""
+
+    @abstractmethod
+    def delete(self, ids: Sequence[str]):
+        ...
+
+    @abstractmethod
+    def count(self, where: Optional[dict] = None) -> int:
+        ...
+
+    @abstractmethod
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Tuple[List[str], np.ndarray, List[Dict[str, Any]]]]:
+        """저장된 전체 (id, 벡터, 메타데이터)를 배치 단위로 순회"""
+
+    def flush(self):
+        """아직 디스크에 기록되지 않은 내용을 기록 (스스로 저장하는 저장소는 할 일 없음)"""
+
+# ------------------------------
+# where 절 평가 (ChromaDB 형식)
+# ------------------------------
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$eq": lambda a, b: a == b,
+    "$ne": lambda a, b: a != b,
+    "$gt": lambda a, b: a is not None and a > b,
+    "$gte": lambda a, b: a is not None and a >= b,
+    "$lt": lambda a, b: a is not None and a < b,
+    "$lte": lambda a, b: a is not None and a <= b,
+    "$in": lambda a, b: a in b,
+    "$nin": lambda a, b: a not in b,
+}
+
+def compile_where(where: Optional[dict]) -> Callable[[Dict[str, Any]], bool]:
+    """ChromaDB 형식 where 절을 메타데이터 한 건에 대한 판별 함수로 변환"""
+    if not where:
+        return lambda metadata: True
+    predicates = []
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            parts = [compile_where(part) for part in condition]
+            if key == "$and":
+                predicates.append(lambda m, parts=parts: all(p(m) for p in parts))
+            else:
+                predicates.append(lambda m, parts=parts: any(p(m) for p in parts))
+            continue
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, operand in condition.items():
+            if op not in _OPERATORS:
+                raise ValueError(f"지원하지 않는 where 연산자: {op}")
+            fn = _OPERATORS[op]
+            predicates.append(lambda m, key=key, fn=fn, operand=operand: fn(m.get(key), operand))
+    return lambda metadata: all(p(metadata) for p in predicates)
+
+# ------------------------------
+# ChromaDB
+# ------------------------------
+class ChromaVectorStore(VectorStore):
+    """ChromaDB 컬렉션을 감싼 저장소 (컬렉션은 처음 사용할 때 가져옴)"""
+
+    def __init__(self, collection_getter: Callable[[], Any]):
+        self._collection_getter = collection_getter
+
+    @property
+    def collection(self):
+        return self._collection_getter()
+
+    def upsert(self, ids, embeddings, metadatas):
+        self.collection.upsert(ids=list(ids), embeddings=[list(map(float, e)) for e in embeddings], metadatas=list(metadatas))
+
+    def get(self, ids):
+        if not ids:
+            return {}
+        result = self.collection.get(ids=list(ids), include=["metadatas"])
+        return {i: m or {} for i, m in zip(result.get("ids", []), result.get("metadatas") or [])}
+
+    def get_embeddings(self, ids):
+        if not ids:
+            return {}
+        result = self.collection.get(ids=list(ids), include=["embeddings"])
+        return {i: np.asarray(e, dtype=np.float32) for i, e in zip(result.get("ids", []), result["embeddings"])}
+
+    def query(self, embedding, n_results, where=None):
+        results = self.collection.query(
+            query_embeddings=[list(map(float, embedding))],
+            n_results=n_results,
+            where=where or None,
+            include=["metadatas", "distances"],
+        )
+        if not results or not results.get("ids"):
+            return []
+        return list(zip(results["ids"][0], results["distances"][0], results["metadatas"][0]))
+
+    def delete(self, ids):
+        if ids:
+            self.collection.delete(ids=list(ids))
+
+    def count(self, where=None):
+        if not where:
+            return self.collection.count()
+        return len(self.collection.get(where=where, include=[])["ids"])
+
+    def iter_all(self, batch_size=1000):
+        offset = 0
+        while True:
+            result = self.collection.get(include=["embeddings", "metadatas"], limit=batch_size, offset=offset)
+            ids = result.get("ids") or []
+            if not ids:
+                return
+            yield ids, np.asarray(result["embeddings"], dtype=np.float32), [m or {} for m in result["metadatas"]]
+            offset += len(ids)
+
+# ------------------------------
+# NumPy (memory-mapped) + HNSW
+# ------------------------------
+class NumpyVectorStore(VectorStore):
+    """프로세스 내부 저장소: 벡터는 memmap float32 행렬, id/메타데이터는 SQLite, 검색은 HNSW 또는 전수 탐색
+    거리는 ChromaDB 기본값과 같은 제곱 L2 거리
+    """
+
+    # 필터 조건을 만족하는 항목이 이 개수 이하이면 HNSW 대신 전수 탐색
+    EXACT_SEARCH_MAX = 2000
+
+    def __init__(self, path: str, dimension: int = None, use_hnsw: bool = True,
+                 hnsw_m: int = 16, hnsw_ef_construction: int = 200, hnsw_ef: int = 64):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(path, "meta.sqlite3"), check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS items (row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, metadata TEXT NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+        stored_dimension = self._conn.execute("SELECT value FROM settings WHERE key = 'dimension'").fetchone()
+        self.dimension = int(stored_dimension[0]) if stored_dimension else dimension
+
+        # row 번호 -> id, id -> row 번호, row 번호 -> 메타데이터 (삭제된 row는 None)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+        for row, item_id, metadata in self._conn.execute("SELECT row, id, metadata FROM items ORDER BY row"):
+            while len(self._ids) < row:
+                self._ids.append(None)
+                self._metadatas.append(None)
+            self._ids.append(item_id)
+            self._metadatas.append(json.loads(metadata))
+            self._rows[item_id] = row
+        self._size = len(self._ids)
+
+        self._vectors = None
+        self._sq_norms = None
+        # 메타데이터 키별 역색인 {키: {값: row 배열}} (필터에 쓰인 키만 만들고, 내용이 바뀌면 비움)
+        self._key_indexes: Dict[str, Dict[Any, np.ndarray]] = {}
+        if self.dimension:
+            self._open_vectors(max(self._size, 1024))
+
+        self.hnsw_params = {"M": hnsw_m, "ef_construction": hnsw_ef_construction, "ef": hnsw_ef}
+        self._hnsw = None
+        self._hnsw_dirty = False
+        if use_hnsw:
+            try:
+                import hnswlib  # noqa: F401
+                self._use_hnsw = True
+            except ImportError:
+                logging.info("[VECTOR STORE] hnswlib이 없어 numpy 전수 탐색을 사용합니다.")
+                self._use_hnsw = False
+        else:
+            self._use_hnsw = False
+
+    # ------------------------------
+    # 내부: 벡터 파일 / 인덱스
+    # ------------------------------
+    def _open_vectors(self, capacity: int):
+        vectors_path = os.path.join(self.path, "vectors.f32")
+        nbytes = capacity * self.dimension * 4
+        if not os.path.exists(vectors_path) or os.path.getsize(vectors_path) < nbytes:
+            with open(vectors_path, "ab") as f:
+                f.truncate(nbytes)
+        if self._vectors is not None:
+            self._vectors.flush()
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+        self._sq_norms = np.einsum("ij,ij->i", self._vectors[:self._size], self._vectors[:self._size])
+
+    def _ensure_capacity(self, size: int):
+        if size > self._vectors.shape[0]:
+            self._open_vectors(max(size, self._vectors.shape[0] * 2))
+
+    def _load_hnsw(self):
+        import hnswlib
+
+        index_path = os.path.join(self.path, "hnsw.bin")
+        index = hnswlib.Index(space="l2", dim=self.dimension)
+        capacity = max(self._vectors.shape[0], 1024)
+        loaded = False
+        if os.path.exists(index_path) and not self._hnsw_dirty:
+            index.load_index(index_path, max_elements=capacity)
+            # 저장 이후 다른 프로세스에서 추가된 row가 있으면 다시 생성
+            loaded = index.get_current_count() == self._size
+            if loaded:
+                for row, item_id in enumerate(self._ids):
+                    if item_id is None:
+                        try:
+                            index.mark_deleted(row)
+                        except RuntimeError:
+                            pass
+            else:
+                index = hnswlib.Index(space="l2", dim=self.dimension)
+        if not loaded:
+            index.init_index(max_elements=capacity, M=self.hnsw_params["M"], ef_construction=self.hnsw_params["ef_construction"])
+            live = np.array([row for row, item_id in enumerate(self._ids) if item_id is not None], dtype=np.int64)
+            if len(live):
+                index.add_items(self._vectors[live], live)
+        index.set_ef(self.hnsw_params["ef"])
+        self._hnsw = index
+        self._hnsw_dirty = not loaded
+
+    # ------------------------------
+    # VectorStore 구현
+    # ------------------------------
+    def upsert(self, ids, embeddings, metadatas):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or len(embeddings) != len(ids):
+            raise ValueError("ids와 embeddings의 개수가 맞지 않습니다.")
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = embeddings.shape[1]
+                self._conn.execute("INSERT OR REPLACE INTO settings VALUES ('dimension', ?)", (str(self.dimension),))
+                self._open_vectors(max(len(ids), 1024))
+            elif embeddings.shape[1] != self.dimension:
+                raise ValueError(f"벡터 차원이 다릅니다: {embeddings.shape[1]} != {self.dimension}")
+
+            rows = []
+            for item_id, metadata in zip(ids, metadatas):
+                row = self._rows.get(item_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._ids.append(item_id)
+                    self._metadatas.append(None)
+                    self._rows[item_id] = row
+                self._metadatas[row] = dict(metadata)
+                rows.append(row)
+
+            self._ensure_capacity(self._size)
+            rows = np.asarray(rows, dtype=np.int64)
+            self._vectors[rows] = embeddings
+            if len(self._sq_norms) < self._size:
+                self._sq_norms = np.concatenate([self._sq_norms, np.zeros(self._size - len(self._sq_norms), dtype=np.float32)])
+            self._sq_norms[rows] = np.einsum("ij,ij->i", embeddings, embeddings)
+
+            self._key_indexes.clear()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO items (row, id, metadata) VALUES (?, ?, ?)",
+                [(int(row), self._ids[row], json.dumps(self._metadatas[row], ensure_ascii=False)) for row in rows],
+            )
+            self._conn.commit()
+
+            if self._hnsw is not None:
+                if self._size > self._hnsw.get_max_elements():
+                    self._hnsw.resize_index(max(self._size, self._hnsw.get_max_elements() * 2))
+                self._hnsw.add_items(embeddings, rows)
+            self._hnsw_dirty = True
+
+    def get(self, ids):
+        with self._lock:
+            return {i: dict(self._metadatas[self._rows[i]]) for i in ids if i in self._rows}
+
+    def get_embeddings(self, ids):
+        with self._lock:
+            return {i: np.array(self._vectors[self._rows[i]]) for i in ids if i in self._rows}
+
+    def query(self, embedding, n_results, where=None):
+        with self._lock:
+            if not self._rows or n_results <= 0:
+                return []
+            query = np.asarray(embedding, dtype=np.float32).reshape(-1)
+            candidates = None
+            if where:
+                candidates = np.flatnonzero(self._match_mask(where))
+                if len(candidates) == 0:
+                    return []
+
+            rows = None
+            # 조건을 만족하는 항목이 적으면 HNSW 그래프를 헤매는 것보다 후보만 전수 탐색하는 편이 빠름
+            if self._use_hnsw and (candidates is None or len(candidates) > max(self.EXACT_SEARCH_MAX, n_results * 20)):
+                if self._hnsw is None:
+                    self._load_hnsw()
+                row_filter = None
+                if candidates is not None:
+                    allowed = np.zeros(self._size, dtype=bool)
+                    allowed[candidates] = True
+                    row_filter = lambda row: bool(allowed[row])
+                k = min(n_results, len(self._rows) if candidates is None else len(candidates))
+                try:
+                    labels, distances = self._hnsw.knn_query(query, k=k, filter=row_filter)
+                    rows, dists = labels[0], distances[0]
+                except RuntimeError:
+                    # HNSW 탐색에서 조건을 만족하는 항목을 k개 찾지 못하면 hnswlib이 실패 -> 전수 탐색으로 대체
+                    rows = None
+
+            if rows is None:
+                if candidates is None:
+                    candidates = np.fromiter((row for row, item_id in enumerate(self._ids) if item_id is not None), dtype=np.int64)
+                rows, dists = self._exact_search(query, candidates, n_results)
+
+            return [(self._ids[row], float(dist), dict(self._metadatas[row])) for row, dist in zip(rows, dists)]
+
+    def _key_index(self, key: str) -> Dict[Any, np.ndarray]:
+        index = self._key_indexes.get(key)
+        if index is None:
+            postings: Dict[Any, List[int]] = {}
+            for row, metadata in enumerate(self._metadatas):
+                if metadata is not None and key in metadata:
+                    postings.setdefault(metadata[key], []).append(row)
+            index = self._key_indexes[key] = {value: np.asarray(rows, dtype=np.int64) for value, rows in postings.items()}
+        return index
+
+    def _rows_mask(self, *row_arrays) -> np.ndarray:
+        mask = np.zeros(self._size, dtype=bool)
+        for rows in row_arrays:
+            mask[rows] = True
+        return mask
+
+    def _match_mask(self, where: dict) -> np.ndarray:
+        """where 절(ChromaDB 형식)을 만족하는 row의 bool 마스크 (키별 역색인 + 집합 연산)
+        범위 연산($gt 등)은 키의 서로 다른 값마다 한 번씩만 비교
+        """
+        live = self._key_indexes.get("\0live")
+        if live is None:
+            live = self._key_indexes["\0live"] = np.array([item_id is not None for item_id in self._ids], dtype=bool)
+        mask = live.copy()
+        for key, condition in where.items():
+            if key == "$and":
+                for part in condition:
+                    mask &= self._match_mask(part)
+                continue
+            if key == "$or":
+                any_mask = np.zeros(self._size, dtype=bool)
+                for part in condition:
+                    any_mask |= self._match_mask(part)
+                mask &= any_mask
+                continue
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            index = self._key_index(key)
+            for op, operand in condition.items():
+                if op not in _OPERATORS:
+                    raise ValueError(f"지원하지 않는 where 연산자: {op}")
+                if op in ("$eq", "$ne"):
+                    matched = self._rows_mask(*[index[operand]] if operand in index else [])
+                elif op in ("$in", "$nin"):
+                    matched = self._rows_mask(*[index[value] for value in operand if value in index])
+                else:
+                    fn = _OPERATORS[op]
+                    matched = self._rows_mask(*[rows for value, rows in index.items() if fn(value, operand)])
+                # $ne/$nin은 키가 없는 항목도 통과 (compile_where와 같은 의미)
+                mask &= ~matched if op in ("$ne", "$nin") else matched
+        return mask
+
+    def _exact_search(self, query: np.ndarray, candidates: np.ndarray, n_results: int, chunk: int = 65536):
+        """후보 row들에 대한 정확한 제곱 L2 거리 상위 n_results (청크 단위 행렬 곱)"""
+        best_rows, best_dists = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        q_norm = float(query @ query)
+        contiguous = len(candidates) == self._size
+        for start in range(0, len(candidates), chunk):
+            rows = candidates[start:start + chunk]
+            block = self._vectors[start:start + len(rows)] if contiguous else self._vectors[rows]
+            dists = self._sq_norms[rows] - 2 * (block @ query) + q_norm
+            rows, dists = np.concatenate([best_rows, rows]), np.concatenate([best_dists, dists])
+            if len(dists) > n_results:
+                top = np.argpartition(dists, n_results - 1)[:n_results]
+                rows, dists = rows[top], dists[top]
+            best_rows, best_dists = rows, dists
+        order = np.argsort(best_dists, kind="stable")
+        return best_rows[order], np.maximum(best_dists[order], 0)
+
+    def delete(self, ids):
+        with self._lock:
+            rows = [self._rows.pop(i) for i in ids if i in self._rows]
+            for row in rows:
+                self._ids[row] = None
+                self._metadatas[row] = None
+                if self._hnsw is not None:
+                    self._hnsw.mark_deleted(row)
+                self._hnsw_dirty = True
+            self._key_indexes.clear()
+            self._conn.executemany("DELETE FROM items WHERE row = ?", [(row,) for row in rows])
+            self._conn.commit()
+
+    def count(self, where=None):
+        with self._lock:
+            if not where:
+                return len(self._rows)
+            return int(self._match_mask(where).sum())
+
+    def iter_all(self, batch_size=1000):
+        with self._lock:
+            live = [row for row, item_id in enumerate(self._ids) if item_id is not None]
+        for start in range(0, len(live), batch_size):
+            rows = live[start:start + batch_size]
+            yield [self._ids[r] for r in rows], np.array(self._vectors[rows]), [dict(self._metadatas[r]) for r in rows]
+
+    def flush(self):
+        """벡터 파일과 HNSW 인덱스를 디스크에 기록"""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            if self._hnsw is not None and self._hnsw_dirty:
+                self._hnsw.save_index(os.path.join(self.path, "hnsw.bin"))
+                self._hnsw_dirty = False
@@ -0,0 +1,107 @@
+"""외부 검색 API 응답 캐시 벤치마크 (로컬 스텁 서버)
+
+- 스트림: 실제 로그 검색어 + "{지역} {목적} 맛집" 프롬프트를 Zipf 분포로 섞은 검색 요청 (bench_query_cache와 같은 방식)
+- 검색 1건마다 추천 파이프라인과 같은 순서로 API 호출:
+  네이버 지역 검색 -> 상위 후보별 블로그 검색 / 다음 웹 검색 / 지역 검색(이름+주소) / 이미지 검색
+- --concurrency 건씩 동시에 처리하며, 캐시 시각은 스트림의 timestamp를 따르므로 엔드포인트별 TTL 만료도 재현됨
+- 캐시 없음 / 캐시 사용을 비교: 소요 시간, 외부 호출 수, 히트율, 절약한 호출 수, 디스크 크기
+- 마지막으로 캐시가 빈 상태에서 같은 검색어를 --burst 개 스레드가 동시에 요청했을 때 외부 호출 수 (single-flight)
+
+실행: python -m backend.benchmarks.bench_api_cache [--queries 500] [--concurrency 8]
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from backend.app import apiCache, service
+from backend.app.apiCache import ApiCache, endpoint_name
+from backend.benchmarks.bench_query_cache import synthetic_stream
+from backend.benchmarks.bench_recommendation_pipeline import StubServer
+
+def configure(stub: StubServer):
+    service.NAVER_LOCAL_URL = f"{stub.base}/naver/local"
+    service.NAVER_BLOG_SEARCH_URL = f"{stub.base}/naver/blog"
+    service.NAVER_IMAGE_URL = f"{stub.base}/naver/image"
+    service.KAKAO_WEB_SEARCH_URL = f"{stub.base}/kakao/web"
+    service.KAKAO_REST_KEY = service.KAKAO_REST_KEY or "bench"
+    # 스텁 URL에도 실제 엔드포인트의 기본 TTL을 적용
+    real = {"naver_local": service.NAVER_LOCAL_URL, "naver_blog": service.NAVER_BLOG_SEARCH_URL,
+            "naver_image": service.NAVER_IMAGE_URL, "kakao_web": service.KAKAO_WEB_SEARCH_URL}
+    ttls = apiCache.endpoint_ttls()
+    return {endpoint_name(url): ttls[name] for name, url in real.items()}
+
+def handle(query: str):
+    """추천 요청 1건이 보내는 검색 API 호출"""
+    for item in service.search_naver_local(query, display=5)[:3]:
+        name = service._clean_html(item.get("title", ""))
+        address = item.get("roadAddress") or item.get("address", "")
+        service._naver_get(service.NAVER_BLOG_SEARCH_URL, {"query": f"{name} 후기", "display": 5})
+        service.kakao_search_web(f"{name} 후기", size=5)
+        service.search_naver_local(f"{name} {address}", display=1)
+        service.fetch_image_url(name)
+
+def replay(stream, stub: StubServer, cache, concurrency: int, clock: dict):
+    apiCache.api_cache, apiCache.API_CACHE_ENABLED = cache, cache is not None
+    stub.requests.clear()
+    start_ts = datetime.fromisoformat(stream[0]["timestamp"])
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for i in range(0, len(stream), concurrency):
+            batch = stream[i:i + concurrency]
+            clock["now"] = (datetime.fromisoformat(batch[0]["timestamp"]) - start_ts).total_seconds()
+            list(pool.map(handle, [entry["query"] for entry in batch]))
+    return time.perf_counter() - start, sum(stub.requests.values())
+
+def run(args):
+    stub = StubServer(args.api_ms, 0, 0)
+    ttls = configure(stub)
+    stream = synthetic_stream(args.queries, seed=0, per_minute=args.per_minute)
+    hours = (datetime.fromisoformat(stream[-1]["timestamp"]) - datetime.fromisoformat(stream[0]["timestamp"])).total_seconds() / 3600
+    print(f"스트림 {len(stream)}건 / 고유 검색어 {len({e['query'] for e in stream})}개 / {hours:.1f}시간, "
+          f"API 스텁 지연 {args.api_ms:.0f}ms, 동시 처리 {args.concurrency}건")
+
+    clock = {"now": 0.0}
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            off_time, off_calls = replay(stream, stub, None, args.concurrency, clock)
+            path = os.path.join(tmp, "api_cache.sqlite3")
+            cache = ApiCache(path, ttls=ttls, clock=lambda: clock["now"])
+            on_time, on_calls = replay(stream, stub, cache, args.concurrency, clock)
+            stats = cache.stats()
+
+            print(f"{'cache':<5} | {'time(s)':>7} | {'outbound calls':>14} | {'hit rate':>8} | {'saved calls':>11} | {'expired':>7}")
+            print(f"{'off':<5} | {off_time:>7.2f} | {off_calls:>14} | {'-':>8} | {'-':>11} | {'-':>7}")
+            print(f"{'on':<5} | {on_time:>7.2f} | {on_calls:>14} | {stats['hit_rate']:>8.3f} | {stats['saved_calls']:>11} | {stats['expired']:>7}")
+            for name, counts in stats["endpoints"].items():
+                lookups = counts["hits"] + counts["misses"]
+                print(f"  {name:<40} hit rate {counts['hits'] / max(lookups, 1):.3f} ({counts['hits']}/{lookups}), TTL {cache.ttl(name) / 3600:.0f}h")
+            rows, raw = cache._conn.execute("SELECT COUNT(*), SUM(LENGTH(body)) FROM responses").fetchone()
+            print(f"  디스크: {stats['disk_entries']}개 항목, 압축 본문 평균 {raw / max(rows, 1):.0f} bytes, 파일 {os.path.getsize(path) / 1024:.0f} KiB")
+            cache.close()
+
+            # single-flight: 빈 캐시에 같은 검색어 동시 요청
+            burst_cache = ApiCache(os.path.join(tmp, "burst.sqlite3"), ttls=ttls)
+            apiCache.api_cache = burst_cache
+            stub.requests.clear()
+            with ThreadPoolExecutor(args.burst) as pool:
+                list(pool.map(lambda _: service.search_naver_local("성수 데이트 맛집", display=5), range(args.burst)))
+            burst_stats = burst_cache.stats()
+            print(f"동시 요청 {args.burst}건 (같은 검색어): 외부 호출 {sum(stub.requests.values())}회, "
+                  f"single-flight 공유 {burst_stats['shared']}건")
+            burst_cache.close()
+        finally:
+            apiCache.api_cache = None
+            stub.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=500, help="검색 요청 수")
+    parser.add_argument("--per-minute", type=float, default=0.5, help="분당 검색 수 (TTL 대비 스트림 길이 결정)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--api-ms", type=float, default=50, help="API 스텁 지연")
+    parser.add_argument("--burst", type=int, default=32)
+    args = parser.parse_args()
+    run(args)
@@ -0,0 +1,153 @@
+"""맛집 상세 정보 중복 처리 벤치마크: 같은 맛집의 동시 캐시 미스를 한 번만 처리하는지 측정 (로컬 스텁 서버)
+
+- 맛집 --restaurants곳에 대한 같은 요청(service.get_restaurants_details_async)을 동시에 여러 번 실행
+  * threads : 한 프로세스에서 --requests개 스레드가 각자 이벤트 루프로 요청 (FastAPI 동기 엔드포인트와 같음)
+              DETAILS_SINGLE_FLIGHT 끔 / 켬 비교
+  * workers : --workers개 프로세스(uvicorn 워커 대역)가 동시에 요청, DETAILS_LOCK_BACKEND none / file 비교
+              NumpyVectorStore는 여러 프로세스가 함께 쓸 수 없으므로 벡터 DB 조회/저장을 공용 SQLite 파일로 대체
+- 스텁 서버/Gemini 스텁/가짜 벡터 변환은 bench_recommendation_pipeline과 같고, LLM 응답 캐시와 API 캐시는 끔
+- gemini / pages: 스텁 서버가 받은 Gemini 요청 / 블로그 페이지 요청 수, upserts: 벡터 DB에 저장한 맛집 수 (중복 포함),
+  p50 / max(s): 요청별 응답 시간, ok: 모든 요청이 모든 맛집의 상세 정보를 받았는지
+
+실행: python -m backend.benchmarks.bench_details_flight [--restaurants 5] [--requests 8] [--workers 4]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from backend.app import llmCache, restaurantLock, service, vectorDBService
+from backend.app.vectorStore import NumpyVectorStore
+from backend.benchmarks.bench_recommendation_pipeline import StubServer, configure
+
+def places(n: int):
+    return [(f"벤치식당{i}", f"서울특별시 강남구 테헤란로 {100 + i}") for i in range(n)]
+
+class SharedStore:
+    """여러 프로세스가 함께 쓰는 벡터 DB 대역 (메타데이터만 SQLite에 저장, 저장 횟수를 함께 기록)"""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS restaurants (id TEXT PRIMARY KEY, metadata TEXT NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS writes (id TEXT NOT NULL)")
+            self._conn.commit()
+
+    def get_restaurants(self, restaurant_ids):
+        ids = list(dict.fromkeys(restaurant_ids))
+        with self._lock:
+            rows = self._conn.execute(f"SELECT id, metadata FROM restaurants WHERE id IN ({','.join('?' * len(ids))})", ids).fetchall()
+        return {restaurant_id: json.loads(metadata) for restaurant_id, metadata in rows}
+
+    def upsert_restaurants(self, batch):
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO restaurants VALUES (?, ?)",
+                                   [(restaurant_id, json.dumps(metadata, ensure_ascii=False)) for restaurant_id, _, metadata in batch])
+            self._conn.executemany("INSERT INTO writes VALUES (?)", [(restaurant_id,) for restaurant_id, _, _ in batch])
+            self._conn.commit()
+
+    def writes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0]
+
+def prepare(base: str):
+    configure(SimpleNamespace(base=base), real_embeddings=False)
+    llmCache.LLM_CACHE_ENABLED = False
+
+def timed_request(targets):
+    start = time.perf_counter()
+    results = asyncio.run(service.get_restaurants_details_async(None, targets))
+    return time.perf_counter() - start, all(results)
+
+def run_threads(stub: StubServer, targets, args, single_flight: bool):
+    """한 프로세스에서 args.requests개 스레드가 동시에 같은 요청"""
+    service.DETAILS_SINGLE_FLIGHT = single_flight
+    upserts = []
+    real_upsert = vectorDBService.upsert_restaurants
+    vectorDBService.upsert_restaurants = lambda batch: (upserts.extend(batch), real_upsert(batch))
+    barrier = threading.Barrier(args.requests)
+    outcomes = [None] * args.requests
+
+    def request(i):
+        barrier.wait()
+        outcomes[i] = timed_request(targets)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            vectorDBService.vector_store, vectorDBService.geo_index = NumpyVectorStore(tmp), None
+            threads = [threading.Thread(target=request, args=(i,)) for i in range(args.requests)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            vectorDBService.vector_store.flush()
+            vectorDBService.vector_store = None
+    finally:
+        vectorDBService.upsert_restaurants = real_upsert
+    return outcomes, len(upserts)
+
+def worker(base: str, store_path: str, lock_backend: str, lock_dir: str, targets, barrier, outcomes):
+    """워커 프로세스 하나: 공용 SQLite를 벡터 DB로 쓰고 다른 워커와 동시에 같은 요청"""
+    prepare(base)
+    store = SharedStore(store_path)
+    vectorDBService.get_restaurants, vectorDBService.upsert_restaurants = store.get_restaurants, store.upsert_restaurants
+    restaurantLock.DETAILS_LOCK_BACKEND, restaurantLock.DETAILS_LOCK_DIR = lock_backend, lock_dir
+    barrier.wait()
+    outcomes.put(timed_request(targets))
+
+def run_workers(stub: StubServer, targets, args, lock_backend: str):
+    """args.workers개 프로세스가 동시에 같은 요청"""
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = os.path.join(tmp, "restaurants.sqlite3")
+        store = SharedStore(store_path)
+        barrier, outcomes = ctx.Barrier(args.workers), ctx.Queue()
+        processes = [ctx.Process(target=worker, args=(stub.base, store_path, lock_backend, os.path.join(tmp, "locks"),
+                                                      targets, barrier, outcomes)) for _ in range(args.workers)]
+        for process in processes:
+            process.start()
+        results = [outcomes.get() for _ in processes]
+        for process in processes:
+            process.join()
+        return results, store.writes()
+
+def run(args):
+    stub = StubServer(args.api_ms, args.page_ms, args.llm_ms)
+    prepare(stub.base)
+    targets = places(args.restaurants)
+    print(f"맛집 {len(targets)}곳, 스텁 지연: API {args.api_ms:.0f}ms / 페이지 {args.page_ms:.0f}ms / LLM {args.llm_ms:.0f}ms")
+    print(f"{'scenario':<8} | {'mode':<13} | {'callers':>7} | {'gemini':>6} | {'pages':>5} | {'upserts':>7} | {'p50(s)':>6} | {'max(s)':>6} | {'ok':>3}")
+    cases = [("threads", "flight off", args.requests, lambda: run_threads(stub, targets, args, False)),
+             ("threads", "flight on", args.requests, lambda: run_threads(stub, targets, args, True)),
+             ("workers", "lock none", args.workers, lambda: run_workers(stub, targets, args, "none")),
+             ("workers", "lock file", args.workers, lambda: run_workers(stub, targets, args, "file"))]
+    try:
+        for scenario, mode, callers, fn in cases:
+            stub.requests.clear()
+            outcomes, upserts = fn()
+            latencies = [elapsed for elapsed, _ in outcomes]
+            ok = "yes" if all(complete for _, complete in outcomes) else "no"
+            print(f"{scenario:<8} | {mode:<13} | {callers:>7} | {stub.requests['gemini']:>6} | {stub.requests['page']:>5} | "
+                  f"{upserts:>7} | {statistics.median(latencies):>6.2f} | {max(latencies):>6.2f} | {ok:>3}")
+    finally:
+        stub.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--restaurants", type=int, default=5, help="요청 하나에 들어 있는 맛집 수")
+    parser.add_argument("--requests", type=int, default=8, help="threads: 동시에 들어오는 같은 요청 수")
+    parser.add_argument("--workers", type=int, default=4, help="workers: 동시에 요청하는 워커 프로세스 수")
+    parser.add_argument("--api-ms", type=float, default=80, help="검색 API 스텁 지연")
+    parser.add_argument("--page-ms", type=float, default=300, help="블로그 페이지 스텁 지연")
+    parser.add_argument("--llm-ms", type=float, default=1500, help="Gemini 스텁 지연")
+    args = parser.parse_args()
+    run(args)
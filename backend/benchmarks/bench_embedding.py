@@ -0,0 +1,58 @@
+"""text_to_vectors 배치 크기별 처리량 및 임베딩 캐시 효과 벤치마크 (CPU)
+
+실행: python -m backend.benchmarks.bench_embedding --texts 512
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from backend.app import nlpService
+from backend.app.embeddingCache import EmbeddingCache
+from backend.benchmarks.corpus import review_snippets
+
+BATCH_SIZES = [1, 8, 32, 128]
+
+def run(n_texts: int, batch_sizes=BATCH_SIZES):
+    # 중복 제거/캐시 효과가 섞이지 않도록 서로 다른 스니펫만 사용하고 캐시는 끈 상태로 측정
+    texts = list(dict.fromkeys(review_snippets(n_texts * 2, seed=1)))[:n_texts]
+    nlpService.EMBEDDING_CACHE_ENABLED = False
+    nlpService.embedding_cache = None
+    nlpService.text_to_vectors(texts[:8])  # 워밍업
+
+    print(f"{'batch_size':>10} | {'texts/sec':>10} | {'elapsed(s)':>10}")
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        nlpService.text_to_vectors(texts, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{batch_size:>10} | {len(texts) / elapsed:>10.1f} | {elapsed:>10.2f}")
+
+    # 기존 방식(한 건씩 text_to_vector 호출)과 비교
+    start = time.perf_counter()
+    for text in texts:
+        nlpService.text_to_vector(text)
+    elapsed = time.perf_counter() - start
+    print(f"{'per-item':>10} | {len(texts) / elapsed:>10.1f} | {elapsed:>10.2f}")
+
+def run_cache(n_texts: int):
+    """콜드 캐시 / 메모리 히트 / 재시작 후(디스크 히트) 처리 시간 비교"""
+    texts = list(dict.fromkeys(review_snippets(n_texts * 2, seed=2)))[:n_texts]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "embedding_cache.sqlite3")
+        phases = [("cold", None), ("memory hit", None), ("restart (disk hit)", "restart")]
+        print(f"{'phase':>20} | {'texts/sec':>10} | stats")
+        for phase, action in phases:
+            if action == "restart" or nlpService.embedding_cache is None:
+                nlpService.embedding_cache = EmbeddingCache(path, nlpService.get_vector_model().name)
+            start = time.perf_counter()
+            nlpService.text_to_vectors(texts)
+            elapsed = time.perf_counter() - start
+            print(f"{phase:>20} | {len(texts) / elapsed:>10.1f} | {nlpService.embedding_cache.stats()}")
+        nlpService.embedding_cache = None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=512, help="벤치마크에 사용할 텍스트 수")
+    args = parser.parse_args()
+    run(args.texts)
+    run_cache(args.texts)
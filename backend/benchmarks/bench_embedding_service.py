@@ -0,0 +1,93 @@
+"""임베딩 사이드카 vs 워커별 모델 로딩: 메모리/처리량 비교 (워커 1, 4, 8개)
+
+각 워커는 별도 프로세스(uvicorn 워커 역할)로, 8개씩 끊어서 text_to_vectors를 호출
+- in-process: 워커마다 모델과 Okt를 로드
+- sidecar   : 사이드카 하나가 모델을 소유하고 워커는 소켓으로 요청 (micro-batching)
+메모리는 모든 워커(+사이드카)의 RSS 합계
+
+실행: python -m backend.benchmarks.bench_embedding_service --texts 256 --workers 1 4 8
+"""
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.benchmarks.corpus import review_snippets
+
+REQUEST_SIZE = 8
+
+def _rss_mb(pid="self") -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def _worker(addr: str, seed: int, n_texts: int, barrier, results):
+    # spawn된 새 인터프리터에서 nlpService를 import 하기 전에 환경 변수를 설정
+    os.environ["EMBEDDING_SERVICE_ADDR"] = addr
+    from backend.app import nlpService
+
+    texts = review_snippets(n_texts, seed=seed)
+    nlpService.text_to_vectors(texts[:REQUEST_SIZE])  # 워밍업 (in-process 모드는 여기서 모델 로드)
+    barrier.wait()
+    start = time.perf_counter()
+    for i in range(0, len(texts), REQUEST_SIZE):
+        nlpService.text_to_vectors(texts[i:i + REQUEST_SIZE])
+    results.put((time.perf_counter() - start, _rss_mb(), len(texts)))
+
+def _run_workers(addr: str, workers: int, n_texts: int):
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(workers), ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(addr, 100 + i, n_texts, barrier, results)) for i in range(workers)]
+    for p in procs:
+        p.start()
+    outputs = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    elapsed = max(o[0] for o in outputs)
+    return sum(o[1] for o in outputs), sum(o[2] for o in outputs) / elapsed
+
+def _start_sidecar(addr: str) -> subprocess.Popen:
+    from backend.app.embeddingService import EmbeddingClient
+
+    proc = subprocess.Popen([sys.executable, "-m", "backend.app.embeddingService", "--addr", addr])
+    client = EmbeddingClient(addr, retry_after=0)
+    for _ in range(600):
+        try:
+            client.stats()
+            return proc
+        except OSError:
+            time.sleep(0.5)
+    proc.kill()
+    raise RuntimeError("사이드카가 시작되지 않았습니다.")
+
+def run(n_texts: int, workers_list):
+    # 캐시 효과를 배제하기 위해 임베딩 캐시는 끄고 측정
+    os.environ["EMBEDDING_CACHE_ENABLED"] = "0"
+    print(f"{'mode':>10} | {'workers':>7} | {'RSS total(MB)':>13} | {'texts/sec':>9}")
+    for workers in workers_list:
+        rss, throughput = _run_workers("", workers, n_texts)
+        print(f"{'in-process':>10} | {workers:>7} | {rss:>13.0f} | {throughput:>9.1f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        addr = f"unix:{os.path.join(tmp, 'embedding.sock')}"
+        sidecar = _start_sidecar(addr)
+        try:
+            for workers in workers_list:
+                rss, throughput = _run_workers(addr, workers, n_texts)
+                rss += _rss_mb(sidecar.pid)
+                print(f"{'sidecar':>10} | {workers:>7} | {rss:>13.0f} | {throughput:>9.1f}")
+        finally:
+            sidecar.terminate()
+            sidecar.wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=256, help="워커 하나가 인코딩할 텍스트 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="비교할 워커 수 목록")
+    args = parser.parse_args()
+    run(args.texts, args.workers)
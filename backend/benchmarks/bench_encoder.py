@@ -0,0 +1,62 @@
+"""인코더 백엔드(torch / onnx / onnx-int8) 정합성 검사 및 지연/처리량 벤치마크
+
+- 정합성: 고정 코퍼스에 대해 torch 기준 임베딩과의 코사인 유사도(평균/최소)
+- 지연: 텍스트 1건 encode의 p50/p95 (ms)
+- 처리량: 배치 32로 전체 코퍼스를 encode 했을 때 texts/sec
+
+실행: python -m backend.benchmarks.bench_encoder --texts 256
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.app.encoderBackend import OnnxEncoder, TorchEncoder
+from backend.app.koreanPreprocessor import clean_text
+from backend.app.nlpService import EMBEDDING_MODEL_NAME
+from backend.benchmarks.corpus import review_snippets
+
+# 백엔드별 최소 코사인 유사도 기준
+PARITY_THRESHOLDS = {"onnx": 0.999, "onnx-int8": 0.95}
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+def _latency_ms(encoder, texts, repeat: int = 50):
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        encoder.encode([texts[i % len(texts)]], batch_size=1)
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.percentile(samples, 50), np.percentile(samples, 95)
+
+def _throughput(encoder, texts, batch_size: int = 32):
+    start = time.perf_counter()
+    encoder.encode(texts, batch_size=batch_size)
+    return len(texts) / (time.perf_counter() - start)
+
+def run(n_texts: int, model_dir: str):
+    # 형태소 분석기 없이도 돌 수 있도록 정규식 정제만 거친 텍스트 사용
+    texts = [clean_text(t) for t in review_snippets(n_texts, seed=4)]
+    encoders = {"torch": TorchEncoder(EMBEDDING_MODEL_NAME)}
+    for backend in ("onnx", "onnx-int8"):
+        encoders[backend] = OnnxEncoder(EMBEDDING_MODEL_NAME, model_dir, quantize=(backend == "onnx-int8"))
+
+    reference = encoders["torch"].encode(texts)
+    print(f"{'backend':>10} | {'cos mean':>8} | {'cos min':>8} | {'parity':>6} | {'p50 ms':>7} | {'p95 ms':>7} | {'texts/sec':>9}")
+    for backend, encoder in encoders.items():
+        encoder.encode(texts[:8])  # 워밍업
+        cos = _cosine(reference, encoder.encode(texts))
+        threshold = PARITY_THRESHOLDS.get(backend, 1.0 - 1e-6)
+        parity = "PASS" if cos.min() >= threshold else "FAIL"
+        p50, p95 = _latency_ms(encoder, texts)
+        print(f"{backend:>10} | {cos.mean():>8.5f} | {cos.min():>8.5f} | {parity:>6} | {p50:>7.2f} | {p95:>7.2f} | {_throughput(encoder, texts):>9.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=256, help="정합성/처리량 측정에 사용할 텍스트 수")
+    parser.add_argument("--model-dir", default="./onnx_models/bench", help="ONNX 변환 결과를 저장할 디렉터리")
+    args = parser.parse_args()
+    run(args.texts, args.model_dir)
@@ -0,0 +1,104 @@
+"""추천 첫 응답 시간 벤치마크: 요청 안에서 보강 (inline) vs 기본 정보만 반환 + 작업 큐 보강 (background, enrichQueue)
+
+- 서로 다른 지역의 추천 요청 --requests개를 --concurrency개 스레드에서 보냄 (모두 콜드 캐시, 후보 --candidates곳)
+- 스텁 서버/Gemini 스텁/가짜 벡터 변환은 bench_recommendation_pipeline과 같음 (API 캐시/페이지 저장소/LLM 캐시 끔)
+  * inline     : service.RECOMMENDATION_MODE=inline, 응답에 상세 정보가 모두 들어 있음
+  * background : 응답은 네이버 Local 기본 정보, 같은 프로세스의 워커 --workers개가 SQLite 작업 큐에서 보강
+                 응답을 받은 뒤 --poll-ms 간격으로 보강 상태(service.get_enrichment_status)를 조회해 모두 ready가 될 때까지 기다림
+- first: 요청부터 첫 응답까지, complete: 요청부터 모든 후보의 상세 정보를 받을 때까지 (inline은 first와 같음)
+  gemini: Gemini 스텁 요청 수, detailed: 상세 정보를 받은 후보 수 / 전체 후보 수
+
+실행: python -m backend.benchmarks.bench_enrich_queue [--requests 20] [--concurrency 4] [--workers 2]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.app import enrichQueue, llmCache, service, vectorDBService
+from backend.app.vectorStore import NumpyVectorStore
+from backend.benchmarks.bench_recommendation_pipeline import StubServer, configure
+from backend.benchmarks.corpus import REGIONS
+
+USER = SimpleNamespace(id=1, interests="데이트,회식")
+
+def percentile(values, q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+def wait_enriched(restaurant_ids, poll: float, timeout: float = 120):
+    """모든 맛집의 보강이 끝날 때까지 (ready, done, failed, unknown) 보강 상태를 조회하고 ready인 맛집 수를 반환"""
+    deadline = time.monotonic() + timeout
+    while True:
+        statuses = service.get_enrichment_status(restaurant_ids)
+        if all(s["status"] in ("ready", enrichQueue.DONE, enrichQueue.FAILED, enrichQueue.UNKNOWN) for s in statuses) or time.monotonic() >= deadline:
+            return sum(1 for s in statuses if s["status"] == "ready")
+        time.sleep(poll)
+
+def one_request(i: int, mode: str, poll: float):
+    request = SimpleNamespace(user_id=1, prompt=f"{REGIONS[i % len(REGIONS)]}{i} 데이트")
+    start = time.perf_counter()
+    result = asyncio.run(service.get_personalized_recommendation_async(None, request, USER))
+    first = time.perf_counter() - start
+    restaurants = result["restaurants"]
+    if mode == "inline":
+        return first, first, len(restaurants), len(restaurants)
+    detailed = wait_enriched([r["restaurant_id"] for r in restaurants], poll)
+    return first, time.perf_counter() - start, detailed, len(restaurants)
+
+def run_mode(stub: StubServer, mode: str, args):
+    service.RECOMMENDATION_MODE = mode
+    with tempfile.TemporaryDirectory() as tmp:
+        vectorDBService.vector_store, vectorDBService.geo_index = NumpyVectorStore(tmp), None
+        enrichQueue.enrich_queue = enrichQueue.EnrichQueue(enrichQueue.sqlite_engine(os.path.join(tmp, "enrich_queue.sqlite3")),
+                                                           retry_backoff=0)
+        workers = [enrichQueue.EnrichWorker(enrichQueue.enrich_queue, poll_interval=args.poll_ms / 1000).start()
+                   for _ in range(args.workers if mode == "background" else 0)]
+        stub.requests.clear()
+        try:
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                outcomes = list(pool.map(lambda i: one_request(i, mode, args.poll_ms / 1000), range(args.requests)))
+        finally:
+            for worker in workers:
+                worker.stop()
+            vectorDBService.vector_store.flush()
+            vectorDBService.vector_store = None
+            enrichQueue.enrich_queue.engine.dispose()
+            enrichQueue.enrich_queue = None
+    firsts = [first for first, _, _, _ in outcomes]
+    completes = [complete for _, complete, _, _ in outcomes]
+    detailed, total = sum(o[2] for o in outcomes), sum(o[3] for o in outcomes)
+    print(f"{mode:<10} | {percentile(firsts, 50):>9.3f} | {percentile(firsts, 95):>9.3f} | {percentile(completes, 50):>12.2f} | "
+          f"{percentile(completes, 95):>12.2f} | {stub.requests['gemini']:>6} | {detailed:>4}/{total:<4}")
+
+def run(args):
+    stub = StubServer(args.api_ms, args.page_ms, args.llm_ms)
+    configure(stub, real_embeddings=False)
+    llmCache.LLM_CACHE_ENABLED = False
+    stub.items_per_search = (args.candidates + 1) // 2
+    service.RECOMMENDATION_CANDIDATES = args.candidates
+    print(f"요청 {args.requests}개 (동시 {args.concurrency}개), 후보 {args.candidates}곳, 보강 워커 {args.workers}개, "
+          f"스텁 지연: API {args.api_ms:.0f}ms / 페이지 {args.page_ms:.0f}ms / LLM {args.llm_ms:.0f}ms")
+    print(f"{'mode':<10} | {'first p50':>9} | {'first p95':>9} | {'complete p50':>12} | {'complete p95':>12} | {'gemini':>6} | detailed")
+    try:
+        for mode in ("inline", "background"):
+            run_mode(stub, mode, args)
+    finally:
+        stub.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="추천 요청 수 (지역이 모두 다름)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 보내는 요청 수")
+    parser.add_argument("--candidates", type=int, default=5, help="요청별 추천 후보 수")
+    parser.add_argument("--workers", type=int, default=2, help="background: 보강 워커 스레드 수")
+    parser.add_argument("--poll-ms", type=float, default=100, help="background: 보강 상태 조회/큐 확인 간격")
+    parser.add_argument("--api-ms", type=float, default=80, help="검색 API 스텁 지연")
+    parser.add_argument("--page-ms", type=float, default=300, help="블로그 페이지 스텁 지연")
+    parser.add_argument("--llm-ms", type=float, default=1500, help="Gemini 스텁 지연")
+    args = parser.parse_args()
+    run(args)
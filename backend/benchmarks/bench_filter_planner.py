@@ -0,0 +1,84 @@
+"""필터 검색 벤치마크: pre-filter vs post-filter vs 자동 선택(planner)
+
+필터 종류
+- selective : 지역 1곳 + 카테고리 1개 + 가격대 1개 (약 0.4%)
+- medium    : 카테고리 1개 (약 15%)
+- broad     : 리뷰 신뢰도 10 이상 (약 90%)
+
+측정 항목: 쿼리 지연 p50/p99, recall@k (조건을 만족하는 항목 중 전수 탐색 결과 기준)
+
+실행: python -m backend.benchmarks.bench_filter_planner [--n 20000] [--backends numpy chroma]
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from backend.app import schemas, vectorDBService
+from backend.app.metadataCodec import restaurant_codec
+from backend.app.vectorStore import ChromaVectorStore, NumpyVectorStore, compile_where
+from backend.benchmarks.bench_vector_store import make_vectors
+from backend.benchmarks.corpus import restaurant_metadata
+
+FILTERS = {
+    "selective": schemas.RestaurantFilter(regions=["강남"], categories=["한식"], price_ranges=["1-2만원"]),
+    "medium": schemas.RestaurantFilter(categories=["카페"]),
+    "broad": schemas.RestaurantFilter(min_review_trust_score=10),
+}
+
+def make_store(backend: str, path: str):
+    if backend == "chroma":
+        import chromadb
+        collection = chromadb.PersistentClient(path=path).get_or_create_collection(name="bench")
+        return ChromaVectorStore(lambda: collection)
+    return NumpyVectorStore(path, use_hnsw=True)
+
+def run(n: int, dim: int, k: int, n_queries: int, backends):
+    records = restaurant_metadata(n, seed=0)
+    encoded = restaurant_codec.encode_many(records)
+    vectors = make_vectors(n, dim, seed=0)
+    queries = make_vectors(n_queries, dim, seed=1)
+    sq_norms = np.einsum("ij,ij->i", vectors, vectors)
+
+    print(f"{'backend':<7} | {'filter':<9} | {'select.':>7} | {'strategy':<8} | {'p50(ms)':>8} | {'p99(ms)':>8} | {f'recall@{k}':>9}")
+    for backend in backends:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = make_store(backend, tmp)
+            for start in range(0, n, 5000):
+                store.upsert([str(i) for i in range(start, min(n, start + 5000))], vectors[start:start + 5000], encoded[start:start + 5000])
+            vectorDBService.vector_store = store
+            vectorDBService.generation += 1
+
+            for filter_name, filters in FILTERS.items():
+                where = vectorDBService.build_where(filters)
+                matches = compile_where(where)
+                rows = np.array([i for i, metadata in enumerate(encoded) if matches(metadata)])
+                selectivity, _ = vectorDBService.estimate_selectivity(where)
+                truth = []
+                for q in queries:
+                    dists = sq_norms[rows] - 2 * (vectors[rows] @ q)
+                    truth.append({records[i]["name"] for i in rows[np.argsort(dists)[:k]]})
+
+                for strategy in ("pre", "post", None):
+                    latencies, hits = [], 0
+                    for q, expected in zip(queries, truth):
+                        start = time.perf_counter()
+                        results = vectorDBService.query_similar_restaurants(q, k, filters=filters, strategy=strategy)
+                        latencies.append((time.perf_counter() - start) * 1000)
+                        hits += len({r["name"] for r in results} & expected)
+                    label = strategy or f"auto:{vectorDBService.plan_filtered_query(where)}"
+                    print(f"{backend:<7} | {filter_name:<9} | {selectivity:>7.3f} | {label:<8} | "
+                          f"{np.percentile(latencies, 50):>8.2f} | {np.percentile(latencies, 99):>8.2f} | "
+                          f"{hits / sum(len(t) for t in truth):>9.3f}")
+    vectorDBService.vector_store = None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=20_000, help="맛집 수")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--backends", nargs="+", default=["numpy", "chroma"], choices=["numpy", "chroma"])
+    args = parser.parse_args()
+    run(args.n, args.dim, args.k, args.queries, args.backends)
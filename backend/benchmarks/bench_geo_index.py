@@ -0,0 +1,103 @@
+"""공간 색인 벤치마크 (맛집 좌표 100k개)
+
+- 색인 생성 / 증분 추가 시간
+- within_radius(500m, 2km), in_bbox(약 1km x 1km), k_nearest(10) : 격자 색인 vs numpy 전수 계산 지연 시간과 결과 일치 여부
+- 유사도 검색 + 반경 교집합 (vectorDBService.query_similar_restaurants(near=...))
+
+실행: python -m backend.benchmarks.bench_geo_index [--n 100000]
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from backend.app import vectorDBService
+from backend.app.geoIndex import GeoIndex, haversine_m, parse_naver_coordinates
+from backend.app.metadataCodec import restaurant_codec
+from backend.app.vectorStore import NumpyVectorStore
+from backend.benchmarks.bench_vector_store import make_vectors
+from backend.benchmarks.corpus import restaurant_metadata
+
+def _percentiles(fn, args_list):
+    latencies, results = [], []
+    for args in args_list:
+        start = time.perf_counter()
+        results.append(fn(*args))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, 50), np.percentile(latencies, 99), results
+
+def run(n: int, n_queries: int, similarity_n: int, dim: int):
+    records = restaurant_metadata(n, seed=0)
+    points = np.array([parse_naver_coordinates(r["mapx"], r["mapy"]) for r in records])
+    ids = [str(i) for i in range(n)]
+    lats, lngs = points[:, 0], points[:, 1]
+
+    index = GeoIndex()
+    start = time.perf_counter()
+    index.upsert_many(zip(ids, lats, lngs))
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(1000):
+        index.upsert(f"new-{i}", lats[i] + 1e-4, lngs[i] + 1e-4)
+    incremental = (time.perf_counter() - start) / 1000 * 1e6
+    index.remove(f"new-{i}" for i in range(1000))
+    print(f"n={n}: 색인 생성 {build:.2f}s, 증분 추가 {incremental:.1f}us/건")
+
+    rng = np.random.default_rng(1)
+    centers = [(float(rng.uniform(37.45, 37.65)), float(rng.uniform(126.8, 127.2))) for _ in range(n_queries)]
+
+    def brute_radius(lat, lng, meters):
+        d = haversine_m(lat, lng, lats, lngs)
+        return {ids[i] for i in np.flatnonzero(d <= meters)}
+
+    def brute_bbox(lat0, lng0, lat1, lng1):
+        return {ids[i] for i in np.flatnonzero((lats >= lat0) & (lats <= lat1) & (lngs >= lng0) & (lngs <= lng1))}
+
+    def brute_knn(lat, lng, k):
+        d = haversine_m(lat, lng, lats, lngs)
+        return [ids[i] for i in np.argsort(d, kind="stable")[:k]]
+
+    cases = [
+        ("radius 500m", lambda lat, lng: index.within_radius(lat, lng, 500), lambda lat, lng: brute_radius(lat, lng, 500),
+         lambda got, expected: {i for i, _ in got} == expected),
+        ("radius 2km", lambda lat, lng: index.within_radius(lat, lng, 2000), lambda lat, lng: brute_radius(lat, lng, 2000),
+         lambda got, expected: {i for i, _ in got} == expected),
+        ("bbox ~1km", lambda lat, lng: index.in_bbox(lat, lng, lat + 0.009, lng + 0.011),
+         lambda lat, lng: brute_bbox(lat, lng, lat + 0.009, lng + 0.011), lambda got, expected: set(got) == expected),
+        ("k_nearest 10", lambda lat, lng: index.k_nearest(lat, lng, 10), lambda lat, lng: brute_knn(lat, lng, 10),
+         lambda got, expected: [i for i, _ in got] == expected),
+    ]
+    print(f"{'query':<13} | {'index p50(ms)':>13} | {'index p99(ms)':>13} | {'brute p50(ms)':>13} | {'match':>5}")
+    for name, indexed, brute, same in cases:
+        p50, p99, got = _percentiles(indexed, centers)
+        b50, _, expected = _percentiles(brute, centers)
+        matched = sum(same(g, e) for g, e in zip(got, expected))
+        print(f"{name:<13} | {p50:>13.3f} | {p99:>13.3f} | {b50:>13.3f} | {matched:>2}/{len(centers)}")
+
+    # 유사도 검색 + 반경 교집합
+    with tempfile.TemporaryDirectory() as tmp:
+        store = NumpyVectorStore(tmp)
+        subset = records[:similarity_n]
+        vectors = make_vectors(len(subset), dim, seed=0)
+        for start in range(0, len(subset), 5000):
+            store.upsert(ids[start:min(start + 5000, len(subset))], vectors[start:start + 5000], restaurant_codec.encode_many(subset[start:start + 5000]))
+        vectorDBService.vector_store, vectorDBService.geo_index = store, None
+        vectorDBService.get_geo_index()
+        queries = make_vectors(n_queries, dim, seed=2)
+        print(f"유사도 + 반경 교집합 (n={len(subset)}, dim={dim})")
+        for radius in (500, 2000, 10000):
+            args = [(q, 10, None, None, (lat, lng, radius)) for q, (lat, lng) in zip(queries, centers)]
+            p50, p99, results = _percentiles(vectorDBService.query_similar_restaurants, args)
+            ok = all(r["distance_m"] <= radius for result in results for r in result)
+            print(f"  radius {radius:>5}m | p50 {p50:.2f}ms | p99 {p99:.2f}ms | 평균 결과 {np.mean([len(r) for r in results]):.1f}곳 | 반경 준수 {ok}")
+        vectorDBService.vector_store, vectorDBService.geo_index = None, None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100_000, help="좌표 수")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--similarity-n", type=int, default=20_000, help="유사도 + 반경 교집합에 사용할 맛집 수")
+    parser.add_argument("--dim", type=int, default=128)
+    args = parser.parse_args()
+    run(args.n, args.queries, args.similarity_n, args.dim)
@@ -0,0 +1,182 @@
+"""본문 추출 벤치마크: readability + BeautifulSoup(html.parser) vs htmlExtract (사이트별 lxml 규칙 -> readability)
+
+- HTML 픽스처: --fixtures 디렉터리(index.json: {"파일명": "원래 URL"})에 저장된 페이지를 사용하고,
+  지정하지 않으면 자주 수집하는 레이아웃을 흉내 낸 페이지를 생성
+  (네이버 블로그 PostView 스마트에디터 ONE/2.0, 모바일 블로그, 티스토리, 다음 뉴스, 브런치, 규칙이 없는 개인 블로그)
+  생성한 페이지는 실제처럼 본문 앞뒤에 큰 스크립트/스타일/내비게이션/댓글/관련 글 영역을 포함
+- before: 기존 service.extract_main_text_from_html (Document(html).summary() -> BeautifulSoup html.parser)
+- after : htmlExtract.extract (현재 프로세스), --byte-cap으로 자른 HTML(스트리밍으로 받을 때와 같음), 프로세스 풀(--workers)
+- 일치도: 두 결과에서 service.extract_review_snippets_from_text로 뽑은 리뷰 문장 집합의 Jaccard (레이아웃별 평균)
+  byte cap이 본문 앞에서 끊으면 agree(cap)이 떨어지므로 기본값(PAGE_BYTE_CAP)이 충분한지 확인할 수 있음
+
+실행: python -m backend.benchmarks.bench_html_extract [--pages 20] [--workers 1 2 4]
+"""
+import argparse
+import json
+import os
+import random
+import time
+from collections import defaultdict
+
+from bs4 import BeautifulSoup
+from readability import Document
+
+from backend.app import htmlExtract, pageStore, service
+from backend.benchmarks.corpus import load_sentences
+
+ENDINGS = ["", " 진짜 추천해요", " 재방문 의사 있어요", " ㅎㅎ", " 다음에 또 올게요", " 가족이랑 오기 좋아요"]
+
+def _script(rng: random.Random, kb: int) -> str:
+    state = {f"key{i}": {"id": rng.randint(0, 10 ** 9), "title": f"item {i}", "flags": [True, False, None]} for i in range(kb * 12)}
+    return f"<script>window.__INITIAL_STATE__ = {json.dumps(state)};</script>"
+
+def _style(kb: int) -> str:
+    return "<style>" + "".join(f".c{i}{{margin:{i % 7}px;padding:{i % 5}px;color:#{i % 4096:03x}}}" for i in range(kb * 25)) + "</style>"
+
+def _links(prefix: str, n: int) -> str:
+    return "".join(f"<li><a href='/{prefix}/{i}'>{prefix} 글 목록 {i} 맛집 추천 모음</a></li>" for i in range(n))
+
+def _paragraphs(rng: random.Random, sentences, n: int):
+    return [" ".join(s.rstrip(".") + rng.choice(ENDINGS) + "." for s in rng.sample(sentences, rng.randint(1, 3))) for _ in range(n)]
+
+def _comments(rng: random.Random, sentences) -> str:
+    return "".join(f"<li class='comment'><span class='nick'>방문자{i}</span><p>{rng.choice(sentences)}</p></li>" for i in range(rng.randint(3, 8)))
+
+def naver_se(rng, sentences):
+    body = "".join(
+        f"<div class='se-component se-text'><div class='se-component-content'><div class='se-module se-module-text'>"
+        f"<p class='se-text-paragraph'><span class='se-fs-'>{p}</span></p><p class='se-text-paragraph'><span>​</span></p></div></div></div>"
+        + ("<div class='se-component se-image'><img src='https://postfiles.pstatic.net/a.jpg'></div>" if i % 3 == 0 else "")
+        for i, p in enumerate(_paragraphs(rng, sentences, rng.randint(8, 20))))
+    return (f"<html><head><title>네이버 블로그</title>{_style(40)}{_script(rng, 120)}</head><body>"
+            f"<div id='blog-menu'><ul>{_links('category', 80)}</ul></div>"
+            f"<div class='se-viewer'><div class='se-main-container'>{body}</div></div>"
+            f"<div class='post_footer'><ul class='u_cbox_list'>{_comments(rng, sentences)}</ul></div>"
+            f"<div class='related'><ul>{_links('post', 40)}</ul></div>{_script(rng, 80)}</body></html>")
+
+def naver_se2(rng, sentences):
+    body = "".join(f"<p>{p}</p><p>&nbsp;</p>" for p in _paragraphs(rng, sentences, rng.randint(8, 20)))
+    return (f"<html><head>{_style(20)}{_script(rng, 80)}</head><body><div id='blog-menu'><ul>{_links('category', 60)}</ul></div>"
+            f"<div id='postViewArea'><div class='post-view'>{body}</div></div>"
+            f"<div class='comments'><ul>{_comments(rng, sentences)}</ul></div>{_script(rng, 60)}</body></html>")
+
+def tistory(rng, sentences):
+    body = "".join(f"<p data-ke-size='size16'>{p}</p>" for p in _paragraphs(rng, sentences, rng.randint(8, 20)))
+    return (f"<html><head>{_style(30)}{_script(rng, 30)}</head><body><div id='sidebar'><ul>{_links('category', 50)}</ul></div>"
+            f"<div class='entry-content'><div class='tt_article_useless_p_margin contents_style'>{body}</div></div>"
+            f"<div class='another_category'><ul>{_links('tag', 20)}</ul></div>"
+            f"<div class='comments'><ol>{_comments(rng, sentences)}</ol></div>{_script(rng, 20)}</body></html>")
+
+def daum_news(rng, sentences):
+    body = "".join(f"<p dmcf-ptype='general'>{p}</p>" for p in _paragraphs(rng, sentences, rng.randint(6, 14)))
+    return (f"<html><head>{_style(30)}{_script(rng, 50)}</head><body><div class='gnb'><ul>{_links('news', 60)}</ul></div>"
+            f"<div class='news_view'><div class='article_view'><section>{body}</section></div></div>"
+            f"<div class='box_rank'><ol>{_links('rank', 30)}</ol></div>{_script(rng, 40)}</body></html>")
+
+def brunch(rng, sentences):
+    body = "".join(f"<h4 class='wrap_item item_type_text'>{p}</h4>" for p in _paragraphs(rng, sentences, rng.randint(8, 16)))
+    return (f"<html><head>{_style(15)}{_script(rng, 40)}</head><body><div class='wrap_body text_align_left'>{body}</div>"
+            f"<div class='wrap_article_recommend'><ul>{_links('brunch', 30)}</ul></div>{_script(rng, 20)}</body></html>")
+
+def personal_blog(rng, sentences):
+    body = "".join(f"<p>{p}</p>" for p in _paragraphs(rng, sentences, rng.randint(8, 20)))
+    return (f"<html><head>{_style(10)}{_script(rng, 15)}</head><body><header><nav><ul>{_links('menu', 20)}</ul></nav></header>"
+            f"<div id='content'><div class='post'><h1>맛집 후기</h1>{body}</div></div>"
+            f"<aside><ul>{_links('recent', 25)}</ul></aside><footer>Powered by WordPress</footer></body></html>")
+
+LAYOUTS = [
+    ("naver_se_one", "https://blog.naver.com/PostView.naver?blogId=foodie{i}&logNo=22{i:09d}", naver_se),
+    ("naver_mobile", "https://m.blog.naver.com/foodie{i}/22{i:09d}", naver_se),
+    ("naver_se2", "https://blog.naver.com/PostView.naver?blogId=oldblog{i}&logNo=11{i:09d}", naver_se2),
+    ("tistory", "https://matzip{i}.tistory.com/{i}", tistory),
+    ("daum_news", "https://v.daum.net/v/2024{i:010d}", daum_news),
+    ("brunch", "https://brunch.co.kr/@writer{i}/{i}", brunch),
+    ("unknown", "https://myfoodlog{i}.example.com/2024/review-{i}", personal_blog),
+]
+
+def generate_fixtures(pages_per_layout: int, seed: int = 0):
+    rng = random.Random(seed)
+    sentences = load_sentences()
+    return [(layout, url.format(i=i), make(rng, sentences)) for layout, url, make in LAYOUTS for i in range(pages_per_layout)]
+
+def load_fixtures(directory: str):
+    with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+        index = json.load(f)
+    fixtures = []
+    for filename, url in index.items():
+        with open(os.path.join(directory, filename), encoding="utf-8", errors="replace") as f:
+            fixtures.append((htmlExtract.rule_for(url).name if htmlExtract.rule_for(url) else "unknown", url, f.read()))
+    return fixtures
+
+def readability_bs4(html: str) -> str:
+    try:
+        return BeautifulSoup(Document(html).summary(), "html.parser").get_text(separator="\n").strip()
+    except Exception:
+        return ""
+
+def snippets(text: str) -> set:
+    return set(service.extract_review_snippets_from_text(text))
+
+def agreement(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+def timed(fn, items):
+    """(페이지별 소요 시간 목록, 결과 목록)"""
+    times, results = [], []
+    for item in items:
+        start = time.perf_counter()
+        results.append(fn(item))
+        times.append(time.perf_counter() - start)
+    return times, results
+
+def cap(html: str, byte_cap: int) -> str:
+    return html.encode("utf-8")[:byte_cap].decode("utf-8", errors="ignore")
+
+def run(args):
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else generate_fixtures(args.pages)
+    total_mb = sum(len(html.encode("utf-8")) for _, _, html in fixtures) / 1e6
+    capped_html = [cap(html, args.byte_cap) for _, _, html in fixtures]
+    capped_mb = sum(len(html.encode("utf-8")) for html in capped_html) / 1e6
+    print(f"픽스처 {len(fixtures)}개 ({total_mb:.1f}MB, 평균 {total_mb * 1e3 / len(fixtures):.0f}KB), "
+          f"byte cap {args.byte_cap // 1024}KB -> {capped_mb:.1f}MB, CPU {os.cpu_count()}개")
+
+    before_times, before = timed(lambda f: readability_bs4(f[2]), fixtures)
+    after_times, after = timed(lambda f: htmlExtract.extract(f[2], f[1]), fixtures)
+    capped_times, capped = timed(lambda i: htmlExtract.extract(capped_html[i], fixtures[i][1]), range(len(fixtures)))
+    before_time, after_time, capped_time = sum(before_times), sum(after_times), sum(capped_times)
+
+    by_layout = defaultdict(list)
+    for i, (layout, _, _) in enumerate(fixtures):
+        by_layout[layout].append(i)
+    print(f"{'layout':<13} | {'pages':>5} | {'method':<11} | {'before ms':>9} | {'after ms':>8} | {'speedup':>7} | {'agree':>5} | {'agree(cap)':>10}")
+    for layout, ids in by_layout.items():
+        b = sum(before_times[i] for i in ids) / len(ids) * 1000
+        a = sum(after_times[i] for i in ids) / len(ids) * 1000
+        agree = sum(agreement(snippets(before[i]), snippets(after[i].text)) for i in ids) / len(ids)
+        agree_cap = sum(agreement(snippets(before[i]), snippets(capped[i].text)) for i in ids) / len(ids)
+        methods = "/".join(sorted({after[i].method for i in ids}))
+        print(f"{layout:<13} | {len(ids):>5} | {methods:<11} | {b:>9.1f} | {a:>8.1f} | {b / a:>6.1f}x | {agree:>5.2f} | {agree_cap:>10.2f}")
+
+    print(f"전체: before {len(fixtures) / before_time:.1f} pages/s, after {len(fixtures) / after_time:.1f} pages/s "
+          f"({before_time / after_time:.1f}x), byte cap 적용 {len(fixtures) / capped_time:.1f} pages/s")
+
+    pages = [(html, url) for _, url, html in fixtures]
+    for workers in args.workers:
+        htmlExtract.close_pool()
+        htmlExtract.HTML_EXTRACT_WORKERS = workers
+        htmlExtract.extract_many(pages[:workers]) # 워커 프로세스 시작 시간 제외
+        start = time.perf_counter()
+        results = htmlExtract.extract_many(pages)
+        elapsed = time.perf_counter() - start
+        same = all(r.text == a.text for r, a in zip(results, after))
+        print(f"프로세스 풀 {workers}개: {len(pages) / elapsed:.1f} pages/s (결과 동일: {same})")
+    htmlExtract.close_pool()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=None, help="저장된 HTML 픽스처 디렉터리 (index.json 포함)")
+    parser.add_argument("--pages", type=int, default=20, help="생성할 레이아웃별 페이지 수")
+    parser.add_argument("--byte-cap", type=int, default=pageStore.PAGE_BYTE_CAP, help="본문을 받을 최대 바이트 수")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4], help="프로세스 풀 크기")
+    args = parser.parse_args()
+    run(args)
@@ -0,0 +1,164 @@
+"""공용 HTTP 클라이언트 벤치마크: 요청마다 새 연결(기존 requests.get) vs 연결 풀 재사용(httpClient)
+
+- 로컬 HTTPS 스텁 서버(자체 서명 인증서, openssl 필요 / --no-tls 이면 HTTP)에 같은 요청을 반복
+- 새 연결을 맺을 때마다 --connect-ms 만큼 지연시켜 실제 외부 API까지의 TCP/TLS 왕복 비용을 흉내
+- 순차 / 스레드 --threads 개 동시 요청의 초당 요청 수(req/s)와 새로 맺은 연결 수 비교
+- --flaky N 이면 N번째 요청마다 503을 반환하여 재시도(MAX_RETRY) 효과도 비교
+
+실행: python -m backend.benchmarks.bench_http_client [--requests 300] [--threads 16]
+"""
+import argparse
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from backend.app.httpClient import HttpClient, HttpError
+
+class StubServer:
+    """keep-alive를 지원하는 로컬 API 스텁 (새 연결마다 connect_ms 지연)"""
+
+    def __init__(self, connect_ms: float, response_ms: float, flaky: int, certfile: str = None):
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.context = None
+        if certfile:
+            self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.context.load_cert_chain(certfile)
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                with stub._lock:
+                    stub.connections += 1
+                time.sleep(connect_ms / 1000)
+                if stub.context:
+                    # TLS 핸드셰이크는 연결별 스레드에서 수행
+                    self.request = stub.context.wrap_socket(self.request, server_side=True)
+                super().setup()
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    failed = flaky and stub.requests % flaky == 0
+                time.sleep(response_ms / 1000)
+                body = b'{"items": []}' if not failed else b'{"errorMessage": "busy"}'
+                self.send_response(503 if failed else 200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.server.request_queue_size = 128
+        scheme = "https" if certfile else "http"
+        self.url = f"{scheme}://localhost:{self.server.server_address[1]}/v1/search/local.json"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self):
+        with self._lock:
+            self.connections = self.requests = 0
+
+    def shutdown(self):
+        self.server.shutdown()
+
+def make_certificate(directory: str) -> str:
+    """localhost용 자체 서명 인증서(키 포함 PEM) 생성"""
+    path = os.path.join(directory, "localhost.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=localhost",
+         "-addext", "subjectAltName=DNS:localhost", "-keyout", path, "-out", path],
+        check=True, capture_output=True,
+    )
+    return path
+
+def old_get(url: str) -> bool:
+    # 기존 service._naver_get 방식: 요청마다 새 연결, 재시도 없음
+    try:
+        resp = requests.get(url, params={"query": "강남 맛집"}, timeout=5)
+        resp.raise_for_status()
+        resp.json()
+        return True
+    except requests.exceptions.RequestException:
+        return False
+
+def pooled_get(client: HttpClient):
+    def get(url: str) -> bool:
+        try:
+            client.get_json(url, params={"query": "강남 맛집"}, timeout=5)
+            return True
+        except HttpError:
+            return False
+    return get
+
+def measure(stub: StubServer, get, n: int, threads: int):
+    stub.reset()
+    start = time.perf_counter()
+    if threads <= 1:
+        results = [get(stub.url) for _ in range(n)]
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            results = list(pool.map(get, [stub.url] * n))
+    elapsed = time.perf_counter() - start
+    return n / elapsed, stub.connections, sum(results) / n
+
+def run(args):
+    tmp = tempfile.mkdtemp()
+    certfile = None
+    if not args.no_tls and shutil.which("openssl"):
+        certfile = make_certificate(tmp)
+        # requests/httpx 모두 이 인증서를 신뢰하도록 설정
+        os.environ["REQUESTS_CA_BUNDLE"] = os.environ["SSL_CERT_FILE"] = certfile
+    stub = StubServer(args.connect_ms, args.response_ms, args.flaky, certfile)
+
+    clients = [("requests.get (old)", None)]
+    clients.append(("httpClient requests", HttpClient(backend="requests", backoff=0.01)))
+    try:
+        clients.append(("httpClient httpx", HttpClient(backend="httpx", backoff=0.01)))
+    except ImportError:
+        pass
+
+    print(f"{'TLS' if certfile else 'HTTP'} 스텁: 새 연결 {args.connect_ms:.0f}ms, 응답 {args.response_ms:.0f}ms"
+          + (f", {args.flaky}번째 요청마다 503" if args.flaky else ""))
+    print(f"{'client':<20} | {'threads':>7} | {'req/s':>8} | {'connections':>11} | {'success':>7} | {'speedup':>7}")
+    try:
+        for threads in args.threads:
+            n = args.requests if threads > 1 else max(args.requests // 4, 1)
+            baseline = None
+            for name, client in clients:
+                get = old_get if client is None else pooled_get(client)
+                rate, connections, success = measure(stub, get, n, threads)
+                baseline = baseline or rate
+                print(f"{name:<20} | {threads:>7} | {rate:>8.1f} | {connections:>11} | {success:>7.1%} | {rate / baseline:>6.1f}x")
+    finally:
+        for _, client in clients:
+            if client is not None:
+                client.close()
+        stub.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400, help="동시 요청 측정 시 요청 수 (순차는 1/4)")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--connect-ms", type=float, default=30, help="새 연결마다 추가되는 지연 (TCP/TLS 왕복 흉내)")
+    parser.add_argument("--response-ms", type=float, default=5)
+    parser.add_argument("--flaky", type=int, default=0, help="N번째 요청마다 503 응답 (0이면 사용 안 함)")
+    parser.add_argument("--no-tls", action="store_true")
+    args = parser.parse_args()
+    run(args)
@@ -0,0 +1,110 @@
+"""LLM 응답 캐시 벤치마크: 캐시 없음 vs llmCache.CachedLLMClient (로컬 Gemini 대역 FakeLLMClient)
+
+- recrawl : 맛집 --restaurants곳을 summarizer로 요약한 뒤, 같은 맛집을 순서를 섞어(배치 구성이 달라짐) 다시 요약
+            두 번째에는 --changed 비율의 맛집만 리뷰 스니펫이 바뀜 -> 나머지는 항목별 캐시 히트
+- restart : recrawl 이후 캐시 파일을 닫고 다시 열어(서버 재시작) 같은 맛집을 한 번 더 요약 -> 디스크 히트
+- course  : 코스 생성 프롬프트(service.course_prompt) --course-requests개를 --threads개 스레드에서 동시에 요청,
+            지역/일정/테마 조합은 --course-combos가지 -> 동시에 들어온 같은 프롬프트는 single-flight로 한 번만 호출
+- 지연 시간: 기본 --base-ms + 출력 토큰당 --output-ms (모두 --time-scale배)
+- calls: 실제 LLM 호출 수, hit rate / saved tok: 그 단계의 캐시 히트율과 절약한 추정 토큰 수,
+  upstream ms / hit ms: 누적 평균 LLM 응답 시간 / 캐시 히트 조회 시간 (llmCache stats)
+
+실행: python -m backend.benchmarks.bench_llm_cache [--restaurants 30] [--changed 0.2]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from backend.app import llmCache, service, summarizer
+from backend.app.llmClient import FakeLLMClient
+from backend.benchmarks.corpus import REGIONS, review_snippets
+
+THEMES = ["데이트", "기념일", "가족 나들이", "친구 모임", "혼밥"]
+SLOTS = [("12:00", "18:00"), ("18:00", "22:00"), ("10:00", "15:00")]
+
+def restaurant_jobs(n: int, reviews: int, seed: int):
+    snippets = review_snippets(n * reviews, seed=seed)
+    return [(f"맛집{i}", {"name": f"맛집{i}", "crawled_info": {"crawled_reviews": snippets[i * reviews:(i + 1) * reviews]}})
+            for i in range(n)]
+
+def recrawl_jobs(jobs, changed: float, reviews: int, seed: int = 7):
+    """changed 비율의 맛집은 리뷰를 바꾸고, 전체 순서를 섞음 (배치 구성이 첫 번째와 달라짐)"""
+    rng = random.Random(seed)
+    fresh = restaurant_jobs(len(jobs), reviews, seed=seed)
+    mixed = [fresh[i] if rng.random() < changed else job for i, job in enumerate(jobs)]
+    rng.shuffle(mixed)
+    return mixed
+
+def course_requests(n: int, combos: int, seed: int = 3):
+    rng = random.Random(seed)
+    pool = [SimpleNamespace(location=REGIONS[i % len(REGIONS)], start_time=SLOTS[i % len(SLOTS)][0],
+                            end_time=SLOTS[i % len(SLOTS)][1], theme=THEMES[i % len(THEMES)]) for i in range(combos)]
+    return [service.course_prompt(rng.choice(pool)) for _ in range(n)]
+
+def fake_client(args):
+    return FakeLLMClient(base_latency=args.base_ms / 1000 * args.time_scale,
+                         output_token_latency=args.output_ms / 1000 * args.time_scale, input_token_latency=0)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def run(args):
+    first = restaurant_jobs(args.restaurants, args.reviews, seed=1)
+    second = recrawl_jobs(first, args.changed, args.reviews)
+    prompts = course_requests(args.course_requests, args.course_combos)
+    print(f"맛집 {args.restaurants}곳 (재크롤링 시 {args.changed:.0%} 변경), 코스 요청 {len(prompts)}개 / 조합 {args.course_combos}가지 "
+          f"/ 스레드 {args.threads}개, 지연 x{args.time_scale}")
+
+    print(f"{'mode':<8} | {'phase':<13} | {'wall(s)':>7} | {'calls':>5} | {'hit rate':>8} | {'saved tok':>9} | {'upstream ms':>11} | {'hit ms':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm_cache.sqlite3")
+        for mode in ("none", "cache"):
+            fake = fake_client(args)
+            cache = llmCache.LLMCache(path) if mode == "cache" else None
+            client = llmCache.CachedLLMClient(fake, cache) if cache else fake
+
+            def measure(phase, fn):
+                """단계별 경과 시간, LLM 호출 수, 캐시 통계 변화량 (히트율은 그 단계의 조회만)"""
+                before, calls = (cache.stats() if cache else {}), fake.calls
+                elapsed, _ = timed(fn)
+                after = cache.stats() if cache else {}
+                delta = {k: after.get(k, 0) - before.get(k, 0) for k in ("hits", "misses", "saved_tokens")}
+                lookups = delta["hits"] + delta["misses"]
+                print(f"{mode:<8} | {phase:<13} | {elapsed:>7.2f} | {fake.calls - calls:>5} | "
+                      f"{delta['hits'] / lookups if lookups else 0:>8.2f} | {delta['saved_tokens']:>9} | "
+                      f"{after.get('upstream_latency_ms') or 0:>11.1f} | {after.get('hit_latency_ms') or 0:>6.2f}")
+
+            summarize = lambda jobs: summarizer.summarize_many(client, service.SUMMARY_TASK, jobs, retry_backoff=0)
+            measure("recrawl(1st)", lambda: summarize(first))
+            measure("recrawl(2nd)", lambda: summarize(second))
+
+            if cache:
+                # 서버 재시작: 같은 파일을 다시 열어 디스크에 남은 항목으로 응답
+                cache.close()
+                cache = llmCache.LLMCache(path)
+                client = llmCache.CachedLLMClient(fake, cache)
+            measure("restart", lambda: summarize(second))
+            with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                measure("course", lambda: list(pool.map(client.generate, prompts)))
+            if cache:
+                cache.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--restaurants", type=int, default=30, help="요약할 맛집 수")
+    parser.add_argument("--reviews", type=int, default=20, help="맛집별 리뷰 스니펫 수")
+    parser.add_argument("--changed", type=float, default=0.2, help="재크롤링 시 리뷰가 바뀐 맛집 비율")
+    parser.add_argument("--course-requests", type=int, default=40, help="코스 생성 요청 수")
+    parser.add_argument("--course-combos", type=int, default=8, help="지역/일정/테마 조합 수")
+    parser.add_argument("--threads", type=int, default=8, help="코스 요청 동시 실행 수")
+    parser.add_argument("--base-ms", type=float, default=1000, help="요청당 기본 지연 (ms)")
+    parser.add_argument("--output-ms", type=float, default=4, help="출력 토큰당 지연 (ms)")
+    parser.add_argument("--time-scale", type=float, default=0.2, help="지연 시간 배율 (벤치마크 시간 단축용)")
+    args = parser.parse_args()
+    run(args)
@@ -0,0 +1,78 @@
+"""LLM 요약 벤치마크: 맛집마다 요청 vs summarizer.BatchSummarizer (로컬 Gemini 대역 FakeLLMClient)
+
+- 맛집 --restaurants곳의 크롤링 정보(리뷰 스니펫 --reviews개 + 신뢰도)를 service.SUMMARY_TASK 형식으로 요약
+- FakeLLMClient 지연 시간 = 기본 지연 + 입력/출력 토큰 수에 비례하는 시간 (--base-ms, --output-ms, 모두 --time-scale배)
+  * per-item serial : 맛집마다 요청 하나, 하나씩 (기존 RestaurantCrawler / RestaurantRecommender)
+  * per-item x4     : 맛집마다 요청 하나, 동시에 4개 (기존 service, LLM_CONCURRENCY 4)
+  * batched         : 토큰 예산(--batch-tokens) 안에서 묶어 동시에 --concurrency개
+  * batched+faults  : batched와 같지만 항목 --fail-rate 비율이 누락/형식 오류, 응답 --malformed-rate 비율이 잘린 JSON
+  * batched+nulls   : batched와 같지만 항목 --null-rate 비율이 배열 값을 null로 넣거나 뺌 (재시도 없이 빈 배열로 받아야 함)
+- requests: LLM 요청 수, in/out tok: 추정 입력/출력 토큰 합, ok: 형식 검증을 통과한 맛집 수, retried: 재시도한 항목 수,
+  lists: 결과의 배열 자리(SUMMARY_TASK)가 모두 배열인 맛집 수
+
+실행: python -m backend.benchmarks.bench_llm_summarize [--restaurants 30] [--time-scale 0.2]
+"""
+import argparse
+import time
+
+from backend.app import service, summarizer
+from backend.app.llmClient import FakeLLMClient
+from backend.benchmarks.corpus import review_snippets
+
+def restaurants(n: int, reviews: int):
+    snippets = review_snippets(n * reviews, seed=1)
+    return [(f"맛집{i}", {"name": f"맛집{i}", "crawled_info": {
+        "crawled_reviews": snippets[i * reviews:(i + 1) * reviews], "review_trust_score": 0.5 + (i % 5) / 10,
+    }}) for i in range(n)]
+
+def run_case(jobs, args, batch_items: int, concurrency: int, fail_rate: float = 0.0, malformed_rate: float = 0.0,
+             null_rate: float = 0.0):
+    client = FakeLLMClient(base_latency=args.base_ms / 1000 * args.time_scale,
+                           output_token_latency=args.output_ms / 1000 * args.time_scale,
+                           input_token_latency=args.input_ms / 1000 * args.time_scale,
+                           fail_rate=fail_rate, malformed_rate=malformed_rate, null_rate=null_rate)
+    engine = summarizer.BatchSummarizer(client, service.SUMMARY_TASK, max_batch_tokens=args.batch_tokens,
+                                        max_batch_items=batch_items, concurrency=concurrency, retry_backoff=0)
+    start = time.perf_counter()
+    results = engine.summarize([summarizer.SummaryJob(key, payload) for key, payload in jobs])
+    elapsed = time.perf_counter() - start
+    list_keys = [k for k, v in service.SUMMARY_TASK.template.items() if isinstance(v, list)]
+    lists = sum(1 for result in results.values() if all(isinstance(result.get(k), list) for k in list_keys))
+    return elapsed, engine.stats(), client, len(results), lists
+
+def run(args):
+    jobs = restaurants(args.restaurants, args.reviews)
+    print(f"맛집 {len(jobs)}곳, 리뷰 {args.reviews}개씩, 지연 모델: 기본 {args.base_ms:.0f}ms + 출력 토큰당 {args.output_ms}ms "
+          f"(x{args.time_scale}), 배치 토큰 예산 {args.batch_tokens}, 배치 최대 {args.batch_items}곳")
+    cases = [
+        ("per-item serial", 1, 1, 0.0, 0.0, 0.0),
+        ("per-item x4", 1, 4, 0.0, 0.0, 0.0),
+        (f"batched x{args.concurrency}", args.batch_items, args.concurrency, 0.0, 0.0, 0.0),
+        (f"batched+faults x{args.concurrency}", args.batch_items, args.concurrency, args.fail_rate, args.malformed_rate, 0.0),
+        (f"batched+nulls x{args.concurrency}", args.batch_items, args.concurrency, 0.0, 0.0, args.null_rate),
+    ]
+    print(f"{'mode':<22} | {'wall(s)':>7} | {'requests':>8} | {'in tok':>7} | {'out tok':>7} | {'ok':>4} | {'retried':>7} | "
+          f"{'lists':>5} | {'speedup':>7}")
+    baseline = None
+    for name, batch_items, concurrency, fail_rate, malformed_rate, null_rate in cases:
+        elapsed, stats, client, ok, lists = run_case(jobs, args, batch_items, concurrency, fail_rate, malformed_rate, null_rate)
+        baseline = baseline or elapsed
+        print(f"{name:<22} | {elapsed:>7.2f} | {stats['requests']:>8} | {client.input_tokens:>7} | {client.output_tokens:>7} | "
+              f"{ok:>4} | {stats['retried_items']:>7} | {lists:>5} | {baseline / elapsed:>6.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--restaurants", type=int, default=30, help="요약할 맛집 수")
+    parser.add_argument("--reviews", type=int, default=20, help="맛집별 리뷰 스니펫 수")
+    parser.add_argument("--base-ms", type=float, default=1000, help="요청당 기본 지연 (ms)")
+    parser.add_argument("--input-ms", type=float, default=0.05, help="입력 토큰당 지연 (ms)")
+    parser.add_argument("--output-ms", type=float, default=4, help="출력 토큰당 지연 (ms)")
+    parser.add_argument("--time-scale", type=float, default=0.2, help="지연 시간 배율 (벤치마크 시간 단축용)")
+    parser.add_argument("--batch-tokens", type=int, default=summarizer.LLM_BATCH_TOKENS, help="배치 하나의 토큰 예산")
+    parser.add_argument("--batch-items", type=int, default=summarizer.LLM_BATCH_SIZE, help="배치 하나의 최대 맛집 수")
+    parser.add_argument("--concurrency", type=int, default=summarizer.LLM_BATCH_CONCURRENCY, help="동시 배치 요청 수")
+    parser.add_argument("--fail-rate", type=float, default=0.1, help="faults: 항목 누락/형식 오류 비율")
+    parser.add_argument("--malformed-rate", type=float, default=0.05, help="faults: 잘린 JSON 응답 비율")
+    parser.add_argument("--null-rate", type=float, default=0.3, help="nulls: 배열 값을 null로 넣거나 빼는 항목 비율")
+    args = parser.parse_args()
+    run(args)
@@ -0,0 +1,96 @@
+"""메타데이터 코덱 왕복(round-trip) 속성 검사 및 기존 '|' 분할 루프와의 마이크로벤치마크
+
+- 속성 검사: 임의의 문자열('|', '[', 따옴표, 이모지, 빈 문자열 포함)과 빈 리스트/None으로 만든
+  레코드가 encode -> decode 후 (None 필드 제외) 원래 값과 같은지 확인
+- 벤치마크: 레코드 n건 encode/decode 시간 (단건 반복, 배치)
+
+실행: python -m backend.benchmarks.bench_metadata_codec --records 10000
+"""
+import argparse
+import random
+import time
+
+from backend.app.metadataCodec import restaurant_codec
+from backend.benchmarks.corpus import restaurant_metadata
+
+TRICKY_PIECES = ["|", "\x1e", "\x1f", "||", "[", "]", "\"", "\\", ",", "맛집", "🍜", " ", "a|b", "[1,2]", "null"]
+
+def legacy_encode(metadata):
+    """변경 전 vectorDBService.upsert_restaurant의 리스트 -> 문자열 변환"""
+    senitized_metadata = {}
+    for key, value in metadata.items():
+        if isinstance(value, list):
+            senitized_metadata[key] = '|'.join(value)
+        else:
+            senitized_metadata[key] = value
+    return senitized_metadata
+
+def legacy_decode(metadata):
+    """변경 전 query_similar_restaurants의 필드별 split 체인"""
+    metadata = dict(metadata)
+    for key in ('summary_pros', 'summary_cons', 'keywords', 'nearby_attractions', 'signature_menu',
+                'categories', 'summary_price', 'summary_opening_hours', 'summary_phone'):
+        if metadata.get(key):
+            metadata[key] = metadata[key].split('|')
+    if metadata.get('summary_paring'):
+        metadata['summary_parking'] = metadata['summary_parking'].split('|')
+    return metadata
+
+def _random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(TRICKY_PIECES) for _ in range(rng.randint(0, 6)))
+
+def _random_record(rng: random.Random) -> dict:
+    record = {}
+    for field in restaurant_codec.list_fields:
+        choice = rng.random()
+        if choice < 0.1:
+            record[field] = None
+        elif choice < 0.2:
+            record[field] = []
+        else:
+            record[field] = [_random_text(rng) for _ in range(rng.randint(1, 5))]
+    for field in ("name", "address", "signature_menu", "summary_price", "summary_parking"):
+        record[field] = _random_text(rng) if rng.random() > 0.1 else None
+    record["review_trust_score"] = rng.randint(0, 100)
+    return record
+
+def check_round_trip(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    legacy_failures = 0
+    for _ in range(n):
+        record = _random_record(rng)
+        expected = {k: v for k, v in record.items() if v is not None}
+        encoded = restaurant_codec.encode(record)
+        assert all(isinstance(v, (str, int, float, bool)) for v in encoded.values()), encoded
+        assert restaurant_codec.decode(encoded) == expected, (record, encoded)
+        legacy_failures += legacy_decode({k: v for k, v in legacy_encode(record).items() if v is not None}) != expected
+    batch = [_random_record(rng) for _ in range(100)]
+    assert restaurant_codec.decode_many(restaurant_codec.encode_many(batch)) == [
+        {k: v for k, v in r.items() if v is not None} for r in batch
+    ]
+    print(f"round-trip: {n}건 통과 (기존 '|' 방식은 {legacy_failures}건에서 값이 달라짐)")
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+def run(n: int):
+    check_round_trip(2000)
+    records = restaurant_metadata(n, seed=8)
+    legacy_encoded = [legacy_encode(r) for r in records]
+    encoded = restaurant_codec.encode_many(records)
+
+    print(f"{'codec':>8} | {'encode(ms)':>10} | {'decode(ms)':>10}")
+    print(f"{'legacy':>8} | {_timed(lambda: [legacy_encode(r) for r in records]):>10.1f} | "
+          f"{_timed(lambda: [legacy_decode(r) for r in legacy_encoded]):>10.1f}")
+    print(f"{'single':>8} | {_timed(lambda: [restaurant_codec.encode(r) for r in records]):>10.1f} | "
+          f"{_timed(lambda: [restaurant_codec.decode(r) for r in encoded]):>10.1f}")
+    print(f"{'batch':>8} | {_timed(lambda: restaurant_codec.encode_many(records)):>10.1f} | "
+          f"{_timed(lambda: restaurant_codec.decode_many(encoded)):>10.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=10000, help="벤치마크 레코드 수")
+    args = parser.parse_args()
+    run(args.records)
@@ -0,0 +1,99 @@
+"""리뷰 교차검증 벤치마크: difflib 전수 비교 vs MinHash LSH (nearDuplicate)
+
+- 네이버 스니펫 n개 (corpus.review_snippets), 다음 스니펫 n개 중 --dup-ratio 비율은 네이버 스니펫을 변형한 글
+  (단어 삭제/추가, 뒷부분 잘림, 글자 누락 등 퍼온 글에서 흔한 변형), 나머지는 새로 생성한 스니펫
+- baseline: 기존 cross_validate_review_sets (SequenceMatcher(...).ratio() > 0.6, 모든 쌍 비교)
+- lsh     : nearDuplicate.match_sets (service.cross_validate_review_sets가 사용)
+- 일치도 (baseline 기준)
+  * rows  : 네이버 스니펫마다 "짝이 있음/없음" 판정이 같은 비율
+  * same  : 네이버 스니펫마다 고른 다음 스니펫까지 같은 비율 (LSH가 후보를 놓친 경우에만 달라짐)
+  * score : 교차검증 점수 (baseline / lsh)
+  baseline이 너무 오래 걸리는 크기는 네이버 스니펫 앞쪽 --baseline-rows 개만 비교하여 전체 시간을 추정
+  (앞쪽 문장의 짝은 뒤쪽 문장과 무관하게 정해지므로 그 범위의 짝은 전체 실행과 같음)
+
+실행: python -m backend.benchmarks.bench_near_duplicate [--sizes 20 200 2000]
+"""
+import argparse
+import difflib
+import random
+import time
+from typing import Dict, List
+
+from backend.app import nearDuplicate
+from backend.benchmarks.corpus import review_snippets
+
+FILLERS = ["진짜", "너무", "정말", "완전", "ㅎㅎ", "솔직히", "역시"]
+
+def perturb(text: str, rng: random.Random) -> str:
+    words = text.split(" ")
+    op = rng.random()
+    if op < 0.35:
+        words = [w for w in words if rng.random() > 0.2]
+        words.insert(rng.randint(0, len(words)), rng.choice(FILLERS))
+    elif op < 0.7:
+        words = words[:max(3, int(len(words) * rng.uniform(0.6, 1.0)))]
+    else:
+        words = [w[:-1] if len(w) > 1 and rng.random() < 0.15 else w for w in words]
+    return " ".join(words)
+
+def make_sets(n: int, dup_ratio: float, seed: int):
+    rng = random.Random(seed)
+    naver = review_snippets(n, seed=seed)
+    dup_count = int(n * dup_ratio)
+    daum = [perturb(naver[i], rng) for i in rng.sample(range(n), dup_count)]
+    daum += review_snippets(n - dup_count, seed=seed + 1)
+    rng.shuffle(daum)
+    return naver, daum
+
+def difflib_matches(naver: List[str], daum: List[str], rows: int) -> Dict[int, int]:
+    """기존 구현과 같은 방식의 짝 찾기 (앞쪽 rows개 네이버 스니펫만)"""
+    used, pairs = set(), {}
+    for i, n_snip in enumerate(naver[:rows]):
+        for j, d_snip in enumerate(daum):
+            if j in used:
+                continue
+            if difflib.SequenceMatcher(None, n_snip, d_snip).ratio() > 0.6:
+                used.add(j)
+                pairs[i] = j
+                break
+    return pairs
+
+def score(cross_count: int, naver_count: int, daum_count: int) -> int:
+    total = naver_count + daum_count - cross_count
+    return min(int((cross_count * 2 / max(total, 1)) * 100), 100) if total else 0
+
+def run(args):
+    print(f"다음 스니펫 중 네이버 변형 비율 {args.dup_ratio:.0%}, LSH: {nearDuplicate.NUM_PERM} perm / {nearDuplicate.BANDS} bands, "
+          f"Jaccard >= {args.threshold}")
+    print(f"{'size':>9} | {'difflib(s)':>11} | {'lsh(s)':>8} | {'speedup':>8} | {'pairs d/l':>11} | {'rows':>5} | {'same':>5} | {'score d/l':>9}")
+    for n in args.sizes:
+        naver, daum = make_sets(n, args.dup_ratio, seed=n)
+        rows = min(n, args.baseline_rows)
+
+        start = time.perf_counter()
+        baseline = difflib_matches(naver, daum, rows)
+        difflib_time = (time.perf_counter() - start) * n / rows
+        estimated = "~" if rows < n else ""
+
+        start = time.perf_counter()
+        pairs = nearDuplicate.match_sets(naver, daum, args.threshold)
+        lsh_time = time.perf_counter() - start
+        lsh = {i: j for i, j in pairs.items() if i < rows}
+
+        row_agreement = sum(1 for i in range(rows) if (i in baseline) == (i in lsh)) / rows
+        same = sum(1 for i in range(rows) if baseline.get(i) == lsh.get(i)) / rows
+        if rows == n:
+            scores = f"{score(len(baseline), n, n)}/{score(len(pairs), n, n)}"
+        else:
+            scores = "-"
+        print(f"{n:>4}x{n:<4} | {estimated + format(difflib_time, '.3f'):>11} | {lsh_time:>8.3f} | {difflib_time / lsh_time:>7.0f}x | "
+              f"{len(baseline):>5}/{len(lsh):<5} | {row_agreement:>5.3f} | {same:>5.3f} | {scores:>9}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000], help="출처별 스니펫 수")
+    parser.add_argument("--dup-ratio", type=float, default=0.3, help="다음 스니펫 중 네이버 스니펫을 변형한 비율")
+    parser.add_argument("--baseline-rows", type=int, default=200, help="difflib로 직접 비교할 네이버 스니펫 수 (나머지는 추정)")
+    parser.add_argument("--threshold", type=float, default=nearDuplicate.NEAR_DUP_THRESHOLD, help="Jaccard 임계값")
+    args = parser.parse_args()
+    run(args)
@@ -0,0 +1,169 @@
+"""페이지 저장소 벤치마크: 같은 맛집들을 여러 번 다시 크롤링할 때의 요청 수 / 전송량 / 소요 시간
+
+- 로컬 블로그 스텁 서버: ETag / Last-Modified를 붙여 응답하고, 조건부 요청에는 304로 응답
+  * 맛집마다 블로그 글 --posts 개 중 일부는 여러 맛집이 함께 참조하는 글 ("강남 맛집 BEST 10" 등)
+  * 일부 글은 모바일 주소(m.)로도 같은 내용이 제공됨 (URL은 다르지만 내용 해시가 같음)
+- 라운드 1: 처음 크롤링 / 라운드 2: 곧바로 다시 크롤링 (fresh TTL 안)
+  라운드 3: fresh TTL이 지난 뒤 다시 크롤링 (조건부 요청, 글의 --changed 비율은 내용이 바뀜)
+- 각 라운드에서 service.fetch_main_text를 저장소 없이 / 저장소 사용으로 실행해 비교
+- 마지막으로 max_bytes를 현재 용량의 절반으로 줄여 GC
+
+실행: python -m backend.benchmarks.bench_page_store [--restaurants 60] [--posts 10]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.app import pageStore, service
+from backend.app.pageStore import DAY, PageStore
+from backend.benchmarks.corpus import review_snippets
+
+BOILERPLATE = "".join(
+    f"<li><a href='/category/{i}'>카테고리 {i}</a></li><script>var widget{i} = {{id: {i}, lazy: true}};</script>" for i in range(400)
+)
+
+class BlogServer:
+    """ETag / Last-Modified 조건부 요청을 지원하는 블로그 스텁"""
+
+    def __init__(self, page_ms: float):
+        self.versions = Counter() # 글 id -> 내용 버전
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                post_id = self.path.rsplit("/", 1)[-1]
+                version = server.versions[post_id]
+                etag = f'"{post_id}-v{version}"'
+                last_modified = formatdate(1_700_000_000 + version * DAY, usegmt=True)
+                time.sleep(page_ms / 1000)
+                if self.headers.get("If-None-Match") == etag:
+                    server.count("304", 0)
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = server.render(post_id, version).encode("utf-8")
+                server.count("200", len(body))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def count(self, status: str, size: int):
+        with self._lock:
+            self.requests[status] += 1
+            self.bytes_sent += size
+
+    @staticmethod
+    def render(post_id: str, version: int) -> str:
+        sentences = review_snippets(12, seed=zlib.crc32(f"{post_id}:{version}".encode("utf-8")))
+        article = "".join(f"<p>{s} 정말 맛있어서 재방문 의사 있어요.</p>" for s in sentences)
+        return (f"<html><head><title>{post_id}</title></head><body><nav><ul>{BOILERPLATE}</ul></nav>"
+                f"<article><h1>방문 후기 {post_id}</h1>{article}</article><footer>{BOILERPLATE}</footer></body></html>")
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self.bytes_sent = 0
+
+    def shutdown(self):
+        self.server.shutdown()
+
+def crawl_plan(base: str, restaurants: int, posts: int, shared_posts: int, seed: int):
+    """맛집별로 크롤링할 블로그 URL 목록"""
+    rng = random.Random(seed)
+    shared = [f"shared{i}" for i in range(shared_posts)]
+    plan = []
+    for r in range(restaurants):
+        post_ids = [f"r{r}p{i}" for i in range(posts - 3)] + rng.sample(shared, 3)
+        urls = []
+        for post_id in post_ids:
+            # 일부 글은 모바일 주소로 링크됨 (같은 내용)
+            host = "m.blog" if rng.random() < 0.3 else "blog"
+            urls.append(f"{base}/{host}/{post_id}")
+        plan.append(urls)
+    return plan
+
+def crawl(plan, concurrency: int):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        texts = list(pool.map(service.fetch_main_text, [url for urls in plan for url in urls]))
+    return time.perf_counter() - start, sum(1 for t in texts if t)
+
+def run(args):
+    blog = BlogServer(args.page_ms)
+    plan = crawl_plan(blog.base, args.restaurants, args.posts, args.shared_posts, seed=0)
+    total_urls = sum(len(urls) for urls in plan)
+    post_ids = sorted({url.rsplit("/", 1)[-1] for urls in plan for url in urls})
+    print(f"맛집 {args.restaurants}곳 x 글 {args.posts}개 = 요청 {total_urls}건, 고유 글 {len(post_ids)}개, "
+          f"페이지 지연 {args.page_ms:.0f}ms, 동시 {args.concurrency}")
+
+    clock = {"now": 1_700_000_000.0}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pages.sqlite3")
+        store = PageStore(path, fresh_ttl=DAY, clock=lambda: clock["now"])
+        print(f"{'round':<22} | {'store':<5} | {'time(s)':>7} | {'200':>5} | {'304':>5} | {'MB sent':>7} | {'texts':>5}")
+        try:
+            rounds = [("1 처음", 0), ("2 바로 다시", 3600), (f"3 TTL 후, {args.changed:.0%} 변경", 2 * DAY)]
+            for name, advance in rounds:
+                clock["now"] += advance
+                if advance > DAY:
+                    rng = random.Random(1)
+                    for post_id in rng.sample(post_ids, int(len(post_ids) * args.changed)):
+                        blog.versions[post_id] += 1
+                for label, enabled in (("off", False), ("on", True)):
+                    pageStore.PAGE_STORE_ENABLED, pageStore.page_store = enabled, store if enabled else None
+                    blog.reset()
+                    elapsed, found = crawl(plan, args.concurrency)
+                    print(f"{name:<22} | {label:<5} | {elapsed:>7.2f} | {blog.requests['200']:>5} | {blog.requests['304']:>5} | "
+                          f"{blog.bytes_sent / 1e6:>7.2f} | {found:>5}")
+
+            stats = store.stats()
+            print(f"저장소: URL {stats['urls']}개 -> 내용 {stats['contents']}개 (중복 제거 {stats['deduplicated']}회), "
+                  f"HTML {stats['html_raw_bytes'] / 1e6:.1f}MB -> 압축 {stats['html_bytes'] / 1e6:.2f}MB, "
+                  f"본문 파싱 {stats['text_misses']}회 / 재사용 {stats['text_hits']}회, 파일 {os.path.getsize(path) / 1e6:.1f}MB")
+            removed = store.gc(max_bytes=stats["html_bytes"] // 2)
+            after = store.stats()
+            print(f"GC (max_bytes={stats['html_bytes'] // 2 / 1e6:.2f}MB): URL {removed}개 삭제 -> "
+                  f"URL {after['urls']}개, 내용 {after['contents']}개, 압축 {after['html_bytes'] / 1e6:.2f}MB")
+        finally:
+            pageStore.page_store = None
+            store.close()
+            blog.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--restaurants", type=int, default=60)
+    parser.add_argument("--posts", type=int, default=10, help="맛집별 블로그 글 수")
+    parser.add_argument("--shared-posts", type=int, default=20, help="여러 맛집이 함께 참조하는 글 수")
+    parser.add_argument("--changed", type=float, default=0.1, help="라운드 3 전에 내용이 바뀌는 글 비율")
+    parser.add_argument("--page-ms", type=float, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    run(args)
@@ -0,0 +1,139 @@
+"""하이브리드 검색 지연 시간 비교: ChromaDB + PostgreSQL(2회 왕복) vs pgvector 단일 쿼리
+
+- chroma+pg : ChromaDB에서 가격대 where로 k*oversample개 검색 -> 지역(주소) 후처리
+              -> PostgreSQL에서 리뷰 수 조회 후 필터 (현재 구조)
+- pgvector  : crud.search_restaurants_hybrid 한 번 (HNSW + SQL 조건 + 리뷰 수 서브쿼리)
+
+pgvector 확장이 설치된 PostgreSQL이 필요합니다 (DATABASE_URL).
+벤치마크 데이터는 이름이 'bench-'로 시작하며 끝나면 삭제합니다.
+
+실행: PGVECTOR_ENABLED=true python -m backend.benchmarks.bench_pgvector [--n 10000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+
+os.environ.setdefault("PGVECTOR_ENABLED", "true")
+
+import chromadb
+import numpy as np
+from sqlalchemy import func
+
+from backend.app import crud, models
+from backend.app.database import PGVECTOR_DIMENSION, SessionLocal
+from backend.app.metadataCodec import restaurant_codec
+from backend.app.pgvectorSync import prepare_database
+from backend.app.vectorStore import ChromaVectorStore
+from backend.benchmarks.corpus import REGIONS, restaurant_metadata
+
+PREFIX = "bench-"
+
+def load(db, n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    records = restaurant_metadata(n, seed=seed)
+    for i, record in enumerate(records):
+        record["name"] = f"{PREFIX}{i}-{record['name']}"
+    vectors = rng.standard_normal((n, PGVECTOR_DIMENSION)).astype(np.float32)
+
+    for start in range(0, n, 1000):
+        crud.upsert_restaurants_in_postgres(db, list(zip(records[start:start + 1000], vectors[start:start + 1000])))
+
+    # 리뷰 수 분포를 만들기 위한 벤치마크 사용자/리뷰
+    user = models.User(
+        name="bench", birthdate=date(2000, 1, 1), gender="-", email=f"{PREFIX}user@example.com",
+        phone=f"{PREFIX}000", address="-", hashed_password="-",
+    )
+    db.add(user)
+    db.commit()
+    restaurant_ids = [
+        r.id for r in db.query(models.Restaurant.id).filter(models.Restaurant.name.like(f"{PREFIX}%")).order_by(models.Restaurant.id)
+    ]
+    reviews = [
+        {"user_id": user.id, "restaurant_id": restaurant_id, "content": "bench", "rating": 5}
+        for restaurant_id in restaurant_ids
+        for _ in range(int(rng.poisson(3)))
+    ]
+    db.bulk_insert_mappings(models.Review, reviews)
+    db.commit()
+    return records, vectors
+
+def cleanup(db):
+    ids = db.query(models.Restaurant.id).filter(models.Restaurant.name.like(f"{PREFIX}%")).subquery()
+    db.query(models.Review).filter(models.Review.restaurant_id.in_(ids.select())).delete(synchronize_session=False)
+    db.query(models.Restaurant).filter(models.Restaurant.name.like(f"{PREFIX}%")).delete(synchronize_session=False)
+    db.query(models.User).filter(models.User.email == f"{PREFIX}user@example.com").delete(synchronize_session=False)
+    db.commit()
+
+def chroma_path(db, store, query, k, region, price_ranges, min_reviews, oversample):
+    results = store.query(query, k * oversample, where={"summary_price": {"$in": price_ranges}})
+    candidates = [(metadata, dist) for _, dist, metadata in results if region in metadata.get("address", "")]
+    if not candidates:
+        return []
+    names = [metadata["name"] for metadata, _ in candidates]
+    counts = dict(
+        db.query(models.Restaurant.name, func.count(models.Review.id))
+        .outerjoin(models.Review, models.Review.restaurant_id == models.Restaurant.id)
+        .filter(models.Restaurant.name.in_(names))
+        .group_by(models.Restaurant.name)
+    )
+    return [metadata["name"] for metadata, _ in candidates if counts.get(metadata["name"], 0) >= min_reviews][:k]
+
+def pgvector_path(db, query, k, region, price_ranges, min_reviews):
+    rows = crud.search_restaurants_hybrid(db, query, limit=k, region=region, price_ranges=price_ranges, min_review_count=min_reviews)
+    return [restaurant.name for restaurant, _, _ in rows]
+
+def run(n: int, k: int, n_queries: int, oversample: int):
+    prepare_database()
+    db = SessionLocal()
+    cleanup(db)
+    try:
+        records, vectors = load(db, n, seed=n)
+        with tempfile.TemporaryDirectory() as tmp:
+            collection = chromadb.PersistentClient(path=tmp).get_or_create_collection(name="bench")
+            store = ChromaVectorStore(lambda: collection)
+            for start in range(0, n, 5000):
+                store.upsert(
+                    [r["name"] for r in records[start:start + 5000]],
+                    vectors[start:start + 5000],
+                    restaurant_codec.encode_many(records[start:start + 5000]),
+                )
+
+            rng = np.random.default_rng(n + 1)
+            prices = sorted({r["summary_price"] for r in records})
+            timings = {"chroma+pg": [], "pgvector": []}
+            overlap = []
+            for _ in range(n_queries):
+                query = rng.standard_normal(PGVECTOR_DIMENSION).astype(np.float32)
+                region = str(rng.choice(REGIONS))
+                price_ranges = list(rng.choice(prices, size=min(2, len(prices)), replace=False))
+
+                start = time.perf_counter()
+                chroma_names = chroma_path(db, store, query, k, region, price_ranges, 2, oversample)
+                timings["chroma+pg"].append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                pg_names = pgvector_path(db, query, k, region, price_ranges, 2)
+                timings["pgvector"].append((time.perf_counter() - start) * 1000)
+
+                if pg_names:
+                    overlap.append(len(set(chroma_names) & set(pg_names)) / len(pg_names))
+
+        print(f"n={n}, k={k}, queries={n_queries}, chroma oversample={oversample}")
+        print(f"{'path':<10} | {'p50(ms)':>8} | {'p99(ms)':>8}")
+        for name, values in timings.items():
+            print(f"{name:<10} | {np.percentile(values, 50):>8.2f} | {np.percentile(values, 99):>8.2f}")
+        print(f"결과 일치율(pgvector 기준): {np.mean(overlap) if overlap else 0:.3f}")
+    finally:
+        cleanup(db)
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=10_000, help="맛집 수")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--oversample", type=int, default=10, help="chroma 경로에서 후처리 전 가져올 배수")
+    args = parser.parse_args()
+    run(args.n, args.k, args.queries, args.oversample)
@@ -0,0 +1,59 @@
+"""한국어 전처리 벤치마크: 기존 단일 스레드 함수 vs fast path vs 프로세스 풀
+
+실행: python -m backend.benchmarks.bench_preprocess --texts 5000 --workers 2 4 8
+"""
+import argparse
+import re
+import time
+
+from konlpy.tag import Okt
+
+from backend.app.koreanPreprocessor import PreprocessorPool, clean_text, filter_tokens
+from backend.benchmarks.corpus import review_snippets
+
+okt = Okt()
+
+def legacy_preprocess_text(text: str) -> str:
+    """변경 전 nlpService.preprocess_text 구현 (비교 기준)"""
+    text = re.sub(r"[^ㄱ-ㅎㅏ-ㅣ가-힣\s]", "", text)
+    tokens = okt.pos(text, stem=True)
+    stopwords = ['하다', '있다', '되다', '그', '않다', '없다', '나', '말', '사람', '이', '보다', '등', '같다', '것']
+    meaningful_tokens = [
+        word for word, pos in tokens
+        if pos in ['Noun', 'Adjective', 'Verb'] and word not in stopwords and len(word) > 1
+    ]
+    return " ".join(meaningful_tokens)
+
+def fast_preprocess_text(text: str) -> str:
+    return filter_tokens(okt.pos(clean_text(text), stem=True))
+
+def _timed(label, fn, n):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>18} | {n / elapsed:>10.1f} | {elapsed:>10.2f}")
+    return result
+
+def run(n_texts: int, workers_list):
+    texts = review_snippets(n_texts, seed=3)
+    legacy_preprocess_text(texts[0])  # JVM 워밍업
+
+    print(f"{'mode':>18} | {'texts/sec':>10} | {'elapsed(s)':>10}")
+    baseline = _timed("legacy (1 proc)", lambda: [legacy_preprocess_text(t) for t in texts], n_texts)
+    fast = _timed("fast path (1 proc)", lambda: [fast_preprocess_text(t) for t in texts], n_texts)
+    assert fast == baseline, "fast path 결과가 기존 함수와 다릅니다."
+
+    for workers in workers_list:
+        pool = PreprocessorPool(workers)
+        pool.warmup()  # 워커별 JVM 기동 시간은 측정에서 제외
+        result = _timed(f"pool x{workers}", lambda: pool.map(texts), n_texts)
+        streamed = _timed(f"pool x{workers} imap", lambda: list(pool.imap(iter(texts))), n_texts)
+        pool.close()
+        assert result == baseline and streamed == baseline, "프로세스 풀 결과 순서/내용이 기존 함수와 다릅니다."
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=5000, help="전처리할 리뷰 스니펫 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4], help="비교할 워커 수 목록")
+    args = parser.parse_args()
+    run(args.texts, args.workers)
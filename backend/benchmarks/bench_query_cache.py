@@ -0,0 +1,131 @@
+"""검색 결과 캐시 벤치마크: search_logs.json 형식의 검색 스트림 재생
+
+- 스트림: --log 파일({"query", "timestamp"} 목록)을 그대로 재생하거나,
+          실제 로그의 검색어 + "{지역} {목적} 맛집" 형태의 프롬프트를 Zipf 분포로 섞어 생성
+- 재생 중 --upsert-every 건마다 새 맛집을 저장해 세대(generation) 무효화를 발생시킴
+- 캐시 시각은 로그의 timestamp를 따르므로 TTL 만료도 재현됨
+- 같은 스트림을 캐시 없이 / 캐시 사용으로 두 번 재생해 히트율과 지연 시간을 비교
+
+쿼리 임베딩은 기본적으로 검색어 해시로 만든 가짜 벡터(+ 미세한 잡음)를 사용 (--real-embeddings 로 실제 모델 사용)
+
+실행: python -m backend.benchmarks.bench_query_cache [--queries 5000] [--log backend_test/search_logs.json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.app import vectorDBService
+from backend.app.metadataCodec import restaurant_codec
+from backend.app.queryCache import QueryCache
+from backend.app.vectorStore import ChromaVectorStore, NumpyVectorStore
+from backend.benchmarks.bench_vector_store import make_vectors
+from backend.benchmarks.corpus import REGIONS, restaurant_metadata
+
+SEARCH_LOGS_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "backend_test", "search_logs.json")
+PURPOSES = ["데이트", "회식", "가족모임", "혼밥", "브런치", "기념일"]
+
+def synthetic_stream(n: int, seed: int, per_minute: float):
+    """실제 로그 검색어 + 지역/목적 프롬프트를 Zipf 분포로 뽑은 (검색어, timestamp) 스트림"""
+    rng = np.random.default_rng(seed)
+    with open(SEARCH_LOGS_FILE, encoding="utf-8") as f:
+        prompts = list(dict.fromkeys(entry["query"] for entry in json.load(f)))
+    prompts += [f"{region} {purpose} 맛집" for region in REGIONS for purpose in PURPOSES]
+    weights = 1 / np.arange(1, len(prompts) + 1) ** 1.1
+    order = rng.permutation(len(prompts))
+    picks = rng.choice(len(prompts), size=n, p=weights / weights.sum())
+    start = datetime(2025, 9, 16, 12, 0, 0)
+    gaps = rng.exponential(60 / per_minute, size=n)
+    return [
+        {"query": prompts[order[i]], "timestamp": (start + timedelta(seconds=float(t))).isoformat()}
+        for i, t in zip(picks, np.cumsum(gaps))
+    ]
+
+def make_embedder(dim: int, real: bool, noise: float, seed: int):
+    if real:
+        from backend.app import nlpService
+        return nlpService.text_to_vector
+    rng = np.random.default_rng(seed)
+
+    def embed(text: str):
+        base = np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(dim).astype(np.float32)
+        # 같은 프롬프트라도 인코더 배치/백엔드에 따라 생기는 미세한 차이
+        return base + rng.normal(0, noise, dim).astype(np.float32)
+    return embed
+
+def make_store(backend: str, path: str):
+    if backend == "chroma":
+        import chromadb
+        collection = chromadb.PersistentClient(path=path).get_or_create_collection(name="bench")
+        return ChromaVectorStore(lambda: collection)
+    return NumpyVectorStore(path)
+
+def replay(stream, embed, dim: int, upsert_every: int, use_cache: bool, ttl: float, n_results: int):
+    clock = {"now": 0.0}
+    vectorDBService.query_cache = QueryCache(ttl=ttl, clock=lambda: clock["now"]) if use_cache else None
+    new_records = restaurant_metadata(len(stream) // max(upsert_every, 1) + 1, seed=99)
+    new_vectors = make_vectors(len(new_records), dim, seed=99)
+
+    start_ts = datetime.fromisoformat(stream[0]["timestamp"])
+    latencies = []
+    for i, entry in enumerate(stream):
+        clock["now"] = (datetime.fromisoformat(entry["timestamp"]) - start_ts).total_seconds()
+        if upsert_every and i and i % upsert_every == 0:
+            record = new_records[i // upsert_every]
+            vectorDBService.upsert_restaurants([(f"new-{i}", new_vectors[i // upsert_every].tolist(), record)])
+        vector = embed(entry["query"])
+        start = time.perf_counter()
+        vectorDBService.query_similar_restaurants(vector, n_results)
+        latencies.append((time.perf_counter() - start) * 1000)
+    stats = vectorDBService.query_cache.stats() if use_cache else None
+    return np.mean(latencies), np.percentile(latencies, 50), np.percentile(latencies, 99), stats
+
+def run(args):
+    if args.log:
+        with open(args.log, encoding="utf-8") as f:
+            stream = sorted(json.load(f), key=lambda entry: entry["timestamp"])
+    else:
+        stream = synthetic_stream(args.queries, seed=0, per_minute=args.per_minute)
+    embed = make_embedder(args.dim, args.real_embeddings, args.noise, seed=1)
+    minutes = (datetime.fromisoformat(stream[-1]["timestamp"]) - datetime.fromisoformat(stream[0]["timestamp"])).total_seconds() / 60
+    print(f"스트림 {len(stream)}건 / 고유 검색어 {len({e['query'] for e in stream})}개 / {minutes:.0f}분, "
+          f"{args.backend} 맛집 {args.restaurants}곳, TTL {args.ttl:.0f}s, 임베딩 잡음 {args.noise:g}")
+
+    print(f"{'upsert':>6} | {'cache':<5} | {'mean(ms)':>8} | {'p50(ms)':>8} | {'p99(ms)':>8} | {'hit rate':>8} | {'expired':>7} | {'invalidated':>11}")
+    for upsert_every, use_cache in [(u, c) for u in args.upsert_every for c in (False, True)]:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = make_store(args.backend, tmp)
+            records = restaurant_metadata(args.restaurants, seed=0)
+            vectors = make_vectors(args.restaurants, args.dim, seed=0)
+            for start in range(0, args.restaurants, 5000):
+                store.upsert([str(i) for i in range(start, min(start + 5000, args.restaurants))],
+                             vectors[start:start + 5000], restaurant_codec.encode_many(records[start:start + 5000]))
+            vectorDBService.vector_store, vectorDBService.geo_index = store, None
+            mean, p50, p99, stats = replay(stream, embed, args.dim, upsert_every, use_cache, args.ttl, args.k)
+        upsert = f"1/{upsert_every}" if upsert_every else "-"
+        if stats:
+            print(f"{upsert:>6} | {'on':<5} | {mean:>8.3f} | {p50:>8.3f} | {p99:>8.3f} | {stats['hit_rate']:>8.3f} | {stats['expired']:>7} | {stats['invalidated']:>11}")
+        else:
+            print(f"{upsert:>6} | {'off':<5} | {mean:>8.3f} | {p50:>8.3f} | {p99:>8.3f} | {'-':>8} | {'-':>7} | {'-':>11}")
+    vectorDBService.vector_store = None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", default=None, help="재생할 search_logs.json 형식 파일 (없으면 스트림 생성)")
+    parser.add_argument("--queries", type=int, default=5000, help="생성할 스트림 길이")
+    parser.add_argument("--per-minute", type=float, default=60, help="생성 스트림의 분당 검색 수")
+    parser.add_argument("--restaurants", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=3, help="n_results")
+    parser.add_argument("--upsert-every", type=int, nargs="+", default=[0, 1000, 200], help="검색 N건마다 맛집 1곳 저장 (0이면 저장 안 함)")
+    parser.add_argument("--backend", default="chroma", choices=["chroma", "numpy"])
+    parser.add_argument("--ttl", type=float, default=300)
+    parser.add_argument("--noise", type=float, default=1e-7, help="가짜 임베딩에 더하는 잡음 크기 (float32 배치 차이 수준)")
+    parser.add_argument("--real-embeddings", action="store_true")
+    args = parser.parse_args()
+    run(args)
@@ -0,0 +1,202 @@
+"""추천 파이프라인 벤치마크: 로컬 스텁 서버(네이버/카카오/Gemini/블로그 페이지)로 콜드 캐시 지연 시간 측정
+
+- 스텁 서버는 요청마다 지정한 지연 시간(--api-ms, --page-ms, --llm-ms)만큼 기다린 뒤 응답
+- 후보 수(--candidates)마다 비어 있는 벡터 저장소에서 service.get_personalized_recommendation_async 실행
+  * serial : 동시 실행 수를 모두 1로 제한 (기존처럼 후보/페이지를 하나씩 처리하는 것과 같음)
+  * async  : 기본 동시 실행 수 (HTTP_CONCURRENCY, LLM_CONCURRENCY)
+- LLM 요약은 후보 전체를 배치로 묶어 요청하므로 (summarizer) Gemini 스텁 요청 수는 후보 수보다 적음
+- 네이버 지역 검색 스텁은 후보 수를 채울 수 있을 만큼 결과를 반환
+- 벡터 변환은 기본적으로 텍스트 해시로 만든 가짜 벡터 사용 (--real-embeddings 로 실제 모델 사용),
+  PostgreSQL 기록은 생략
+
+실행: python -m backend.benchmarks.bench_recommendation_pipeline [--candidates 3 10 30]
+"""
+import argparse
+import asyncio
+import json
+import re
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import requests
+
+from backend.app import apiCache, crud, llmClient, nlpService, pageStore, service, vectorDBService
+from backend.app.vectorStore import NumpyVectorStore
+from backend.benchmarks.corpus import REGIONS, review_snippets
+
+class StubServer:
+    """네이버/카카오/Gemini API와 블로그 페이지를 흉내 내는 로컬 HTTP 서버"""
+
+    def __init__(self, api_ms: float, page_ms: float, llm_ms: float):
+        self.delays = {"api": api_ms / 1000, "page": page_ms / 1000, "llm": llm_ms / 1000}
+        self.items_per_search = 5
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, body: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                kind, body, content_type = stub.route(url.path, {k: v[0] for k, v in parse_qs(url.query).items()})
+                stub.count(kind)
+                time.sleep(stub.delays["page" if kind == "page" else "api"])
+                self._reply(body, content_type)
+
+            def do_POST(self):
+                prompt = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))["contents"][0]["parts"][0]["text"]
+                stub.count("gemini")
+                time.sleep(stub.delays["llm"])
+                self._reply(json.dumps(stub.summary(prompt), ensure_ascii=False).encode("utf-8"), "application/json")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def count(self, kind: str):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def route(self, path: str, params: dict):
+        query = params.get("query", "")
+        seed = zlib.crc32(query.encode("utf-8"))
+        if path == "/naver/local":
+            display = self.items_per_search if " 맛집" in query else int(params.get("display", 1))
+            items = [{
+                "title": f"<b>{query.split()[0]}</b> 식당{seed % 1000}-{i}", "link": f"{self.base}/place/{seed}/{i}",
+                "address": f"서울특별시 강남구 역삼동 {i}", "roadAddress": f"서울특별시 강남구 테헤란로 {i}",
+                "mapx": str(1270276000 + i * 1000), "mapy": str(374979000 + i * 1000),
+            } for i in range(display)]
+            return "naver_local", json.dumps({"items": items}, ensure_ascii=False).encode("utf-8"), "application/json"
+        if path == "/naver/blog":
+            items = [{"link": f"{self.base}/page/{seed}/n{i}"} for i in range(int(params.get("display", 5)))]
+            return "naver_blog", json.dumps({"items": items}).encode("utf-8"), "application/json"
+        if path == "/naver/image":
+            return "naver_image", json.dumps({"items": [{"link": f"{self.base}/image/{seed}.jpg"}]}).encode("utf-8"), "application/json"
+        if path == "/kakao/web":
+            documents = [{"url": f"{self.base}/page/{seed}/d{i}"} for i in range(int(params.get("size", 5)))]
+            return "kakao_web", json.dumps({"documents": documents}).encode("utf-8"), "application/json"
+        # 블로그 페이지: 같은 맛집의 네이버/다음 페이지는 문장이 겹치도록 맛집 seed로 생성
+        page_seed = int(path.split("/")[2]) if path.startswith("/page/") else 0
+        sentences = [s + " 정말 맛있어서 재방문 의사 있어요" for s in review_snippets(6, seed=page_seed)]
+        html = "<html><body><article><h1>방문 후기</h1>" + "".join(f"<p>{s}.</p>" for s in sentences) + "</article></body></html>"
+        return "page", html.encode("utf-8"), "text/html; charset=utf-8"
+
+    @staticmethod
+    def summary(prompt: str) -> dict:
+        # 배치 요약 프롬프트의 맛집 목록 id마다 같은 요약을 반환
+        ids = re.findall(r'"id": "(\d+)"', prompt)
+        return {"candidates": [{"content": {"parts": [{"text": json.dumps({"results": [{
+            "id": i, "summary_pros": ["맛있어요", "친절해요", "분위기 좋아요"], "summary_cons": ["웨이팅", "주차", "가격"],
+            "keywords": ["데이트", "분위기", "파스타", "와인", "기념일"], "signature_menu": "파스타",
+            "price_range": "2-3만원", "opening_hours": "11:00-22:00", "parking": "불가", "phone": "02-000-0000",
+            "nearby_attractions": ["공원", "전시", "카페"],
+        } for i in ids]}, ensure_ascii=False)}]}}]}
+
+    def shutdown(self):
+        self.server.shutdown()
+
+class StubGemini(llmClient.LLMClient):
+    """Gemini 대신 스텁 서버에 요청하는 LLM 클라이언트"""
+    name = "stub"
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def generate(self, prompt: str, json_mode: bool = False) -> str:
+        resp = requests.post(self.url, json={"contents": [{"parts": [{"text": prompt}]}]}, timeout=30)
+        resp.raise_for_status()
+        return resp.json()["candidates"][0]["content"]["parts"][0]["text"]
+
+def fake_text_to_vectors(texts, batch_size: int = 32):
+    return np.stack([np.random.default_rng(zlib.crc32(t.encode("utf-8"))).standard_normal(768).astype(np.float32) for t in texts])
+
+def configure(stub: StubServer, real_embeddings: bool):
+    service.NAVER_LOCAL_URL = f"{stub.base}/naver/local"
+    service.NAVER_BLOG_SEARCH_URL = f"{stub.base}/naver/blog"
+    service.NAVER_IMAGE_URL = f"{stub.base}/naver/image"
+    service.KAKAO_WEB_SEARCH_URL = f"{stub.base}/kakao/web"
+    service.KAKAO_REST_KEY = service.KAKAO_REST_KEY or "bench"
+    service.SCRAPINGBEE_KEY = None
+    llmClient.set_llm_client(StubGemini(f"{stub.base}/gemini"))
+    # 콜드 캐시 지연 시간을 재는 것이므로 API 응답 캐시와 페이지 저장소는 끔
+    apiCache.API_CACHE_ENABLED = False
+    pageStore.PAGE_STORE_ENABLED = False
+    if not real_embeddings:
+        nlpService.text_to_vectors = fake_text_to_vectors
+    crud.upsert_restaurants_in_postgres = lambda db, items: None
+
+def set_limits(http: int, llm: int):
+    service.HTTP_CONCURRENCY, service.LLM_CONCURRENCY = http, llm
+    if service._executor is not None:
+        service._executor.shutdown(wait=True)
+        service._executor = None
+
+def run_once(candidates: int, prompt: str):
+    request = SimpleNamespace(user_id=1, prompt=prompt)
+    user = SimpleNamespace(id=1, interests="데이트,회식")
+    start = time.perf_counter()
+    result = asyncio.run(service.get_personalized_recommendation_async(None, request, user))
+    return time.perf_counter() - start, len(result["restaurants"])
+
+def run(args):
+    stub = StubServer(args.api_ms, args.page_ms, args.llm_ms)
+    configure(stub, args.real_embeddings)
+    default_limits = (service.HTTP_CONCURRENCY, service.LLM_CONCURRENCY)
+    print(f"스텁 지연: API {args.api_ms:.0f}ms / 페이지 {args.page_ms:.0f}ms / LLM {args.llm_ms:.0f}ms, "
+          f"async 동시 실행 수: HTTP {default_limits[0]} / LLM {default_limits[1]}")
+    print(f"{'candidates':>10} | {'mode':<6} | {'cold(s)':>8} | {'warm(s)':>8} | {'restaurants':>11} | {'requests':>8} | {'speedup':>7}")
+    try:
+        for n in args.candidates:
+            stub.items_per_search = (n + 1) // 2
+            service.RECOMMENDATION_CANDIDATES = n
+            serial_cold = None
+            for mode, limits in (("serial", (1, 1)), ("async", default_limits)):
+                set_limits(*limits)
+                with tempfile.TemporaryDirectory() as tmp:
+                    vectorDBService.vector_store, vectorDBService.geo_index = NumpyVectorStore(tmp), None
+                    if vectorDBService.query_cache:
+                        vectorDBService.query_cache.clear()
+                    stub.requests.clear()
+                    prompt = f"{REGIONS[n % len(REGIONS)]} 데이트"
+                    cold, found = run_once(n, prompt)
+                    total_requests = sum(stub.requests.values())
+                    warm, _ = run_once(n, prompt)
+                    vectorDBService.vector_store.flush()
+                    vectorDBService.vector_store = None
+                serial_cold = serial_cold or cold
+                speedup = f"{serial_cold / cold:.1f}x" if mode == "async" else "-"
+                print(f"{n:>10} | {mode:<6} | {cold:>8.2f} | {warm:>8.3f} | {found:>11} | {total_requests:>8} | {speedup:>7}")
+    finally:
+        set_limits(*default_limits)
+        stub.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[3, 10, 30], help="추천 후보 수")
+    parser.add_argument("--api-ms", type=float, default=80, help="검색 API 스텁 지연")
+    parser.add_argument("--page-ms", type=float, default=300, help="블로그 페이지 스텁 지연")
+    parser.add_argument("--llm-ms", type=float, default=1500, help="Gemini 스텁 지연")
+    parser.add_argument("--real-embeddings", action="store_true")
+    args = parser.parse_args()
+    run(args)
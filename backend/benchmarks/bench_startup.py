@@ -0,0 +1,91 @@
+"""앱 시작 시간 벤치마크: import 시간, 헬스 체크까지 시간, /ready 까지 시간
+
+- before : 기존처럼 import 시점에 모든 자원을 순서대로 준비 (import + 직렬 워밍업, STARTUP_MODE=serial)
+- after  : import는 가볍게 하고 lifespan에서 백그라운드 병렬 워밍업 (STARTUP_MODE=background)
+
+실행: python -m backend.benchmarks.bench_startup --runs 3
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+IMPORT_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import backend.app.main as main
+imported = time.perf_counter() - start
+if {serial}:
+    main.readiness.run_serially()
+else:
+    main.readiness.start()
+    while any(s["state"] in ("pending", "warming") for s in main.readiness.report()["components"].values()):
+        time.sleep(0.01)
+print(json.dumps({{"import": imported, "ready": time.perf_counter() - start, "report": main.readiness.report()}}))
+"""
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _in_process(serial: bool) -> dict:
+    out = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT.format(serial=serial)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def _poll(url: str, deadline: float, accept_503: bool = False):
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                return resp.status, json.loads(resp.read() or b"{}")
+        except urllib.error.HTTPError as e:
+            body = json.loads(e.read() or b"{}")
+            if accept_503 and not any(c["state"] in ("pending", "warming") for c in body.get("components", {}).values()):
+                return e.code, body  # 워밍업은 끝났지만 실패한 구성 요소가 있음
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            pass
+        time.sleep(0.02)
+    return None, {}
+
+def _uvicorn(mode: str, timeout: float) -> dict:
+    port = _free_port()
+    env = {**os.environ, "STARTUP_MODE": mode}
+    start = time.monotonic()
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(port)],
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = start + timeout
+        _poll(f"http://127.0.0.1:{port}/", deadline)
+        health = time.monotonic() - start
+        status, report = _poll(f"http://127.0.0.1:{port}/ready", deadline, accept_503=True)
+        return {"health": health, "ready": time.monotonic() - start, "status": status, "report": report}
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def run(runs: int, timeout: float):
+    print(f"{'mode':>10} | {'import(s)':>9} | {'in-proc ready(s)':>16} | {'health 200(s)':>13} | {'/ready(s)':>9}")
+    for mode, serial in (("serial", True), ("background", False)):
+        local = [_in_process(serial) for _ in range(runs)]
+        served = [_uvicorn(mode, timeout) for _ in range(runs)]
+        print(f"{mode:>10} | {statistics.median(r['import'] for r in local):>9.2f} | "
+              f"{statistics.median(r['ready'] for r in local):>16.2f} | "
+              f"{statistics.median(r['health'] for r in served):>13.2f} | "
+              f"{statistics.median(r['ready'] for r in served):>9.2f}")
+        print("           구성 요소별 워밍업(s):",
+              {name: c.get("seconds") for name, c in local[-1]["report"]["components"].items()},
+              "/ready 상태:", served[-1]["status"])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="모드별 반복 횟수 (중앙값 보고)")
+    parser.add_argument("--timeout", type=float, default=300, help="서버 준비 대기 최대 시간(초)")
+    args = parser.parse_args()
+    run(args.runs, args.timeout)
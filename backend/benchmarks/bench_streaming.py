@@ -0,0 +1,166 @@
+"""스트리밍 응답 벤치마크: 전체 응답 시간 vs 첫 항목까지의 시간 (로컬 스텁 서버)
+
+- recommend : 후보 --candidates곳 추천, 빈 벡터 저장소(cold)와 후보 절반이 이미 저장된 경우(half)
+  * full        : service.get_personalized_recommendation_async (모든 후보가 끝나야 응답)
+  * stream cN   : service.iter_personalized_recommendation_async, 벡터 DB에 없는 후보를 N곳씩 묶어 처리 (STREAM_CHUNK_SIZE)
+- course    : 코스 --courses개 (코스마다 장소 --steps곳, cold)
+  * full        : service.create_date_course
+  * stream      : service.iter_date_courses_async (코스마다 장소 정보가 준비되는 대로)
+- 스트리밍은 eventStream.encode_events로 NDJSON까지 인코딩하며 측정 (/recommendations/stream, /date-course/stream과 같음)
+- 경우마다 --repeat번 반복한 중앙값
+- first(s): 첫 항목(스트리밍) 또는 전체 응답(full)까지, total(s): 마지막 항목까지, items: 받은 맛집/코스 수,
+  gemini: Gemini 스텁 요청 수 (묶음을 작게 나눌수록 LLM 요청이 늘어남)
+- 스텁 서버/Gemini 스텁/가짜 벡터 변환은 bench_recommendation_pipeline과 같음 (API 캐시/페이지 저장소/LLM 캐시 끔),
+  Gemini 스텁은 코스 생성 프롬프트에는 "코스 N: 제목 | 장소 -> 장소" 형식으로 응답, 스텁 지연은 요청마다 +-(--jitter) 변동
+
+실행: python -m backend.benchmarks.bench_streaming [--candidates 3 10] [--chunk-sizes 1 2 4]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from backend.app import eventStream, llmCache, service, vectorDBService
+from backend.app.vectorStore import NumpyVectorStore
+from backend.benchmarks.bench_recommendation_pipeline import StubServer, configure
+from backend.benchmarks.corpus import REGIONS
+
+USER = SimpleNamespace(id=1, interests="데이트,회식")
+
+class JitteredDelays(dict):
+    """조회할 때마다 기준 지연에 +-jitter 비율의 변동을 주는 지연 시간 표 (실제 페이지/LLM 응답 시간처럼 제각각)"""
+
+    def __init__(self, delays: dict, jitter: float, seed: int = 0):
+        super().__init__(delays)
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __getitem__(self, kind: str) -> float:
+        with self._lock:
+            return super().__getitem__(kind) * self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+class CourseStubServer(StubServer):
+    """코스 생성 프롬프트에는 코스 목록 텍스트로 응답하는 스텁 서버"""
+    courses, steps = 3, 2
+
+    def summary(self, prompt: str) -> dict:
+        if "데이트 코스 플래너" not in prompt:
+            return StubServer.summary(prompt)
+        location = prompt.split("- 지역:")[1].split("\n")[0].strip()
+        text = "\n".join(f"코스 {c + 1}: [{location} 코스{c}] | " + " -> ".join(f"{location}장소{c}-{s}" for s in range(self.steps))
+                         for c in range(self.courses))
+        return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+async def stream_timings(events):
+    """NDJSON으로 인코딩하며 (첫 항목까지, 마지막 항목까지, 항목 수)를 측정"""
+    start = time.perf_counter()
+    first, last, items = None, 0.0, 0
+    async for line in eventStream.encode_events(events, sse=False):
+        if line.startswith(b'{"event": "summary"'):
+            break
+        items += 1
+        last = time.perf_counter() - start
+        first = first if first is not None else last
+    return first or 0.0, last, items
+
+def measure(stub: StubServer, fn, prepare=None, repeat: int = 1):
+    """빈 벡터 저장소에서 prepare()로 일부를 채운 뒤 fn() 실행을 repeat번 반복 -> 항목별 중앙값 (first, total, items, Gemini 요청 수)"""
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            vectorDBService.vector_store, vectorDBService.geo_index = NumpyVectorStore(tmp), None
+            if prepare:
+                prepare()
+            stub.requests.clear()
+            try:
+                runs.append((*fn(), stub.requests["gemini"]))
+            finally:
+                vectorDBService.vector_store.flush()
+                vectorDBService.vector_store = None
+    return tuple(statistics.median(values) for values in zip(*runs))
+
+def print_row(scenario: str, size: int, cache: str, mode: str, result, full_first: float):
+    first, total, items, gemini = result
+    print(f"{scenario:<9} | {size:>4} | {cache:<5} | {mode:<10} | {first:>8.2f} | {total:>8.2f} | {items:>5.0f} | {gemini:>6.0f} | "
+          f"{full_first / first if first else 0:>6.1f}x")
+
+def run_recommend(stub: StubServer, n: int, args):
+    stub.items_per_search = (n + 1) // 2
+    service.RECOMMENDATION_CANDIDATES = n
+    request = SimpleNamespace(user_id=1, prompt=f"{REGIONS[n % len(REGIONS)]} 데이트")
+
+    def full():
+        start = time.perf_counter()
+        result = asyncio.run(service.get_personalized_recommendation_async(None, request, USER))
+        elapsed = time.perf_counter() - start
+        return elapsed, elapsed, len(result["restaurants"])
+
+    def stream():
+        events = (("restaurant", {"index": i, "restaurant": details})
+                  async for i, details in service.iter_personalized_recommendation_async(None, request, USER))
+        return asyncio.run(stream_timings(events))
+
+    def half_warm():
+        # 후보를 하나 걸러 하나씩 미리 저장 (자주 검색되는 지역처럼 일부 후보만 벡터 DB에 있는 경우)
+        candidates = asyncio.run(service._recommendation_candidates(request, USER))
+        asyncio.run(service.get_restaurants_details_async(None, [service._place(item) for item in candidates[::2]]))
+
+    for cache, prepare in (("cold", None), ("half", half_warm)):
+        baseline = measure(stub, full, prepare, args.repeat)
+        print_row("recommend", n, cache, "full", baseline, baseline[0])
+        for chunk_size in args.chunk_sizes:
+            service.STREAM_CHUNK_SIZE = chunk_size
+            print_row("recommend", n, cache, f"stream c{chunk_size}", measure(stub, stream, prepare, args.repeat), baseline[0])
+
+def run_course(stub: CourseStubServer, args):
+    stub.courses, stub.steps = args.courses, args.steps
+    stub.items_per_search = 1
+    request = SimpleNamespace(user_id=1, location=REGIONS[0], start_time="14:00", end_time="20:00", theme="데이트")
+
+    def full():
+        start = time.perf_counter()
+        result = service.create_date_course(None, request, USER)
+        elapsed = time.perf_counter() - start
+        return elapsed, elapsed, len(result["courses"])
+
+    def stream():
+        events = (("course", {"index": i, "course": course}) async for i, course in service.iter_date_courses_async(None, request))
+        return asyncio.run(stream_timings(events))
+
+    baseline = measure(stub, full, repeat=args.repeat)
+    print_row("course", args.courses, "cold", "full", baseline, baseline[0])
+    print_row("course", args.courses, "cold", "stream", measure(stub, stream, repeat=args.repeat), baseline[0])
+
+def run(args):
+    stub = CourseStubServer(args.api_ms, args.page_ms, args.llm_ms)
+    stub.delays = JitteredDelays(stub.delays, args.jitter)
+    configure(stub, real_embeddings=False)
+    llmCache.LLM_CACHE_ENABLED = False
+    print(f"스텁 지연: API {args.api_ms:.0f}ms / 페이지 {args.page_ms:.0f}ms / LLM {args.llm_ms:.0f}ms "
+          f"(요청마다 +-{args.jitter:.0%} 변동)")
+    print(f"{'scenario':<9} | {'size':>4} | {'cache':<5} | {'mode':<10} | {'first(s)':>8} | {'total(s)':>8} | {'items':>5} | {'gemini':>6} | {'first x':>7}")
+    try:
+        for n in args.candidates:
+            run_recommend(stub, n, args)
+        run_course(stub, args)
+    finally:
+        stub.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[3, 10], help="추천 후보 수")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[1, 2, 4], help="스트리밍 시 함께 처리할 후보 수")
+    parser.add_argument("--courses", type=int, default=3, help="코스 수")
+    parser.add_argument("--steps", type=int, default=2, help="코스별 장소 수")
+    parser.add_argument("--api-ms", type=float, default=80, help="검색 API 스텁 지연")
+    parser.add_argument("--page-ms", type=float, default=300, help="블로그 페이지 스텁 지연")
+    parser.add_argument("--llm-ms", type=float, default=1500, help="Gemini 스텁 지연")
+    parser.add_argument("--repeat", type=int, default=3, help="경우마다 반복 횟수 (중앙값)")
+    parser.add_argument("--jitter", type=float, default=0.5, help="스텁 지연 변동 비율")
+    args = parser.parse_args()
+    run(args)
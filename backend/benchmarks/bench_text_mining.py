@@ -0,0 +1,93 @@
+"""리뷰 문장 추출 벤치마크: 키워드별 `in` 검사 + 광고 패턴별 re.search vs textMining.ReviewMatcher
+
+- 블로그 본문: 저장된 실제 Gemini 요약 문장(corpus)을 구어체 어미/해시태그/메뉴판/내비게이션 줄과 섞은 블로그 글,
+  --ad-ratio 비율의 글에는 "소정의 원고료", "체험단" 등의 광고 고지 포함 (총 --mb MB)
+- 세 호출 위치의 키워드 목록과 분리 방식을 그대로 비교
+  * service          : 문장 단위([.。!?\\n]), 21자 이상
+  * RestaurantCrawler: 줄 단위, 21~199자
+  * backend_test     : 줄 단위, 16자 이상
+- before: 문장마다 any(k in s for k in keywords) 후 광고 패턴마다 re.search (기존 서비스의 광고 필터와 같은 방식)
+- after : ReviewMatcher.extract (키워드 전체 / 광고 패턴 전체를 각각 합친 정규식으로 문장마다 한 번씩)
+- 두 방식이 추출한 문장 목록이 같은지 확인, 문장마다 나온 키워드까지 모두 태깅하는 ReviewMatcher.scan 시간도 함께 측정
+
+실행: python -m backend.benchmarks.bench_text_mining [--mb 4]
+"""
+import argparse
+import random
+import re
+import time
+
+from backend.app import service, textMining
+from backend.benchmarks.corpus import load_sentences
+
+ENDINGS = ["", " 진짜 추천해요", " 재방문 의사 있어요", " ㅎㅎ", " 다음에 또 올게요", " 가족이랑 오기 좋아요", " 웨이팅은 좀 있었어요"]
+NAV_LINES = ["공감 12 댓글 3", "이웃추가", "카테고리 이동", "맨 위로", "블로그 홈", "지도 보기", "URL 복사"]
+MENU_LINES = ["시그니처 파스타 18,000원", "런치 세트 (11:30-15:00)", "주차: 건물 지하 1시간 무료", "영업시간 11:00 - 22:00"]
+AD_LINES = ["본 포스팅은 업체로부터 제공받아 작성한 솔직한 후기입니다", "소정의 원고료를 받아 작성되었습니다",
+            "체험단으로 방문하여 작성한 글입니다", "협찬을 받아 방문했지만 맛은 솔직하게 적었어요"]
+# crawling.py는 import 시 Gemini를 설정하므로 키워드 목록을 그대로 옮겨 옴
+CRAWLER_KEYWORDS = ["맛있", "추천", "별로", "최고", "불친절", "친절", "가격", "가성비", "재방문", "웨이팅", "분위기", "서비스", "음식", "맛", "후기"]
+TEST_KEYWORDS = ["맛", "분위기", "가격", "서비스", "추천"]
+
+def blog_corpus(megabytes: float, ad_ratio: float, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    sentences = load_sentences()
+    posts, size = [], 0
+    while size < megabytes * 1e6:
+        lines = [f"{rng.choice(service.REVIEW_KEYWORDS)} 맛집 다녀온 후기 #{len(posts)}"] + rng.sample(NAV_LINES, 3)
+        for _ in range(rng.randint(10, 30)):
+            roll = rng.random()
+            if roll < 0.6:
+                lines.append(" ".join(s.rstrip(".") + rng.choice(ENDINGS) + "." for s in rng.sample(sentences, rng.randint(1, 3))))
+            elif roll < 0.8:
+                lines.append(rng.choice(MENU_LINES))
+            else:
+                lines.append("#" + " #".join(rng.sample(service.REVIEW_KEYWORDS, 4)))
+        if rng.random() < ad_ratio:
+            lines.insert(rng.randint(1, len(lines)), rng.choice(AD_LINES))
+        post = "\n".join(lines)
+        posts.append(post)
+        size += len(post.encode("utf-8"))
+    return "\n\n".join(posts), len(posts)
+
+def before(text: str, keywords, separators: str, min_length: int, max_length=None):
+    reviews = []
+    for s in re.split(separators, text):
+        s = s.strip()
+        if len(s) < min_length or (max_length is not None and len(s) > max_length):
+            continue
+        if any(k in s for k in keywords) and not any(re.search(p, s) for p in textMining.AD_PATTERNS):
+            reviews.append(s)
+    return reviews
+
+def run(args):
+    text, post_count = blog_corpus(args.mb, args.ad_ratio)
+    mb = len(text.encode("utf-8")) / 1e6
+    print(f"블로그 글 {post_count}개, {mb:.1f}MB, 광고 고지 포함 비율 {args.ad_ratio:.0%}")
+    callers = [
+        ("service", service.REVIEW_KEYWORDS, textMining.SENTENCE_SEPARATORS, 21, None),
+        ("RestaurantCrawler", CRAWLER_KEYWORDS, textMining.LINE_SEPARATORS, 21, 199),
+        ("backend_test", TEST_KEYWORDS, textMining.LINE_SEPARATORS, 16, None),
+    ]
+    print(f"{'caller':<18} | {'before(s)':>9} | {'after(s)':>8} | {'MB/s b/a':>13} | {'speedup':>7} | {'scan(s)':>7} | {'reviews':>7} | {'same':>5}")
+    for name, keywords, separators, min_length, max_length in callers:
+        start = time.perf_counter()
+        expected = before(text, keywords, separators, min_length, max_length)
+        before_time = time.perf_counter() - start
+
+        matcher = textMining.ReviewMatcher(keywords, separators=separators)
+        start = time.perf_counter()
+        actual = matcher.extract(text, min_length, max_length)
+        after_time = time.perf_counter() - start
+        start = time.perf_counter()
+        list(matcher.scan(text, min_length, max_length))
+        scan_time = time.perf_counter() - start
+        print(f"{name:<18} | {before_time:>9.3f} | {after_time:>8.3f} | {mb / before_time:>6.1f}/{mb / after_time:<6.1f} | "
+              f"{before_time / after_time:>6.1f}x | {scan_time:>7.3f} | {len(actual):>7} | {str(actual == expected):>5}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=4, help="블로그 본문 크기 (MB)")
+    parser.add_argument("--ad-ratio", type=float, default=0.2, help="광고 고지가 들어간 글 비율")
+    args = parser.parse_args()
+    run(args)
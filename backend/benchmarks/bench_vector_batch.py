@@ -0,0 +1,50 @@
+"""벡터 DB 단건 호출 vs 배치 호출 벤치마크 (맛집 10 / 100 / 1000곳)
+
+- upsert: upsert_restaurant 반복 vs upsert_restaurants 1회
+- 조회  : get_restaurant_by_id 반복 vs get_restaurants 1회
+
+실행: python -m backend.benchmarks.bench_vector_batch
+"""
+import argparse
+import tempfile
+import time
+
+import chromadb
+import numpy as np
+
+from backend.app import database, vectorDBService
+from backend.benchmarks.corpus import restaurant_metadata
+
+DIMENSION = 768
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+def run(sizes):
+    rng = np.random.default_rng(0)
+    print(f"{'n':>5} | {'upsert per-item(ms)':>19} | {'upsert batch(ms)':>16} | {'get per-item(ms)':>16} | {'get batch(ms)':>13}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            client = chromadb.PersistentClient(path=tmp)
+            records = restaurant_metadata(n, seed=n)
+            ids = [f"{r['name']}_{r['address']}" for r in records]
+            vectors = rng.standard_normal((n, DIMENSION)).astype(np.float32).tolist()
+
+            database.restaurant_collection = client.get_or_create_collection(name="per_item")
+            upsert_single = _timed(lambda: [vectorDBService.upsert_restaurant(i, v, m) for i, v, m in zip(ids, vectors, records)])
+            get_single = _timed(lambda: [vectorDBService.get_restaurant_by_id(i) for i in ids])
+
+            database.restaurant_collection = client.get_or_create_collection(name="batched")
+            upsert_batch = _timed(lambda: vectorDBService.upsert_restaurants(list(zip(ids, vectors, records))))
+            get_batch = _timed(lambda: vectorDBService.get_restaurants(ids))
+            assert len(vectorDBService.get_restaurants(ids)) == len(set(ids))
+        print(f"{n:>5} | {upsert_single:>19.1f} | {upsert_batch:>16.1f} | {get_single:>16.1f} | {get_batch:>13.1f}")
+    database.restaurant_collection = None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="맛집 수 목록")
+    args = parser.parse_args()
+    run(args.sizes)
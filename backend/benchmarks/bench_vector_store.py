@@ -0,0 +1,96 @@
+"""벡터 저장소 백엔드 비교 벤치마크 (벡터 10k / 100k / 1M개)
+
+- chroma      : ChromaVectorStore (ChromaDB HNSW)
+- numpy-exact : NumpyVectorStore, numpy 전수 탐색
+- numpy-hnsw  : NumpyVectorStore, hnswlib (설치되어 있을 때만)
+
+측정 항목: 적재 시간, recall@k (numpy 전수 탐색 결과 기준), 쿼리 지연 p50/p99
+1M x 768 차원은 약 3GB이므로 메모리가 작은 환경에서는 --dim 또는 --sizes를 줄여서 실행
+
+실행: python -m backend.benchmarks.bench_vector_store [--sizes 10000 100000] [--dim 768]
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from backend.app.vectorStore import ChromaVectorStore, NumpyVectorStore
+
+INSERT_BATCH = 5000  # ChromaDB 한 번 호출의 최대 배치보다 작게
+
+def make_vectors(n: int, dim: int, seed: int, clusters: int = 64) -> np.ndarray:
+    """실제 임베딩처럼 군집이 있는 벡터 생성 (가우시안 혼합)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 100_000):
+        size = min(100_000, n - start)
+        labels = rng.integers(0, clusters, size)
+        vectors[start:start + size] = centers[labels] + 0.5 * rng.standard_normal((size, dim)).astype(np.float32)
+    return vectors
+
+def ground_truth(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    sq_norms = np.einsum("ij,ij->i", vectors, vectors)
+    truth = []
+    for q in queries:
+        dists = sq_norms - 2 * (vectors @ q)
+        top = np.argpartition(dists, k - 1)[:k]
+        truth.append(top[np.argsort(dists[top])])
+    return np.array(truth)
+
+def bench(store, vectors: np.ndarray, queries: np.ndarray, truth: np.ndarray, k: int):
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), INSERT_BATCH):
+        chunk = vectors[offset:offset + INSERT_BATCH]
+        ids = [str(i) for i in range(offset, offset + len(chunk))]
+        store.upsert(ids, chunk, [{"row": i} for i in range(offset, offset + len(chunk))])
+    store.query(queries[0], k)  # 인덱스 로딩/생성은 적재 시간에 포함
+    build = time.perf_counter() - start
+
+    latencies, hits = [], 0
+    for q, expected in zip(queries, truth):
+        start = time.perf_counter()
+        results = store.query(q, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(set(int(i) for i, _, _ in results) & set(expected.tolist()))
+    return build, hits / truth.size, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+def run(sizes, dim: int, k: int, n_queries: int, chroma_max: int):
+    try:
+        import hnswlib  # noqa: F401
+        has_hnsw = True
+    except ImportError:
+        has_hnsw = False
+        print("hnswlib이 설치되어 있지 않아 numpy-hnsw는 건너뜁니다.")
+
+    print(f"{'n':>8} | {'backend':<11} | {'build(s)':>8} | {f'recall@{k}':>9} | {'p50(ms)':>8} | {'p99(ms)':>8}")
+    for n in sizes:
+        vectors = make_vectors(n, dim, seed=n)
+        queries = make_vectors(n_queries, dim, seed=n + 1)
+        truth = ground_truth(vectors, queries, k)
+
+        backends = [("numpy-exact", lambda path: NumpyVectorStore(path, use_hnsw=False))]
+        if has_hnsw:
+            backends.append(("numpy-hnsw", lambda path: NumpyVectorStore(path, use_hnsw=True)))
+        if n <= chroma_max:
+            def chroma(path):
+                import chromadb
+                collection = chromadb.PersistentClient(path=path).get_or_create_collection(name="bench")
+                return ChromaVectorStore(lambda: collection)
+            backends.append(("chroma", chroma))
+
+        for name, factory in backends:
+            with tempfile.TemporaryDirectory() as tmp:
+                build, recall, p50, p99 = bench(factory(tmp), vectors, queries, truth, k)
+            print(f"{n:>8} | {name:<11} | {build:>8.1f} | {recall:>9.3f} | {p50:>8.2f} | {p99:>8.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="벡터 수 목록")
+    parser.add_argument("--dim", type=int, default=768, help="벡터 차원 (ko-sroberta-multitask = 768)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--chroma-max", type=int, default=100_000, help="이보다 큰 n에서는 chroma 적재를 생략")
+    args = parser.parse_args()
+    run(args.sizes, args.dim, args.k, args.queries, args.chroma_max)
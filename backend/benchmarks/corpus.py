@@ -0,0 +1,59 @@
+import json
+import random
+from pathlib import Path
+from typing import List
+
+# 벤치마크용 리뷰 문장 코퍼스
+# backend_test에 저장된 실제 Gemini 요약 결과(pros/cons)를 재조합하여 원하는 개수만큼 생성
+RECOMMENDATIONS_FILE = Path(__file__).resolve().parents[2] / "backend_test" / "restaurant_recommendations.json"
+
+def load_sentences() -> List[str]:
+    """저장된 추천 결과에서 장점/단점 문장을 모두 읽어옴"""
+    with open(RECOMMENDATIONS_FILE, encoding="utf-8") as f:
+        data = json.load(f)
+    sentences = []
+    for item in data:
+        sentences.extend(item.get("pros", []))
+        sentences.extend(item.get("cons", []))
+    return [s for s in sentences if s]
+
+def review_snippets(n: int, seed: int = 0, max_sentences: int = 3) -> List[str]:
+    """문장 1~max_sentences개를 이어 붙인 리뷰 스니펫 n개를 결정적으로 생성"""
+    rng = random.Random(seed)
+    sentences = load_sentences()
+    return [" ".join(rng.sample(sentences, rng.randint(1, max_sentences))) for _ in range(n)]
+
+CATEGORIES = ["한식", "일식", "중식", "양식", "카페", "분식", "고기", "해산물", "이탈리안", "디저트"]
+REGIONS = ["강남", "홍대", "성수", "이태원", "종로", "잠실", "여의도", "합정", "연남", "을지로"]
+PRICE_RANGES = ["1만원 이하", "1-2만원", "2-3만원", "3만원 이상"]
+
+def restaurant_metadata(n: int, seed: int = 0) -> List[dict]:
+    """RestaurantDetail 형태의 맛집 메타데이터 n개를 결정적으로 생성
+    mapx/mapy는 네이버 지역 검색과 같은 형식(WGS84 경위도 * 1e7 정수 문자열)의 서울 근방 좌표
+    """
+    rng = random.Random(seed)
+    sentences = load_sentences()
+    with open(RECOMMENDATIONS_FILE, encoding="utf-8") as f:
+        keywords = sorted({k for item in json.load(f) for k in item.get("keywords", [])})
+    records = []
+    for i in range(n):
+        region = rng.choice(REGIONS)
+        records.append({
+            "name": f"{region} 맛집 {i}",
+            "address": f"서울 {region} {rng.randint(1, 999)}-{rng.randint(1, 99)}",
+            "image_url": f"https://example.com/images/{i}.jpg",
+            "mapx": str(int((126.8 + rng.random() * 0.4) * 1e7)),
+            "mapy": str(int((37.45 + rng.random() * 0.2) * 1e7)),
+            "review_trust_score": rng.randint(0, 100),
+            "categories": rng.sample(CATEGORIES, rng.randint(1, 2)),
+            "summary_pros": rng.sample(sentences, 3),
+            "summary_cons": rng.sample(sentences, 3),
+            "keywords": rng.sample(keywords, 5),
+            "nearby_attractions": [f"{region} 공원", f"{region} 전시관"],
+            "signature_menu": rng.choice(keywords),
+            "summary_price": rng.choice(PRICE_RANGES),
+            "summary_parking": rng.choice(["주차 가능", "주차 불가", "인근 공영주차장 이용"]),
+            "summary_opening_hours": "11:00 - 22:00",
+            "summary_phone": f"02-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        })
+    return records
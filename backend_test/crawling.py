@@ -1,15 +1,24 @@
-import requests
 import json
 import os
+import sys
 import logging
 from typing import Dict, Any, List
 from datetime import datetime
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from readability.readability import Document
 import google.generativeai as genai
 import re
 
+# 백엔드와 같은 공용 HTTP 클라이언트, API 응답 캐시, 페이지 저장소, 본문/리뷰 문장 추출기, 배치 요약기, LLM 응답 캐시 사용 (backend/app/httpClient.py, apiCache.py, pageStore.py, htmlExtract.py, textMining.py, summarizer.py, llmCache.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from backend.app.httpClient import get_http_client
+from backend.app.apiCache import cached_get_json
+from backend.app.pageStore import fetch_page, page_text
+from backend.app.textMining import LINE_SEPARATORS, ReviewMatcher
+from backend.app.htmlExtract import canonical_url, extract_main_text
+from backend.app.llmClient import GeminiClient
+from backend.app.llmCache import with_cache
+from backend.app.summarizer import SummaryTask, summarize_many
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -21,19 +30,45 @@ GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 if GOOGLE_API_KEY:
     genai.configure(api_key=GOOGLE_API_KEY)
     model = genai.GenerativeModel('gemini-1.5-flash')
+    LLM_CLIENT = with_cache(GeminiClient('gemini-1.5-flash', model=model)) # 맛집 분석은 여러 곳을 한 번의 요청으로, 같은 프롬프트는 캐시에서
 else:
     model = None
+    LLM_CLIENT = None
     logging.warning("Google API 키가 설정되지 않았습니다. Gemini AI 기능이 비활성화됩니다.")
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 페이지에서 리뷰로 사용할 줄의 키워드 (광고 문구가 있는 줄은 제외)
+REVIEW_MATCHER = ReviewMatcher(["맛", "분위기", "가격", "서비스", "추천"], separators=LINE_SEPARATORS)
+
+# 개별 맛집 분석 형식
+ANALYSIS_TASK = SummaryTask(
+    instruction="""당신은 레스토랑 데이터 분석가입니다. 각 식당의 기본 정보(name, address, phone, category)와 크롤링된 리뷰들(reviews)을 바탕으로, 요청된 JSON 형식에 맞춰 정보를 요약하고 분석해주세요.
+모든 필드는 반드시 채워져야 합니다. 정보가 부족할 경우, 리뷰 내용에 기반하여 최대한 추론해주세요.
+- `name`, `phone`, `address`는 기본 정보를 그대로 사용하고, 비어 있으면 "정보 없음"으로 작성해주세요.
+- `signature_dishes`와 `price_range`는 리뷰에서 언급된 메뉴와 가격을 기반으로 작성해주세요.
+- `pros`와 `cons`는 각각 3개씩 구체적인 장점과 단점을 명확하게 요약해주세요.
+- `keywords`는 해당 식당의 특징을 가장 잘 나타내는 키워드 5개를 선정해주세요.""",
+    template={
+        "name": "상호명",
+        "phone": "전화번호",
+        "address": "주소",
+        "signature_dishes": ["대표메뉴1", "대표메뉴2"],
+        "price_range": "예: 1-2만원대",
+        "pros": ["구체적인 장점 1", "구체적인 장점 2", "구체적인 장점 3"],
+        "cons": ["구체적인 단점 1", "구체적인 단점 2", "구체적인 단점 3"],
+        "keywords": ["키워드1", "키워드2", "키워드3", "키워드4", "키워드5"]
+    },
+)
+
 class RestaurantRecommender:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        # 공용 HTTP 클라이언트 (호스트별 연결 풀 공유, 연결 오류/5xx 재시도)
+        self.http = get_http_client()
+        self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        })
+        }
 
     def kakao_search_local(self, query: str) -> List[Dict[str, Any]]:
         """카카오 지역 검색 API로 맛집 후보 목록을 최대한 많이 검색 (최대 45곳)"""
@@ -49,16 +84,12 @@ class RestaurantRecommender:
         for page in range(1, 4): 
             params = {"query": query, "size": 15, "page": page, "category_group_code": "FD6"}
             try:
-                response = self.session.get(url, headers=headers, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    documents = data.get('documents', [])
-                    restaurants.extend(documents)
-                    if data['meta']['is_end']:
-                        break # 마지막 페이지면 중단
-                else:
-                    logging.error(f"카카오 API 오류 (Page {page}): {response.status_code} - {response.text}")
-                    break
+                # 같은 검색어/페이지는 API 응답 캐시에서 바로 반환 (apiCache)
+                data = cached_get_json(url, params, lambda: self.http.get_json(url, headers={**self.headers, **headers}, params=params, timeout=10))
+                documents = data.get('documents', [])
+                restaurants.extend(documents)
+                if data['meta']['is_end']:
+                    break # 마지막 페이지면 중단
             except Exception as e:
                 logging.error(f"카카오 API 요청 오류 (Page {page}): {e}")
                 break
@@ -76,90 +107,43 @@ class RestaurantRecommender:
         params = {"query": f"{query} 후기 맛집", "size": size}
         
         try:
-            response = self.session.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                return response.json().get('documents', [])
-            else:
-                logging.error(f"카카오 웹 검색 오류: {response.status_code}")
-                return []
+            data = cached_get_json(url, params, lambda: self.http.get_json(url, headers={**self.headers, **headers}, params=params, timeout=10))
+            return data.get('documents', [])
         except Exception as e:
             logging.error(f"카카오 웹 검색 요청 오류: {e}")
             return []
 
     def fetch_page_content(self, url: str) -> str:
-        """웹페이지 내용 크롤링"""
+        """웹페이지 내용 크롤링 (페이지 저장소를 거쳐 같은 내용은 다시 받거나 파싱하지 않음)"""
         try:
-            response = self.session.get(url, timeout=10)
-            if response.status_code == 200:
-                doc = Document(response.text)
-                soup = BeautifulSoup(doc.summary(), 'html.parser')
-                text = soup.get_text(separator='\n', strip=True)
-                return text[:2500]  # 분석할 텍스트 양 소폭 증가
+            page = fetch_page(canonical_url(url), headers=self.headers, timeout=10)
+            if page is not None:
+                return page_text(page, "main_text", lambda html: extract_main_text(html, page.url))[:2500]  # 분석할 텍스트 양 소폭 증가
             return ""
         except Exception as e:
             logging.warning(f"페이지 크롤링 실패 {url}: {e}")
             return ""
 
+    def analyze_restaurants_with_gemini(self, items: List[tuple]) -> List[Dict[str, Any]]:
+        """(카카오 기본 정보, 리뷰 목록) 여러 개를 배치로 묶어 Gemini AI로 분석 (입력 순서대로, 실패하면 빈 dict)"""
+        jobs = [(i, {
+            "name": kakao_info.get('place_name', '알 수 없음'),
+            "address": kakao_info.get('address_name', ''),
+            "phone": kakao_info.get('phone', ''),
+            "category": kakao_info.get('category_name', '').split(' > ')[-1].strip(),
+            "reviews": reviews,
+        }) for i, (kakao_info, reviews) in enumerate(items) if reviews]
+        analyses = summarize_many(LLM_CLIENT, ANALYSIS_TASK, jobs)
+        logging.info(f"Gemini 분석 완료: {len(analyses)}/{len(jobs)}개 맛집")
+        return [analyses.get(i, {}) for i in range(len(items))]
+
     def analyze_restaurant_with_gemini(self, kakao_info: Dict[str, Any], reviews: List[str]) -> Dict[str, Any]:
         """Gemini AI로 개별 맛집 정보 분석 및 요약"""
-        if not model or not reviews:
-            return {}
-
-        reviews_text = '\n- '.join(reviews)
-        restaurant_name = kakao_info.get('place_name', '알 수 없음')
-        
-        prompt = f"""
-        당신은 레스토랑 데이터 분석가입니다. 아래의 식당 기본 정보와 크롤링된 리뷰들을 바탕으로, 요청된 JSON 형식에 맞춰 정보를 요약하고 분석해주세요.
-
-        **기본 정보:**
-        - 상호명: {restaurant_name}
-        - 주소: {kakao_info.get('address_name', '')}
-        - 전화번호: {kakao_info.get('phone', '')}
-        - 카테고리: {kakao_info.get('category_name', '').split(' > ')[-1].strip()}
-
-        **수집된 리뷰:**
-        - {reviews_text}
-
-        **요청:**
-        위 정보를 바탕으로 다음 JSON 구조를 완성해주세요. 모든 필드는 반드시 채워져야 합니다. 정보가 부족할 경우, 리뷰 내용에 기반하여 최대한 추론해주세요.
-        - `signature_dishes`와 `price_range`는 리뷰에서 언급된 메뉴와 가격을 기반으로 작성해주세요.
-        - `pros`와 `cons`는 각각 3개씩 구체적인 장점과 단점을 명확하게 요약해주세요.
-        - `keywords`는 해당 식당의 특징을 가장 잘 나타내는 키워드 5개를 선정해주세요.
-
-        ```json
-        {{
-          "name": "{restaurant_name}",
-          "phone": "{kakao_info.get('phone', '정보 없음')}",
-          "address": "{kakao_info.get('address_name', '정보 없음')}",
-          "signature_dishes": ["대표메뉴1", "대표메뉴2"],
-          "price_range": "예: 1-2만원대",
-          "pros": ["구체적인 장점 1", "구체적인 장점 2", "구체적인 장점 3"],
-          "cons": ["구체적인 단점 1", "구체적인 단점 2", "구체적인 단점 3"],
-          "keywords": ["키워드1", "키워드2", "키워드3", "키워드4", "키워드5"]
-        }}
-        ```
-        """
-        
-        try:
-            response = model.generate_content(prompt)
-            clean_response = re.search(r'```json\s*(\{.*?\})\s*```', response.text, re.DOTALL)
-            if clean_response:
-                json_str = clean_response.group(1)
-                analysis = json.loads(json_str)
-                logging.info(f"Gemini 분석 완료: {restaurant_name}")
-                return analysis
-            else:
-                json_str = response.text[response.text.find('{'):response.text.rfind('}')+1]
-                analysis = json.loads(json_str)
-                logging.info(f"Gemini 분석 완료 (폴백): {restaurant_name}")
-                return analysis
-        except Exception as e:
-            logging.error(f"Gemini AI 분석 오류 ({restaurant_name}): {e}")
-            return {}
+        return self.analyze_restaurants_with_gemini([(kakao_info, reviews)])[0]
 
     def get_top_recommendations(self, user_profile: Dict[str, Any], all_restaurants_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """분석된 맛집 데이터와 사용자 프로필을 기반으로 최종 3곳 추천"""
-        if not model or not all_restaurants_data:
+        if not LLM_CLIENT or not all_restaurants_data:
             return all_restaurants_data[:3] 
 
         logging.info("Gemini AI를 통해 사용자 맞춤 추천을 시작합니다...")
@@ -185,15 +169,15 @@ class RestaurantRecommender:
         """
         
         try:
-            response = model.generate_content(prompt)
-            clean_response = re.search(r'```json\s*(\[.*?\])\s*```', response.text, re.DOTALL)
+            response_text = LLM_CLIENT.generate(prompt)
+            clean_response = re.search(r'```json\s*(\[.*?\])\s*```', response_text, re.DOTALL)
             if clean_response:
                 json_str = clean_response.group(1)
                 top_3 = json.loads(json_str)
                 logging.info(f"Gemini AI 추천 완료: {len(top_3)}개 맛집 선정")
                 return top_3
             else:
-                json_str = response.text[response.text.find('['):response.text.rfind(']')+1]
+                json_str = response_text[response_text.find('['):response_text.rfind(']')+1]
                 top_3 = json.loads(json_str)
                 logging.info(f"Gemini AI 추천 완료 (폴백): {len(top_3)}개 맛집 선정")
                 return top_3
@@ -211,6 +195,7 @@ class RestaurantRecommender:
             return []
             
         analyzed_results = []
+        pending = [] # 리뷰를 모았지만 아직 분석하지 않은 (기본 정보, 리뷰) 목록
 
         # 2. 각 후보에 대해 크롤링 및 Gemini 분석 실행
         for i, restaurant in enumerate(candidate_restaurants):
@@ -230,20 +215,20 @@ class RestaurantRecommender:
                 url = web_result.get('url', '')
                 content = self.fetch_page_content(url)
                 if content:
-                    reviews_on_page = [
-                        line.strip() for line in content.split('\n')
-                        if len(line.strip()) > 15 and any(k in line for k in ["맛", "분위기", "가격", "서비스", "추천"])
-                    ]
+                    reviews_on_page = REVIEW_MATCHER.extract(content, min_length=16)
                     all_reviews.extend(reviews_on_page)
             
             if all_reviews:
-                # 리뷰가 존재할 경우에만 Gemini 분석 실행
-                analysis = self.analyze_restaurant_with_gemini(restaurant, list(set(all_reviews))[:15]) # 중복제거, 15개로 제한
-                if analysis:
-                    analyzed_results.append(analysis)
+                # 리뷰가 존재할 경우에만 Gemini 분석 대상에 추가
+                pending.append((restaurant, list(set(all_reviews))[:15])) # 중복제거, 15개로 제한
             else:
                 # 리뷰를 못 찾았으면 건너뛰고 다음 후보로 진행
                 logging.warning(f"리뷰를 찾지 못해 '{place_name}' 분석을 건너뜁니다.")
+
+            # 목표 수량을 채울 만큼 모였거나 후보가 끝나면 모인 맛집을 배치로 묶어 분석 (실패한 만큼 다음 후보로 다시 채움)
+            if pending and (len(analyzed_results) + len(pending) >= target_count or i == len(candidate_restaurants) - 1):
+                analyzed_results.extend(analysis for analysis in self.analyze_restaurants_with_gemini(pending) if analysis)
+                pending = []
         
         logging.info(f"총 {len(analyzed_results)}개의 맛집 분석을 완료했습니다.")
         return analyzed_results
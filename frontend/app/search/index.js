@@ -1,8 +1,8 @@
 // app/search/index.js
 import React, { useState, useEffect, useRef } from 'react';
 import { useLocalSearchParams, useRouter } from 'expo-router';
-// search와 saveSearchLog 함수를 모두 가져옵니다.
-import { search, saveSearchLog } from '../../services/searchService';
+// 추천 스트리밍과 saveSearchLog 함수를 가져옵니다.
+import { streamRecommendations, saveSearchLog } from '../../services/searchService';
 import ResultScreen from '../../components/ResultScreen';
 
 export default function SearchResultsScreen() {
@@ -14,28 +14,49 @@ export default function SearchResultsScreen() {
     const [searchResults, setSearchResults] = useState([]);
     const [isLoading, setIsLoading] = useState(false);
     const textInputRef = useRef(null);
+    const streamRef = useRef(null);
 
     const performSearch = async (query) => {
+        // 이전 검색의 스트리밍은 중단합니다.
+        if (streamRef.current) {
+            streamRef.current.cancel();
+            streamRef.current = null;
+        }
+        setSearchResults([]);
         if (!query) {
-            setSearchResults([]);
+            // 중단한 검색은 로딩 상태를 되돌리지 않으므로 여기서 끕니다.
+            setIsLoading(false);
             return;
         }
         setIsLoading(true);
+        let stream = null;
         try {
             // 1. 백엔드에 검색 로그를 저장합니다.
             await saveSearchLog(query);
 
-            // 2. 백엔드에서 전체 결과를 가져와 필터링합니다.
-            const results = await search(query);
-            setSearchResults(results);
+            // 2. 추천 맛집을 받는 대로 후보 순서에 맞춰 바로 화면에 추가합니다.
+            stream = streamRecommendations(query, {
+                onItem: (restaurant, index) => {
+                    setSearchResults(prev =>
+                        [...prev, { ...restaurant, index }].sort((a, b) => a.index - b.index)
+                    );
+                },
+            });
+            streamRef.current = stream;
+            await stream.promise;
         } catch (error) {
             console.error('Search error:', error);
-            setSearchResults([]);
         } finally {
-            setIsLoading(false);
+            // 그 사이에 새 검색이 시작됐으면 로딩 상태는 새 검색이 관리합니다.
+            if (streamRef.current === stream) {
+                streamRef.current = null;
+                setIsLoading(false);
+            }
         }
     };
 
+    useEffect(() => () => streamRef.current && streamRef.current.cancel(), []);
+
     useEffect(() => {
         if (initialQuery) {
             const initialFilter = { id: Date.now(), text: initialQuery, active: true };
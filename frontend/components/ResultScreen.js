@@ -17,33 +17,43 @@ import Footer from './Footer';
 //     </TouchableOpacity>
 // );
 
-const ResultCard = ({ item, onPress }) => (
-    <TouchableOpacity onPress={() => onPress(item)} style={styles.card}>
-        {/* 새로운 JSON 파일에는 image 필드가 없으므로, 기본 이미지 URL을 사용합니다. */}
-        <Image source={{ uri: 'https://placehold.co/100x100/A8A8A8/FFFFFF?text=Cureat' }} style={styles.cardImage} />
-        <View style={styles.cardContent}>
-            {/* name 필드를 사용하여 음식점 이름을 표시 */}
-            <Text style={styles.cardTitle}>{item.name}</Text>
+const PLACEHOLDER_IMAGE = 'https://placehold.co/100x100/A8A8A8/FFFFFF?text=Cureat';
 
-            {/* rating, reviews, description 대신 다른 정보들을 표시 */}
-            <View style={styles.cardInfoContainer}>
-                {item.signature_dishes && item.signature_dishes.length > 0 && (
-                    <Text style={styles.cardInfo}>시그니처: {item.signature_dishes.join(', ')}</Text>
-                )}
-                {item.pros && (
-                    <Text style={styles.cardInfo}>장점: {item.pros[0]}</Text>
-                )}
-                {item.cons && (
-                    <Text style={styles.cardInfo}>단점: {item.cons[0]}</Text>
-                )}
+const ResultCard = ({ item, onPress }) => {
+    // 추천 API(RestaurantDetail)와 기존 JSON 결과의 필드 이름이 달라 둘 다 지원합니다.
+    const signature = item.signature_menu || (item.signature_dishes && item.signature_dishes.join(', '));
+    const pros = item.summary_pros || item.pros;
+    const cons = item.summary_cons || item.cons;
+    const price = item.summary_price || item.price_range;
 
-                {item.price_range && (
-                    <Text style={styles.cardInfo}>가격대: {item.price_range}</Text>
-                )}
+    return (
+        <TouchableOpacity onPress={() => onPress(item)} style={styles.card}>
+            {/* 이미지가 없는 결과는 기본 이미지 URL을 사용합니다. */}
+            <Image source={{ uri: item.image_url || PLACEHOLDER_IMAGE }} style={styles.cardImage} />
+            <View style={styles.cardContent}>
+                {/* name 필드를 사용하여 음식점 이름을 표시 */}
+                <Text style={styles.cardTitle}>{item.name}</Text>
+
+                {/* rating, reviews, description 대신 다른 정보들을 표시 */}
+                <View style={styles.cardInfoContainer}>
+                    {!!signature && (
+                        <Text style={styles.cardInfo}>시그니처: {signature}</Text>
+                    )}
+                    {pros && pros.length > 0 && (
+                        <Text style={styles.cardInfo}>장점: {pros[0]}</Text>
+                    )}
+                    {cons && cons.length > 0 && (
+                        <Text style={styles.cardInfo}>단점: {cons[0]}</Text>
+                    )}
+
+                    {!!price && (
+                        <Text style={styles.cardInfo}>가격대: {price}</Text>
+                    )}
+                </View>
             </View>
-        </View>
-    </TouchableOpacity>
-);
+        </TouchableOpacity>
+    );
+};
 
 
 
@@ -117,7 +127,7 @@ const ResultScreen = ({
             <FlatList
                 data={searchResults}
                 renderItem={({ item }) => <ResultCard item={item} onPress={navigateToDetail} />}
-                keyExtractor={(item, index) => index.toString()}
+                keyExtractor={(item, index) => item.restaurant_id || `${item.name}-${index}`}
                 ListEmptyComponent={
                     isLoading ? (
                         <Text style={styles.loadingText}>검색 중...</Text>
@@ -127,6 +137,12 @@ const ResultScreen = ({
                         </Text>
                     )
                 }
+                // 스트리밍으로 일부 결과가 먼저 도착하면, 나머지를 찾는 동안 목록 아래에 안내를 표시합니다.
+                ListFooterComponent={
+                    isLoading && searchResults.length > 0 ? (
+                        <Text style={styles.loadingMoreText}>더 많은 맛집을 찾는 중...</Text>
+                    ) : null
+                }
                 style={styles.resultsList}
                 contentContainerStyle={[
                     styles.resultsListContent,
@@ -228,6 +244,12 @@ const styles = StyleSheet.create({
         fontSize: 16,
         color: '#888',
     },
+    loadingMoreText: {
+        textAlign: 'center',
+        marginVertical: 15,
+        fontSize: 14,
+        color: '#888',
+    },
     noResultsText: {
         textAlign: 'center',
         marginTop: 50,
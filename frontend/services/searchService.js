@@ -92,4 +92,69 @@ export const search = async (query) => {
     console.error('검색 API 호출 중 오류 발생:', error);
     throw new Error('검색 오류가 발생했습니다.');
   }
-};
\ No newline at end of file
+};
+
+/**
+ * 백엔드의 /recommendations/stream 에서 추천 맛집을 준비되는 대로 하나씩 받는 함수
+ * React Native의 fetch는 응답 본문을 스트리밍으로 읽을 수 없으므로 XMLHttpRequest의 onprogress로
+ * 지금까지 받은 NDJSON 줄을 처리합니다.
+ * @param {string} prompt 사용자가 입력한 검색어
+ * @param {object} handlers onItem(restaurant, index): 맛집 하나를 받을 때마다, onSummary(summary): 마지막 요약을 받을 때
+ * @param {number} userId 추천을 요청하는 사용자 ID
+ * @returns {{promise: Promise<object>, cancel: Function}} promise는 요약(summary) 이벤트로 끝나고, cancel로 요청을 취소합니다.
+ */
+export const streamRecommendations = (prompt, { onItem, onSummary } = {}, userId = 1) => {
+  const xhr = new XMLHttpRequest();
+  const promise = new Promise((resolve, reject) => {
+    let offset = 0;
+    let summary = null;
+
+    // 줄 단위로 끝까지 받은 이벤트만 처리합니다. (마지막 줄이 아직 다 오지 않았을 수 있음)
+    // XHR 콜백 안에서 던진 오류는 promise로 전달되지 않으므로, 해석할 수 없는 줄이 오면 요청을 끊고 reject 합니다.
+    const consume = () => {
+      try {
+        const text = xhr.responseText || '';
+        let end = text.indexOf('\n', offset);
+        while (end !== -1) {
+          const line = text.slice(offset, end).trim();
+          offset = end + 1;
+          if (line) {
+            const { event, data } = JSON.parse(line);
+            if (event === 'restaurant' && onItem) {
+              onItem(data.restaurant, data.index);
+            } else if (event === 'summary') {
+              summary = data;
+              if (onSummary) onSummary(data);
+            } else if (event === 'error') {
+              console.warn('추천 스트리밍 중 오류:', data.message);
+            }
+          }
+          end = text.indexOf('\n', offset);
+        }
+        return true;
+      } catch (error) {
+        reject(new Error(`추천 스트리밍 응답을 처리하지 못했습니다: ${error.message}`));
+        xhr.abort();
+        return false;
+      }
+    };
+
+    xhr.open('POST', `${API_BASE_URL}/recommendations/stream`);
+    xhr.setRequestHeader('Content-Type', 'application/json');
+    xhr.setRequestHeader('Accept', 'application/x-ndjson');
+    xhr.onprogress = consume;
+    xhr.onload = () => {
+      if (xhr.status !== 200) {
+        reject(new Error(`추천 API 호출 중 오류 발생: ${xhr.status}`));
+        return;
+      }
+      if (consume()) {
+        resolve(summary);
+      }
+    };
+    xhr.onerror = () => reject(new Error('통신 오류가 발생했습니다.'));
+    xhr.onabort = () => resolve(summary);
+    xhr.send(JSON.stringify({ user_id: userId, prompt }));
+  });
+  return { promise, cancel: () => xhr.abort() };
+};